@@ -0,0 +1 @@
+# backend/alembic/__init__.py
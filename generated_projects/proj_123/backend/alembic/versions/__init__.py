@@ -0,0 +1 @@
+# backend/alembic/versions/__init__.py
@@ -0,0 +1 @@
+# backend/app/__init__.py
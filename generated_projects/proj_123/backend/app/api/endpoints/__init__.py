@@ -0,0 +1 @@
+# backend/app/api/endpoints/__init__.py
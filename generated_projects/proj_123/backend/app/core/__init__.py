@@ -0,0 +1 @@
+# backend/app/core/__init__.py
@@ -0,0 +1 @@
+# backend/app/crud/__init__.py
@@ -0,0 +1 @@
+# backend/app/db/__init__.py
@@ -0,0 +1 @@
+# backend/app/models/__init__.py
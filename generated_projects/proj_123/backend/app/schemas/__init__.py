@@ -0,0 +1 @@
+# backend/app/schemas/__init__.py
@@ -140,6 +140,31 @@ class RedisClient:
             logger.error(f"Cache delete error: {e}")
             return False
     
+    async def delete_pattern(self, pattern: str) -> int:
+        """Delete all keys matching a glob pattern.
+
+        Args:
+            pattern: Key pattern to match (e.g., "llm:*")
+
+        Returns:
+            Number of keys deleted
+        """
+        if not self.enabled:
+            return 0
+
+        try:
+            client = await self._get_client()
+            if client is None:
+                return 0
+
+            deleted = 0
+            async for key in client.scan_iter(match=pattern, count=500):
+                deleted += await client.delete(key)
+            return deleted
+        except Exception as e:
+            logger.error(f"Cache delete_pattern error: {e}")
+            return 0
+
     async def close(self):
         """Close Redis connection."""
         if self._client:
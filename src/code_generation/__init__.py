@@ -4,10 +4,20 @@ Ignara Code Generation System v2.
 Modules:
     architect    — Intelligent Architecture Designer (idea → SystemSpec)
     engine_v2    — LLM-Powered Code Generator (SystemSpec → complete codebase)
+    artifact_store — Content-addressed store of validated generated files
+    batching     — Several small files per LLM call (delimiter protocol)
+    checkpoint   — Build checkpoints for resuming interrupted generation
+    context_packer — Token-budgeted, relevance-ranked prompt context
+    incremental  — Spec diffing and build manifests for incremental rebuilds
+    job_store    — Persistent, bounded registry of v2 API generation jobs
+    patching     — Patch-based healing (minimal diffs instead of full regeneration)
+    project_index — Shared per-project file index (paths, hashes, lazy ASTs)
     quality      — Code Quality Pipeline (validation + auto-fix)
     pipeline     — Orchestration Pipeline (architect → generate → validate → fix)
     refinement   — Iterative Refinement Engine (natural language code changes)
     routes       — FastAPI routes for the v2 pipeline API
+    tiering      — Fast/strong model routing by file difficulty
+    zip_export   — Streaming, cacheable ZIP export of generated projects
 
 Legacy modules (v1, template-based):
     engine           — Original template-based generator
@@ -338,7 +338,7 @@ class SystemArchitect:
     # Initialisation
     # -------------------------------------------------------------------------
 
-    def __init__(self, llm_client=None, provider: str = "auto"):
+    def __init__(self, llm_client=None, provider: str = "auto", similarity_cache=None):
         """
         Initialise the SystemArchitect.
 
@@ -347,7 +347,16 @@ class SystemArchitect:
                         created automatically via get_llm_client(provider).
             provider:   Provider string passed to get_llm_client when
                         llm_client is not supplied.  Defaults to "auto".
+            similarity_cache: Optional SimilarityCache that serves step
+                        responses for near-identical ideas.  Defaults to the
+                        process-wide one, which is off unless
+                        LLM_SIMILARITY_CACHE is set.
         """
+        if similarity_cache is None:
+            from src.llm.similarity_cache import get_default_similarity_cache  # noqa: PLC0415
+            similarity_cache = get_default_similarity_cache()
+        self._similarity_cache = similarity_cache
+
         if llm_client is not None:
             self._client = llm_client
         else:
@@ -380,6 +389,8 @@ class SystemArchitect:
           4. Frontend pages and components
           5. Validation / consistency check — permissions, integrations, rules
 
+        Steps 3–5 only depend on steps 1 and 2 and run concurrently.
+
         Args:
             idea_name:        Short name for the application.
             idea_description: Plain-English description of the idea.
@@ -412,9 +423,7 @@ class SystemArchitect:
         # ---------- Step 1: High-level decomposition ----------
         decomposition: Dict[str, Any] = {}
         try:
-            decomposition = await asyncio.to_thread(
-                self._step1_decompose, context, idea_name
-            )
+            decomposition = await self._step1_decompose(context, idea_name)
             steps_completed.append("decomposition")
             logger.info("Step 1 (decomposition) complete")
         except Exception as exc:
@@ -426,46 +435,46 @@ class SystemArchitect:
         # ---------- Step 2: Entity / data model ----------
         entities: List[EntitySpec] = []
         try:
-            entities = await asyncio.to_thread(
-                self._step2_entities, context, decomposition
-            )
+            entities = await self._step2_entities(context, decomposition)
             steps_completed.append("entities")
             logger.info(f"Step 2 (entities) complete → {len(entities)} entities")
         except Exception as exc:
             logger.warning(f"Step 2 failed: {exc}")
 
-        # ---------- Step 3: API routes ----------
+        # ---------- Steps 3–5: routes, pages, cross-cutting ----------
+        # Each needs only the context, entities and decomposition, so they
+        # run concurrently; a failed step falls back to its empty default.
+        step_results = await asyncio.gather(
+            self._step3_routes(context, entities, decomposition),
+            self._step4_pages(context, entities, decomposition),
+            self._step5_cross_cutting(context, entities, decomposition),
+            return_exceptions=True,
+        )
+        routes_result, pages_result, cross_cutting_result = step_results
+
         routes: List[RouteSpec] = []
-        try:
-            routes = await asyncio.to_thread(
-                self._step3_routes, context, entities, decomposition
-            )
+        if isinstance(routes_result, BaseException):
+            logger.warning(f"Step 3 failed: {routes_result}")
+        else:
+            routes = routes_result
             steps_completed.append("routes")
             logger.info(f"Step 3 (routes) complete → {len(routes)} routes")
-        except Exception as exc:
-            logger.warning(f"Step 3 failed: {exc}")
 
-        # ---------- Step 4: Frontend pages ----------
         pages: List[PageSpec] = []
-        try:
-            pages = await asyncio.to_thread(
-                self._step4_pages, context, entities, decomposition
-            )
+        if isinstance(pages_result, BaseException):
+            logger.warning(f"Step 4 failed: {pages_result}")
+        else:
+            pages = pages_result
             steps_completed.append("pages")
             logger.info(f"Step 4 (pages) complete → {len(pages)} pages")
-        except Exception as exc:
-            logger.warning(f"Step 4 failed: {exc}")
 
-        # ---------- Step 5: Permissions, integrations, rules, tech stack ----------
         cross_cutting: Dict[str, Any] = {}
-        try:
-            cross_cutting = await asyncio.to_thread(
-                self._step5_cross_cutting, context, entities, decomposition
-            )
+        if isinstance(cross_cutting_result, BaseException):
+            logger.warning(f"Step 5 failed: {cross_cutting_result}")
+        else:
+            cross_cutting = cross_cutting_result
             steps_completed.append("cross_cutting")
             logger.info("Step 5 (cross-cutting) complete")
-        except Exception as exc:
-            logger.warning(f"Step 5 failed: {exc}")
 
         # ---------- Assemble the SystemSpec ----------
         spec = self._assemble_spec(
@@ -488,6 +497,26 @@ class SystemArchitect:
         )
         return spec
 
+    # -------------------------------------------------------------------------
+    # Private: LLM call
+    # -------------------------------------------------------------------------
+
+    async def _complete(self, step_name: str, context: str, prompt: str, **kwargs):
+        """
+        Run one step's completion, via the similarity cache when enabled.
+
+        The idea context is the part allowed to differ between hits; each
+        step is its own namespace. Only responses that parse as JSON are
+        cached, so a malformed answer is never replayed to similar ideas.
+        """
+        if self._similarity_cache is None:
+            return await self._client.acomplete(prompt, **kwargs)
+        return await self._similarity_cache.acomplete(
+            self._client, f"architect.{step_name}", context, prompt,
+            validate=lambda response: safe_parse_json(response.content, step_name=step_name) is not None,
+            **kwargs,
+        )
+
     # -------------------------------------------------------------------------
     # Private: Context Builder
     # -------------------------------------------------------------------------
@@ -510,7 +539,7 @@ Description: {idea_description}
     # Private: Step 1 — High-level decomposition
     # -------------------------------------------------------------------------
 
-    def _step1_decompose(
+    async def _step1_decompose(
         self,
         context: str,
         idea_name: str,
@@ -559,7 +588,9 @@ Return a JSON object with this exact structure:
 
 Focus on what this specific app needs — do not add generic features."""
 
-        response = self._client.complete(
+        response = await self._complete(
+            "step1_decompose",
+            context,
             prompt,
             system_prompt=system_prompt,
             max_tokens=2048,
@@ -576,7 +607,7 @@ Focus on what this specific app needs — do not add generic features."""
     # Private: Step 2 — Entity / data model
     # -------------------------------------------------------------------------
 
-    def _step2_entities(
+    async def _step2_entities(
         self,
         context: str,
         decomposition: Dict[str, Any],
@@ -648,7 +679,9 @@ Rules:
 9. Add audit fields: created_by, updated_by for entities modified by users.
 10. Consider adding a Settings or Configuration entity for app-wide settings."""
 
-        response = self._client.complete(
+        response = await self._complete(
+            "step2_entities",
+            context,
             prompt,
             system_prompt=system_prompt,
             max_tokens=4096,
@@ -715,7 +748,7 @@ Rules:
     # Private: Step 3 — API routes
     # -------------------------------------------------------------------------
 
-    def _step3_routes(
+    async def _step3_routes(
         self,
         context: str,
         entities: List[EntitySpec],
@@ -781,7 +814,9 @@ Requirements:
 9. For list endpoints, include filter_by and sort_by options in the response.
 10. Add a /api/v1/stats or /api/v1/dashboard endpoint that returns aggregate counts/metrics."""
 
-        response = self._client.complete(
+        response = await self._complete(
+            "step3_routes",
+            context,
             prompt,
             system_prompt=system_prompt,
             max_tokens=4096,
@@ -839,7 +874,7 @@ Requirements:
     # Private: Step 4 — Frontend pages
     # -------------------------------------------------------------------------
 
-    def _step4_pages(
+    async def _step4_pages(
         self,
         context: str,
         entities: List[EntitySpec],
@@ -910,7 +945,9 @@ Requirements:
 9. Every page should specify at least 2-3 components for a rich, complete experience.
 10. Add an /onboarding or /getting-started page for new users."""
 
-        response = self._client.complete(
+        response = await self._complete(
+            "step4_pages",
+            context,
             prompt,
             system_prompt=system_prompt,
             max_tokens=4096,
@@ -957,7 +994,7 @@ Requirements:
     # Private: Step 5 — Cross-cutting concerns
     # -------------------------------------------------------------------------
 
-    def _step5_cross_cutting(
+    async def _step5_cross_cutting(
         self,
         context: str,
         entities: List[EntitySpec],
@@ -1066,7 +1103,9 @@ Tech stack should be idiomatic for a modern SaaS — prefer the defaults unless
 For tech_stack_recommendation: list specific pinned versions for all major dependencies.
 For project_structure: provide a realistic directory tree using ASCII art characters."""
 
-        response = self._client.complete(
+        response = await self._complete(
+            "step5_cross_cutting",
+            context,
             prompt,
             system_prompt=system_prompt,
             max_tokens=3000,
@@ -0,0 +1,256 @@
+"""
+Content-Addressed Artifact Store for Generated Files.
+
+Regenerating the same project (or one that shares files with an earlier
+build) asks the LLM for byte-identical requests over and over. The store
+remembers each validated file under a key derived from everything that
+determines the request:
+
+- the fully rendered prompt and the file's relative path,
+- a hash of each dependency's interface summary (``_FileSpec.depends_on``),
+- the model, provider, system prompt and base temperature.
+
+A hit lets :class:`~src.code_generation.engine_v2.CodeGeneratorV2` write the
+file straight to disk, skipping both the LLM call and the heal loop.
+
+Layout on disk (git-style)::
+
+    <root>/objects/ab/ab12...   file contents, named by their sha256
+    <root>/refs/cd/cd34...      request key -> object sha
+
+Identical outputs for different requests share one object. Writes go to a
+temporary file first and are moved into place with ``os.replace`` so
+concurrent builds never observe a half-written entry.
+
+The store is bounded: every ``gc_every`` stores, :meth:`ArtifactStore.gc`
+drops refs unused for ``max_age_seconds`` (a hit refreshes a ref's mtime),
+then the least recently used refs until the objects fit in ``max_bytes``,
+and deletes objects no ref points to.
+
+Disabled unless ``CODEGEN_ARTIFACT_STORE`` is set (``1`` for the default
+``.codegen_artifacts`` directory, or a directory path).
+``CODEGEN_ARTIFACT_STORE_MAX_MB`` (default 1024) and
+``CODEGEN_ARTIFACT_STORE_MAX_AGE_DAYS`` (default 30) set the bounds.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARTIFACT_DIR = ".codegen_artifacts"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 3600
+
+
+def _sha256(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ArtifactStore:
+    """Filesystem store of generated sources keyed by request content."""
+
+    def __init__(
+        self,
+        root: os.PathLike = DEFAULT_ARTIFACT_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        gc_every: int = 200,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.gc_every = gc_every
+        self._lock = threading.Lock()
+        self._gc_lock = threading.Lock()
+        self._stores_since_gc = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(
+        prompt: str,
+        relative_path: str,
+        dependency_interfaces: Mapping[str, str],
+        model: str,
+        temperature: float,
+        system_prompt: str = "",
+        provider: str = "",
+    ) -> str:
+        """Request key: hash of the prompt, dependency interfaces and model settings."""
+        deps = "\n".join(
+            f"{path}:{_sha256(summary)}"
+            for path, summary in sorted(dependency_interfaces.items())
+        )
+        parts = [
+            _sha256(prompt), relative_path, deps, str(model), str(provider),
+            f"{temperature:.3f}", _sha256(system_prompt),
+        ]
+        return _sha256("|||".join(parts))
+
+    def _path(self, kind: str, digest: str) -> Path:
+        return self.root / kind / digest[:2] / digest
+
+    def _atomic_write(self, dest: Path, data: str) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as fh:
+                fh.write(data)
+            os.replace(tmp, dest)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored source for *key*, or None."""
+        ref = self._path("refs", key)
+        try:
+            object_sha = ref.read_text(encoding="utf-8").strip()
+            source = self._path("objects", object_sha).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        if _sha256(source) != object_sha:
+            logger.warning(f"Artifact store object {object_sha} is corrupt; ignoring")
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            # Recency for gc()
+            os.utime(ref)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return source
+
+    def put(self, key: str, source: str) -> Optional[str]:
+        """Store *source* under *key*; returns the object sha, or None if the write failed."""
+        object_sha = _sha256(source)
+        try:
+            obj = self._path("objects", object_sha)
+            if not obj.exists():
+                self._atomic_write(obj, source)
+            self._atomic_write(self._path("refs", key), object_sha)
+        except OSError as exc:
+            logger.warning(f"Artifact store write failed: {exc}")
+            return None
+        with self._lock:
+            self.stores += 1
+            self._stores_since_gc += 1
+            due = self._stores_since_gc >= self.gc_every
+            if due:
+                self._stores_since_gc = 0
+        if due:
+            self.gc()
+        return object_sha
+
+    @staticmethod
+    def _entries(directory: Path) -> List[Tuple[Path, os.stat_result]]:
+        entries = []
+        for path in directory.glob("*/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                continue
+        return entries
+
+    def gc(self) -> int:
+        """Enforce ``max_age_seconds`` and ``max_bytes``; returns how many refs were dropped."""
+        if not self._gc_lock.acquire(blocking=False):
+            return 0  # another thread is already collecting
+        try:
+            cutoff = time.time() - self.max_age_seconds
+            refs: List[Tuple[float, Path, str]] = []
+            dropped = 0
+            for path, st in self._entries(self.root / "refs"):
+                if st.st_mtime < cutoff:
+                    dropped += self._unlink(path)
+                    continue
+                try:
+                    refs.append((st.st_mtime, path, path.read_text(encoding="utf-8").strip()))
+                except OSError:
+                    continue
+            objects = {path.name: (path, st) for path, st in self._entries(self.root / "objects")}
+
+            # Least recently used refs go first until the live objects fit
+            refs.sort(key=lambda r: r[0])
+            users: Dict[str, int] = {}
+            for _, _, sha in refs:
+                users[sha] = users.get(sha, 0) + 1
+            live_bytes = sum(objects[sha][1].st_size for sha in users if sha in objects)
+            for _, path, sha in refs:
+                if live_bytes <= self.max_bytes:
+                    break
+                dropped += self._unlink(path)
+                users[sha] -= 1
+                if not users[sha] and sha in objects:
+                    live_bytes -= objects[sha][1].st_size
+
+            # Fresh objects may belong to a put() whose ref isn't written yet
+            settled = time.time() - 60
+            for sha, (path, st) in objects.items():
+                if not users.get(sha) and st.st_mtime < settled:
+                    self._unlink(path)
+        finally:
+            self._gc_lock.release()
+        if dropped:
+            with self._lock:
+                self.evicted += dropped
+            logger.info(f"Artifact store evicted {dropped} entries")
+        return dropped
+
+    @staticmethod
+    def _unlink(path: Path) -> int:
+        try:
+            path.unlink()
+            return 1
+        except OSError:
+            return 0
+
+    def stats(self) -> Dict[str, int]:
+        """Lookup, store and eviction counters for this process."""
+        with self._lock:
+            return {
+                "hits": self.hits, "misses": self.misses,
+                "stores": self.stores, "evicted": self.evicted,
+            }
+
+
+_default_artifact_store: Optional[ArtifactStore] = None
+
+
+def get_default_artifact_store() -> Optional[ArtifactStore]:
+    """
+    Return the process-wide artifact store, or None when it is off.
+
+    Enabled with ``CODEGEN_ARTIFACT_STORE=1`` (stored under
+    ``.codegen_artifacts``) or ``CODEGEN_ARTIFACT_STORE=<directory>``.
+    """
+    global _default_artifact_store
+    if _default_artifact_store is None:
+        setting = os.getenv("CODEGEN_ARTIFACT_STORE", "").strip()
+        if not setting or setting.lower() in ("0", "false", "no"):
+            return None
+        root = DEFAULT_ARTIFACT_DIR if setting.lower() in ("1", "true", "yes") else setting
+        _default_artifact_store = ArtifactStore(
+            root,
+            max_bytes=int(float(os.getenv("CODEGEN_ARTIFACT_STORE_MAX_MB", "1024")) * 1024 * 1024),
+            max_age_seconds=float(os.getenv("CODEGEN_ARTIFACT_STORE_MAX_AGE_DAYS", "30")) * 24 * 3600,
+        )
+    return _default_artifact_store
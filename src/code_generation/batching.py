@@ -0,0 +1,92 @@
+"""
+Multi-File Batched Generation for Small Files.
+
+A project plan contains many small files (``.gitignore``, ``.dockerignore``,
+``tsconfig.json``, ``postcss.config.js``, Dockerfiles, CSS, ...). Generated
+one per call, each costs a full LLM round trip carrying the whole system
+prompt. :class:`~src.code_generation.engine_v2.CodeGeneratorV2` instead
+groups up to ``BATCH_MAX_FILES`` small files that are ready at the same time
+into one completion:
+
+- :func:`is_batchable` picks the small files of a plan;
+- :func:`build_batch_prompt` joins their individual prompts and asks for
+  every file between delimiter lines::
+
+      === FILE: frontend/tsconfig.json ===
+      ...contents...
+      === END FILE ===
+
+- :func:`split_batch_response` cuts the completion back into files.
+
+Each file is then validated (and healed, if needed) on its own; a file the
+model skipped or truncated is generated by itself as before.
+"""
+
+import re
+from pathlib import PurePosixPath
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Files whose output is a few dozen lines at most
+SMALL_FILE_NAMES = frozenset({
+    ".gitignore", ".dockerignore", ".env.example", ".prettierrc", ".eslintrc.json",
+    "Dockerfile", "alembic.ini", "requirements.txt", "pyproject.toml", "package.json",
+    "tsconfig.json", "tsconfig.node.json", "postcss.config.js", "postcss.config.cjs",
+    "tailwind.config.ts", "tailwind.config.js", "next.config.js", "next.config.mjs",
+    "vite.config.ts", "svelte.config.js", "ci.yml", "__init__.py",
+})
+SMALL_FILE_SUFFIXES = (".css",)
+
+FILE_START = "=== FILE: {path} ==="
+FILE_END = "=== END FILE ==="
+_START_LINE = re.compile(r"^=== FILE: (.+?) ===\s*$", re.MULTILINE)
+
+BATCH_PROTOCOL = """
+
+BATCH MODE: this request asks for several files at once. Rule 1 is relaxed as follows:
+output every requested file, each one wrapped exactly like this, and nothing else:
+=== FILE: <relative path> ===
+<complete raw file contents, no markdown fences>
+=== END FILE ==="""
+
+
+def is_batchable(relative_path: str) -> bool:
+    """True for the small files worth generating several-per-call."""
+    path = PurePosixPath(relative_path)
+    return path.name in SMALL_FILE_NAMES or path.suffix in SMALL_FILE_SUFFIXES
+
+
+def build_batch_prompt(items: Sequence[Tuple[str, str]]) -> str:
+    """One prompt requesting every ``(relative_path, prompt)`` in *items*."""
+    parts = [
+        f"Generate the following {len(items)} files. Each section below is the full "
+        f"request for one file; answer all of them using the batch delimiter format."
+    ]
+    for n, (path, prompt) in enumerate(items, 1):
+        parts.append(f"\n##### Request {n} of {len(items)}: {path}\n\n{prompt.strip()}")
+    parts.append(
+        "\nOutput the files in this order: "
+        + ", ".join(path for path, _ in items)
+        + f". Start each with '{FILE_START.format(path='<path>')}' and end it with '{FILE_END}'."
+    )
+    return "\n".join(parts)
+
+
+def split_batch_response(response: str, expected: Iterable[str]) -> Dict[str, str]:
+    """
+    Cut a batched completion into ``{relative_path: source}``.
+
+    Only paths in *expected* are returned. A section without its end marker
+    (a truncated completion) is dropped, so that file is regenerated alone.
+    """
+    wanted = set(expected)
+    files: Dict[str, str] = {}
+    starts: List[re.Match] = list(_START_LINE.finditer(response))
+    for i, match in enumerate(starts):
+        path = match.group(1).strip()
+        body_end = starts[i + 1].start() if i + 1 < len(starts) else len(response)
+        body = response[match.end():body_end]
+        end = body.rfind(FILE_END)
+        if path not in wanted or end == -1:
+            continue
+        files[path] = body[:end].strip("\n") + "\n"
+    return files
@@ -29,11 +29,16 @@ def run_v2_pipeline_thread(
     features: Optional[str] = None,
     monetization: Optional[str] = None,
     customization: Optional[Dict[str, Any]] = None,
+    resume: bool = False,
 ) -> None:
     """Run the v2 GenerationPipeline in a worker thread.
 
     This replaces the old _run_pipeline_thread that used the v1 template-based engine.
     All progress updates are pushed into build_manager for SSE streaming.
+
+    With *resume*, a build of the same idea that was interrupted (worker
+    died, deploy restart) continues from its checkpoint instead of starting
+    over: the architect step and every finished file are skipped.
     """
     from src.services.build_manager import build_manager
 
@@ -53,7 +58,10 @@ def run_v2_pipeline_thread(
         build_manager.update_build(build_id, status="running")
         build_manager.push_event(build_id, {
             "type": "started",
-            "message": "Pipeline started — designing architecture",
+            "message": (
+                "Pipeline resumed from checkpoint" if resume
+                else "Pipeline started — designing architecture"
+            ),
         })
 
         if notify:
@@ -119,6 +127,7 @@ def run_v2_pipeline_thread(
                 theme=theme,
                 max_fix_rounds=2,
                 customization=customization,
+                resume=resume,
             ):
                 # Map v2 phases to build_manager stages
                 stage_map = {
@@ -184,6 +193,7 @@ def run_v2_pipeline_thread(
             "total_files": result.generation.total_files,
             "total_lines": result.generation.total_lines,
             "llm_calls_made": result.generation.llm_calls_made,
+            "llm_calls_by_tier": result.generation.tier_calls,
             "fixes_applied": result.fixes_applied,
             "generation_time": result.total_time_seconds,
         }
@@ -0,0 +1,106 @@
+"""
+Build Checkpoints for Resuming Interrupted Generation.
+
+If the worker running a build dies mid-way (deploy restart, OOM, crash), the
+architect spec, every generated file and the accumulated interface summaries
+would otherwise be lost. A :class:`BuildCheckpoint` in the output directory
+(``.ignara/checkpoint.json``) records the progress instead:
+
+- :class:`~src.code_generation.pipeline.GenerationPipeline` writes it as
+  soon as the architect has produced the spec;
+- :class:`~src.code_generation.engine_v2.CodeGeneratorV2` updates it after
+  every file with the file's status, content hash, interface summary and
+  result record, plus the running LLM call count.
+
+A run started with ``resume=True`` reloads the spec and skips every file that
+finished (and is still on disk unchanged) with the same spec, theme and
+customization, so only the remaining files cost LLM calls. The pipeline
+removes the checkpoint once a build completes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from src.code_generation.architect import SystemSpec
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_PATH = ".ignara/checkpoint.json"
+
+
+class FileCheckpoint(BaseModel):
+    """Outcome of one file of a checkpointed build."""
+
+    # "done" | "failed"
+    status: str
+    sha256: str = ""
+    interface: str = ""
+    # GeneratedFile fields, to report the file again on resume
+    record: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BuildCheckpoint(BaseModel):
+    """Progress of an in-flight build, saved after every step."""
+
+    spec: SystemSpec
+    theme: str = "Modern"
+    customization: Dict[str, Any] = Field(default_factory=dict)
+    # "architect" (spec only) | "generate" (files in progress) | "generated"
+    stage: str = "architect"
+    files: Dict[str, FileCheckpoint] = Field(default_factory=dict)
+    llm_calls: int = 0
+
+    @classmethod
+    def load(cls, output_dir: Path) -> Optional["BuildCheckpoint"]:
+        """Read the checkpoint in *output_dir*, or None if there isn't a usable one."""
+        path = Path(output_dir) / CHECKPOINT_PATH
+        try:
+            return cls.model_validate_json(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable build checkpoint %s: %s", path, exc)
+            return None
+
+    def save(self, output_dir: Path) -> None:
+        """Write the checkpoint atomically into *output_dir*."""
+        path = Path(output_dir) / CHECKPOINT_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.model_dump(mode="json")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @staticmethod
+    def clear(output_dir: Path) -> None:
+        """Remove the checkpoint of a finished build."""
+        try:
+            (Path(output_dir) / CHECKPOINT_PATH).unlink()
+        except FileNotFoundError:
+            pass
+
+    def matches(self, spec: SystemSpec, theme: str, customization: Dict[str, Any]) -> bool:
+        """True if this checkpoint was made for the same build inputs."""
+        return (
+            self.theme == theme
+            and self.customization == customization
+            and self.spec.model_dump(mode="json") == spec.model_dump(mode="json")
+        )
+
+    def completed_file(self, output_dir: Path, relative_path: str) -> Optional[FileCheckpoint]:
+        """The checkpoint of *relative_path* if it finished and is unchanged on disk."""
+        entry = self.files.get(relative_path)
+        if entry is None or entry.status != "done":
+            return None
+        try:
+            data = (Path(output_dir) / relative_path).read_bytes()
+        except OSError:
+            return None
+        if hashlib.sha256(data).hexdigest() != entry.sha256:
+            return None
+        return entry
@@ -8,17 +8,19 @@ Runs after all files are generated to detect and fix cross-file issues:
 4. Missing __init__.py files — auto-creates them for proper Python packaging
 
 This is the "polish" step that turns individually-correct files into a
-coherent, runnable project.
+coherent, runnable project. Files are read from (and fixes written through)
+a shared :class:`~src.code_generation.project_index.ProjectIndex`.
 """
 from __future__ import annotations
 
 import ast
 import logging
-import os
 import re
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
+from src.code_generation.project_index import IGNORED_DIRS, IndexedFile, ProjectIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,12 +61,15 @@ class ConsistencyChecker:
 
     # Common intra-project import patterns for a FastAPI + Next.js project
     _BACKEND_IMPORT_ROOTS = {"app", "backend"}
-    _IGNORED_DIRS = {"__pycache__", ".git", "node_modules", ".next", "dist", "build", ".venv", "venv"}
+    _IGNORED_DIRS = {"dist", "build"} | IGNORED_DIRS
 
-    def run(self, project_dir: str) -> ConsistencyResult:
+    def run(self, project_dir: str, index: Optional[ProjectIndex] = None) -> ConsistencyResult:
         """
         Run the full consistency pass on the project at *project_dir*.
 
+        *index* is the project's shared file index (built if not given);
+        fixes are written through it so later passes see them.
+
         Returns a :class:`ConsistencyResult` with all fixes applied and warnings.
         """
         result = ConsistencyResult()
@@ -74,17 +79,19 @@ class ConsistencyChecker:
             result.warnings.append(f"Project directory not found: {project_dir}")
             return result
 
+        idx = ProjectIndex.ensure(project, index)
+
         # 1. Ensure __init__.py files exist in all Python package dirs
-        self._ensure_init_files(project, result)
+        self._ensure_init_files(project, result, idx)
 
         # 2. Validate and fix Python imports
-        self._fix_python_imports(project, result)
+        self._fix_python_imports(project, result, idx)
 
         # 3. Sync environment variables across config, .env.example, docker-compose
-        self._sync_env_vars(project, result)
+        self._sync_env_vars(project, result, idx)
 
         # 4. Validate frontend import paths
-        self._fix_frontend_imports(project, result)
+        self._fix_frontend_imports(project, result, idx)
 
         logger.info(
             "Consistency pass complete: %d fix(es), %d warning(s)",
@@ -93,33 +100,56 @@ class ConsistencyChecker:
         )
         return result
 
+    def _is_ignored(self, rel: str) -> bool:
+        """True if the project-relative path lies inside an ignored directory."""
+        return any(part in self._IGNORED_DIRS for part in rel.split("/")[:-1])
+
+    def _indexed_files(
+        self, index: ProjectIndex, under: Path, suffixes: Tuple[str, ...]
+    ) -> List[IndexedFile]:
+        """Indexed files below *under* with one of *suffixes*, skipping ignored dirs."""
+        return [
+            f for f in index.files(suffixes, under=under)
+            if not self._is_ignored(f.rel)
+        ]
+
     # ------------------------------------------------------------------
     # 1. __init__.py creation
     # ------------------------------------------------------------------
 
-    def _ensure_init_files(self, project: Path, result: ConsistencyResult) -> None:
+    def _ensure_init_files(
+        self, project: Path, result: ConsistencyResult, index: Optional[ProjectIndex] = None
+    ) -> None:
         """Create missing __init__.py files in backend Python package directories."""
+        idx = ProjectIndex.ensure(project, index)
         backend_dir = project / "backend"
-        if not backend_dir.is_dir():
+        if not idx.is_dir(backend_dir):
             # Also check if the project root IS the backend
             backend_dir = project
-            if not (backend_dir / "app").is_dir():
+            if not idx.is_dir(backend_dir / "app"):
                 return
 
-        for dirpath, dirnames, filenames in os.walk(str(backend_dir)):
-            # Skip ignored directories
-            dirnames[:] = [d for d in dirnames if d not in self._IGNORED_DIRS]
-
-            path = Path(dirpath)
+        base = idx.rel(backend_dir)
+        # Parents sort before their children, so this visits top-down like os.walk
+        package_dirs = [base] + [
+            d for d in idx.dirs(under=backend_dir)
+            if not any(part in self._IGNORED_DIRS for part in d.split("/"))
+        ]
+        for rel_dir in package_dirs:
+            prefix = "" if rel_dir == "." else rel_dir + "/"
+            filenames = [f.name for f in idx.files(under=rel_dir, recursive=False)]
+            subdirs = [
+                d for d in package_dirs
+                if d != rel_dir and d.startswith(prefix) and "/" not in d[len(prefix):]
+            ]
             # Only create __init__.py in directories that contain .py files
             # or other package directories
             has_py = any(f.endswith(".py") for f in filenames)
-            has_subpackages = any((path / d / "__init__.py").exists() for d in dirnames)
+            has_subpackages = any(idx.is_file(f"{d}/__init__.py") for d in subdirs)
 
             if (has_py or has_subpackages) and "__init__.py" not in filenames:
-                init_path = path / "__init__.py"
-                init_path.write_text("")
-                rel = str(init_path.relative_to(project))
+                rel = f"{prefix}__init__.py"
+                idx.write_text(rel, "")
                 result.fixes.append(ConsistencyFix(
                     file_path=rel,
                     description="Created missing __init__.py for Python package",
@@ -131,33 +161,30 @@ class ConsistencyChecker:
     # 2. Python import validation & fixing
     # ------------------------------------------------------------------
 
-    def _fix_python_imports(self, project: Path, result: ConsistencyResult) -> None:
+    def _fix_python_imports(
+        self, project: Path, result: ConsistencyResult, index: Optional[ProjectIndex] = None
+    ) -> None:
         """Scan Python files for broken intra-project imports and attempt fixes."""
+        idx = ProjectIndex.ensure(project, index)
         backend_dir = project / "backend"
-        if not backend_dir.is_dir():
+        if not idx.is_dir(backend_dir):
             backend_dir = project
 
         # Build a map of available Python modules in the project
-        available_modules = self._build_module_map(backend_dir, project)
+        available_modules = self._build_module_map(backend_dir, project, idx)
 
-        for py_file in backend_dir.rglob("*.py"):
-            if any(part in self._IGNORED_DIRS for part in py_file.parts):
-                continue
-            self._check_file_imports(py_file, available_modules, project, result)
+        for py_file in self._indexed_files(idx, backend_dir, (".py",)):
+            self._check_file_imports(py_file, available_modules, idx, result)
 
-    def _build_module_map(self, backend_dir: Path, project: Path) -> Set[str]:
+    def _build_module_map(
+        self, backend_dir: Path, project: Path, index: Optional[ProjectIndex] = None
+    ) -> Set[str]:
         """Build a set of all available Python module dotted paths."""
+        idx = ProjectIndex.ensure(project, index)
         modules: Set[str] = set()
-        for py_file in backend_dir.rglob("*.py"):
-            if any(part in self._IGNORED_DIRS for part in py_file.parts):
-                continue
-            try:
-                rel = py_file.relative_to(project)
-            except ValueError:
-                continue
-
+        for py_file in self._indexed_files(idx, backend_dir, (".py",)):
             # Convert path to module notation: backend/app/models/user.py → backend.app.models.user
-            parts = list(rel.parts)
+            parts = py_file.rel.split("/")
             if parts[-1] == "__init__.py":
                 parts = parts[:-1]
             else:
@@ -174,20 +201,15 @@ class ConsistencyChecker:
 
     def _check_file_imports(
         self,
-        py_file: Path,
+        py_file: IndexedFile,
         available_modules: Set[str],
-        project: Path,
+        index: ProjectIndex,
         result: ConsistencyResult,
     ) -> None:
         """Check imports in a single Python file and fix common issues."""
-        try:
-            source = py_file.read_text(encoding="utf-8", errors="replace")
-        except OSError:
-            return
-
-        try:
-            tree = ast.parse(source)
-        except SyntaxError:
+        source = py_file.text
+        tree = py_file.tree
+        if tree is None:
             return  # Skip unparseable files
 
         modified = False
@@ -211,15 +233,14 @@ class ConsistencyChecker:
                         new_import = f"from {fixed_module} "
                         source = source.replace(old_import, new_import, 1)
                         modified = True
-                        rel_path = str(py_file.relative_to(project))
                         result.fixes.append(ConsistencyFix(
-                            file_path=rel_path,
+                            file_path=py_file.rel,
                             description=f"Fixed import: '{module}' → '{fixed_module}'",
                             fix_type="import_fix",
                         ))
 
         if modified:
-            py_file.write_text(source, encoding="utf-8")
+            index.write_text(py_file.rel, source)
 
     @staticmethod
     def _is_external_import(module: str) -> bool:
@@ -272,30 +293,30 @@ class ConsistencyChecker:
     # 3. Environment variable synchronization
     # ------------------------------------------------------------------
 
-    def _sync_env_vars(self, project: Path, result: ConsistencyResult) -> None:
+    def _sync_env_vars(
+        self, project: Path, result: ConsistencyResult, index: Optional[ProjectIndex] = None
+    ) -> None:
         """Ensure .env.example mentions all env vars referenced in config.py."""
+        idx = ProjectIndex.ensure(project, index)
         config_paths = [
-            project / "backend" / "app" / "core" / "config.py",
-            project / "app" / "core" / "config.py",
+            "backend/app/core/config.py",
+            "app/core/config.py",
         ]
         config_file = None
         for p in config_paths:
-            if p.is_file():
-                config_file = p
+            config_file = idx.get(p)
+            if config_file is not None:
                 break
 
         if not config_file:
             return
 
-        env_example = project / ".env.example"
-        if not env_example.exists():
-            env_example = project / "backend" / ".env.example"
+        env_example = ".env.example"
+        if not idx.is_file(env_example):
+            env_example = "backend/.env.example"
 
         # Extract env var names from config.py (look for field names in Settings class)
-        try:
-            source = config_file.read_text(encoding="utf-8")
-        except OSError:
-            return
+        source = config_file.text
 
         # Match patterns like: DATABASE_URL: str = Field(...)  or  DATABASE_URL: str
         config_vars: Set[str] = set()
@@ -308,15 +329,13 @@ class ConsistencyChecker:
         # Read existing .env.example
         existing_vars: Set[str] = set()
         env_content = ""
-        if env_example.exists():
-            try:
-                env_content = env_example.read_text(encoding="utf-8")
-                for line in env_content.splitlines():
-                    if "=" in line and not line.strip().startswith("#"):
-                        var_name = line.split("=", 1)[0].strip()
-                        existing_vars.add(var_name)
-            except OSError:
-                pass
+        env_entry = idx.get(env_example)
+        if env_entry is not None:
+            env_content = env_entry.text
+            for line in env_content.splitlines():
+                if "=" in line and not line.strip().startswith("#"):
+                    var_name = line.split("=", 1)[0].strip()
+                    existing_vars.add(var_name)
 
         # Add missing vars to .env.example
         missing = config_vars - existing_vars
@@ -342,13 +361,11 @@ class ConsistencyChecker:
             new_content = env_content.rstrip() + "\n\n# Auto-added by consistency check\n"
             new_content += "\n".join(additions) + "\n"
 
-            target = env_example if env_example.exists() else (project / ".env.example")
-            target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_text(new_content, encoding="utf-8")
+            target = env_example if env_entry is not None else ".env.example"
+            idx.write_text(target, new_content)
 
-            rel_path = str(target.relative_to(project))
             result.fixes.append(ConsistencyFix(
-                file_path=rel_path,
+                file_path=target,
                 description=f"Added {len(missing)} missing env var(s): {', '.join(sorted(missing)[:5])}{'...' if len(missing) > 5 else ''}",
                 fix_type="env_sync",
             ))
@@ -357,54 +374,46 @@ class ConsistencyChecker:
     # 4. Frontend import validation
     # ------------------------------------------------------------------
 
-    def _fix_frontend_imports(self, project: Path, result: ConsistencyResult) -> None:
+    def _fix_frontend_imports(
+        self, project: Path, result: ConsistencyResult, index: Optional[ProjectIndex] = None
+    ) -> None:
         """Check TypeScript/TSX imports use correct @ alias paths."""
+        idx = ProjectIndex.ensure(project, index)
         frontend_dir = project / "frontend"
-        if not frontend_dir.is_dir():
+        if not idx.is_dir(frontend_dir):
             return
 
         src_dir = frontend_dir / "src"
-        if not src_dir.is_dir():
+        if not idx.is_dir(src_dir):
             return
 
+        ts_files = self._indexed_files(idx, src_dir, (".ts", ".tsx"))
+        src_prefix = idx.rel(src_dir) + "/"
+
         # Build a map of available TS/TSX modules
         available_ts: Set[str] = set()
-        for ext in ("*.ts", "*.tsx"):
-            for f in src_dir.rglob(ext):
-                if any(part in self._IGNORED_DIRS for part in f.parts):
-                    continue
-                try:
-                    rel = f.relative_to(src_dir)
-                except ValueError:
-                    continue
-                # @/components/ui/index → @/components/ui
-                parts = list(rel.parts)
-                stem = parts[-1].replace(".tsx", "").replace(".ts", "")
-                if stem == "index":
-                    parts = parts[:-1]
-                else:
-                    parts[-1] = stem
-                alias = "@/" + "/".join(parts)
-                available_ts.add(alias)
+        for f in ts_files:
+            # @/components/ui/index → @/components/ui
+            parts = f.rel[len(src_prefix):].split("/")
+            stem = parts[-1].replace(".tsx", "").replace(".ts", "")
+            if stem == "index":
+                parts = parts[:-1]
+            else:
+                parts[-1] = stem
+            alias = "@/" + "/".join(parts)
+            available_ts.add(alias)
 
-        for ext in ("*.ts", "*.tsx"):
-            for ts_file in src_dir.rglob(ext):
-                if any(part in self._IGNORED_DIRS for part in ts_file.parts):
-                    continue
-                self._check_ts_imports(ts_file, available_ts, project, result)
+        for ts_file in ts_files:
+            self._check_ts_imports(ts_file, available_ts, result)
 
     def _check_ts_imports(
         self,
-        ts_file: Path,
+        ts_file: IndexedFile,
         available: Set[str],
-        project: Path,
         result: ConsistencyResult,
     ) -> None:
         """Check imports in a TypeScript file for common issues."""
-        try:
-            source = ts_file.read_text(encoding="utf-8", errors="replace")
-        except OSError:
-            return
+        source = ts_file.text
 
         modified = False
         # Match: import ... from "@/something"  or  import ... from '@/something'
@@ -420,8 +429,7 @@ class ConsistencyChecker:
                     # No fix needed — the module system handles index resolution
                     pass
                 else:
-                    rel = str(ts_file.relative_to(project))
                     result.warnings.append(
-                        f"{rel}: import '{import_path}' may not resolve — "
+                        f"{ts_file.rel}: import '{import_path}' may not resolve — "
                         f"target file not found in project"
                     )
@@ -0,0 +1,129 @@
+"""
+Token-Budgeted Context Packing for Codegen Prompts.
+
+Every file prompt embeds the spec summary and the interfaces of already
+generated files. Rendered in full, both grow with the size of the project,
+so a large spec makes every one of the 50+ prompts long (input-token
+latency and cost on each call).
+
+When :class:`~src.code_generation.engine_v2.CodeGeneratorV2` builds the
+prompt for a file, the sections are split into :class:`Fragment` objects
+scored by relevance to that file:
+
+- spec fragments (entities, API routes, business rules) score highest when
+  they concern the file's own entities (its ``spec_scope`` and path), then
+  the entities those are related to;
+- dependency interfaces score highest for the file's ``depends_on`` (its
+  import graph), then by the path heuristics of ``_interfaces_summary``.
+
+:func:`pack` then keeps the required fragments plus the best-scoring others
+that fit the section's :class:`ContextBudget`. Kept fragments are rendered
+in their original order, so a spec that fits the budget renders exactly as
+before.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.code_generation.architect import SystemSpec
+from src.llm.rate_governor import CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of *text* (same ratio as the rate governor's estimate)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class ContextBudget:
+    """Per-file token budgets for the packed prompt sections."""
+
+    spec_tokens: int = 1500
+    interface_tokens: int = 2000
+    # Never include more than this many interfaces, however small
+    max_interfaces: int = 15
+
+
+@dataclass
+class Fragment:
+    """One packable piece of prompt context."""
+
+    text: str
+    score: float = 0.0
+    # Always kept, and counted against the budget first
+    required: bool = False
+
+
+def pack(fragments: Sequence[Fragment], budget_tokens: int, max_items: Optional[int] = None) -> List[bool]:
+    """
+    Choose which *fragments* to keep within *budget_tokens*.
+
+    Required fragments are always kept. The others are taken greedily by
+    descending score (ties in original order), skipping any that would
+    overflow the budget, up to *max_items* optional fragments.
+
+    Returns a keep-flag per fragment, in the original order.
+    """
+    keep = [f.required for f in fragments]
+    used = sum(estimate_tokens(f.text) for f in fragments if f.required)
+    taken = 0
+    ranked = sorted(
+        (i for i, f in enumerate(fragments) if not f.required),
+        key=lambda i: -fragments[i].score,
+    )
+    for i in ranked:
+        if max_items is not None and taken >= max_items:
+            break
+        cost = estimate_tokens(fragments[i].text)
+        if used + cost > budget_tokens:
+            continue
+        keep[i] = True
+        used += cost
+        taken += 1
+    return keep
+
+
+def target_entities(
+    spec: SystemSpec, relative_path: str, scope: Optional[Iterable[str]] = None
+) -> Dict[str, float]:
+    """
+    Entities a file is about, as ``{lowercase name: weight}``.
+
+    Weight 1.0 for entities named in the file's scope keys
+    (``entity:<name>``) or its path, 0.5 for entities they are related to.
+    """
+    names = {e.name.lower() for e in spec.entities}
+    direct = {
+        key.split(":", 1)[1] for key in (scope or ()) if key.startswith("entity:")
+    } & names
+    path_lower = relative_path.lower()
+    direct.update(name for name in names if name in path_lower)
+
+    weights: Dict[str, float] = {name: 1.0 for name in direct}
+    for entity in spec.entities:
+        name = entity.name.lower()
+        related = {r.entity.lower() for r in entity.relationships}
+        if name in direct:
+            for other in related & names:
+                weights.setdefault(other, 0.5)
+        elif related & direct:
+            weights.setdefault(name, 0.5)
+    return weights
+
+
+def mention_score(text: str, weights: Dict[str, float]) -> float:
+    """Highest weight among the entities mentioned in *text* (0 if none)."""
+    text_lower = text.lower()
+    return max((w for name, w in weights.items() if name in text_lower), default=0.0)
+
+
+def render_section(
+    heading: Optional[str], fragments: Sequence[Fragment], keep: Sequence[bool], noun: str
+) -> Tuple[List[str], int]:
+    """Lines for a packed section, with a note counting what was left out."""
+    lines = [heading] if heading is not None else []
+    lines.extend(f.text for f, k in zip(fragments, keep) if k)
+    dropped = sum(1 for k in keep if not k)
+    if dropped:
+        lines.append(f"  … {dropped} more {noun} omitted (not relevant to this file)")
+    return lines, dropped
@@ -22,6 +22,8 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from src.code_generation.project_index import ProjectIndex
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -323,6 +325,7 @@ class CriticPanel:
         self,
         output_dir: str,
         spec: Any,  # SystemSpec — typed as Any to avoid circular import
+        index: Optional[ProjectIndex] = None,
     ) -> CriticReport:
         """
         Run all critics in parallel and return an aggregated CriticReport.
@@ -330,11 +333,12 @@ class CriticPanel:
         Args:
             output_dir: Path to the directory containing generated files.
             spec:        SystemSpec produced by the architect phase.
+            index:       Shared file index of output_dir (built if omitted).
 
         Returns:
             CriticReport with per-critic summaries and aggregate metrics.
         """
-        files = self._read_files(output_dir)
+        files = self._read_files(output_dir, index)
         if not files:
             logger.warning("CriticPanel: no files found in %s — returning empty report", output_dir)
             return CriticReport(
@@ -352,7 +356,9 @@ class CriticPanel:
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _read_files(self, output_dir: str) -> Dict[str, str]:
+    def _read_files(
+        self, output_dir: str, index: Optional[ProjectIndex] = None
+    ) -> Dict[str, str]:
         """Read all text files from output_dir (recursively, up to 500 KB each)."""
         _MAX_FILE_BYTES = 512 * 1024  # 512 KB per file
         files: Dict[str, str] = {}
@@ -361,28 +367,23 @@ class CriticPanel:
             logger.warning("CriticPanel: output_dir does not exist: %s", output_dir)
             return files
 
-        for path in sorted(base.rglob("*")):
-            if not path.is_file():
-                continue
+        for entry in ProjectIndex.ensure(base, index):
             # Skip binary / lockfiles / hidden directories
-            rel = path.relative_to(base)
-            parts = rel.parts
-            if any(p.startswith(".") for p in parts):
+            if any(p.startswith(".") for p in entry.rel.split("/")):
                 continue
-            if path.name in {"package-lock.json", "yarn.lock", "poetry.lock", "Pipfile.lock"}:
+            if entry.name in {"package-lock.json", "yarn.lock", "poetry.lock", "Pipfile.lock"}:
                 continue
             # Only text-ish extensions
-            suffix = path.suffix.lower()
+            suffix = entry.suffix.lower()
             if suffix in {
                 ".py", ".js", ".ts", ".jsx", ".tsx", ".html", ".css", ".scss",
                 ".json", ".yaml", ".yml", ".toml", ".md", ".txt", ".env",
                 ".sh", ".sql", "",
             }:
-                try:
-                    content = path.read_bytes()[:_MAX_FILE_BYTES].decode("utf-8", errors="replace")
-                    files[str(rel)] = content
-                except OSError as exc:
-                    logger.debug("CriticPanel: could not read %s: %s", path, exc)
+                if entry.size <= _MAX_FILE_BYTES:
+                    files[entry.rel] = entry.text
+                else:
+                    files[entry.rel] = entry.data[:_MAX_FILE_BYTES].decode("utf-8", errors="replace")
 
         logger.debug("CriticPanel: loaded %d files from %s", len(files), output_dir)
         return files
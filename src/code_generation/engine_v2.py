@@ -24,6 +24,7 @@ from __future__ import annotations
 
 import ast
 import asyncio
+import hashlib
 import logging
 import os
 import secrets
@@ -32,7 +33,7 @@ import time
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Set
 
 from pydantic import BaseModel, Field
 
@@ -46,6 +47,33 @@ from src.code_generation.architect import (
     SystemSpec,
     TechStackSpec,
 )
+from src.code_generation.artifact_store import ArtifactStore, get_default_artifact_store
+from src.code_generation.batching import (
+    BATCH_PROTOCOL,
+    build_batch_prompt,
+    is_batchable,
+    split_batch_response,
+)
+from src.code_generation.checkpoint import BuildCheckpoint, FileCheckpoint
+from src.code_generation.context_packer import (
+    ContextBudget,
+    Fragment,
+    estimate_tokens,
+    mention_score,
+    pack,
+    render_section,
+    target_entities,
+)
+from src.code_generation.incremental import (
+    BuildManifest,
+    IncrementalState,
+    diff_specs,
+    entity_scope,
+    page_scope,
+    summary_scope,
+)
+from src.code_generation.patching import PATCH_SYSTEM_PROMPT, apply_patch, build_patch_prompt
+from src.code_generation.tiering import ModelTier, ModelTiering
 from src.llm import get_llm_client
 from src.llm.client import BaseLLMClient
 
@@ -138,6 +166,16 @@ class GeneratedFile(BaseModel):
     category: FileCategory = FileCategory.BACKEND_CONFIG
     llm_generated: bool = True
     heal_attempts: int = 0
+    # Written from the artifact store instead of calling the LLM
+    cached: bool = False
+    # Kept from the previous build by an incremental run
+    reused: bool = False
+    # Estimated size of the generation prompt (0 for static files)
+    prompt_tokens: int = 0
+    # Generated together with other small files in one LLM call
+    batched: bool = False
+    # Finished by an earlier, interrupted run of this build (resume)
+    resumed: bool = False
 
 
 class GenerationResult(BaseModel):
@@ -152,6 +190,25 @@ class GenerationResult(BaseModel):
     generation_time_seconds: float = 0.0
     llm_calls_made: int = 0
     warnings: List[str] = Field(default_factory=list)
+    # Artifact store lookups (both 0 when the store is disabled)
+    artifact_cache_hits: int = 0
+    artifact_cache_misses: int = 0
+    # Files kept unchanged from the previous build (incremental runs only)
+    files_reused: int = 0
+    # Heals resolved by applying a model-written patch instead of regenerating
+    patch_heals: int = 0
+    # Files generated several-per-call by batched completions
+    files_batched: int = 0
+    # Files skipped because an interrupted run had already finished them
+    files_resumed: int = 0
+    # LLM calls and their total latency per model tier ("fast" / "strong")
+    tier_calls: Dict[str, int] = Field(default_factory=dict)
+    tier_latency_seconds: Dict[str, float] = Field(default_factory=dict)
+    # Files moved from the fast to the strong tier after failing validation
+    tier_escalations: int = 0
+    # Estimated prompt tokens per generated file (relative path -> tokens)
+    prompt_tokens: Dict[str, int] = Field(default_factory=dict)
+    total_prompt_tokens: int = 0
 
 
 class ProgressEvent(BaseModel):
@@ -161,6 +218,9 @@ class ProgressEvent(BaseModel):
     percentage: float
     current_file: Optional[str] = None
     message: str = ""
+    # Populated on "streaming" events while *current_file* is being written
+    bytes_generated: int = 0
+    tokens_generated: int = 0
 
 
 # ---------------------------------------------------------------------------
@@ -179,6 +239,9 @@ class _FileSpec:
     # Dependencies: list of relative paths that must be generated first.
     # Files with no deps (or whose deps are satisfied) can run concurrently.
     depends_on: List[str] = field(default_factory=list)
+    # Spec parts the prompt is built from, as incremental scope keys
+    # ("entity:<name>", "entities", "pages", ...); None = the whole spec
+    spec_scope: Optional[List[str]] = None
 
 
 @dataclass
@@ -192,12 +255,153 @@ class _GenerationContext:
     # Accumulates a summary of already-generated files' key exports/interfaces
     generated_interfaces: Dict[str, str] = field(default_factory=dict)
     llm_calls: int = 0
+    artifact_hits: int = 0
+    artifact_misses: int = 0
+    patch_heals: int = 0
     warnings: List[str] = field(default_factory=list)
     # Pre-computed spec summary (computed once, shared across all prompts)
     _spec_summary_cache: Optional[str] = None
     # Lock for thread-safe updates to shared state
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
     customization: Dict[str, Any] = field(default_factory=dict)
+    # Receives ProgressEvents (including per-file "streaming" ones) during generation
+    on_progress: Optional[Callable[[ProgressEvent], None]] = None
+    files_total: int = 0
+    files_completed: int = 0
+    # Set when regenerating incrementally against a previous build
+    incremental: Optional[IncrementalState] = None
+    files_reused: int = 0
+    # Token budgets for the spec and interface sections of each prompt (None = unbounded)
+    context_budget: Optional[ContextBudget] = field(default_factory=ContextBudget)
+    # File whose prompt is being built; set only around the synchronous prompt_builder call
+    _packing_for: Optional[_FileSpec] = None
+    # relative path -> scope keys of the spec context its prompt embedded
+    prompt_scopes: Dict[str, Set[str]] = field(default_factory=dict)
+    # Category of every planned file, for model tiering
+    file_categories: Dict[str, FileCategory] = field(default_factory=dict)
+    tier_calls: Dict[str, int] = field(default_factory=dict)
+    tier_seconds: Dict[str, float] = field(default_factory=dict)
+    tier_escalations: int = 0
+
+    def percentage(self) -> float:
+        """Overall completion percentage, by files finished."""
+        if not self.files_total:
+            return 0.0
+        return round((self.files_completed / self.files_total) * 100, 1)
+
+
+class _PartialFileWriter:
+    """Streams LLM deltas for one file into a ``.partial`` sibling of its destination.
+
+    Deltas are buffered in memory and flushed from a worker thread on the
+    same throttle as the "streaming" progress events, so the event loop never
+    blocks on disk I/O. :meth:`commit` writes the final validated source and
+    atomically replaces the destination; :meth:`discard` removes the partial
+    file. A crash mid-stream therefore leaves only a ``.partial`` file behind.
+    """
+
+    # Minimum seconds between disk flushes / "streaming" progress events per file
+    PROGRESS_INTERVAL = 0.5
+
+    def __init__(self, dest: Path, relative_path: str, ctx: _GenerationContext) -> None:
+        self.dest = dest
+        self.partial_path = dest.with_name(dest.name + ".partial")
+        self.relative_path = relative_path
+        self._ctx = ctx
+        self._buffer: List[str] = []
+        self._truncate = True
+        self.bytes_generated = 0
+        self.chars_generated = 0
+        self._last_emit = 0.0
+
+    async def reset(self) -> None:
+        """Start a fresh attempt; the partial file is truncated on the next flush."""
+        self._buffer = []
+        self._truncate = True
+        self.bytes_generated = 0
+        self.chars_generated = 0
+
+    async def write(self, delta: str) -> None:
+        """Buffer *delta*; flush and emit progress at most every :attr:`PROGRESS_INTERVAL`."""
+        self._buffer.append(delta)
+        self.bytes_generated += len(delta.encode("utf-8"))
+        self.chars_generated += len(delta)
+
+        now = time.monotonic()
+        if now - self._last_emit < self.PROGRESS_INTERVAL:
+            return
+        self._last_emit = now
+        await self.flush()
+        if self._ctx.on_progress is not None:
+            self._ctx.on_progress(ProgressEvent(
+                step="streaming",
+                percentage=self._ctx.percentage(),
+                current_file=self.relative_path,
+                message=f"Writing {self.relative_path} ({self.bytes_generated:,} bytes)",
+                bytes_generated=self.bytes_generated,
+                # Same ~4 chars/token estimate the mock client reports
+                tokens_generated=self.chars_generated // 4,
+            ))
+
+    async def flush(self) -> None:
+        """Append buffered deltas to the partial file from a worker thread."""
+        if not self._buffer and not self._truncate:
+            return
+        data = "".join(self._buffer)
+        mode = "w" if self._truncate else "a"
+        self._buffer = []
+        self._truncate = False
+        await asyncio.to_thread(self._append, mode, data)
+
+    def _append(self, mode: str, data: str) -> None:
+        self.partial_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.partial_path.open(mode, encoding="utf-8") as fh:
+            fh.write(data)
+
+    async def commit(self, source: str) -> None:
+        """Write the final *source* and atomically move it onto the destination."""
+        self._buffer = []
+        self._truncate = False
+        await asyncio.to_thread(self._replace, source)
+
+    def _replace(self, source: str) -> None:
+        self.partial_path.parent.mkdir(parents=True, exist_ok=True)
+        self.partial_path.write_text(source, encoding="utf-8")
+        os.replace(self.partial_path, self.dest)
+
+    def discard(self) -> None:
+        """Remove any partial output (generation failed or was cancelled)."""
+        self._buffer = []
+        self.partial_path.unlink(missing_ok=True)
+
+
+async def drain_progress(
+    task: "asyncio.Future[Any]",
+    events: "asyncio.Queue[Any]",
+) -> AsyncGenerator[Any, None]:
+    """Yield items from *events* as they arrive until *task* finishes.
+
+    Used to surface ``on_progress`` callbacks from a running :meth:`CodeGeneratorV2.generate`
+    through an async generator. Anything queued after the task finishes is flushed,
+    and the task is cancelled if the consumer stops iterating early.
+    """
+    getter: Optional[asyncio.Future] = None
+    try:
+        while not task.done():
+            getter = asyncio.ensure_future(events.get())
+            done, _ = await asyncio.wait({task, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+            else:
+                getter.cancel()
+            getter = None
+        while not events.empty():
+            yield events.get_nowait()
+    finally:
+        if getter is not None:
+            getter.cancel()
+        if not task.done():
+            task.cancel()
 
 
 # ---------------------------------------------------------------------------
@@ -279,18 +483,24 @@ def _validate_file(relative_path: str, source: str) -> Optional[str]:
 def _spec_summary(spec: SystemSpec, *, compact: bool = False, ctx: Optional["_GenerationContext"] = None) -> str:
     """Render a concise text representation of *spec* for use in prompts.
 
+    While a file's prompt is being built (``ctx._packing_for``) and the full
+    summary exceeds ``ctx.context_budget.spec_tokens``, entities, routes and
+    business rules are packed by relevance to that file; see
+    :mod:`src.code_generation.context_packer`.
+
     Args:
         spec: The system specification.
         compact: If True, omit API routes and business rules for shorter prompts
                  (useful for config/infra files that don't need route details).
         ctx: Optional generation context; if provided and has customization, appends it.
     """
-    lines: List[str] = [
+    header = [
         f"App: {spec.app_name}",
         f"Description: {spec.description}",
         "",
         "Entities:",
     ]
+    entity_frags: List[Fragment] = []
     for ent in spec.entities:
         field_list = ", ".join(
             f"{f.name}: {f.type}{'(required)' if f.required else '(optional)'}"
@@ -299,63 +509,89 @@ def _spec_summary(spec: SystemSpec, *, compact: bool = False, ctx: Optional["_Ge
         rel_list = ", ".join(
             f"{r.type} → {r.entity}" for r in ent.relationships
         )
-        lines.append(f"  • {ent.name} [{ent.table_name if hasattr(ent, 'table_name') else ent.plural}]")
+        block = [f"  • {ent.name} [{ent.table_name if hasattr(ent, 'table_name') else ent.plural}]"]
         if field_list:
-            lines.append(f"      Fields: {field_list}")
+            block.append(f"      Fields: {field_list}")
         if rel_list:
-            lines.append(f"      Relations: {rel_list}")
+            block.append(f"      Relations: {rel_list}")
+        entity_frags.append(Fragment("\n".join(block)))
 
+    route_frags: List[Fragment] = []
+    rule_frags: List[Fragment] = []
     if not compact:
-        lines += ["", "API Routes:"]
         for route in spec.api_routes[:20]:  # cap at 20 to keep prompt size sane
-            lines.append(f"  {route.method:6} {route.path}  ({'auth' if route.auth_required else 'public'})")
+            block = [f"  {route.method:6} {route.path}  ({'auth' if route.auth_required else 'public'})"]
             if route.business_logic:
-                lines.append(f"         Logic: {route.business_logic[:120]}")
-
-    lines += ["", "Roles: " + ", ".join(r.name for r in spec.roles)]
+                block.append(f"         Logic: {route.business_logic[:120]}")
+            route_frags.append(Fragment("\n".join(block)))
+        rule_frags = [Fragment(f"  • {rule}") for rule in spec.business_rules]
 
-    lines += ["", "Integrations: " + ", ".join(i.name for i in spec.integrations)]
-
-    if not compact:
-        lines += ["", "Business Rules:"]
-        for rule in spec.business_rules:
-            lines.append(f"  • {rule}")
-
-    lines += [
+    roles = ["", "Roles: " + ", ".join(r.name for r in spec.roles)]
+    integrations = ["", "Integrations: " + ", ".join(i.name for i in spec.integrations)]
+    tail = [
         "",
         f"Tech Stack: {spec.tech_stack.backend_framework} / "
         f"{spec.tech_stack.frontend_framework} / {spec.tech_stack.database}",
     ]
     if ctx is not None and ctx.customization:
-        lines.append(f"\nCustomization: backend={ctx.customization.get('backend_framework','fastapi')}, "
-                     f"db={ctx.customization.get('database','postgresql')}, "
-                     f"auth={ctx.customization.get('auth_strategy','jwt')}, "
-                     f"frontend={ctx.customization.get('frontend_framework','nextjs')}, "
-                     f"css={ctx.customization.get('css_framework','tailwind')}, "
-                     f"deploy={ctx.customization.get('deployment_target','docker')}")
+        tail.append(f"\nCustomization: backend={ctx.customization.get('backend_framework','fastapi')}, "
+                    f"db={ctx.customization.get('database','postgresql')}, "
+                    f"auth={ctx.customization.get('auth_strategy','jwt')}, "
+                    f"frontend={ctx.customization.get('frontend_framework','nextjs')}, "
+                    f"css={ctx.customization.get('css_framework','tailwind')}, "
+                    f"deploy={ctx.customization.get('deployment_target','docker')}")
         if ctx.customization.get('extra_instructions'):
-            lines.append(f"Extra instructions: {ctx.customization['extra_instructions']}")
+            tail.append(f"Extra instructions: {ctx.customization['extra_instructions']}")
+
+    fragments = entity_frags + route_frags + rule_frags
+    keep = [True] * len(fragments)
+    target = ctx._packing_for if ctx is not None else None
+    budget = ctx.context_budget if ctx is not None else None
+    weights: Dict[str, float] = {}
+    if target is not None:
+        weights = target_entities(spec, target.relative_path, target.spec_scope)
+        # What this prompt embeds decides when the next incremental build reuses it
+        ctx.prompt_scopes.setdefault(target.relative_path, set()).update(summary_scope(weights, compact))
+    if target is not None and budget is not None:
+        fixed = estimate_tokens("\n".join(header + roles + integrations + tail)) + 10
+        if fixed + sum(estimate_tokens(f.text) for f in fragments) > budget.spec_tokens:
+            for ent, frag in zip(spec.entities, entity_frags):
+                weight = weights.get(ent.name.lower(), 0.0)
+                frag.score = 10 * weight or 1
+                # The file's own entities are never dropped
+                frag.required = weight == 1.0
+            for frag in route_frags:
+                frag.score = 8 * mention_score(frag.text, weights) or 1
+            for frag in rule_frags:
+                frag.score = 4 * mention_score(frag.text, weights) or 1
+            keep = pack(fragments, budget.spec_tokens - fixed)
+
+    n_ent, n_route = len(entity_frags), len(route_frags)
+    lines, _ = render_section(None, entity_frags, keep[:n_ent], "entities")
+    lines = header + lines
+    if not compact:
+        section, _ = render_section("API Routes:", route_frags, keep[n_ent:n_ent + n_route], "routes")
+        lines += [""] + section
+    lines += roles + integrations
+    if not compact:
+        section, _ = render_section("Business Rules:", rule_frags, keep[n_ent + n_route:], "rules")
+        lines += [""] + section
+    lines += tail
     return "\n".join(lines)
 
 
 def _spec_summary_with_customization(spec: SystemSpec, ctx: "_GenerationContext", *, compact: bool = False) -> str:
     """Render spec summary with customization preferences appended."""
-    lines = _spec_summary(spec, compact=compact).splitlines()
-    if ctx.customization:
-        lines.append(f"\nCustomization: backend={ctx.customization.get('backend_framework','fastapi')}, "
-                     f"db={ctx.customization.get('database','postgresql')}, "
-                     f"auth={ctx.customization.get('auth_strategy','jwt')}, "
-                     f"frontend={ctx.customization.get('frontend_framework','nextjs')}, "
-                     f"css={ctx.customization.get('css_framework','tailwind')}, "
-                     f"deploy={ctx.customization.get('deployment_target','docker')}")
-        if ctx.customization.get('extra_instructions'):
-            lines.append(f"Extra instructions: {ctx.customization['extra_instructions']}")
-    return "\n".join(lines)
+    return _spec_summary(spec, compact=compact, ctx=ctx)
 
 
 def _interfaces_summary(ctx: _GenerationContext, *, relevant_to: Optional[str] = None) -> str:
     """Render already-generated file interfaces for inclusion in subsequent prompts.
 
+    The selected interfaces are packed into ``ctx.context_budget``; while a
+    file's prompt is being built, that file's ``depends_on`` interfaces are
+    ranked first and always included.
+
     Args:
         ctx: Generation context containing all generated interfaces so far.
         relevant_to: If provided, only include interfaces that are likely
@@ -366,6 +602,9 @@ def _interfaces_summary(ctx: _GenerationContext, *, relevant_to: Optional[str] =
         return "(No files generated yet.)"
 
     items = list(ctx.generated_interfaces.items())
+    deps = set(ctx._packing_for.depends_on) if ctx._packing_for is not None else set()
+    budget = ctx.context_budget
+    max_items = budget.max_interfaces if budget is not None else 15
 
     # If we know what file we're generating, filter to relevant interfaces only
     if relevant_to:
@@ -381,6 +620,9 @@ def _interfaces_summary(ctx: _GenerationContext, *, relevant_to: Optional[str] =
             score = 0
             path_lower = path.lower()
             path_stem = Path(path).stem.lower()
+            # Direct imports of the file being generated → always included
+            if path in deps:
+                score += 100
             # Same entity name in filename → very relevant
             if target_stem and target_stem != "__init__" and target_stem in path_lower:
                 score += 10
@@ -395,21 +637,26 @@ def _interfaces_summary(ctx: _GenerationContext, *, relevant_to: Optional[str] =
                 score += 5
             return score
 
-        # Sort by relevance, take top 15 most relevant
+        # Sort by relevance, take the most relevant that fit the budget
         scored = [(path, iface, _relevance(path)) for path, iface in items]
         scored.sort(key=lambda x: x[2], reverse=True)
-        items = [(p, i) for p, i, s in scored if s > 0][:15]
+        candidates = [(p, i, s) for p, i, s in scored if s > 0]
 
-        if not items:
+        if not candidates:
             # Fallback: just show the last 10
-            items = list(ctx.generated_interfaces.items())[-10:]
+            candidates = [(p, i, n) for n, (p, i) in enumerate(items)][-10:]
     else:
-        items = items[-30:]  # cap at 30
-
-    parts = []
-    for path, iface in items:
-        parts.append(f"--- {path} ---\n{iface}\n")
-    return "\n".join(parts)
+        # cap at 30, newest first when the budget runs out
+        candidates = [(p, i, n) for n, (p, i) in enumerate(items)][-30:]
+        max_items = 30
+
+    blocks = [Fragment(f"--- {path} ---\n{iface}\n", score=score, required=path in deps)
+              for path, iface, score in candidates]
+    if budget is not None:
+        keep = pack(blocks, budget.interface_tokens, max_items=max_items)
+    else:
+        keep = [n < max_items for n in range(len(blocks))]
+    return "\n".join(b.text for b, k in zip(blocks, keep) if k)
 
 
 def _entity_detail(entity: EntitySpec) -> str:
@@ -5812,23 +6059,57 @@ class CodeGeneratorV2:
     architectural context — no static template substitution.
 
     Key features:
-    - Concurrent generation: files in the same dependency tier are generated
-      in parallel using ``asyncio.gather``.
+    - Concurrent generation: files are scheduled as a dependency DAG and
+      each starts as soon as its own dependencies are done, critical path first.
     - Dependency-aware ordering: files declare their dependencies so that
       models are available before schemas, schemas before CRUD, etc.
     - Smart context propagation: each prompt only receives interfaces
       relevant to the file being generated, not all 50+ interfaces.
-    - Self-healing with full source: when a file has a syntax error the
-      retry prompt includes both the error AND the broken source so the
-      LLM can see exactly what to fix.
+    - Self-healing with patches: when a file has a syntax error the LLM is
+      first asked for a minimal diff, applied locally; only if that fails is
+      the file regenerated with both the error AND the broken source shown.
+    - Artifact reuse: with an :class:`ArtifactStore`, a file whose prompt,
+      dependency interfaces and model settings match an earlier validated
+      generation is written from the store without calling the LLM.
+    - Incremental rebuilds: ``generate(..., incremental=True)`` diffs the spec
+      against the previous build's manifest and only regenerates files whose
+      spec scope or dependency interfaces changed.
+    - Batched small files: configs, ignore files, CSS and similar files that
+      are ready together are requested in one completion, then split,
+      validated and healed per file.
+    - Context packing: spec and interface sections are packed into a
+      per-file :class:`ContextBudget` by relevance, so prompts stay short on
+      large specs; estimated prompt tokens are reported per file.
+    - Model tiering: with a :class:`ModelTiering`, simple config files go to
+      a fast model and move to the strong model if they fail validation.
     """
 
     MAX_HEAL_ATTEMPTS = 3
-    # Maximum concurrent LLM calls per batch (to avoid overwhelming the provider)
+    # Patch requests per file before falling back to full regeneration (0 disables)
+    MAX_PATCH_ATTEMPTS = 2
+    # Output budget of a patch request, and the longest file shown in full to it
+    PATCH_MAX_TOKENS = 1024
+    PATCH_MAX_LINES = 600
+    # Small files (see batching.is_batchable) requested per LLM call (1 disables batching)
+    BATCH_MAX_FILES = 4
+    # Maximum files in flight per build. Provider-wide limits across all
+    # builds are enforced by the shared rate governor in the LLM client.
     MAX_CONCURRENCY = 6
 
-    def __init__(self, provider: Optional[str] = None):
+    def __init__(
+        self,
+        provider: Optional[str] = None,
+        artifact_store: Optional[ArtifactStore] = None,
+        context_budget: Optional[ContextBudget] = None,
+        tiering: Optional[ModelTiering] = None,
+    ):
         self._client: BaseLLMClient = get_llm_client(provider) if provider else get_llm_client()
+        # Fast/strong model routing; None sends every request to self._client
+        self._tiering = tiering if tiering is not None else ModelTiering.from_env()
+        # Content-addressed store of validated files; None disables reuse
+        self._artifacts = artifact_store if artifact_store is not None else get_default_artifact_store()
+        # Per-file prompt context budget; set to None for unbounded prompts
+        self.context_budget: Optional[ContextBudget] = context_budget or ContextBudget()
 
     # ------------------------------------------------------------------
     # Public API
@@ -5840,70 +6121,136 @@ class CodeGeneratorV2:
         output_dir: str,
         theme: str = "Modern",
         customization: Optional[Dict[str, Any]] = None,
+        on_progress: Optional[Callable[[ProgressEvent], None]] = None,
+        incremental: bool = False,
+        previous_output_dir: Optional[str] = None,
+        resume: bool = False,
     ) -> GenerationResult:
         """
         Generate a complete, production-ready project from *spec*.
 
-        Files are grouped into dependency tiers and each tier is generated
-        concurrently.  Within a tier, up to :attr:`MAX_CONCURRENCY` files
-        are generated in parallel.
+        Files are scheduled as a dependency DAG: each file starts as soon as
+        the files it ``depends_on`` have finished, preferring files on the
+        longest remaining dependency chain.  Up to :attr:`MAX_CONCURRENCY`
+        files of this build are generated in parallel; the LLM client's rate
+        governor additionally paces calls against the provider's limits
+        across all builds.
 
         Args:
-            spec:       The system specification produced by the Architect.
-            output_dir: Filesystem path where the project will be written.
-            theme:      Visual theme hint passed to frontend prompts.
+            spec:        The system specification produced by the Architect.
+            output_dir:  Filesystem path where the project will be written.
+            theme:       Visual theme hint passed to frontend prompts.
+            on_progress: Optional callback receiving :class:`ProgressEvent` objects —
+                         a "start" event, a "streaming" event as each file's content
+                         arrives, and a "generating" event as each file completes.
+            incremental: Diff *spec* against the build manifest of the previous
+                         build and regenerate only the affected files, reusing
+                         the rest (falls back to a full build without a manifest).
+            previous_output_dir: Where the previous build lives; defaults to
+                         *output_dir*.
+            resume:      Continue an interrupted build of the same spec from the
+                         checkpoint in *output_dir*, skipping files that already
+                         finished (a fresh build without a matching checkpoint).
 
         Returns:
             A :class:`GenerationResult` with file list, metrics, and warnings.
         """
         t_start = time.monotonic()
-        ctx = _GenerationContext(spec=spec, output_dir=Path(output_dir), theme=theme, customization=customization or {})
+        ctx = _GenerationContext(
+            spec=spec, output_dir=Path(output_dir), theme=theme,
+            customization=customization or {}, on_progress=on_progress,
+            context_budget=self.context_budget,
+        )
         ctx.output_dir.mkdir(parents=True, exist_ok=True)
+        checkpoint = self._load_checkpoint(ctx) if resume else None
+        if checkpoint is None:
+            checkpoint = BuildCheckpoint(spec=spec, theme=theme, customization=ctx.customization)
+        checkpoint.stage = "generate"
+        if incremental:
+            ctx.incremental = self._load_incremental_state(
+                ctx, Path(previous_output_dir) if previous_output_dir else ctx.output_dir,
+            )
 
         plan = self._build_file_plan(ctx)
-        tiers = self._topological_tiers(plan)
-
-        generated_files: List[GeneratedFile] = []
+        ctx.file_categories = {fs.relative_path: fs.category for fs in plan}
+        if ctx.incremental is not None:
+            self._remove_stale_files(plan, ctx)
+
+        generated_files = self._resume_completed_files(plan, ctx, checkpoint) if resume else []
+        resumed_paths = {f.path for f in generated_files}
+        checkpoint.files = {p: e for p, e in checkpoint.files.items() if p in resumed_paths}
+        self._save_checkpoint(checkpoint, ctx)
         total_steps = len(plan)
-        completed = 0
+        ctx.files_total = total_steps
+        completed = len(generated_files)
+        ctx.files_completed = completed
+
+        if on_progress is not None:
+            on_progress(ProgressEvent(
+                step="start",
+                percentage=ctx.percentage(),
+                message=(
+                    f"Generating {total_steps} files for {spec.app_name}"
+                    + (f" ({completed} already done, resuming)" if completed else "")
+                ),
+            ))
 
-        for tier_idx, tier in enumerate(tiers):
+        def _on_file_done(fs: _FileSpec, result: Any) -> None:
+            nonlocal completed
+            completed += 1
+            if isinstance(result, BaseException):
+                logger.error("Failed to generate %s: %s", fs.relative_path, result)
+                ctx.warnings.append(f"Generation failed for {fs.relative_path}: {result}")
+                # Create a placeholder so downstream files aren't missing deps
+                generated_files.append(GeneratedFile(
+                    path=fs.relative_path,
+                    lines=0,
+                    category=fs.category,
+                    llm_generated=False,
+                    heal_attempts=0,
+                ))
+            else:
+                generated_files.append(result)
+            self._checkpoint_file(checkpoint, fs, result, ctx)
             logger.info(
-                "[tier %d/%d] Generating %d files concurrently",
-                tier_idx + 1, len(tiers), len(tier),
+                "[%d/%d] %s",
+                completed, total_steps, fs.relative_path,
             )
+            ctx.files_completed = completed
+            if on_progress is not None:
+                on_progress(ProgressEvent(
+                    step="generating",
+                    percentage=ctx.percentage(),
+                    current_file=fs.relative_path,
+                    message=f"[{completed}/{total_steps}] {fs.description or fs.relative_path}",
+                ))
 
-            # Limit concurrency with a semaphore
-            sem = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        await self._run_dag(
+            [fs for fs in plan if fs.relative_path not in resumed_paths],
+            lambda fs: self._generate_file(fs, ctx),
+            _on_file_done,
+            self.MAX_CONCURRENCY,
+            batch_worker=lambda specs: self._generate_batch(specs, ctx),
+            batchable=lambda fs: is_batchable(fs.relative_path),
+            batch_size=self.BATCH_MAX_FILES,
+        )
 
-            async def _gen_with_sem(fs: _FileSpec) -> GeneratedFile:
-                async with sem:
-                    return await self._generate_file(fs, ctx)
+        # Report files in plan order regardless of completion order
+        plan_order = {fs.relative_path: i for i, fs in enumerate(plan)}
+        generated_files.sort(key=lambda f: plan_order.get(f.path, len(plan_order)))
 
-            results = await asyncio.gather(
-                *[_gen_with_sem(fs) for fs in tier],
-                return_exceptions=True,
-            )
+        checkpoint.stage = "generated"
+        self._save_checkpoint(checkpoint, ctx)
 
-            for fs, result in zip(tier, results):
-                completed += 1
-                if isinstance(result, Exception):
-                    logger.error("Failed to generate %s: %s", fs.relative_path, result)
-                    ctx.warnings.append(f"Generation failed for {fs.relative_path}: {result}")
-                    # Create a placeholder so downstream files aren't missing deps
-                    generated_files.append(GeneratedFile(
-                        path=fs.relative_path,
-                        lines=0,
-                        category=fs.category,
-                        llm_generated=False,
-                        heal_attempts=0,
-                    ))
-                else:
-                    generated_files.append(result)
-                logger.info(
-                    "[%d/%d] %s",
-                    completed, total_steps, fs.relative_path,
-                )
+        # Record what this build was made from so the next one can be incremental
+        try:
+            BuildManifest(
+                spec=spec, theme=theme, customization=ctx.customization,
+                interfaces=ctx.generated_interfaces,
+                scopes={path: sorted(keys) for path, keys in ctx.prompt_scopes.items()},
+            ).save(ctx.output_dir)
+        except OSError as exc:
+            logger.warning("Could not write build manifest: %s", exc)
 
         # Tally metrics
         backend_cats = {
@@ -5932,8 +6279,95 @@ class CodeGeneratorV2:
             generation_time_seconds=round(time.monotonic() - t_start, 2),
             llm_calls_made=ctx.llm_calls,
             warnings=ctx.warnings,
+            artifact_cache_hits=ctx.artifact_hits,
+            artifact_cache_misses=ctx.artifact_misses,
+            files_reused=ctx.files_reused,
+            prompt_tokens={f.path: f.prompt_tokens for f in generated_files if f.prompt_tokens},
+            total_prompt_tokens=sum(f.prompt_tokens for f in generated_files),
+            patch_heals=ctx.patch_heals,
+            files_batched=sum(1 for f in generated_files if f.batched),
+            files_resumed=len(resumed_paths),
+            tier_calls=dict(ctx.tier_calls),
+            tier_latency_seconds={tier: round(sec, 2) for tier, sec in ctx.tier_seconds.items()},
+            tier_escalations=ctx.tier_escalations,
         )
 
+    # ------------------------------------------------------------------
+    # Checkpoints (resume after an interrupted build)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _load_checkpoint(ctx: _GenerationContext) -> Optional[BuildCheckpoint]:
+        """The output directory's checkpoint, if it was made for this same build."""
+        checkpoint = BuildCheckpoint.load(ctx.output_dir)
+        if checkpoint is None:
+            logger.info("No checkpoint in %s; generating from scratch", ctx.output_dir)
+            return None
+        if not checkpoint.matches(ctx.spec, ctx.theme, ctx.customization):
+            logger.info("Checkpoint in %s is for different build inputs; ignoring it", ctx.output_dir)
+            return None
+        # Keep counting the interrupted run's LLM calls
+        ctx.llm_calls = checkpoint.llm_calls
+        return checkpoint
+
+    @staticmethod
+    def _resume_completed_files(
+        plan: List[_FileSpec],
+        ctx: _GenerationContext,
+        checkpoint: BuildCheckpoint,
+    ) -> List[GeneratedFile]:
+        """Results for the files of *plan* an interrupted run already finished.
+
+        Their interfaces are restored into *ctx* so dependents' prompts are
+        built exactly as in the interrupted run.
+        """
+        resumed: List[GeneratedFile] = []
+        for fs in plan:
+            entry = checkpoint.completed_file(ctx.output_dir, fs.relative_path)
+            if entry is None:
+                continue
+            ctx.generated_interfaces[fs.relative_path] = entry.interface
+            state = ctx.incremental
+            if state is not None and state.previous.interfaces.get(fs.relative_path) != entry.interface:
+                state.changed_interfaces.add(fs.relative_path)
+            resumed.append(GeneratedFile.model_validate({**entry.record, "resumed": True}))
+        if resumed:
+            logger.info("Resuming build: %d of %d files already generated", len(resumed), len(plan))
+        return resumed
+
+    @staticmethod
+    def _save_checkpoint(checkpoint: BuildCheckpoint, ctx: _GenerationContext) -> None:
+        checkpoint.llm_calls = ctx.llm_calls
+        try:
+            checkpoint.save(ctx.output_dir)
+        except OSError as exc:
+            logger.warning("Could not write build checkpoint: %s", exc)
+
+    def _checkpoint_file(
+        self,
+        checkpoint: BuildCheckpoint,
+        file_spec: _FileSpec,
+        result: Any,
+        ctx: _GenerationContext,
+    ) -> None:
+        """Record *file_spec*'s outcome in the checkpoint and save it."""
+        if isinstance(result, BaseException):
+            entry = FileCheckpoint(status="failed")
+        else:
+            try:
+                data = (ctx.output_dir / file_spec.relative_path).read_bytes()
+            except OSError:
+                entry = FileCheckpoint(status="failed")
+            else:
+                entry = FileCheckpoint(
+                    status="done",
+                    sha256=hashlib.sha256(data).hexdigest(),
+                    interface=ctx.generated_interfaces.get(file_spec.relative_path, ""),
+                    record=result.model_dump(mode="json"),
+                )
+        checkpoint.files[file_spec.relative_path] = entry
+        self._save_checkpoint(checkpoint, ctx)
+
     async def generate_with_progress(
         self,
         spec: SystemSpec,
@@ -5944,66 +6378,253 @@ class CodeGeneratorV2:
         """
         Async generator variant that yields :class:`ProgressEvent` objects during generation.
 
-        Uses the same concurrent tier-based approach as :meth:`generate`.
+        Runs :meth:`generate` and relays its ``on_progress`` events, including
+        "streaming" events carrying bytes/tokens written so far for files that
+        are still being generated.
         """
-        t_start = time.monotonic()
-        ctx = _GenerationContext(spec=spec, output_dir=Path(output_dir), theme=theme, customization=customization or {})
-        ctx.output_dir.mkdir(parents=True, exist_ok=True)
+        events: asyncio.Queue[ProgressEvent] = asyncio.Queue()
+        task = asyncio.ensure_future(self.generate(
+            spec, output_dir, theme, customization, on_progress=events.put_nowait,
+        ))
 
-        plan = self._build_file_plan(ctx)
-        tiers = self._topological_tiers(plan)
-        total_steps = len(plan)
-        generated_files: List[GeneratedFile] = []
+        async for event in drain_progress(task, events):
+            yield event
 
+        result = task.result()
         yield ProgressEvent(
-            step="start",
-            percentage=0.0,
-            message=f"Generating {total_steps} files for {spec.app_name}",
+            step="complete",
+            percentage=100.0,
+            message=f"Done — {result.total_files} files generated in "
+                    f"{round(result.generation_time_seconds, 1)}s",
         )
 
-        completed = 0
-        for tier in tiers:
-            sem = asyncio.Semaphore(self.MAX_CONCURRENCY)
-
-            async def _gen_with_sem(fs: _FileSpec) -> GeneratedFile:
-                async with sem:
-                    return await self._generate_file(fs, ctx)
-
-            results = await asyncio.gather(
-                *[_gen_with_sem(fs) for fs in tier],
-                return_exceptions=True,
-            )
+    # ------------------------------------------------------------------
+    # Incremental regeneration
+    # ------------------------------------------------------------------
 
-            for fs, result in zip(tier, results):
-                completed += 1
-                pct = round((completed / total_steps) * 100, 1)
-                if isinstance(result, Exception):
-                    ctx.warnings.append(f"Generation failed for {fs.relative_path}: {result}")
-                    generated_files.append(GeneratedFile(
-                        path=fs.relative_path, lines=0, category=fs.category,
-                        llm_generated=False, heal_attempts=0,
-                    ))
-                else:
-                    generated_files.append(result)
+    @staticmethod
+    def _load_incremental_state(
+        ctx: _GenerationContext, previous_dir: Path,
+    ) -> Optional[IncrementalState]:
+        """Diff ctx.spec against the previous build, or None to build from scratch."""
+        previous = BuildManifest.load(previous_dir)
+        if previous is None:
+            logger.info("No build manifest in %s; generating from scratch", previous_dir)
+            return None
+        diff = diff_specs(previous.spec, ctx.spec)
+        if previous.theme != ctx.theme or previous.customization != ctx.customization:
+            logger.info("Theme or customization changed; full regeneration")
+            diff.full = True
+        logger.info(
+            "Incremental build against %s: %s",
+            previous_dir, "full" if diff.full else sorted(diff.changed) or "no spec changes",
+        )
+        return IncrementalState(previous=previous, previous_dir=previous_dir, diff=diff)
 
-                yield ProgressEvent(
-                    step="generating",
-                    percentage=pct,
-                    current_file=fs.relative_path,
-                    message=f"[{completed}/{total_steps}] {fs.description or fs.relative_path}",
-                )
+    @staticmethod
+    def _remove_stale_files(plan: List[_FileSpec], ctx: _GenerationContext) -> None:
+        """Delete files of the previous build that are no longer in the plan (e.g. removed entities)."""
+        state = ctx.incremental
+        if state is None or state.previous_dir.resolve() != ctx.output_dir.resolve():
+            return
+        planned = {fs.relative_path for fs in plan}
+        for relative_path in state.previous.interfaces:
+            if relative_path not in planned:
+                stale = ctx.output_dir / relative_path
+                if stale.is_file():
+                    logger.info("Removing %s (no longer in the plan)", relative_path)
+                    stale.unlink()
+
+    async def _reuse_previous(
+        self, file_spec: _FileSpec, ctx: _GenerationContext,
+    ) -> Optional[GeneratedFile]:
+        """Keep *file_spec*'s output from the previous build if nothing it depends on changed."""
+        state = ctx.incremental
+        if state is None:
+            return None
+        interface = state.previous.interfaces.get(file_spec.relative_path)
+        # The declared scope plus what the previous prompt actually embedded
+        embedded = state.previous.scopes.get(file_spec.relative_path, [])
+        scope = None if file_spec.spec_scope is None else [*file_spec.spec_scope, *embedded]
+        if interface is None or state.diff.affects(scope):
+            return None
+        async with ctx._lock:
+            if any(dep in state.changed_interfaces for dep in file_spec.depends_on):
+                return None
+        previous = state.previous_dir / file_spec.relative_path
+        try:
+            source = previous.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
 
-        yield ProgressEvent(
-            step="complete",
-            percentage=100.0,
-            message=f"Done — {len(generated_files)} files generated in "
-                    f"{round(time.monotonic() - t_start, 1)}s",
+        dest = ctx.output_dir / file_spec.relative_path
+        if dest.resolve() != previous.resolve():
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.write_text(source, encoding="utf-8")
+        async with ctx._lock:
+            ctx.generated_interfaces[file_spec.relative_path] = interface
+            ctx.prompt_scopes[file_spec.relative_path] = set(embedded)
+            ctx.files_reused += 1
+        logger.debug("Reused %s from the previous build", file_spec.relative_path)
+        return GeneratedFile(
+            path=file_spec.relative_path,
+            lines=source.count("\n") + 1,
+            category=file_spec.category,
+            llm_generated=False,
+            reused=True,
         )
 
     # ------------------------------------------------------------------
     # Dependency tier computation
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _critical_path_lengths(plan: List[_FileSpec]) -> Dict[str, int]:
+        """Length of the longest chain of dependents starting at each file (itself included).
+
+        Files that head long chains gate the most remaining work, so the
+        scheduler starts them first.  Dependencies outside *plan* are ignored;
+        files on a cycle count the cycle once.
+        """
+        paths = {fs.relative_path for fs in plan}
+        dependents: Dict[str, List[str]] = {p: [] for p in paths}
+        for fs in plan:
+            for dep in fs.depends_on:
+                if dep in paths and dep != fs.relative_path:
+                    dependents[dep].append(fs.relative_path)
+
+        lengths: Dict[str, int] = {}
+        on_stack: set[str] = set()
+
+        def _length(path: str) -> int:
+            if path in lengths:
+                return lengths[path]
+            on_stack.add(path)
+            best = 0
+            for child in dependents[path]:
+                if child not in on_stack:
+                    best = max(best, _length(child))
+            on_stack.discard(path)
+            lengths[path] = best + 1
+            return lengths[path]
+
+        for fs in plan:
+            _length(fs.relative_path)
+        return lengths
+
+    @classmethod
+    async def _run_dag(
+        cls,
+        plan: List[_FileSpec],
+        worker: Callable[[_FileSpec], Any],
+        on_done: Callable[[_FileSpec, Any], None],
+        max_concurrency: int,
+        batch_worker: Optional[Callable[[List[_FileSpec]], Any]] = None,
+        batchable: Optional[Callable[[_FileSpec], bool]] = None,
+        batch_size: int = 1,
+    ) -> None:
+        """Run *worker* over *plan* as a dependency DAG.
+
+        A file becomes ready once every file it depends on has finished
+        (successfully or not — failures still produce a placeholder), and
+        ready files start in order of :meth:`_critical_path_lengths`, then
+        plan order, with at most *max_concurrency* running.  *on_done*
+        receives each file with its result or exception.  If dependencies
+        form a cycle, the stuck files are released together once nothing
+        else can run.
+
+        With a *batch_worker*, a starting *batchable* file takes up to
+        ``batch_size - 1`` other batchable files from the ready set along;
+        the group occupies one slot and *batch_worker* returns a result (or
+        exception) per file.
+        """
+        import heapq
+
+        index = {fs.relative_path: i for i, fs in enumerate(plan)}
+        priority = cls._critical_path_lengths(plan)
+        waiting_on: Dict[str, set[str]] = {
+            fs.relative_path: {
+                d for d in fs.depends_on if d in index and d != fs.relative_path
+            }
+            for fs in plan
+        }
+        dependents: Dict[str, List[str]] = {fs.relative_path: [] for fs in plan}
+        for path, deps in waiting_on.items():
+            for dep in deps:
+                dependents[dep].append(path)
+
+        ready: List[tuple[int, int, str]] = []
+        pending = set(index)
+
+        def _release(path: str) -> None:
+            pending.discard(path)
+            heapq.heappush(ready, (-priority[path], index[path], path))
+
+        for path, deps in waiting_on.items():
+            if not deps:
+                _release(path)
+
+        def _take_batch(first: _FileSpec) -> List[_FileSpec]:
+            batch, skipped = [first], []
+            while ready and len(batch) < batch_size:
+                item = heapq.heappop(ready)
+                candidate = plan[index[item[2]]]
+                if batchable(candidate):
+                    batch.append(candidate)
+                else:
+                    skipped.append(item)
+            for item in skipped:
+                heapq.heappush(ready, item)
+            return batch
+
+        async def _run_one(fs: _FileSpec) -> List[Any]:
+            return [await worker(fs)]
+
+        running: Dict[asyncio.Future, List[_FileSpec]] = {}
+        try:
+            while ready or running or pending:
+                while ready and len(running) < max_concurrency:
+                    _, _, path = heapq.heappop(ready)
+                    fs = plan[index[path]]
+                    if batch_worker is not None and batch_size > 1 and batchable(fs):
+                        batch = _take_batch(fs)
+                        if len(batch) > 1:
+                            running[asyncio.ensure_future(batch_worker(batch))] = batch
+                            continue
+                    running[asyncio.ensure_future(_run_one(fs))] = [fs]
+
+                if not running:
+                    # Only cyclic dependencies are left — run them without ordering
+                    logger.warning(
+                        "Cannot resolve dependencies for %d remaining files; "
+                        "generating them without ordering.",
+                        len(pending),
+                    )
+                    for path in sorted(pending, key=index.__getitem__):
+                        _release(path)
+                    continue
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    specs = running.pop(task)
+                    if task.cancelled():
+                        results: List[Any] = [asyncio.CancelledError()] * len(specs)
+                    elif task.exception() is not None:
+                        results = [task.exception()] * len(specs)
+                    else:
+                        results = task.result()
+                    for fs, result in zip(specs, results):
+                        on_done(fs, result)
+                        for child in dependents[fs.relative_path]:
+                            deps = waiting_on[child]
+                            deps.discard(fs.relative_path)
+                            if not deps and child in pending:
+                                _release(child)
+        finally:
+            # Cancelled or failed mid-build: don't leave files generating
+            for task in running:
+                task.cancel()
+
     @staticmethod
     def _topological_tiers(plan: List[_FileSpec]) -> List[List[_FileSpec]]:
         """Group *plan* into tiers respecting dependency order.
@@ -6066,6 +6687,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_db_base_prompt(c),
             description="SQLAlchemy declarative base",
             depends_on=[],  # Tier 0
+            spec_scope=["entity_names"],
         ))
         plan.append(_FileSpec(
             relative_path="backend/app/db/session.py",
@@ -6073,6 +6695,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_db_session_prompt(c),
             description="Async DB session factory",
             depends_on=[],  # Tier 0
+            spec_scope=[],
         ))
         plan.append(_FileSpec(
             relative_path="backend/app/core/config.py",
@@ -6080,6 +6703,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_core_config_prompt(c),
             description="Pydantic settings / config",
             depends_on=[],  # Tier 0
+            spec_scope=[],
         ))
         plan.append(_FileSpec(
             relative_path="backend/app/core/security.py",
@@ -6087,6 +6711,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_core_security_prompt(c),
             description="Password hashing + JWT utils",
             depends_on=["backend/app/core/config.py"],
+            spec_scope=[],
         ))
         plan.append(_FileSpec(
             relative_path="backend/app/core/auth.py",
@@ -6094,6 +6719,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_core_auth_prompt(c),
             description="FastAPI auth dependencies",
             depends_on=["backend/app/core/security.py", "backend/app/db/session.py"],
+            spec_scope=["entity_names"],
         ))
 
         # __init__ files (static, no LLM needed, Tier 0)
@@ -6115,6 +6741,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c, p=init_path: f"# {p}\n",
                 description=f"Package init: {init_path}",
                 depends_on=[],  # Tier 0
+                spec_scope=[],
             ))
 
         # ========== TIER 1: All entity models (concurrent, depend on DB base) ==========
@@ -6129,6 +6756,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c, e=ent: _build_model_prompt(e, c),
                 description=f"SQLAlchemy model: {ent.name}",
                 depends_on=["backend/app/db/base.py"],
+                spec_scope=entity_scope(ent),
             ))
 
         # ========== TIER 2: All entity schemas (concurrent, depend on their model) ==========
@@ -6143,6 +6771,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c, e=ent: _build_schema_prompt(e, c),
                 description=f"Pydantic schemas: {ent.name}",
                 depends_on=[f"backend/app/models/{ent.name.lower()}.py"],
+                spec_scope=entity_scope(ent),
             ))
 
         # ========== TIER 3: All CRUD modules (concurrent, depend on model + schema) ==========
@@ -6160,6 +6789,7 @@ class CodeGeneratorV2:
                     f"backend/app/models/{ent.name.lower()}.py",
                     f"backend/app/schemas/{ent.name.lower()}.py",
                 ],
+                spec_scope=entity_scope(ent),
             ))
 
         # ========== TIER 4: All API routers (concurrent, depend on CRUD + auth) ==========
@@ -6170,6 +6800,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_auth_router_prompt(c),
             description="Auth router (login/register/refresh)",
             depends_on=["backend/app/core/auth.py", "backend/app/core/security.py"],
+            spec_scope=["entity_names"],
         ))
         router_paths.append("backend/app/api/endpoints/auth.py")
 
@@ -6187,6 +6818,7 @@ class CodeGeneratorV2:
                     f"backend/app/schemas/{ent.name.lower()}.py",
                     "backend/app/core/auth.py",
                 ],
+                spec_scope=entity_scope(ent),
             ))
 
         # ========== TIER 5: Router aggregator + main app (depend on all routers) ==========
@@ -6196,6 +6828,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_main_router_prompt(c),
             description="Main API router aggregator",
             depends_on=router_paths,
+            spec_scope=["entity_names"],
         ))
         plan.append(_FileSpec(
             relative_path="backend/app/main.py",
@@ -6203,6 +6836,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_main_app_prompt(c),
             description="FastAPI application entry point",
             depends_on=["backend/app/api/__init__.py"],
+            spec_scope=["entity_names"],
         ))
 
         # ========== Backend config files (Tier 0 — no code deps) ==========
@@ -6212,6 +6846,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_requirements_prompt(c),
             description="Python requirements",
             depends_on=[],
+            spec_scope=[],
         ))
         plan.append(_FileSpec(
             relative_path="backend/Dockerfile",
@@ -6219,6 +6854,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_backend_dockerfile_prompt(c),
             description="Backend Dockerfile",
             depends_on=[],
+            spec_scope=[],
         ))
         plan.append(_FileSpec(
             relative_path="backend/alembic.ini",
@@ -6226,6 +6862,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_alembic_ini_prompt(c),
             description="Alembic config",
             depends_on=[],
+            spec_scope=[],
         ))
         plan.append(_FileSpec(
             relative_path="backend/alembic/env.py",
@@ -6233,6 +6870,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_alembic_env_prompt(c),
             description="Alembic env.py configuration",
             depends_on=["backend/alembic.ini", "backend/app/db/base.py", "backend/app/db/session.py"],
+            spec_scope=["entity_names"],
         ))
         plan.append(_FileSpec(
             relative_path="backend/alembic/versions/001_initial.py",
@@ -6240,6 +6878,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_initial_migration_prompt(c),
             description="Initial Alembic migration",
             depends_on=model_paths + ["backend/alembic/env.py"],
+            spec_scope=["entities"],
         ))
 
         # ========== Seed data script (depends on models + session) ==========
@@ -6249,6 +6888,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_seed_data_prompt(c),
             description="Database seed script (Faker, idempotent)",
             depends_on=model_paths + ["backend/app/db/session.py", "backend/app/core/security.py"],
+            spec_scope=["entities"],
         ))
 
         # ========== TIER 5: Backend tests (depend on routes + CRUD) ==========
@@ -6263,6 +6903,7 @@ class CodeGeneratorV2:
                     f"backend/app/api/endpoints/{ent.name.lower()}.py",
                     f"backend/app/schemas/{ent.name.lower()}.py",
                 ],
+                spec_scope=entity_scope(ent),
             ))
 
         # ========== Frontend: framework selection ==========
@@ -6278,6 +6919,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_frontend_types_prompt(c),
                 description="TypeScript type definitions",
                 depends_on=[],
+                spec_scope=["entities"],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/src/lib/api.ts",
@@ -6285,6 +6927,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_api_client_prompt(c),
                 description="Typed API client",
                 depends_on=["frontend/src/types/index.ts"],
+                spec_scope=["entities", "api_routes"],
             ))
 
             # Tier 1: App.vue + Router (depend on types)
@@ -6294,6 +6937,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_vue_app_prompt(c),
                 description="Root App.vue component",
                 depends_on=["frontend/src/types/index.ts"],
+                spec_scope=["pages"],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/src/router/index.ts",
@@ -6301,6 +6945,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_vue_router_prompt(c),
                 description="Vue Router configuration",
                 depends_on=["frontend/src/types/index.ts"],
+                spec_scope=["pages", "entity_names"],
             ))
 
             # Tier 2: Pinia stores per entity
@@ -6315,6 +6960,7 @@ class CodeGeneratorV2:
                     prompt_builder=lambda c, e=ent: _build_vue_store_prompt(e, c),
                     description=f"Pinia store: {ent.name}",
                     depends_on=["frontend/src/lib/api.ts", "frontend/src/types/index.ts"],
+                    spec_scope=entity_scope(ent),
                 ))
 
             # Tier 3: Entity components (List, Form, Card per entity)
@@ -6335,6 +6981,7 @@ class CodeGeneratorV2:
                         "frontend/src/lib/api.ts",
                         f"frontend/src/stores/{ent.name.lower()}.ts",
                     ],
+                    spec_scope=entity_scope(ent),
                 ))
 
             # Tier 4: Page views
@@ -6347,6 +6994,7 @@ class CodeGeneratorV2:
                     prompt_builder=lambda c, p=pg: _build_vue_page_prompt(p, c, c.theme),
                     description=f"Vue page: {pg.title}",
                     depends_on=vue_component_paths + vue_store_paths,
+                    spec_scope=page_scope(pg),
                 ))
 
             # Config files
@@ -6356,6 +7004,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_vue_package_json_prompt(c),
                 description="Frontend package.json (Vue/Vite)",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/vite.config.ts",
@@ -6363,6 +7012,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_vue_vite_config_prompt(c),
                 description="Vite config (Vue)",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/tailwind.config.ts",
@@ -6370,6 +7020,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_tailwind_config_prompt(c, c.theme),
                 description="Tailwind CSS config",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/tsconfig.json",
@@ -6377,6 +7028,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_tsconfig_prompt(c),
                 description="TypeScript config",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/Dockerfile",
@@ -6384,6 +7036,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_frontend_dockerfile_prompt(c),
                 description="Frontend Dockerfile",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/postcss.config.js",
@@ -6391,6 +7044,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_postcss_config_prompt(c),
                 description="PostCSS config for Tailwind CSS",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/src/index.css",
@@ -6398,6 +7052,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_global_css_prompt(c),
                 description="Global CSS with Tailwind directives and design tokens",
                 depends_on=[],
+                spec_scope=[],
             ))
 
         elif frontend_framework == 'svelte':
@@ -6410,6 +7065,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_frontend_types_prompt(c),
                 description="TypeScript type definitions",
                 depends_on=[],
+                spec_scope=["entities"],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/src/lib/api.ts",
@@ -6417,6 +7073,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_api_client_prompt(c),
                 description="Typed API client",
                 depends_on=["frontend/src/lib/types/index.ts"],
+                spec_scope=["entities", "api_routes"],
             ))
 
             # Tier 1: Root layout
@@ -6426,6 +7083,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_svelte_layout_prompt(c, c.theme),
                 description="SvelteKit root layout",
                 depends_on=["frontend/src/lib/types/index.ts"],
+                spec_scope=["pages"],
             ))
 
             # Tier 2: Svelte stores per entity
@@ -6440,6 +7098,7 @@ class CodeGeneratorV2:
                     prompt_builder=lambda c, e=ent: _build_svelte_store_prompt(e, c),
                     description=f"Svelte store: {ent.name}",
                     depends_on=["frontend/src/lib/api.ts", "frontend/src/lib/types/index.ts"],
+                    spec_scope=entity_scope(ent),
                 ))
 
             # Tier 3: Entity components
@@ -6458,6 +7117,7 @@ class CodeGeneratorV2:
                         "frontend/src/lib/api.ts",
                         f"frontend/src/lib/stores/{ent.name.lower()}.ts",
                     ],
+                    spec_scope=entity_scope(ent),
                 ))
 
             # Tier 4: Page routes
@@ -6472,6 +7132,7 @@ class CodeGeneratorV2:
                     depends_on=svelte_component_paths + svelte_store_paths + [
                         "frontend/src/routes/+layout.svelte",
                     ],
+                    spec_scope=page_scope(pg),
                 ))
 
             # Config files
@@ -6481,6 +7142,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_svelte_package_json_prompt(c),
                 description="Frontend package.json (SvelteKit)",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/svelte.config.js",
@@ -6488,6 +7150,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_svelte_config_prompt(c),
                 description="SvelteKit config",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/tailwind.config.ts",
@@ -6495,6 +7158,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_tailwind_config_prompt(c, c.theme),
                 description="Tailwind CSS config",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/tsconfig.json",
@@ -6502,6 +7166,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_tsconfig_prompt(c),
                 description="TypeScript config",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/Dockerfile",
@@ -6509,6 +7174,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_frontend_dockerfile_prompt(c),
                 description="Frontend Dockerfile",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/postcss.config.js",
@@ -6516,6 +7182,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_postcss_config_prompt(c),
                 description="PostCSS config for Tailwind CSS",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/src/app.css",
@@ -6523,6 +7190,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_global_css_prompt(c),
                 description="Global CSS with Tailwind directives and design tokens",
                 depends_on=[],
+                spec_scope=[],
             ))
 
         else:
@@ -6535,6 +7203,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_react_types_prompt(c),
                 description="TypeScript type definitions (entity interfaces, API types, form schemas)",
                 depends_on=[],  # Tier 0 for frontend
+                spec_scope=["entities"],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/src/lib/api.ts",
@@ -6542,6 +7211,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_api_client_prompt(c),
                 description="Typed API client",
                 depends_on=["frontend/src/types/index.ts"],
+                spec_scope=["entities", "api_routes"],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/src/components/ui/index.tsx",
@@ -6549,6 +7219,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_ui_components_prompt(c, c.theme),
                 description="Shared UI component library",
                 depends_on=[],  # Tier 0 for frontend
+                spec_scope=[],
             ))
 
             # ========== Frontend: Entity components (depend on types + UI + API) ==========
@@ -6564,6 +7235,7 @@ class CodeGeneratorV2:
                         "frontend/src/lib/api.ts",
                         "frontend/src/components/ui/index.tsx",
                     ],
+                    spec_scope=entity_scope(ent),
                 ))
 
             # ========== Frontend: Pages (depend on entity components) ==========
@@ -6577,6 +7249,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_auth_pages_prompt(c, c.theme),
                 description="Login + register pages",
                 depends_on=["frontend/src/components/ui/index.tsx", "frontend/src/lib/api.ts"],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/src/app/(dashboard)/layout.tsx",
@@ -6584,6 +7257,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_dashboard_layout_prompt(c, c.theme),
                 description="Dashboard layout",
                 depends_on=["frontend/src/components/ui/index.tsx"],
+                spec_scope=["entity_names"],
             ))
             for page in spec.pages:
                 pg = page
@@ -6596,6 +7270,7 @@ class CodeGeneratorV2:
                     depends_on=entity_component_paths + [
                         "frontend/src/app/(dashboard)/layout.tsx",
                     ],
+                    spec_scope=page_scope(pg),
                 ))
 
             # ========== Frontend: Config (Tier 0 — no code deps) ==========
@@ -6605,6 +7280,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_frontend_package_json_prompt(c),
                 description="Frontend package.json",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/tailwind.config.ts",
@@ -6612,6 +7288,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_tailwind_config_prompt(c, c.theme),
                 description="Tailwind CSS config",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/tsconfig.json",
@@ -6619,6 +7296,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_typescript_config_prompt(c),
                 description="TypeScript config (strict mode, path aliases, ES2022)",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/Dockerfile",
@@ -6626,6 +7304,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_frontend_dockerfile_prompt(c),
                 description="Frontend Dockerfile",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/postcss.config.js",
@@ -6633,6 +7312,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_postcss_config_prompt(c),
                 description="PostCSS config for Tailwind CSS",
                 depends_on=[],
+                spec_scope=[],
             ))
             plan.append(_FileSpec(
                 relative_path="frontend/src/app/globals.css",
@@ -6640,6 +7320,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_global_css_prompt(c),
                 description="Global CSS with Tailwind directives and design tokens",
                 depends_on=[],
+                spec_scope=[],
             ))
 
         # ========== Infrastructure (Tier 0 — no code deps) ==========
@@ -6649,6 +7330,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_docker_compose_prompt(c),
             description="Docker Compose",
             depends_on=[],
+            spec_scope=[],
         ))
         plan.append(_FileSpec(
             relative_path=".env.example",
@@ -6656,6 +7338,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_env_example_prompt(c),
             description="Environment variables example",
             depends_on=[],
+            spec_scope=[],
         ))
         plan.append(_FileSpec(
             relative_path=".gitignore",
@@ -6663,6 +7346,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_gitignore_prompt(c),
             description=".gitignore",
             depends_on=[],
+            spec_scope=[],
         ))
         plan.append(_FileSpec(
             relative_path=".dockerignore",
@@ -6670,6 +7354,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_dockerignore_prompt(c),
             description=".dockerignore (excludes node_modules, __pycache__, .env, etc.)",
             depends_on=[],
+            spec_scope=[],
         ))
         plan.append(_FileSpec(
             relative_path="README.md",
@@ -6677,6 +7362,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_readme_prompt(c),
             description="Project README",
             depends_on=[],
+            spec_scope=["entity_names", "page_routes"],
         ))
         plan.append(_FileSpec(
             relative_path=".github/workflows/ci.yml",
@@ -6684,6 +7370,7 @@ class CodeGeneratorV2:
             prompt_builder=lambda c: _build_github_ci_prompt(c),
             description="GitHub Actions CI/CD",
             depends_on=[],
+            spec_scope=[],
         ))
 
         # ========== Supabase integration (conditional on database == 'supabase') ==========
@@ -6695,6 +7382,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_supabase_schema_prompt(c),
                 description="Supabase SQL migration (CREATE TABLE + RLS + triggers)",
                 depends_on=[],  # Pure SQL, no Python deps
+                spec_scope=["entities"],
             ))
 
             # 2. Python Supabase client (replaces / supplements SQLAlchemy CRUD)
@@ -6704,6 +7392,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_supabase_client_prompt(c),
                 description="Supabase Python client + auth helpers",
                 depends_on=["backend/app/core/config.py"],
+                spec_scope=[],
             ))
 
             # 3. TypeScript database types (replaces generic types/index.ts)
@@ -6713,6 +7402,7 @@ class CodeGeneratorV2:
                 prompt_builder=lambda c: _build_supabase_types_prompt(c),
                 description="Supabase TypeScript database types",
                 depends_on=[],
+                spec_scope=["entities"],
             ))
 
             # 4. Supabase config file for local development
@@ -6737,6 +7427,7 @@ class CodeGeneratorV2:
                 """).strip(),
                 description="Supabase local dev config",
                 depends_on=[],
+                spec_scope=[],
             ))
 
         return plan
@@ -6754,24 +7445,207 @@ class CodeGeneratorV2:
 
         Thread-safe: uses an asyncio lock when updating shared context state
         so that concurrent generation doesn't corrupt the interfaces dict.
+        In an incremental build, unaffected files are reused instead.
         """
-        prompt = file_spec.prompt_builder(ctx)
+        reused = await self._reuse_previous(file_spec, ctx)
+        if reused is not None:
+            return reused
 
+        prompt = self._build_prompt(file_spec, ctx)
         # Short-circuit for trivially static prompts (like __init__.py lines)
-        if len(prompt) < 80 and not prompt.strip().endswith("?"):
-            source = prompt
-            heal_attempts = 0
-        else:
+        if self._is_static_prompt(prompt):
+            return await self._finish_file(file_spec, prompt, ctx)
+
+        artifact_key, source = await self._lookup_artifact(file_spec, prompt, ctx)
+        if source is not None:
+            # Validated output for this exact request: no LLM, no heal loop
+            return await self._finish_file(
+                file_spec, source, ctx, cached=True, prompt_tokens=estimate_tokens(prompt),
+            )
+        return await self._generate_from_prompt(file_spec, prompt, artifact_key, ctx)
+
+    async def _generate_batch(
+        self,
+        file_specs: List[_FileSpec],
+        ctx: _GenerationContext,
+    ) -> List[Any]:
+        """Generate several small files with one LLM completion.
+
+        Files that are reused, static or in the artifact store are handled as
+        in :meth:`_generate_file`; the rest are requested together using the
+        delimiter protocol of :mod:`src.code_generation.batching`. Each file
+        cut from the response is validated and healed on its own, and files
+        missing from it (or a failed batch call) are generated one by one.
+
+        Returns a GeneratedFile or exception per file, in *file_specs* order.
+        """
+        results: Dict[str, Any] = {}
+        todo: List[tuple[_FileSpec, str, Optional[str]]] = []
+        for fs in file_specs:
+            try:
+                reused = await self._reuse_previous(fs, ctx)
+                if reused is not None:
+                    results[fs.relative_path] = reused
+                    continue
+                prompt = self._build_prompt(fs, ctx)
+                if self._is_static_prompt(prompt):
+                    results[fs.relative_path] = await self._finish_file(fs, prompt, ctx)
+                    continue
+                artifact_key, source = await self._lookup_artifact(fs, prompt, ctx)
+                if source is not None:
+                    results[fs.relative_path] = await self._finish_file(
+                        fs, source, ctx, cached=True, prompt_tokens=estimate_tokens(prompt),
+                    )
+                    continue
+                todo.append((fs, prompt, artifact_key))
+            except Exception as exc:
+                results[fs.relative_path] = exc
+
+        sections: Dict[str, str] = {}
+        if len(todo) > 1:
+            batch_prompt = build_batch_prompt([(fs.relative_path, prompt) for fs, prompt, _ in todo])
+            # The fast tier only if it would take every file of the batch
+            tiers = {self._tier_for(fs.relative_path, prompt, ctx) for fs, prompt, _ in todo}
+            tier = ModelTier.FAST if tiers == {ModelTier.FAST} else ModelTier.STRONG
+            try:
+                # No backoff retries: every file falls back to its own call
+                response = await self._call_llm(
+                    batch_prompt, ctx, temperature=0.2, max_retries=0,
+                    system_prompt=CODEGEN_SYSTEM_PROMPT + BATCH_PROTOCOL, tier=tier,
+                )
+                sections = split_batch_response(response, [fs.relative_path for fs, _, _ in todo])
+            except Exception as exc:
+                logger.warning(
+                    "Batched generation of %d files failed; generating them one by one: %s",
+                    len(todo), exc,
+                )
+            else:
+                logger.debug("Batch call returned %d of %d files", len(sections), len(todo))
+
+        outcomes = await asyncio.gather(
+            *(
+                self._finish_batched(fs, prompt, artifact_key, sections.get(fs.relative_path), ctx)
+                for fs, prompt, artifact_key in todo
+            ),
+            return_exceptions=True,
+        )
+        for (fs, _, _), outcome in zip(todo, outcomes):
+            results[fs.relative_path] = outcome
+        return [results[fs.relative_path] for fs in file_specs]
+
+    async def _finish_batched(
+        self,
+        file_spec: _FileSpec,
+        prompt: str,
+        artifact_key: Optional[str],
+        source: Optional[str],
+        ctx: _GenerationContext,
+    ) -> GeneratedFile:
+        """Validate (and heal) one file cut from a batch response."""
+        if source is None:
+            return await self._generate_from_prompt(file_spec, prompt, artifact_key, ctx)
+        source, heal_attempts = await self._llm_generate_with_heal(
+            prompt=prompt,
+            relative_path=file_spec.relative_path,
+            ctx=ctx,
+            initial_source=source,
+        )
+        await self._store_artifact(artifact_key, source, heal_attempts)
+        return await self._finish_file(
+            file_spec, source, ctx, heal_attempts=heal_attempts,
+            prompt_tokens=estimate_tokens(prompt), batched=True,
+        )
+
+    @staticmethod
+    def _build_prompt(file_spec: _FileSpec, ctx: _GenerationContext) -> str:
+        """Render *file_spec*'s prompt, packing context for this file."""
+        # Prompt builders are synchronous, so no other file's prompt can be
+        # built while _packing_for points at this one
+        ctx._packing_for = file_spec
+        ctx.prompt_scopes[file_spec.relative_path] = set()
+        try:
+            return file_spec.prompt_builder(ctx)
+        finally:
+            ctx._packing_for = None
+
+    @staticmethod
+    def _is_static_prompt(prompt: str) -> bool:
+        """True if *prompt* is the file's literal content (like __init__.py lines)."""
+        return len(prompt) < 80 and not prompt.strip().endswith("?")
+
+    async def _lookup_artifact(
+        self,
+        file_spec: _FileSpec,
+        prompt: str,
+        ctx: _GenerationContext,
+    ) -> tuple[Optional[str], Optional[str]]:
+        """Return ``(artifact_key, stored_source)``; both None when the store is off."""
+        if self._artifacts is None:
+            return None, None
+        artifact_key = self._artifact_key(file_spec, prompt, ctx)
+        # Disk reads stay off the event loop
+        source = await asyncio.to_thread(self._artifacts.get, artifact_key)
+        async with ctx._lock:
+            if source is None:
+                ctx.artifact_misses += 1
+            else:
+                ctx.artifact_hits += 1
+        if source is not None:
+            logger.debug("Artifact store hit for %s", file_spec.relative_path)
+        return artifact_key, source
+
+    async def _store_artifact(self, artifact_key: Optional[str], source: str, heal_attempts: int) -> None:
+        # Only sources that passed validation are worth replaying
+        if artifact_key is not None and heal_attempts <= self.MAX_HEAL_ATTEMPTS:
+            await asyncio.to_thread(self._artifacts.put, artifact_key, source)
+
+    async def _generate_from_prompt(
+        self,
+        file_spec: _FileSpec,
+        prompt: str,
+        artifact_key: Optional[str],
+        ctx: _GenerationContext,
+    ) -> GeneratedFile:
+        """Generate *file_spec* with its own LLM call, streaming into a partial file."""
+        # Stream the completion into a .partial sibling so progress is
+        # visible while the LLM is still writing.
+        dest = ctx.output_dir / file_spec.relative_path
+        writer = _PartialFileWriter(dest, file_spec.relative_path, ctx)
+        try:
             source, heal_attempts = await self._llm_generate_with_heal(
                 prompt=prompt,
                 relative_path=file_spec.relative_path,
                 ctx=ctx,
+                writer=writer,
             )
+            # Replace the partial output with the final (fixed, validated) source
+            await writer.commit(source)
+        except BaseException:
+            writer.discard()
+            raise
+        await self._store_artifact(artifact_key, source, heal_attempts)
+        return await self._finish_file(
+            file_spec, source, ctx, heal_attempts=heal_attempts,
+            prompt_tokens=estimate_tokens(prompt), written=True,
+        )
 
-        # Write to disk
-        dest = ctx.output_dir / file_spec.relative_path
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        dest.write_text(source, encoding="utf-8")
+    async def _finish_file(
+        self,
+        file_spec: _FileSpec,
+        source: str,
+        ctx: _GenerationContext,
+        *,
+        heal_attempts: int = 0,
+        cached: bool = False,
+        prompt_tokens: int = 0,
+        batched: bool = False,
+        written: bool = False,
+    ) -> GeneratedFile:
+        """Write *source* (unless already *written*) and record the file's interface."""
+        if not written:
+            dest = ctx.output_dir / file_spec.relative_path
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.write_text(source, encoding="utf-8")
 
         line_count = source.count("\n") + 1
 
@@ -6780,6 +7654,10 @@ class CodeGeneratorV2:
         interface = self._extract_interface_summary(file_spec.relative_path, source)
         async with ctx._lock:
             ctx.generated_interfaces[file_spec.relative_path] = interface
+            state = ctx.incremental
+            if state is not None and state.previous.interfaces.get(file_spec.relative_path) != interface:
+                # Dependents of this file can no longer be reused
+                state.changed_interfaces.add(file_spec.relative_path)
 
         logger.debug("Wrote %s (%d lines)", file_spec.relative_path, line_count)
 
@@ -6789,13 +7667,53 @@ class CodeGeneratorV2:
             category=file_spec.category,
             llm_generated=True,
             heal_attempts=heal_attempts,
+            cached=cached,
+            prompt_tokens=prompt_tokens,
+            batched=batched,
+        )
+
+    def _artifact_key(self, file_spec: _FileSpec, prompt: str, ctx: _GenerationContext) -> str:
+        """Artifact store key for generating *file_spec* from *prompt*."""
+        dependency_interfaces = {
+            dep: ctx.generated_interfaces.get(dep, "") for dep in file_spec.depends_on
+        }
+        client = self._client_for(self._tier_for(file_spec.relative_path, prompt, ctx))
+        return ArtifactStore.key(
+            prompt,
+            file_spec.relative_path,
+            dependency_interfaces,
+            model=str(getattr(client, "model", "")),
+            temperature=0.2,  # first-attempt temperature of _llm_generate_with_heal
+            system_prompt=CODEGEN_SYSTEM_PROMPT,
+            provider=str(getattr(client, "provider_name", "")),
         )
 
+    def _tier_for(
+        self,
+        relative_path: str,
+        prompt: str,
+        ctx: _GenerationContext,
+        failures: int = 0,
+    ) -> ModelTier:
+        """The model tier for generating *relative_path* after *failures* failed validations."""
+        if self._tiering is None:
+            return ModelTier.STRONG
+        return self._tiering.choose(
+            relative_path, ctx.file_categories.get(relative_path), estimate_tokens(prompt), failures,
+        )
+
+    def _client_for(self, tier: ModelTier) -> BaseLLMClient:
+        if tier == ModelTier.FAST and self._tiering is not None:
+            return self._tiering.fast_client
+        return self._client
+
     async def _llm_generate_with_heal(
         self,
         prompt: str,
         relative_path: str,
         ctx: _GenerationContext,
+        writer: Optional[_PartialFileWriter] = None,
+        initial_source: Optional[str] = None,
     ) -> tuple[str, int]:
         """
         Call the LLM to generate *source* for *relative_path*.
@@ -6806,18 +7724,37 @@ class CodeGeneratorV2:
 
         Before each retry, attempts an AST-based auto-fix for common issues
         (missing imports, unbalanced brackets) that can be resolved without
-        the LLM.
+        the LLM. Then, up to :attr:`MAX_PATCH_ATTEMPTS` times per file, asks
+        for a minimal patch for the reported error (see
+        :mod:`src.code_generation.patching`) and applies it locally; the full
+        file is only regenerated when patching does not produce valid source.
+
+        If *writer* is given, each full attempt's output is streamed into it.
+        If *initial_source* is given (a file cut from a batched completion),
+        it stands in for the first attempt's LLM output.
+
+        With model tiering, each attempt goes to the tier chosen for the file
+        and its heal history; a file that fails on the fast tier continues
+        on the strong one.
 
         Returns a (source_code, heal_attempt_count) tuple.
         """
         heal_count = 0
+        patch_attempts = 0
         current_prompt = prompt
         # Escalating temperature: start precise, get more creative on retries
         temperatures = [0.2, 0.4, 0.6, 0.8]
 
+        tier = self._tier_for(relative_path, prompt, ctx)
+
         for attempt in range(self.MAX_HEAL_ATTEMPTS + 1):
             temp = temperatures[min(attempt, len(temperatures) - 1)]
-            source = await self._call_llm(current_prompt, ctx, temperature=temp)
+            if attempt == 0 and initial_source is not None:
+                source = initial_source
+            else:
+                source = await self._call_llm(
+                    current_prompt, ctx, temperature=temp, writer=writer, tier=tier,
+                )
             source = _strip_code_fences(source)
 
             # Try automatic fixes before validation (works on all file types)
@@ -6828,6 +7765,23 @@ class CodeGeneratorV2:
                 return source, heal_count
 
             heal_count = attempt + 1
+            next_tier = self._tier_for(relative_path, prompt, ctx, failures=heal_count)
+            if next_tier != tier:
+                logger.info("Escalating %s to the %s model tier", relative_path, next_tier.value)
+                self._tiering.record_failure(relative_path)
+                async with ctx._lock:
+                    ctx.tier_escalations += 1
+                tier = next_tier
+            if patch_attempts < self.MAX_PATCH_ATTEMPTS and heal_count <= self.MAX_HEAL_ATTEMPTS:
+                patched, error, rounds = await self._patch_heal(
+                    relative_path, source, error, ctx, self.MAX_PATCH_ATTEMPTS - patch_attempts,
+                    tier=tier,
+                )
+                patch_attempts += rounds
+                if error is None:
+                    return patched, heal_count
+                source = patched
+
             if heal_count > self.MAX_HEAL_ATTEMPTS:
                 msg = (
                     f"File {relative_path} still has syntax errors after "
@@ -6860,6 +7814,54 @@ class CodeGeneratorV2:
         # Unreachable in practice, but satisfies type checker
         return source, heal_count  # type: ignore[return-value]
 
+    async def _patch_heal(
+        self,
+        relative_path: str,
+        source: str,
+        error: str,
+        ctx: _GenerationContext,
+        max_rounds: int,
+        tier: ModelTier = ModelTier.STRONG,
+    ) -> tuple[str, Optional[str], int]:
+        """Repair *source* with model-written patches instead of regenerating it.
+
+        Each round asks for a minimal diff for the current *error* and applies
+        it locally; a patch that applies but leaves a (different) error feeds
+        the next round. Stops at the first round whose patch does not apply.
+
+        Returns ``(source, error, rounds_used)`` where *error* is None once
+        the patched source validates.
+        """
+        rounds = 0
+        while rounds < max_rounds:
+            patch_prompt = build_patch_prompt(relative_path, source, error, max_lines=self.PATCH_MAX_LINES)
+            if patch_prompt is None:
+                break
+            rounds += 1
+            try:
+                # No backoff retries: a failed patch request falls straight
+                # back to full regeneration, which retries on its own
+                response = await self._call_llm(
+                    patch_prompt, ctx, temperature=0.0, max_retries=0,
+                    system_prompt=PATCH_SYSTEM_PROMPT, max_tokens=self.PATCH_MAX_TOKENS, tier=tier,
+                )
+            except Exception as exc:
+                logger.warning("Patch request for %s failed: %s", relative_path, exc)
+                break
+            patched = apply_patch(source, _strip_code_fences(response))
+            if patched is None:
+                logger.info("Patch for %s did not apply; regenerating the full file", relative_path)
+                break
+            patched = self._auto_fix_source(relative_path, patched)
+            new_error = _validate_file(relative_path, patched)
+            source, error = patched, new_error
+            if error is None:
+                logger.info("Healed %s with a patch (round %d)", relative_path, rounds)
+                async with ctx._lock:
+                    ctx.patch_heals += 1
+                return source, None, rounds
+        return source, error, rounds
+
     @staticmethod
     def _auto_fix_source(relative_path: str, source: str) -> str:
         """Attempt lightweight automatic fixes on generated source code.
@@ -6966,30 +7968,58 @@ class CodeGeneratorV2:
         ctx: Optional[_GenerationContext] = None,
         temperature: float = 0.2,
         max_retries: int = 3,
+        writer: Optional[_PartialFileWriter] = None,
+        system_prompt: str = CODEGEN_SYSTEM_PROMPT,
+        max_tokens: int = 8192,
+        tier: ModelTier = ModelTier.STRONG,
     ) -> str:
         """
         Dispatch a single LLM completion call asynchronously with retry.
 
-        The underlying ``client.complete()`` is synchronous; we use
-        ``asyncio.to_thread`` so that it does not block the event loop.
+        Uses the client's native ``acomplete()`` so in-flight generations do
+        not each occupy an executor thread. When *writer* is given the call
+        goes through ``astream()`` instead and every delta is handed to the
+        writer as it arrives; the writer is reset before each retry.
 
         Retries on transient errors (rate limits, timeouts, server errors)
         with exponential backoff (2s, 4s, 8s). Permanent errors (auth,
         bad request) are raised immediately.
 
-        If *ctx* is provided, increments the LLM call counter thread-safely.
+        *system_prompt* and *max_tokens* default to full-file generation
+        (up to 8192 output tokens, to allow large files). *tier* selects the
+        client when model tiering is on.
+
+        If *ctx* is provided, increments the LLM call counter (overall and
+        per tier, with the call's latency) thread-safely.
         """
+        client = self._client_for(tier)
         last_error: Optional[Exception] = None
+        # Tier latency covers the whole call, retries and backoff included
+        started = time.monotonic()
         for attempt in range(max_retries + 1):
             try:
-                response = await asyncio.to_thread(
-                    self._client.complete,
-                    prompt,
-                    CODEGEN_SYSTEM_PROMPT,
-                    8192,   # max_tokens — allow large files
-                    temperature,
-                    False,  # json_mode
-                )
+                if writer is None:
+                    response = await client.acomplete(
+                        prompt,
+                        system_prompt,
+                        max_tokens,
+                        temperature,
+                        False,  # json_mode
+                    )
+                    content = response.content
+                else:
+                    await writer.reset()
+                    chunks: List[str] = []
+                    async for delta in client.astream(
+                        prompt,
+                        system_prompt,
+                        max_tokens,
+                        temperature,
+                        False,  # json_mode
+                    ):
+                        chunks.append(delta)
+                        await writer.write(delta)
+                    content = "".join(chunks)
                 break  # success
             except Exception as exc:
                 last_error = exc
@@ -7010,10 +8040,13 @@ class CodeGeneratorV2:
                 await asyncio.sleep(wait_seconds)
         else:
             raise last_error  # type: ignore[misc]
+        elapsed = time.monotonic() - started
         if ctx is not None:
             async with ctx._lock:
                 ctx.llm_calls += 1
-        return response.content
+                ctx.tier_calls[tier.value] = ctx.tier_calls.get(tier.value, 0) + 1
+                ctx.tier_seconds[tier.value] = ctx.tier_seconds.get(tier.value, 0.0) + elapsed
+        return content
 
     # ------------------------------------------------------------------
     # Interface extraction (for context propagation)
@@ -0,0 +1,200 @@
+"""
+Incremental Regeneration Support for CodeGeneratorV2.
+
+A finished build leaves a :class:`BuildManifest` in its output directory
+(``.ignara/build_manifest.json``) recording the spec it was generated from
+and the interface summary of every file. The next build of the same project
+can then run incrementally:
+
+1. :func:`diff_specs` compares the previous spec with the new one and
+   returns a :class:`SpecDiff`, a set of *scope keys* naming what changed
+   (``entity:<name>``, ``entities``, ``entity_names``, ``page:<route>``,
+   ``pages``, ``page_routes``, ``api_routes``).
+   A changed entity also marks every entity related to it (in either
+   direction, in either spec), since their prompts carry each other's
+   details.
+2. Every ``_FileSpec`` declares the scope keys it is derived from
+   (``spec_scope``), and the manifest adds the keys its prompt actually
+   embedded (see :func:`summary_scope`). A file is regenerated when one of
+   those keys changed, when a spec-wide field changed, or when a file it
+   ``depends_on`` was regenerated with a different interface. Everything
+   else is reused from the previous output directory.
+
+Files with no declared scope are treated as depending on the whole spec.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from pydantic import BaseModel, Field
+
+from src.code_generation.architect import EntitySpec, PageSpec, SystemSpec
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = ".ignara/build_manifest.json"
+
+# Bookkeeping written by the architect; never affects generated code
+_SPEC_METADATA_FIELDS = {"architect_version", "llm_steps_completed", "generation_time_ms"}
+# Spec fields with per-item diffing; any other changed field affects every file
+_SCOPED_FIELDS = {"entities", "pages", "api_routes"}
+
+
+def entity_scope(entity: EntitySpec) -> List[str]:
+    """Scope keys for a file generated from a single entity."""
+    return [f"entity:{entity.name.lower()}"]
+
+
+def page_scope(page: PageSpec) -> List[str]:
+    """Scope keys for a page file: the page itself plus its related entities."""
+    return [f"page:{page.route}"] + [
+        f"entity:{name.lower()}" for name in page.related_entities
+    ]
+
+
+def summary_scope(focus: Iterable[str], compact: bool = False) -> Set[str]:
+    """
+    Scope keys of a prompt embedding the spec summary.
+
+    A prompt focused on some entities (lowercase names, as weighted by
+    :func:`~src.code_generation.context_packer.target_entities`) depends on
+    those; an unfocused one (config, app shell, ...) on every entity, and on
+    the API routes unless the summary was compact.
+    """
+    focus = set(focus)
+    if focus:
+        return {f"entity:{name}" for name in focus}
+    keys = {"entities", "entity_names"}
+    if not compact:
+        keys.add("api_routes")
+    return keys
+
+
+def _related_entities(*specs: SystemSpec) -> Dict[str, Set[str]]:
+    """Lowercase entity name -> names it is related to, in either direction."""
+    related: Dict[str, Set[str]] = {}
+    for spec in specs:
+        for entity in spec.entities:
+            name = entity.name.lower()
+            for rel in entity.relationships:
+                other = rel.entity.lower()
+                related.setdefault(name, set()).add(other)
+                related.setdefault(other, set()).add(name)
+    return related
+
+
+@dataclass
+class SpecDiff:
+    """What changed between two specs, as scope keys."""
+
+    changed: Set[str] = field(default_factory=set)
+    # A spec-wide field (app name, tech stack, roles, ...) changed
+    full: bool = False
+
+    @property
+    def empty(self) -> bool:
+        return not self.full and not self.changed
+
+    def affects(self, scope: Optional[Sequence[str]]) -> bool:
+        """True if a file derived from *scope* (None = the whole spec) must be regenerated."""
+        if self.full:
+            return True
+        if scope is None:
+            return bool(self.changed)
+        return any(key in self.changed for key in scope)
+
+
+def _dump(item: BaseModel) -> Any:
+    return item.model_dump(mode="json")
+
+
+def diff_specs(old: SystemSpec, new: SystemSpec) -> SpecDiff:
+    """Diff two specs into the scope keys their generated files are keyed on."""
+    diff = SpecDiff()
+    old_data = old.model_dump(mode="json", exclude=_SPEC_METADATA_FIELDS | _SCOPED_FIELDS)
+    new_data = new.model_dump(mode="json", exclude=_SPEC_METADATA_FIELDS | _SCOPED_FIELDS)
+    changed_fields = sorted(k for k in old_data.keys() | new_data.keys() if old_data.get(k) != new_data.get(k))
+    if changed_fields:
+        logger.info("Spec-wide fields changed (%s); full regeneration", ", ".join(changed_fields))
+        diff.full = True
+
+    old_entities = {e.name.lower(): _dump(e) for e in old.entities}
+    new_entities = {e.name.lower(): _dump(e) for e in new.entities}
+    related = _related_entities(old, new)
+    for name in old_entities.keys() | new_entities.keys():
+        if old_entities.get(name) != new_entities.get(name):
+            diff.changed.update({f"entity:{name}", "entities"})
+            diff.changed.update(f"entity:{other}" for other in related.get(name, ()))
+    if list(old_entities) != list(new_entities):
+        diff.changed.add("entity_names")
+
+    old_pages = {p.route: _dump(p) for p in old.pages}
+    new_pages = {p.route: _dump(p) for p in new.pages}
+    for route in old_pages.keys() | new_pages.keys():
+        if old_pages.get(route) != new_pages.get(route):
+            diff.changed.update({f"page:{route}", "pages"})
+    if list(old_pages) != list(new_pages):
+        diff.changed.add("page_routes")
+
+    # Routes are rendered into the CRUD/router prompts of the entity they
+    # mention (same matching as _build_crud_prompt)
+    old_routes = {(r.method, r.path): _dump(r) for r in old.api_routes}
+    new_routes = {(r.method, r.path): _dump(r) for r in new.api_routes}
+    entity_names = old_entities.keys() | new_entities.keys()
+    for key in old_routes.keys() | new_routes.keys():
+        if old_routes.get(key) == new_routes.get(key):
+            continue
+        diff.changed.add("api_routes")
+        route = new_routes.get(key) or old_routes[key]
+        tags = [t.lower() for t in route.get("tags") or []]
+        for name in entity_names:
+            if name in route["path"].lower() or name in tags:
+                diff.changed.add(f"entity:{name}")
+    return diff
+
+
+class BuildManifest(BaseModel):
+    """What a finished build was generated from, for the next incremental build."""
+
+    spec: SystemSpec
+    theme: str = "Modern"
+    customization: Dict[str, Any] = Field(default_factory=dict)
+    # relative path -> interface summary, for every successfully generated file
+    interfaces: Dict[str, str] = Field(default_factory=dict)
+    # relative path -> scope keys of the spec context its prompt embedded
+    scopes: Dict[str, List[str]] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, output_dir: Path) -> Optional["BuildManifest"]:
+        """Read the manifest of a previous build, or None if there isn't a usable one."""
+        path = Path(output_dir) / MANIFEST_PATH
+        try:
+            return cls.model_validate_json(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable build manifest %s: %s", path, exc)
+            return None
+
+    def save(self, output_dir: Path) -> None:
+        """Write the manifest atomically into *output_dir*."""
+        path = Path(output_dir) / MANIFEST_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.model_dump(mode="json"), indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+@dataclass
+class IncrementalState:
+    """Per-build bookkeeping for an incremental run."""
+
+    previous: BuildManifest
+    previous_dir: Path
+    diff: SpecDiff
+    # Regenerated files whose interface differs from the previous build
+    changed_interfaces: Set[str] = field(default_factory=set)
@@ -0,0 +1,376 @@
+"""
+Durable, Bounded Job Registry for the v2 Generation API.
+
+The v2 routes used to keep every :class:`~src.code_generation.routes.JobRecord`
+(with its full ``PipelineResult``) in a plain dict: unbounded, lost on
+restart and invisible to other workers. :class:`JobStore` keeps the same
+mapping interface (``get``, ``[]``, ``in``, ``values``) on top of two tiers:
+
+- a small in-memory LRU of hot records. Jobs this worker is running stay
+  there (their WebSocket queue lives in memory); other records are dropped
+  least recently used first once ``max_hot`` is exceeded. A hot record of an
+  unfinished job run by another worker is re-read from the backend when it
+  is older than ``refresh_seconds``, so its progress and completion show up.
+- a persistent :class:`JobBackend` holding every job as JSON. The default is
+  :class:`SQLiteJobBackend`; another database (e.g. Postgres shared by all
+  workers) plugs in by implementing the same five methods.
+
+Finished jobs are deleted from the backend ``ttl_seconds`` after they
+complete, swept at most every ``sweep_interval_seconds`` on writes. The same
+sweep marks jobs failed when they have not been saved for ``stale_seconds``
+while unfinished (their worker died). Memory per worker is therefore bounded
+by ``max_hot`` plus the jobs it is running.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterator, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_DB = "ignara_jobs.db"
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+STALE_JOB_ERROR = "Job abandoned: its worker stopped before it finished"
+
+
+class JobBackend(ABC):
+    """Persistent tier of :class:`JobStore`: job dicts keyed by job id."""
+
+    @abstractmethod
+    def save(self, job_id: str, status: str, finished_at: Optional[float], data: Dict[str, Any]) -> None:
+        """Insert or replace a job; *finished_at* is a Unix time once it is terminal."""
+
+    @abstractmethod
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The stored dict of *job_id*, or None."""
+
+    @abstractmethod
+    def delete(self, job_id: str) -> None:
+        """Drop *job_id* if present."""
+
+    @abstractmethod
+    def iter_jobs(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ``(job_id, data)`` for every stored job, newest first."""
+
+    @abstractmethod
+    def evict_finished(self, before: float) -> int:
+        """Delete jobs that finished before the Unix time *before*; return how many."""
+
+    @abstractmethod
+    def fail_stale(self, before: float, error: str, keep: FrozenSet[str] = frozenset()) -> int:
+        """
+        Mark unfinished jobs last saved before *before* as failed with *error*.
+
+        Jobs in *keep* are left alone. Returns how many were marked.
+        """
+
+    def close(self) -> None:
+        """Release connections."""
+
+
+class SQLiteJobBackend(JobBackend):
+    """Jobs in a local SQLite database (WAL mode, one connection per thread)."""
+
+    def __init__(self, db_path: os.PathLike = DEFAULT_JOB_DB) -> None:
+        self._db_path = Path(db_path)
+        self._local = threading.local()
+        self._initialised = False
+        self._init_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        # Connect lazily so importing the routes doesn't create the database
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self._db_path), timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with self._init_lock:
+            if not self._initialised:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS v2_jobs (
+                        job_id       TEXT PRIMARY KEY,
+                        status       TEXT NOT NULL,
+                        created_at   REAL NOT NULL,
+                        finished_at  REAL,
+                        updated_at   REAL,
+                        data         TEXT NOT NULL
+                    )
+                    """
+                )
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(v2_jobs)")}
+                if "updated_at" not in columns:
+                    conn.execute("ALTER TABLE v2_jobs ADD COLUMN updated_at REAL")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_v2_jobs_finished_at ON v2_jobs (finished_at)"
+                )
+                self._initialised = True
+        return conn
+
+    def save(self, job_id: str, status: str, finished_at: Optional[float], data: Dict[str, Any]) -> None:
+        self._conn().execute(
+            """
+            INSERT INTO v2_jobs (job_id, status, created_at, finished_at, updated_at, data)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(job_id) DO UPDATE SET
+                status = excluded.status,
+                finished_at = excluded.finished_at,
+                updated_at = excluded.updated_at,
+                data = excluded.data
+            """,
+            (job_id, status, time.time(), finished_at, time.time(), json.dumps(data)),
+        )
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT data FROM v2_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, job_id: str) -> None:
+        self._conn().execute("DELETE FROM v2_jobs WHERE job_id = ?", (job_id,))
+
+    def iter_jobs(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        cursor = self._conn().execute("SELECT job_id, data FROM v2_jobs ORDER BY created_at DESC")
+        for job_id, data in cursor:
+            yield job_id, json.loads(data)
+
+    def evict_finished(self, before: float) -> int:
+        cursor = self._conn().execute(
+            "DELETE FROM v2_jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (before,)
+        )
+        return cursor.rowcount
+
+    def fail_stale(self, before: float, error: str, keep: FrozenSet[str] = frozenset()) -> int:
+        conn = self._conn()
+        rows = conn.execute(
+            "SELECT job_id, data FROM v2_jobs WHERE finished_at IS NULL "
+            "AND COALESCE(updated_at, created_at) < ?",
+            (before,),
+        ).fetchall()
+        now = time.time()
+        marked = 0
+        for job_id, raw in rows:
+            if job_id in keep:
+                continue
+            data = json.loads(raw)
+            data.update(
+                status="failed", error=error,
+                completed_at=datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            )
+            # The finished_at guard skips jobs another worker finished meanwhile
+            cursor = conn.execute(
+                "UPDATE v2_jobs SET status = 'failed', finished_at = ?, updated_at = ?, data = ? "
+                "WHERE job_id = ? AND finished_at IS NULL",
+                (now, now, json.dumps(data), job_id),
+            )
+            marked += cursor.rowcount
+        return marked
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class JobStore:
+    """
+    Mapping of job id to job record, backed by a :class:`JobBackend`.
+
+    Records must provide ``job_id``, ``status``, ``completed_at`` and
+    ``to_dict()``; *decode* rebuilds one from such a dict. Mutating a record
+    does not persist it: call :meth:`save` after each state change. Saving an
+    unfinished job marks it as run by this worker until it is saved finished.
+    """
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        decode: Callable[[Dict[str, Any]], Any],
+        max_hot: int = 128,
+        ttl_seconds: float = 24 * 3600,
+        sweep_interval_seconds: float = 300.0,
+        refresh_seconds: float = 2.0,
+        stale_seconds: float = 2 * 3600,
+    ) -> None:
+        self.backend = backend
+        self._decode = decode
+        self.max_hot = max_hot
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.refresh_seconds = refresh_seconds
+        self.stale_seconds = stale_seconds
+        self._hot: "OrderedDict[str, Any]" = OrderedDict()
+        # When each hot record was read from the backend
+        self._loaded_at: Dict[str, float] = {}
+        # Unfinished jobs this worker is running (and saving)
+        self._owned: Set[str] = set()
+        self._lock = threading.Lock()
+        # Sweep on the first save, so jobs abandoned by a crashed worker are failed at startup
+        self._last_sweep = time.monotonic() - sweep_interval_seconds
+
+    # -- mapping interface ------------------------------------------------
+
+    def get(self, job_id: str, default: Any = None) -> Any:
+        """The record of *job_id* (from memory, else the backend), or *default*."""
+        with self._lock:
+            job = self._hot.get(job_id)
+            if job is not None:
+                self._hot.move_to_end(job_id)
+                if (
+                    job_id in self._owned
+                    or job.status in TERMINAL_STATUSES
+                    or time.monotonic() - self._loaded_at.get(job_id, 0.0) < self.refresh_seconds
+                ):
+                    return job
+        # Not hot, or another worker's unfinished job that may have moved on
+        try:
+            data = self.backend.load(job_id)
+        except Exception as exc:
+            logger.warning("Job store lookup of %s failed: %s", job_id, exc)
+            return job if job is not None else default
+        if data is None:
+            with self._lock:
+                self._forget(job_id)
+            return default
+        job = self._decode(data)
+        self._remember(job, loaded=True)
+        return job
+
+    def __getitem__(self, job_id: str) -> Any:
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        return job
+
+    def __setitem__(self, job_id: str, job: Any) -> None:
+        self.save(job)
+
+    def __delitem__(self, job_id: str) -> None:
+        with self._lock:
+            self._forget(job_id)
+        self.backend.delete(job_id)
+
+    def __contains__(self, job_id: object) -> bool:
+        return isinstance(job_id, str) and self.get(job_id) is not None
+
+    def values(self) -> Iterator[Any]:
+        """Every job: hot records first, then stored ones (decoded one at a time)."""
+        with self._lock:
+            hot = list(self._hot.values())
+        yield from hot
+        seen = {job.job_id for job in hot}
+        for job_id, data in self.backend.iter_jobs():
+            if job_id not in seen:
+                yield self._decode(data)
+
+    # -- persistence --------------------------------------------------------
+
+    def save(self, job: Any) -> None:
+        """Persist *job*'s current state and keep it hot."""
+        finished_at = None
+        with self._lock:
+            if job.status in TERMINAL_STATUSES:
+                finished_at = job.completed_at.timestamp() if job.completed_at else time.time()
+                self._owned.discard(job.job_id)
+            else:
+                self._owned.add(job.job_id)
+        self._remember(job)
+        try:
+            self.backend.save(job.job_id, job.status, finished_at, job.to_dict())
+        except Exception as exc:
+            logger.warning("Could not persist job %s: %s", job.job_id, exc)
+        self._maybe_sweep()
+
+    def _remember(self, job: Any, loaded: bool = False) -> None:
+        """Put *job* in the hot LRU, dropping least recently used records not run here."""
+        with self._lock:
+            self._hot[job.job_id] = job
+            self._hot.move_to_end(job.job_id)
+            if loaded:
+                self._loaded_at[job.job_id] = time.monotonic()
+            excess = len(self._hot) - self.max_hot
+            if excess <= 0:
+                return
+            # Jobs running here stay: their progress channel only exists in memory
+            for job_id in [j for j in self._hot if j not in self._owned]:
+                if excess <= 0:
+                    break
+                self._forget(job_id)
+                excess -= 1
+
+    def _forget(self, job_id: str) -> None:
+        """Drop *job_id* from memory; call with the lock held."""
+        self._hot.pop(job_id, None)
+        self._loaded_at.pop(job_id, None)
+        self._owned.discard(job_id)
+
+    def _maybe_sweep(self) -> None:
+        if time.monotonic() - self._last_sweep >= self.sweep_interval_seconds:
+            self.evict_expired()
+
+    def evict_expired(self) -> int:
+        """
+        Delete finished jobs older than ``ttl_seconds`` from both tiers.
+
+        Also fails stale unfinished jobs (see the module docstring). Returns
+        how many jobs were deleted.
+        """
+        self._last_sweep = time.monotonic()
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            for job_id in [
+                j for j, rec in self._hot.items()
+                if rec.status in TERMINAL_STATUSES
+                and rec.completed_at is not None and rec.completed_at.timestamp() < cutoff
+            ]:
+                self._forget(job_id)
+            owned = frozenset(self._owned)
+        try:
+            evicted = self.backend.evict_finished(cutoff)
+            abandoned = self.backend.fail_stale(time.time() - self.stale_seconds, STALE_JOB_ERROR, keep=owned)
+        except Exception as exc:
+            logger.warning("Job store TTL sweep failed: %s", exc)
+            return 0
+        if evicted:
+            logger.info("Evicted %d expired generation jobs", evicted)
+        if abandoned:
+            logger.warning("Marked %d abandoned generation jobs as failed", abandoned)
+        return evicted
+
+
+def job_store_from_env(decode: Callable[[Dict[str, Any]], Any]) -> JobStore:
+    """
+    A :class:`JobStore` on SQLite, configured by the environment.
+
+    ``CODEGEN_JOB_DB`` is the database path (default ``ignara_jobs.db``),
+    ``CODEGEN_JOB_TTL_SECONDS`` how long finished jobs are kept (default one
+    day), ``CODEGEN_JOB_HOT_SIZE`` the in-memory LRU size (default 128) and
+    ``CODEGEN_JOB_STALE_SECONDS`` how long an unfinished job may go unsaved
+    before it is failed (default two hours).
+    """
+    return JobStore(
+        SQLiteJobBackend(os.getenv("CODEGEN_JOB_DB", DEFAULT_JOB_DB)),
+        decode,
+        max_hot=int(os.getenv("CODEGEN_JOB_HOT_SIZE", "128")),
+        ttl_seconds=float(os.getenv("CODEGEN_JOB_TTL_SECONDS", str(24 * 3600))),
+        stale_seconds=float(os.getenv("CODEGEN_JOB_STALE_SECONDS", str(2 * 3600))),
+    )
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Inverse of ``datetime.isoformat()`` for stored job timestamps."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
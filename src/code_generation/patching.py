@@ -0,0 +1,186 @@
+"""
+Patch-Based Healing for Generated Files.
+
+When a generated file fails validation, regenerating it in full costs as many
+output tokens as the first attempt, while most syntax errors are a one- to
+three-line fix. :meth:`CodeGeneratorV2._llm_generate_with_heal
+<src.code_generation.engine_v2.CodeGeneratorV2._llm_generate_with_heal>`
+first asks the model for a minimal edit instead:
+
+- :func:`build_patch_prompt` shows the broken file with line numbers (or a
+  window around the error line for long files) and the validation error;
+- the model answers with a unified diff, or with line-range replacements::
+
+      REPLACE LINES 12-14
+      <new lines>
+      END REPLACE
+
+- :func:`apply_patch` applies it locally. Diff hunks are located by their
+  context (nearest match to the stated line number, trailing whitespace
+  ignored), so slightly-off line numbers still apply.
+
+Anything that does not apply cleanly returns None and the heal loop falls
+back to full regeneration.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+PATCH_SYSTEM_PROMPT = """You repair syntax errors in generated source files.
+Reply with ONLY the minimal edit that fixes the reported error, as a unified diff
+(hunk headers "@@ -start,count +start,count @@", context lines prefixed with a space,
+removed lines with "-", added lines with "+"). Line numbers refer to the numbered
+file you are shown; do not include the line-number prefixes in the diff.
+Alternatively, reply with one or more blocks of the form:
+REPLACE LINES <first>-<last>
+<replacement lines>
+END REPLACE
+Do not output the whole file, explanations, or markdown fences."""
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_REPLACE_HEADER = re.compile(r"^REPLACE LINES (\d+)\s*-\s*(\d+)\s*$")
+_REPLACE_END = "END REPLACE"
+_ERROR_LINE = re.compile(r"\bline (\d+)")
+
+
+def error_line(error: str) -> Optional[int]:
+    """Line number mentioned in a validation error, if any."""
+    match = _ERROR_LINE.search(error)
+    return int(match.group(1)) if match else None
+
+
+def build_patch_prompt(
+    relative_path: str, source: str, error: str, max_lines: int = 600, window: int = 40
+) -> Optional[str]:
+    """
+    Repair prompt for *source*, or None if the file is too long to patch.
+
+    Files up to *max_lines* are shown in full; longer ones only as a window
+    of *window* lines either side of the error line (None without one).
+    """
+    lines = source.splitlines()
+    first, last = 1, len(lines)
+    if len(lines) > max_lines:
+        line = error_line(error)
+        if line is None:
+            return None
+        first, last = max(1, line - window), min(len(lines), line + window)
+    width = len(str(last))
+    numbered = "\n".join(
+        f"{n:>{width}} | {lines[n - 1]}" for n in range(first, last + 1)
+    )
+    shown = "" if (first, last) == (1, len(lines)) else f" (lines {first}-{last} of {len(lines)})"
+    return (
+        f"File: {relative_path}{shown}\n"
+        f"Validation error: {error}\n\n"
+        f"{numbered}\n\n"
+        f"Reply with the minimal patch that fixes this error."
+    )
+
+
+def _find_block(lines: List[str], block: List[str], expected: int, start: int) -> Optional[int]:
+    """Index of *block* in *lines* at or after *start*, nearest to *expected*."""
+    wanted = [b.rstrip() for b in block]
+    last = len(lines) - len(block)
+    if last < start:
+        return None
+    expected = min(max(expected, start), last)
+    for distance in range(0, max(expected - start, last - expected) + 1):
+        for pos in (expected - distance, expected + distance):
+            if start <= pos <= last and [l.rstrip() for l in lines[pos:pos + len(block)]] == wanted:
+                return pos
+    return None
+
+
+def _parse_hunks(patch: str) -> List[Tuple[int, List[str], List[str]]]:
+    """(old_start, old_lines, new_lines) per hunk of a unified diff."""
+    hunks: List[Tuple[int, List[str], List[str]]] = []
+    current: Optional[Tuple[int, List[str], List[str]]] = None
+    for raw in patch.splitlines():
+        header = _HUNK_HEADER.match(raw)
+        if header:
+            current = (int(header.group(1)), [], [])
+            hunks.append(current)
+            continue
+        # File headers come before the first hunk; "\ No newline" markers carry no content
+        if current is None or raw.startswith("\\"):
+            continue
+        _, old, new = current
+        if raw.startswith("-"):
+            old.append(raw[1:])
+        elif raw.startswith("+"):
+            new.append(raw[1:])
+        else:
+            # Context line; models often drop the leading space on blank lines
+            text = raw[1:] if raw.startswith(" ") else raw
+            old.append(text)
+            new.append(text)
+    return hunks
+
+
+def _apply_unified(lines: List[str], patch: str) -> Optional[List[str]]:
+    hunks = _parse_hunks(patch)
+    if not hunks:
+        return None
+    result = list(lines)
+    # Shift of later hunks: lines added so far plus any drift in where hunks matched
+    offset = 0
+    floor = 0
+    for old_start, old, new in hunks:
+        if not old:
+            # Pure insertion after line old_start
+            pos = min(max(old_start + offset, floor), len(result))
+        else:
+            pos = _find_block(result, old, old_start - 1 + offset, floor)
+            if pos is None:
+                return None
+        offset = pos - (old_start if not old else old_start - 1) + len(new) - len(old)
+        result[pos:pos + len(old)] = new
+        floor = pos + len(new)
+    return result
+
+
+def _apply_replacements(lines: List[str], patch: str) -> Optional[List[str]]:
+    edits: List[Tuple[int, int, List[str]]] = []
+    current: Optional[List[str]] = None
+    for raw in patch.splitlines():
+        header = _REPLACE_HEADER.match(raw.strip()) if current is None else None
+        if header:
+            current = []
+            edits.append((int(header.group(1)), int(header.group(2)), current))
+        elif current is not None:
+            if raw.strip() == _REPLACE_END:
+                current = None
+            else:
+                current.append(raw)
+    if not edits or current is not None:
+        return None
+    edits.sort(key=lambda e: e[0])
+    previous_last = 0
+    for first, last, _ in edits:
+        if first < 1 or last < first - 1 or last > len(lines) or first <= previous_last:
+            return None
+        previous_last = last
+    result = list(lines)
+    for first, last, new in reversed(edits):
+        result[first - 1:last] = new
+    return result
+
+
+def apply_patch(source: str, patch: str) -> Optional[str]:
+    """
+    Apply a model-written *patch* to *source*.
+
+    Accepts a unified diff or ``REPLACE LINES`` blocks. Returns the patched
+    source, or None if the patch is malformed, does not match, or changes
+    nothing.
+    """
+    lines = source.splitlines()
+    if re.search(r"(?m)^@@ -\d", patch):
+        patched = _apply_unified(lines, patch)
+    else:
+        patched = _apply_replacements(lines, patch)
+    if patched is None or patched == lines:
+        return None
+    text = "\n".join(patched)
+    return text + "\n" if source.endswith("\n") else text
@@ -22,9 +22,16 @@ from typing import Any, AsyncGenerator, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 from src.code_generation.architect import SystemArchitect, SystemSpec
+from src.code_generation.checkpoint import BuildCheckpoint
 from src.code_generation.consistency import ConsistencyChecker, ConsistencyResult
 from src.code_generation.critic_integration import CriticPanel, CriticReport
-from src.code_generation.engine_v2 import CodeGeneratorV2, GenerationResult
+from src.code_generation.engine_v2 import (
+    CodeGeneratorV2,
+    GenerationResult,
+    ProgressEvent,
+    drain_progress,
+)
+from src.code_generation.project_index import ProjectIndex
 from src.code_generation.quality import AutoFixer, CodeQualityPipeline, QualityReport
 
 logger = logging.getLogger(__name__)
@@ -89,7 +96,7 @@ class GenerationPipeline:
         self.architect = SystemArchitect()
         self.generator = CodeGeneratorV2()
         self.quality = CodeQualityPipeline()
-        self.fixer = AutoFixer()
+        self.fixer = AutoFixer(quality=self.quality)
         self.critic_panel = CriticPanel()
         self.consistency = ConsistencyChecker()
         self.output_base_dir = Path(output_base_dir)
@@ -106,6 +113,9 @@ class GenerationPipeline:
         theme: str = "Modern",
         max_fix_rounds: int = 2,
         customization: Optional[Dict[str, Any]] = None,
+        spec: Optional[SystemSpec] = None,
+        incremental: bool = False,
+        resume: bool = False,
     ) -> PipelineResult:
         """Run the full generation pipeline.
 
@@ -115,6 +125,12 @@ class GenerationPipeline:
             features:         Optional feature list forwarded to the architect.
             theme:            Visual theme hint passed to the code generator.
             max_fix_rounds:   Maximum auto-fix iterations (0 to skip fixing).
+            spec:             Use this (e.g. edited) spec instead of running the architect.
+            incremental:      Regenerate only the files affected by the changes since
+                              the previous build in the same output directory.
+            resume:           Continue an interrupted build in the same output directory
+                              from its checkpoint: reuse the checkpointed spec (unless
+                              *spec* is given) and skip files that already finished.
 
         Returns:
             A :class:`PipelineResult` containing the spec, generated files,
@@ -136,17 +152,25 @@ class GenerationPipeline:
         # ----------------------------------------------------------------
         # Step 1: Architecture Design
         # ----------------------------------------------------------------
-        logger.info("[pipeline] Step 1/4 — Architecture design")
-        try:
-            spec: SystemSpec = await self.architect.design(
-                idea_name=idea_name,
-                idea_description=idea_description,
-                features=features,
-                customization=customization,
-            )
-        except Exception as exc:
-            logger.exception("[pipeline] Architect failed: %s", exc)
-            raise RuntimeError(f"Architecture design failed: {exc}") from exc
+        checkpoint = self._load_checkpoint(output_dir, theme, customization) if resume else None
+        if spec is not None:
+            logger.info("[pipeline] Step 1/4 — Using the supplied spec")
+        elif checkpoint is not None:
+            logger.info("[pipeline] Step 1/4 — Resuming with the checkpointed spec")
+            spec = checkpoint.spec
+        else:
+            logger.info("[pipeline] Step 1/4 — Architecture design")
+            try:
+                spec = await self.architect.design(
+                    idea_name=idea_name,
+                    idea_description=idea_description,
+                    features=features,
+                    customization=customization,
+                )
+            except Exception as exc:
+                logger.exception("[pipeline] Architect failed: %s", exc)
+                raise RuntimeError(f"Architecture design failed: {exc}") from exc
+        self._checkpoint_spec(output_dir, spec, theme, customization, checkpoint)
 
         # ----------------------------------------------------------------
         # Step 2: Code Generation
@@ -158,6 +182,8 @@ class GenerationPipeline:
                 output_dir=str(output_dir),
                 theme=theme,
                 customization=customization,
+                incremental=incremental,
+                resume=resume,
             )
         except Exception as exc:
             logger.exception("[pipeline] Generator failed: %s", exc)
@@ -168,8 +194,10 @@ class GenerationPipeline:
         # ----------------------------------------------------------------
         logger.info("[pipeline] Step 2.5/4 — Consistency pass")
         consistency_fixes_run = 0
+        # One walk of the output tree, shared by every post-generation pass
+        index = await asyncio.to_thread(ProjectIndex.build, output_dir)
         try:
-            consistency_result: ConsistencyResult = self.consistency.run(str(output_dir))
+            consistency_result: ConsistencyResult = self.consistency.run(str(output_dir), index=index)
             consistency_fixes_run = consistency_result.total_fixes
             if consistency_result.total_fixes > 0:
                 logger.info("[pipeline] Consistency pass: %d fix(es) applied", consistency_result.total_fixes)
@@ -186,6 +214,7 @@ class GenerationPipeline:
             quality_report: QualityReport = await self.quality.validate(
                 output_dir=str(output_dir),
                 spec=spec.model_dump(),
+                index=index,
             )
         except Exception as exc:
             logger.exception("[pipeline] Quality validation failed: %s", exc)
@@ -200,6 +229,7 @@ class GenerationPipeline:
             critic_report = await self.critic_panel.run(
                 output_dir=str(output_dir),
                 spec=spec,
+                index=index,
             )
             critic_report_dict = critic_report.to_dict()
             logger.info(
@@ -229,6 +259,7 @@ class GenerationPipeline:
                 fixes_in_round, quality_report = await self.fixer.fix(
                     output_dir=str(output_dir),
                     report=quality_report,
+                    index=index,
                 )
             except Exception as exc:
                 logger.warning("[pipeline] AutoFixer round %d failed: %s", round_num, exc)
@@ -267,6 +298,7 @@ class GenerationPipeline:
             customization=customization or None,
         )
 
+        BuildCheckpoint.clear(output_dir)
         logger.info(
             "[pipeline] Done in %.1fs — status=%s, files=%d, score=%d/100",
             total_time,
@@ -284,6 +316,9 @@ class GenerationPipeline:
         theme: str = "Modern",
         max_fix_rounds: int = 2,
         customization: Optional[Dict[str, Any]] = None,
+        spec: Optional[SystemSpec] = None,
+        incremental: bool = False,
+        resume: bool = False,
     ) -> AsyncGenerator[PipelineProgress, None]:
         """Stream pipeline progress for real-time UI updates.
 
@@ -291,7 +326,8 @@ class GenerationPipeline:
         The final event has ``phase="complete"`` and ``progress=100``.
         The final event also carries a ``result`` attribute (a full
         :class:`PipelineResult`) so callers can use it directly without
-        running the pipeline a second time.
+        running the pipeline a second time. *spec*, *incremental* and
+        *resume* work as in :meth:`run`.
 
         Usage::
 
@@ -319,12 +355,18 @@ class GenerationPipeline:
             message=f"Analysing idea: {idea_name}",
         )
 
-        spec: SystemSpec = await self.architect.design(
-            idea_name=idea_name,
-            idea_description=idea_description,
-            features=features,
-            customization=customization,
-        )
+        checkpoint = self._load_checkpoint(output_dir, theme, customization) if resume else None
+        if spec is None and checkpoint is not None:
+            logger.info("[pipeline] Resuming with the checkpointed spec")
+            spec = checkpoint.spec
+        elif spec is None:
+            spec = await self.architect.design(
+                idea_name=idea_name,
+                idea_description=idea_description,
+                features=features,
+                customization=customization,
+            )
+        self._checkpoint_spec(output_dir, spec, theme, customization, checkpoint)
 
         entity_count = len(spec.entities) if spec.entities else 0
         route_count = len(spec.api_routes) if spec.api_routes else 0
@@ -352,12 +394,32 @@ class GenerationPipeline:
             message="LLM-powered file generation beginning",
         )
 
-        generation: GenerationResult = await self.generator.generate(
+        # Relay per-file progress (including streamed bytes for files still
+        # being written) so WebSocket clients see movement inside this phase.
+        gen_events: asyncio.Queue[ProgressEvent] = asyncio.Queue()
+        gen_task = asyncio.ensure_future(self.generator.generate(
             spec=spec,
             output_dir=str(output_dir),
             theme=theme,
             customization=customization,
-        )
+            on_progress=gen_events.put_nowait,
+            incremental=incremental,
+            resume=resume,
+        ))
+        files_done = 0
+        async for gen_event in drain_progress(gen_task, gen_events):
+            if gen_event.step == "start":
+                continue
+            if gen_event.step == "generating":
+                files_done += 1
+            yield PipelineProgress(
+                phase="generate",
+                step=gen_event.current_file or gen_event.step,
+                progress=21 + int(gen_event.percentage * 0.49),
+                message=gen_event.message,
+                files_generated=files_done,
+            )
+        generation: GenerationResult = gen_task.result()
 
         yield PipelineProgress(
             phase="generate",
@@ -379,8 +441,10 @@ class GenerationPipeline:
         )
 
         consistency_fixes = 0
+        # One walk of the output tree, shared by every post-generation pass
+        index = await asyncio.to_thread(ProjectIndex.build, output_dir)
         try:
-            consistency_result = self.consistency.run(str(output_dir))
+            consistency_result = self.consistency.run(str(output_dir), index=index)
             consistency_fixes = consistency_result.total_fixes
             if consistency_fixes > 0:
                 logger.info("[pipeline] Consistency pass: %d fix(es)", consistency_fixes)
@@ -404,6 +468,7 @@ class GenerationPipeline:
         quality_report: QualityReport = await self.quality.validate(
             output_dir=str(output_dir),
             spec=spec.model_dump(),
+            index=index,
         )
 
         yield PipelineProgress(
@@ -432,6 +497,7 @@ class GenerationPipeline:
             _cr = await self.critic_panel.run(
                 output_dir=str(output_dir),
                 spec=spec,
+                index=index,
             )
             critic_report_dict = _cr.to_dict()
             logger.info(
@@ -478,6 +544,7 @@ class GenerationPipeline:
                 fixes_in_round, quality_report = await self.fixer.fix(
                     output_dir=str(output_dir),
                     report=quality_report,
+                    index=index,
                 )
             except Exception as exc:
                 logger.warning("[pipeline] AutoFixer round %d failed: %s", round_num, exc)
@@ -526,12 +593,39 @@ class GenerationPipeline:
         )
         # Attach the result as an extra attribute so callers can grab it.
         final_event._pipeline_result = pipeline_result  # type: ignore[attr-defined]
+        BuildCheckpoint.clear(output_dir)
         yield final_event
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _load_checkpoint(
+        output_dir: Path, theme: str, customization: Dict[str, Any],
+    ) -> Optional[BuildCheckpoint]:
+        """The checkpoint of an interrupted build with the same theme and customization."""
+        checkpoint = BuildCheckpoint.load(output_dir)
+        if checkpoint is None or (checkpoint.theme, checkpoint.customization) != (theme, customization):
+            return None
+        return checkpoint
+
+    @staticmethod
+    def _checkpoint_spec(
+        output_dir: Path,
+        spec: SystemSpec,
+        theme: str,
+        customization: Dict[str, Any],
+        checkpoint: Optional[BuildCheckpoint],
+    ) -> None:
+        """Checkpoint the architect's spec, keeping a matching resumed checkpoint as is."""
+        if checkpoint is not None and checkpoint.matches(spec, theme, customization):
+            return
+        try:
+            BuildCheckpoint(spec=spec, theme=theme, customization=customization).save(output_dir)
+        except OSError as exc:
+            logger.warning("[pipeline] Could not write build checkpoint: %s", exc)
+
     def _output_dir(self, idea_name: str) -> Path:
         """Derive a safe output directory from the idea name."""
         safe_name = "".join(
@@ -0,0 +1,268 @@
+"""
+Shared in-memory index of a generated project.
+
+The post-generation passes (``ConsistencyChecker``, ``CodeQualityPipeline``,
+``CriticPanel`` and ``AutoFixer``) all look at the same files. Instead of each
+check walking the tree, reading and ``ast.parse``-ing every file again, the
+pipeline builds one :class:`ProjectIndex` per project and hands it to every
+pass:
+
+- one ``os.walk`` collects paths, stat results and content bytes;
+- each file carries its sha256 content hash;
+- text decoding and Python ASTs are computed lazily, once per content.
+
+Passes that modify files write through :meth:`ProjectIndex.write_text` so the
+index stays current; :meth:`ProjectIndex.refresh` picks up edits made behind
+its back.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Never part of the generated sources: tooling caches, build metadata
+# (.ignara: manifest and checkpoint), refinement backups
+IGNORED_DIRS = frozenset({
+    "__pycache__", ".git", "node_modules", ".next", ".venv", "venv", ".ignara", ".ignara_backups",
+})
+# Scratch files of in-flight (or interrupted) streamed writes
+IGNORED_SUFFIXES = (".partial",)
+
+
+def is_project_file(rel: str) -> bool:
+    """True if the project-relative posix path *rel* is a generated source, not build metadata."""
+    parts = rel.split("/")
+    return not rel.endswith(IGNORED_SUFFIXES) and not any(part in IGNORED_DIRS for part in parts[:-1])
+
+
+class IndexedFile:
+    """One file in a :class:`ProjectIndex`: stat, bytes, hash, lazy text and AST."""
+
+    def __init__(self, root: Path, rel: str, data: bytes, size: int, mtime_ns: int) -> None:
+        self.root = root
+        self.rel = rel
+        self.data = data
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.sha256 = hashlib.sha256(data).hexdigest()
+        self._text: Optional[str] = None
+        self._tree: Optional[ast.AST] = None
+        self._parse_error: Optional[SyntaxError] = None
+        self._parsed = False
+
+    @property
+    def path(self) -> Path:
+        return self.root / self.rel
+
+    @property
+    def name(self) -> str:
+        return self.rel.rsplit("/", 1)[-1]
+
+    @property
+    def suffix(self) -> str:
+        return Path(self.rel).suffix
+
+    @property
+    def text(self) -> str:
+        """Content decoded as UTF-8 (undecodable bytes replaced)."""
+        if self._text is None:
+            self._text = self.data.decode("utf-8", errors="replace")
+        return self._text
+
+    def _parse(self) -> None:
+        if not self._parsed:
+            try:
+                self._tree = ast.parse(self.text, filename=self.rel)
+            except SyntaxError as exc:
+                self._parse_error = exc
+            except (ValueError, RecursionError) as exc:
+                # e.g. null bytes in the source
+                self._parse_error = SyntaxError(str(exc))
+            self._parsed = True
+
+    @property
+    def tree(self) -> Optional[ast.AST]:
+        """Parsed Python AST, or None if the file doesn't parse."""
+        self._parse()
+        return self._tree
+
+    @property
+    def parse_error(self) -> Optional[SyntaxError]:
+        """The SyntaxError raised by parsing, if any."""
+        self._parse()
+        return self._parse_error
+
+    def __repr__(self) -> str:
+        return f"<IndexedFile {self.rel} {self.size}B {self.sha256[:8]}>"
+
+
+class ProjectIndex:
+    """Every file under a project root, read in a single walk."""
+
+    # Skipped during the walk
+    IGNORED_DIRS = IGNORED_DIRS
+    IGNORED_SUFFIXES = IGNORED_SUFFIXES
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._resolved_root = self.root.resolve()
+        self._files: Dict[str, IndexedFile] = {}
+        self._dirs: Set[str] = set()
+
+    @classmethod
+    def build(cls, root: os.PathLike) -> "ProjectIndex":
+        """Walk *root* once and load every file."""
+        index = cls(Path(root))
+        index._walk()
+        return index
+
+    @classmethod
+    def ensure(cls, root: os.PathLike, index: Optional["ProjectIndex"]) -> "ProjectIndex":
+        """Return *index* if given (and for *root*), else build a fresh one."""
+        if index is not None and index._resolved_root == Path(root).resolve():
+            return index
+        return cls.build(root)
+
+    def _walk(self) -> None:
+        files: Dict[str, IndexedFile] = {}
+        dirs: Set[str] = set()
+        if self.root.is_dir():
+            for dirpath, dirnames, filenames in os.walk(self.root):
+                dirnames[:] = sorted(d for d in dirnames if d not in self.IGNORED_DIRS)
+                rel_dir = Path(dirpath).relative_to(self.root).as_posix()
+                if rel_dir != ".":
+                    dirs.add(rel_dir)
+                for filename in filenames:
+                    if filename.endswith(self.IGNORED_SUFFIXES):
+                        continue
+                    rel = filename if rel_dir == "." else f"{rel_dir}/{filename}"
+                    entry = self._load(rel, self._files.get(rel))
+                    if entry is not None:
+                        files[rel] = entry
+        self._files = dict(sorted(files.items()))
+        self._dirs = dirs
+
+    def _load(self, rel: str, previous: Optional[IndexedFile] = None) -> Optional[IndexedFile]:
+        path = self.root / rel
+        try:
+            st = path.stat()
+            if (
+                previous is not None
+                and previous.size == st.st_size
+                and previous.mtime_ns == st.st_mtime_ns
+            ):
+                return previous
+            data = path.read_bytes()
+        except OSError as exc:
+            logger.debug("ProjectIndex: could not read %s: %s", path, exc)
+            return None
+        return IndexedFile(self.root, rel, data, st.st_size, st.st_mtime_ns)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def rel(self, path: os.PathLike) -> str:
+        """
+        Project-relative posix path for *path*.
+
+        Accepts paths built from the root (``root / "backend"``), absolute
+        paths, or paths that are already project-relative. Raises
+        ``ValueError`` for absolute paths outside the project.
+        """
+        p = Path(path)
+        for base in (self.root, self._resolved_root):
+            try:
+                return p.relative_to(base).as_posix()
+            except ValueError:
+                continue
+        if p.is_absolute():
+            return p.resolve().relative_to(self._resolved_root).as_posix()
+        return p.as_posix()
+
+    def get(self, path: os.PathLike) -> Optional[IndexedFile]:
+        """The indexed file at *path*, or None."""
+        return self._files.get(self.rel(path))
+
+    def exists(self, path: os.PathLike) -> bool:
+        rel = self.rel(path)
+        return rel in self._files or self.is_dir(rel)
+
+    def is_file(self, path: os.PathLike) -> bool:
+        return self.rel(path) in self._files
+
+    def is_dir(self, path: os.PathLike) -> bool:
+        rel = self.rel(path)
+        return rel in ("", ".") or rel in self._dirs
+
+    def files(
+        self,
+        suffixes: Optional[Iterable[str]] = None,
+        under: Optional[os.PathLike] = None,
+        recursive: bool = True,
+    ) -> List[IndexedFile]:
+        """Indexed files in path order, optionally filtered by suffix and directory."""
+        wanted: Optional[Tuple[str, ...]] = tuple(suffixes) if suffixes is not None else None
+        prefix = ""
+        if under is not None:
+            prefix = self.rel(under)
+            prefix = "" if prefix in ("", ".") else prefix + "/"
+        result = []
+        for rel, entry in self._files.items():
+            if prefix and not rel.startswith(prefix):
+                continue
+            if not recursive and "/" in rel[len(prefix):]:
+                continue
+            if wanted is not None and not rel.endswith(wanted):
+                continue
+            result.append(entry)
+        return result
+
+    def dirs(self, under: Optional[os.PathLike] = None) -> List[str]:
+        """Relative paths of indexed directories, optionally only those below *under*."""
+        prefix = ""
+        if under is not None:
+            prefix = self.rel(under)
+            prefix = "" if prefix in ("", ".") else prefix + "/"
+        return sorted(d for d in self._dirs if d.startswith(prefix))
+
+    def __iter__(self):
+        return iter(self._files.values())
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def write_text(self, path: os.PathLike, text: str) -> IndexedFile:
+        """Write *text* to *path* on disk and update the index entry."""
+        rel = self.rel(path)
+        dest = self.root / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_text(text, encoding="utf-8")
+        parent = Path(rel).parent
+        while parent.as_posix() != ".":
+            self._dirs.add(parent.as_posix())
+            parent = parent.parent
+        entry = self._load(rel)
+        if entry is None:
+            raise OSError(f"Could not re-read {dest} after writing it")
+        self._files[rel] = entry
+        self._files = dict(sorted(self._files.items()))
+        return entry
+
+    def refresh(self) -> Set[str]:
+        """Re-walk the tree (re-reading only files whose size/mtime changed); returns changed paths."""
+        before = {rel: entry.sha256 for rel, entry in self._files.items()}
+        self._walk()
+        after = {rel: entry.sha256 for rel, entry in self._files.items()}
+        return {rel for rel in before.keys() | after.keys() if before.get(rel) != after.get(rel)}
@@ -9,18 +9,29 @@ from __future__ import annotations
 
 import ast
 import asyncio
+import fnmatch
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
 import re
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
 
 from pydantic import BaseModel, Field, model_validator
 
+from src.code_generation.project_index import IndexedFile, ProjectIndex
 from src.llm.client import get_llm_client
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 # ---------------------------------------------------------------------------
 # Standard-library module names (used for import classification)
 # ---------------------------------------------------------------------------
@@ -133,6 +144,479 @@ def _build_summary(report: QualityReport) -> str:
     )
 
 
+# ---------------------------------------------------------------------------
+# Validation cache
+# ---------------------------------------------------------------------------
+
+
+def _digest(parts: Iterable[str]) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ValidationCache:
+    """
+    Memoised check results, so re-validating a project only re-runs the
+    checks whose inputs changed.
+
+    - Per-file results are keyed by ``(check, path, sha256, context)``;
+      *context* covers any project-wide input the result depends on (e.g.
+      the set of local module names for the import check).
+    - Cross-file results are keyed by ``(check, fingerprint)``, where the
+      fingerprint hashes the project layout plus the contents of the files
+      that check reads.
+
+    Bounded LRU; shared between the checks' worker threads.
+    """
+
+    def __init__(self, max_entries: int = 50_000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+        # Stored by put_file(); the first lookup isn't counted as a hit
+        self._primed: set[Tuple[str, ...]] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _file_key(check: str, entry: IndexedFile, context: str) -> Tuple[str, ...]:
+        return ("file", check, entry.rel, entry.sha256, context)
+
+    def _store(self, key: Tuple[str, ...], value: Any) -> None:
+        # Caller holds the lock
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._primed.discard(evicted)
+
+    def _get_or_compute(self, key: Tuple[str, ...], compute: Callable[[], _T]) -> _T:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                if key in self._primed:
+                    self._primed.discard(key)
+                else:
+                    self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._store(key, value)
+        return value
+
+    def has_file(self, check: str, entry: IndexedFile, context: str = "") -> bool:
+        """True if the result of *check* for *entry*'s content is cached."""
+        with self._lock:
+            return self._file_key(check, entry, context) in self._entries
+
+    def put_file(self, check: str, entry: IndexedFile, value: Any, context: str = "") -> None:
+        """Store a per-file result computed elsewhere (e.g. in a worker process)."""
+        key = self._file_key(check, entry, context)
+        with self._lock:
+            self.misses += 1
+            self._store(key, value)
+            self._primed.add(key)
+
+    def per_file(
+        self,
+        check: str,
+        entry: IndexedFile,
+        compute: Callable[[IndexedFile], _T],
+        context: str = "",
+    ) -> _T:
+        """Result of *check* for *entry*, computed only for content not seen before."""
+        return self._get_or_compute(
+            self._file_key(check, entry, context), lambda: compute(entry)
+        )
+
+    def cross_file(self, check: str, fingerprint: str, compute: Callable[[], _T]) -> _T:
+        """Result of a cross-file *check*, recomputed only when its *fingerprint* changes."""
+        return self._get_or_compute(("cross", check, fingerprint), compute)
+
+    def stats(self) -> Dict[str, int]:
+        """Lookup counters and current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+def _layout_fingerprint(
+    root: Path,
+    index: ProjectIndex,
+    contents: Iterable[IndexedFile] = (),
+    extra: str = "",
+) -> str:
+    """Hash of the project's paths plus the contents of *contents* (and *extra*)."""
+    parts = [str(root), extra]
+    parts.extend(f.rel for f in index)
+    parts.extend(index.dirs())
+    parts.extend(f"{f.rel}:{f.sha256}" for f in contents)
+    return _digest(parts)
+
+
+# ---------------------------------------------------------------------------
+# Per-file checks
+#
+# Each takes one indexed file and returns its QualityChecks; the results are
+# memoised by ValidationCache under the file's content hash.
+# ---------------------------------------------------------------------------
+
+
+class _SecurityFacts(NamedTuple):
+    """Per-file inputs to the project-wide CORS/JWT security checks."""
+
+    cors: bool
+    jwt_secret_from_env: bool
+    jwt_algorithm: bool
+
+
+def _python_syntax_checks(py_file: IndexedFile) -> List[QualityCheck]:
+    rel = py_file.rel
+    error = py_file.parse_error
+    if error is None:
+        return [
+            QualityCheck(
+                name=f"python_syntax:{rel}",
+                category="syntax",
+                passed=True,
+                severity="info",
+                message=f"Syntax OK: {rel}",
+                file_path=rel,
+            )
+        ]
+    return [
+        QualityCheck(
+            name=f"python_syntax:{rel}",
+            category="syntax",
+            passed=False,
+            severity="error",
+            message=f"Syntax error in {rel}: {error.msg}",
+            file_path=rel,
+            line_number=error.lineno,
+            fix_suggestion="Review and correct the syntax error at the indicated line.",
+        )
+    ]
+
+
+def _typescript_checks(ts_file: IndexedFile) -> List[QualityCheck]:
+    checks: List[QualityCheck] = []
+    rel = ts_file.rel
+    source = ts_file.text
+
+    # Check brace/bracket balance
+    open_braces = source.count("{") - source.count("}")
+    open_brackets = source.count("[") - source.count("]")
+    open_parens = source.count("(") - source.count(")")
+
+    if open_braces != 0:
+        checks.append(
+            QualityCheck(
+                name=f"ts_braces:{rel}",
+                category="syntax",
+                passed=False,
+                severity="error",
+                message=(
+                    f"Unbalanced curly braces in {rel} "
+                    f"(net: {open_braces:+d})"
+                ),
+                file_path=rel,
+                fix_suggestion="Ensure every opening '{' has a matching closing '}'.",
+            )
+        )
+    elif open_brackets != 0:
+        checks.append(
+            QualityCheck(
+                name=f"ts_brackets:{rel}",
+                category="syntax",
+                passed=False,
+                severity="warning",
+                message=(
+                    f"Unbalanced square brackets in {rel} "
+                    f"(net: {open_brackets:+d})"
+                ),
+                file_path=rel,
+            )
+        )
+    elif open_parens != 0:
+        checks.append(
+            QualityCheck(
+                name=f"ts_parens:{rel}",
+                category="syntax",
+                passed=False,
+                severity="warning",
+                message=(
+                    f"Unbalanced parentheses in {rel} "
+                    f"(net: {open_parens:+d})"
+                ),
+                file_path=rel,
+            )
+        )
+    else:
+        checks.append(
+            QualityCheck(
+                name=f"ts_syntax:{rel}",
+                category="syntax",
+                passed=True,
+                severity="info",
+                message=f"Basic syntax OK: {rel}",
+                file_path=rel,
+            )
+        )
+
+    # Check import statements are well-formed
+    bad_imports = re.findall(
+        r'^import\s+(?!.*from\s+["\'])(?!.*\*\s+as\s+)(?!type\s+)(\w+)',
+        source,
+        re.MULTILINE,
+    )
+    for imp in bad_imports:
+        checks.append(
+            QualityCheck(
+                name=f"ts_import:{rel}:{imp}",
+                category="imports",
+                passed=False,
+                severity="warning",
+                message=f"Possibly malformed import '{imp}' in {rel}",
+                file_path=rel,
+                fix_suggestion=f"Verify: import {{ {imp} }} from '...' or import {imp} from '...'",
+            )
+        )
+
+    return checks
+
+
+def _import_checks(py_file: IndexedFile, local_names: set[str]) -> List[QualityCheck]:
+    checks: List[QualityCheck] = []
+    rel = py_file.rel
+    tree = py_file.tree
+    if tree is None:
+        # Already reported in syntax check
+        return checks
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            if isinstance(node, ast.Import):
+                names = [alias.name.split(".")[0] for alias in node.names]
+            else:
+                # ImportFrom: module may be None for relative imports
+                if node.module is None:
+                    continue  # relative import like `from . import x`
+                names = [node.module.split(".")[0]]
+
+            for top_name in names:
+                if not top_name:
+                    continue
+                if top_name in _STDLIB_MODULES:
+                    continue
+                if top_name in _KNOWN_THIRD_PARTY:
+                    continue
+                # Check if it's a local module
+                if top_name in local_names:
+                    continue
+                # Unknown import — flag as warning
+                checks.append(
+                    QualityCheck(
+                        name=f"import_missing:{rel}:{top_name}",
+                        category="imports",
+                        passed=False,
+                        severity="warning",
+                        message=(
+                            f"Unknown import '{top_name}' in {rel} — "
+                            "not found in stdlib, known packages, or project."
+                        ),
+                        file_path=rel,
+                        line_number=node.lineno,
+                        fix_suggestion=(
+                            f"Add '{top_name}' to requirements.txt "
+                            "or verify the module path is correct."
+                        ),
+                    )
+                )
+    return checks
+
+
+def _security_checks(py_file: IndexedFile) -> Tuple[List[QualityCheck], _SecurityFacts]:
+    checks: List[QualityCheck] = []
+    rel = py_file.rel
+    source = py_file.text
+    lines = source.splitlines()
+
+    # --- Hardcoded secrets ---
+    for pattern, label in _SECRET_PATTERNS:
+        for lineno, line in enumerate(lines, start=1):
+            if re.search(pattern, line):
+                # Skip lines that read from env
+                if "os.getenv" in line or "os.environ" in line or "getenv" in line:
+                    continue
+                checks.append(
+                    QualityCheck(
+                        name=f"security_secret:{rel}:{lineno}",
+                        category="security",
+                        passed=False,
+                        severity="error",
+                        message=f"{label} detected in {rel}:{lineno}",
+                        file_path=rel,
+                        line_number=lineno,
+                        fix_suggestion=(
+                            "Move this value to an environment variable "
+                            "and read it with os.getenv()."
+                        ),
+                    )
+                )
+
+    # --- SQL injection ---
+    for pattern, label in _SQL_INJECTION_PATTERNS:
+        for lineno, line in enumerate(lines, start=1):
+            if re.search(pattern, line):
+                checks.append(
+                    QualityCheck(
+                        name=f"security_sqli:{rel}:{lineno}",
+                        category="security",
+                        passed=False,
+                        severity="error",
+                        message=f"{label} in {rel}:{lineno}",
+                        file_path=rel,
+                        line_number=lineno,
+                        fix_suggestion=(
+                            "Use parameterised queries or ORM methods "
+                            "instead of string-formatting SQL."
+                        ),
+                    )
+                )
+
+    # --- eval / exec ---
+    for lineno, line in enumerate(lines, start=1):
+        stripped = line.strip()
+        if re.search(r'\beval\s*\(', stripped) and not stripped.startswith("#"):
+            checks.append(
+                QualityCheck(
+                    name=f"security_eval:{rel}:{lineno}",
+                    category="security",
+                    passed=False,
+                    severity="error",
+                    message=f"eval() usage in {rel}:{lineno} — arbitrary code execution risk",
+                    file_path=rel,
+                    line_number=lineno,
+                    fix_suggestion="Avoid eval(); use ast.literal_eval() for safe evaluation.",
+                )
+            )
+        if re.search(r'\bexec\s*\(', stripped) and not stripped.startswith("#"):
+            checks.append(
+                QualityCheck(
+                    name=f"security_exec:{rel}:{lineno}",
+                    category="security",
+                    passed=False,
+                    severity="warning",
+                    message=f"exec() usage in {rel}:{lineno} — potential code injection",
+                    file_path=rel,
+                    line_number=lineno,
+                    fix_suggestion="Consider replacing exec() with explicit logic.",
+                )
+            )
+
+    facts = _SecurityFacts(
+        # --- CORS ---
+        cors="CORSMiddleware" in source or "add_middleware" in source,
+        # --- JWT ---
+        jwt_secret_from_env=bool(re.search(r'SECRET_KEY\s*=\s*os\.getenv', source)),
+        jwt_algorithm=bool(re.search(r'ALGORITHM\s*=\s*["\']HS(256|384|512)["\']', source)),
+    )
+    return checks, facts
+
+
+def _import_style_checks(py_file: IndexedFile) -> List[QualityCheck]:
+    """Flag a file that mixes relative and absolute ``src.`` imports."""
+    source = py_file.text
+    has_relative = bool(re.search(r'from \.\w', source))
+    has_absolute_src = bool(re.search(r'from src\.', source))
+    if not (has_relative and has_absolute_src):
+        return []
+    return [
+        QualityCheck(
+            name=f"consistency_import_style:{py_file.rel}",
+            category="consistency",
+            passed=False,
+            severity="warning",
+            message=f"Mixed relative and absolute imports in {py_file.rel}",
+            file_path=py_file.rel,
+            fix_suggestion="Use either relative OR absolute imports consistently per file.",
+        )
+    ]
+
+
+# name -> (suffixes it applies to, check); "imports" also takes the local module names
+_PER_FILE_CHECKS: Dict[str, Tuple[Tuple[str, ...], Callable[..., Any]]] = {
+    "python_syntax": ((".py",), _python_syntax_checks),
+    "typescript_syntax": ((".ts", ".tsx"), _typescript_checks),
+    "imports": ((".py",), _import_checks),
+    "security": ((".py",), _security_checks),
+    "import_style": ((".py",), _import_style_checks),
+}
+
+
+def _local_module_names(index: ProjectIndex) -> set[str]:
+    """
+    Names an import may resolve to inside the project: top-level packages
+    and modules, plus the first two path components of every .py file
+    (e.g. backend/app/main.py -> backend, app).
+    """
+    names: set[str] = set()
+    for f in index.files([".py"]):
+        parts = f.rel.split("/")
+        names.add(parts[0])
+        if len(parts) > 1:
+            names.add(parts[1])
+    names.update(d for d in index.dirs() if "/" not in d)
+    names.update(f.rel[:-3] for f in index.files([".py"], recursive=False))
+    return names
+
+
+def _run_file_checks_shard(
+    root: str,
+    shard: List[Tuple[str, bytes, Tuple[str, ...]]],
+    local_names: frozenset[str],
+) -> List[Tuple[str, str, Any]]:
+    """
+    Worker-process entry point: run the named per-file checks over a shard
+    of ``(path, content, check names)`` and return ``(path, check, result)``.
+    """
+    results: List[Tuple[str, str, Any]] = []
+    for rel, data, check_names in shard:
+        entry = IndexedFile(Path(root), rel, data, len(data), 0)
+        for name in check_names:
+            check = _PER_FILE_CHECKS[name][1]
+            value = check(entry, local_names) if name == "imports" else check(entry)
+            results.append((rel, name, value))
+    return results
+
+
+def _shard_by_size(items: List[Tuple[str, bytes, Tuple[str, ...]]], shards: int) -> List[list]:
+    """Split *items* into at most *shards* lists of similar total size, largest files first."""
+    buckets: List[list] = [[] for _ in range(max(1, shards))]
+    loads = [0] * len(buckets)
+    for item in sorted(items, key=lambda i: len(i[1]), reverse=True):
+        lightest = loads.index(min(loads))
+        buckets[lightest].append(item)
+        loads[lightest] += len(item[1])
+    return [b for b in buckets if b]
+
+
+def _workers_from_env() -> int:
+    setting = os.getenv("CODEGEN_QUALITY_WORKERS", "").strip().lower()
+    if not setting:
+        return 0
+    if setting == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(setting))
+    except ValueError:
+        logger.warning("Ignoring non-numeric CODEGEN_QUALITY_WORKERS=%r", setting)
+        return 0
+
+
 # ---------------------------------------------------------------------------
 # CodeQualityPipeline
 # ---------------------------------------------------------------------------
@@ -144,17 +628,102 @@ class CodeQualityPipeline:
 
     Call ``await pipeline.validate(output_dir, spec)`` to get a QualityReport.
     Checks run in parallel where they are independent.
+
+    Results are memoised in a :class:`ValidationCache`, so validating the
+    same project again (e.g. after an AutoFixer round) only re-checks the
+    files that changed and the cross-file checks whose inputs changed.
+
+    The checks run in threads, which share the GIL. With ``workers`` > 1
+    (or ``CODEGEN_QUALITY_WORKERS=<n>|auto``), the per-file checks (AST
+    parsing, regex scans) are sharded across a pool of worker processes
+    whenever at least ``process_min_files`` files need checking; their
+    results are merged into the cache before the report is assembled.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        cache: Optional[ValidationCache] = None,
+        workers: Optional[int] = None,
+        process_min_files: int = 32,
+    ) -> None:
         self._client = get_llm_client("auto")
+        self._cache = cache if cache is not None else ValidationCache()
+        self.workers = workers if workers is not None else _workers_from_env()
+        self.process_min_files = process_min_files
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any were started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Forking this (threaded) process directly can deadlock the child;
+            # workers fork from a forkserver that has this module preloaded
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._pool
+
+    async def _precompute_in_processes(self, root: Path, index: ProjectIndex) -> None:
+        """Run uncached per-file checks in worker processes and cache the results."""
+        local_names = _local_module_names(index)
+        contexts = {"imports": _digest(sorted(local_names))}
+
+        pending: List[Tuple[str, bytes, Tuple[str, ...]]] = []
+        for entry in index:
+            names = tuple(
+                name for name, (suffixes, _) in _PER_FILE_CHECKS.items()
+                if entry.rel.endswith(suffixes)
+                and not self._cache.has_file(name, entry, contexts.get(name, ""))
+            )
+            if names:
+                pending.append((entry.rel, entry.data, names))
+        if len(pending) < self.process_min_files:
+            return
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        shards = _shard_by_size(pending, self.workers)
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool, _run_file_checks_shard, str(root), shard, frozenset(local_names)
+                )
+                for shard in shards
+            ),
+            return_exceptions=True,
+        )
+        failed = next((r for r in results if isinstance(r, BaseException)), None)
+        if failed is not None:
+            # e.g. BrokenProcessPool; the checks then run in threads as usual
+            logger.warning("Quality worker processes failed (%s); checking in threads.", failed)
+            self.close()
+            return
+
+        for shard_results in results:
+            for rel, name, value in shard_results:
+                entry = index.get(rel)
+                if entry is not None:
+                    self._cache.put_file(name, entry, value, contexts.get(name, ""))
+        logger.info(
+            "Checked %d file(s) in %d worker process(es)", len(pending), len(shards)
+        )
 
     # ------------------------------------------------------------------
     # Public entry point
     # ------------------------------------------------------------------
 
     async def validate(
-        self, output_dir: str, spec: Optional[Dict[str, Any]] = None
+        self,
+        output_dir: str,
+        spec: Optional[Dict[str, Any]] = None,
+        index: Optional[ProjectIndex] = None,
     ) -> QualityReport:
         """
         Run all quality checks against *output_dir* and return a report.
@@ -165,6 +734,8 @@ class CodeQualityPipeline:
             Path to the root of the generated project.
         spec:
             Optional app spec dict used for completeness checks.
+        index:
+            Shared :class:`ProjectIndex` of *output_dir*; built here if omitted.
         """
         root = Path(output_dir)
         if not root.exists():
@@ -179,15 +750,20 @@ class CodeQualityPipeline:
             return QualityReport(checks=[check])
 
         logger.info("Starting quality pipeline on %s", output_dir)
+        if index is None:
+            index = await asyncio.to_thread(ProjectIndex.build, root)
+        before = self._cache.stats()
+        if self.workers > 1:
+            await self._precompute_in_processes(root, index)
 
         # Run independent checks in parallel
         results = await asyncio.gather(
-            self._check_python_syntax(root),
-            self._check_typescript_syntax(root),
-            self._check_imports(root),
-            self._check_security(root),
-            self._check_docker(root),
-            self._check_file_structure(root),
+            self._check_python_syntax(root, index),
+            self._check_typescript_syntax(root, index),
+            self._check_imports(root, index),
+            self._check_security(root, index),
+            self._check_docker(root, index),
+            self._check_file_structure(root, index),
             return_exceptions=True,
         )
 
@@ -208,25 +784,33 @@ class CodeQualityPipeline:
                 checks.extend(result)  # type: ignore[arg-type]
 
         # Completeness and consistency depend on the results of other checks
-        completeness_checks = await self._check_completeness(root, spec)
-        consistency_checks = await self._check_consistency(root)
+        completeness_checks = await self._check_completeness(root, spec, index)
+        consistency_checks = await self._check_consistency(root, index)
         checks.extend(completeness_checks)
         checks.extend(consistency_checks)
 
         report = QualityReport(checks=checks)
-        logger.info("Quality pipeline complete: %s", report.summary)
+        after = self._cache.stats()
+        logger.info(
+            "Quality pipeline complete: %s (%d check result(s) reused, %d recomputed)",
+            report.summary,
+            after["hits"] - before["hits"],
+            after["misses"] - before["misses"],
+        )
         return report
 
     # ------------------------------------------------------------------
     # Individual check methods
     # ------------------------------------------------------------------
 
-    async def _check_python_syntax(self, root: Path) -> List[QualityCheck]:
+    async def _check_python_syntax(
+        self, root: Path, index: Optional[ProjectIndex] = None
+    ) -> List[QualityCheck]:
         """AST-parse every .py file and report syntax errors."""
 
         def _run() -> List[QualityCheck]:
             checks: List[QualityCheck] = []
-            py_files = list(root.rglob("*.py"))
+            py_files = ProjectIndex.ensure(root, index).files([".py"])
             if not py_files:
                 checks.append(
                     QualityCheck(
@@ -240,49 +824,14 @@ class CodeQualityPipeline:
                 return checks
 
             for py_file in py_files:
-                rel = py_file.relative_to(root)
-                try:
-                    source = py_file.read_text(encoding="utf-8", errors="replace")
-                    ast.parse(source, filename=str(rel))
-                    checks.append(
-                        QualityCheck(
-                            name=f"python_syntax:{rel}",
-                            category="syntax",
-                            passed=True,
-                            severity="info",
-                            message=f"Syntax OK: {rel}",
-                            file_path=str(rel),
-                        )
-                    )
-                except SyntaxError as exc:
-                    checks.append(
-                        QualityCheck(
-                            name=f"python_syntax:{rel}",
-                            category="syntax",
-                            passed=False,
-                            severity="error",
-                            message=f"Syntax error in {rel}: {exc.msg}",
-                            file_path=str(rel),
-                            line_number=exc.lineno,
-                            fix_suggestion="Review and correct the syntax error at the indicated line.",
-                        )
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    checks.append(
-                        QualityCheck(
-                            name=f"python_syntax:{rel}",
-                            category="syntax",
-                            passed=False,
-                            severity="warning",
-                            message=f"Could not parse {rel}: {exc}",
-                            file_path=str(rel),
-                        )
-                    )
+                checks.extend(self._cache.per_file("python_syntax", py_file, _python_syntax_checks))
             return checks
 
         return await asyncio.to_thread(_run)
 
-    async def _check_typescript_syntax(self, root: Path) -> List[QualityCheck]:
+    async def _check_typescript_syntax(
+        self, root: Path, index: Optional[ProjectIndex] = None
+    ) -> List[QualityCheck]:
         """
         Basic TypeScript/JavaScript checks:
         - Balanced braces and brackets
@@ -292,101 +841,16 @@ class CodeQualityPipeline:
 
         def _run() -> List[QualityCheck]:
             checks: List[QualityCheck] = []
-            ts_files = list(root.rglob("*.ts")) + list(root.rglob("*.tsx"))
-            if not ts_files:
-                return checks  # Not every project has TypeScript
-
+            ts_files = ProjectIndex.ensure(root, index).files([".ts", ".tsx"])
             for ts_file in ts_files:
-                rel = ts_file.relative_to(root)
-                try:
-                    source = ts_file.read_text(encoding="utf-8", errors="replace")
-                except OSError:
-                    continue
-
-                # Check brace/bracket balance
-                open_braces = source.count("{") - source.count("}")
-                open_brackets = source.count("[") - source.count("]")
-                open_parens = source.count("(") - source.count(")")
-
-                if open_braces != 0:
-                    checks.append(
-                        QualityCheck(
-                            name=f"ts_braces:{rel}",
-                            category="syntax",
-                            passed=False,
-                            severity="error",
-                            message=(
-                                f"Unbalanced curly braces in {rel} "
-                                f"(net: {open_braces:+d})"
-                            ),
-                            file_path=str(rel),
-                            fix_suggestion="Ensure every opening '{' has a matching closing '}'.",
-                        )
-                    )
-                elif open_brackets != 0:
-                    checks.append(
-                        QualityCheck(
-                            name=f"ts_brackets:{rel}",
-                            category="syntax",
-                            passed=False,
-                            severity="warning",
-                            message=(
-                                f"Unbalanced square brackets in {rel} "
-                                f"(net: {open_brackets:+d})"
-                            ),
-                            file_path=str(rel),
-                        )
-                    )
-                elif open_parens != 0:
-                    checks.append(
-                        QualityCheck(
-                            name=f"ts_parens:{rel}",
-                            category="syntax",
-                            passed=False,
-                            severity="warning",
-                            message=(
-                                f"Unbalanced parentheses in {rel} "
-                                f"(net: {open_parens:+d})"
-                            ),
-                            file_path=str(rel),
-                        )
-                    )
-                else:
-                    checks.append(
-                        QualityCheck(
-                            name=f"ts_syntax:{rel}",
-                            category="syntax",
-                            passed=True,
-                            severity="info",
-                            message=f"Basic syntax OK: {rel}",
-                            file_path=str(rel),
-                        )
-                    )
-
-                # Check import statements are well-formed
-                bad_imports = re.findall(
-                    r'^import\s+(?!.*from\s+["\'])(?!.*\*\s+as\s+)(?!type\s+)(\w+)',
-                    source,
-                    re.MULTILINE,
-                )
-                for imp in bad_imports:
-                    checks.append(
-                        QualityCheck(
-                            name=f"ts_import:{rel}:{imp}",
-                            category="imports",
-                            passed=False,
-                            severity="warning",
-                            message=f"Possibly malformed import '{imp}' in {rel}",
-                            file_path=str(rel),
-                            fix_suggestion=f"Verify: import {{ {imp} }} from '...' or import {imp} from '...'",
-                        )
-                    )
-
+                checks.extend(self._cache.per_file("typescript_syntax", ts_file, _typescript_checks))
             return checks
 
         return await asyncio.to_thread(_run)
 
-    async def _check_imports(self, root: Path) -> List[QualityCheck]:
+    async def _check_imports(
+        self, root: Path, index: Optional[ProjectIndex] = None
+    ) -> List[QualityCheck]:
         """
         For Python files:
         - Extract all import statements via AST
@@ -396,70 +860,22 @@ class CodeQualityPipeline:
 
         def _run() -> List[QualityCheck]:
             checks: List[QualityCheck] = []
-            py_files = list(root.rglob("*.py"))
+            idx = ProjectIndex.ensure(root, index)
+            py_files = idx.files([".py"])
 
-            # Build set of available local modules (package directories + .py files)
-            local_modules: set[str] = set()
-            for f in py_files:
-                # Module name relative to root, e.g. backend/app/main -> backend
-                parts = f.relative_to(root).parts
-                local_modules.add(parts[0])
-                if len(parts) > 1:
-                    local_modules.add(parts[1])
+            local_names = _local_module_names(idx)
+            # A file's result only changes with its content or this name set
+            context = _digest(sorted(local_names))
 
             for py_file in py_files:
-                rel = py_file.relative_to(root)
-                try:
-                    source = py_file.read_text(encoding="utf-8", errors="replace")
-                    tree = ast.parse(source, filename=str(rel))
-                except (SyntaxError, OSError):
-                    # Already reported in syntax check
-                    continue
-
-                for node in ast.walk(tree):
-                    if isinstance(node, (ast.Import, ast.ImportFrom)):
-                        if isinstance(node, ast.Import):
-                            names = [alias.name.split(".")[0] for alias in node.names]
-                        else:
-                            # ImportFrom: module may be None for relative imports
-                            if node.module is None:
-                                continue  # relative import like `from . import x`
-                            names = [node.module.split(".")[0]]
-
-                        for top_name in names:
-                            if not top_name:
-                                continue
-                            if top_name in _STDLIB_MODULES:
-                                continue
-                            if top_name in _KNOWN_THIRD_PARTY:
-                                continue
-                            # Check if it's a local module
-                            candidate = root / top_name
-                            if (
-                                candidate.is_dir()
-                                or (root / f"{top_name}.py").exists()
-                                or top_name in local_modules
-                            ):
-                                continue
-                            # Unknown import — flag as warning
-                            checks.append(
-                                QualityCheck(
-                                    name=f"import_missing:{rel}:{top_name}",
-                                    category="imports",
-                                    passed=False,
-                                    severity="warning",
-                                    message=(
-                                        f"Unknown import '{top_name}' in {rel} — "
-                                        "not found in stdlib, known packages, or project."
-                                    ),
-                                    file_path=str(rel),
-                                    line_number=node.lineno,
-                                    fix_suggestion=(
-                                        f"Add '{top_name}' to requirements.txt "
-                                        "or verify the module path is correct."
-                                    ),
-                                )
-                            )
+                checks.extend(
+                    self._cache.per_file(
+                        "imports",
+                        py_file,
+                        lambda f: _import_checks(f, local_names),
+                        context=context,
+                    )
+                )
 
             if not checks:
                 checks.append(
@@ -475,7 +891,9 @@ class CodeQualityPipeline:
 
         return await asyncio.to_thread(_run)
 
-    async def _check_security(self, root: Path) -> List[QualityCheck]:
+    async def _check_security(
+        self, root: Path, index: Optional[ProjectIndex] = None
+    ) -> List[QualityCheck]:
         """
         Security checks:
         - Hardcoded secrets/passwords outside .env.example
@@ -487,106 +905,18 @@ class CodeQualityPipeline:
 
         def _run() -> List[QualityCheck]:
             checks: List[QualityCheck] = []
-            py_files = list(root.rglob("*.py"))
+            idx = ProjectIndex.ensure(root, index)
 
             cors_found = False
             jwt_secret_from_env = False
             jwt_algorithm_found = False
 
-            for py_file in py_files:
-                rel = py_file.relative_to(root)
-                is_env_example = py_file.name in (".env.example", ".env.sample")
-
-                try:
-                    source = py_file.read_text(encoding="utf-8", errors="replace")
-                except OSError:
-                    continue
-
-                lines = source.splitlines()
-
-                # --- Hardcoded secrets ---
-                if not is_env_example:
-                    for pattern, label in _SECRET_PATTERNS:
-                        for lineno, line in enumerate(lines, start=1):
-                            if re.search(pattern, line):
-                                # Skip lines that read from env
-                                if "os.getenv" in line or "os.environ" in line or "getenv" in line:
-                                    continue
-                                checks.append(
-                                    QualityCheck(
-                                        name=f"security_secret:{rel}:{lineno}",
-                                        category="security",
-                                        passed=False,
-                                        severity="error",
-                                        message=f"{label} detected in {rel}:{lineno}",
-                                        file_path=str(rel),
-                                        line_number=lineno,
-                                        fix_suggestion=(
-                                            "Move this value to an environment variable "
-                                            "and read it with os.getenv()."
-                                        ),
-                                    )
-                                )
-
-                # --- SQL injection ---
-                for pattern, label in _SQL_INJECTION_PATTERNS:
-                    for lineno, line in enumerate(lines, start=1):
-                        if re.search(pattern, line):
-                            checks.append(
-                                QualityCheck(
-                                    name=f"security_sqli:{rel}:{lineno}",
-                                    category="security",
-                                    passed=False,
-                                    severity="error",
-                                    message=f"{label} in {rel}:{lineno}",
-                                    file_path=str(rel),
-                                    line_number=lineno,
-                                    fix_suggestion=(
-                                        "Use parameterised queries or ORM methods "
-                                        "instead of string-formatting SQL."
-                                    ),
-                                )
-                            )
-
-                # --- eval / exec ---
-                for lineno, line in enumerate(lines, start=1):
-                    stripped = line.strip()
-                    if re.search(r'\beval\s*\(', stripped) and not stripped.startswith("#"):
-                        checks.append(
-                            QualityCheck(
-                                name=f"security_eval:{rel}:{lineno}",
-                                category="security",
-                                passed=False,
-                                severity="error",
-                                message=f"eval() usage in {rel}:{lineno} — arbitrary code execution risk",
-                                file_path=str(rel),
-                                line_number=lineno,
-                                fix_suggestion="Avoid eval(); use ast.literal_eval() for safe evaluation.",
-                            )
-                        )
-                    if re.search(r'\bexec\s*\(', stripped) and not stripped.startswith("#"):
-                        checks.append(
-                            QualityCheck(
-                                name=f"security_exec:{rel}:{lineno}",
-                                category="security",
-                                passed=False,
-                                severity="warning",
-                                message=f"exec() usage in {rel}:{lineno} — potential code injection",
-                                file_path=str(rel),
-                                line_number=lineno,
-                                fix_suggestion="Consider replacing exec() with explicit logic.",
-                            )
-                        )
-
-                # --- CORS ---
-                if "CORSMiddleware" in source or "add_middleware" in source:
-                    cors_found = True
-
-                # --- JWT ---
-                if re.search(r'SECRET_KEY\s*=\s*os\.getenv', source):
-                    jwt_secret_from_env = True
-                if re.search(r'ALGORITHM\s*=\s*["\']HS(256|384|512)["\']', source):
-                    jwt_algorithm_found = True
+            for py_file in idx.files([".py"]):
+                file_checks, facts = self._cache.per_file("security", py_file, _security_checks)
+                checks.extend(file_checks)
+                cors_found = cors_found or facts.cors
+                jwt_secret_from_env = jwt_secret_from_env or facts.jwt_secret_from_env
+                jwt_algorithm_found = jwt_algorithm_found or facts.jwt_algorithm
 
             # --- CORS global check ---
             if not cors_found:
@@ -616,7 +946,7 @@ class CodeQualityPipeline:
 
             # --- JWT global check ---
             if not jwt_secret_from_env and any(
-                (root / d).exists()
+                idx.exists(d)
                 for d in ["backend", "app", "src"]
             ):
                 checks.append(
@@ -646,7 +976,10 @@ class CodeQualityPipeline:
         return await asyncio.to_thread(_run)
 
     async def _check_completeness(
-        self, root: Path, spec: Optional[Dict[str, Any]]
+        self,
+        root: Path,
+        spec: Optional[Dict[str, Any]],
+        index: Optional[ProjectIndex] = None,
     ) -> List[QualityCheck]:
         """
         If a spec is provided, verify:
@@ -657,7 +990,7 @@ class CodeQualityPipeline:
         - Auth endpoints exist
         """
 
-        def _run() -> List[QualityCheck]:
+        def _compute(idx: ProjectIndex) -> List[QualityCheck]:
             checks: List[QualityCheck] = []
 
             if not spec:
@@ -688,7 +1021,7 @@ class CodeQualityPipeline:
                     backend_root / "models.py",
                     backend_root / f"models/{entity_lower}.py",
                 ]
-                if not any(c.exists() for c in model_candidates):
+                if not any(idx.exists(c) for c in model_candidates):
                     checks.append(
                         QualityCheck(
                             name=f"completeness_model:{entity}",
@@ -718,7 +1051,7 @@ class CodeQualityPipeline:
                     backend_root / "api" / "v1" / f"{entity_lower}.py",
                     backend_root / "crud" / f"{entity_lower}.py",
                 ]
-                if not any(c.exists() for c in crud_candidates):
+                if not any(idx.exists(c) for c in crud_candidates):
                     checks.append(
                         QualityCheck(
                             name=f"completeness_crud:{entity}",
@@ -748,7 +1081,7 @@ class CodeQualityPipeline:
                     backend_root / "schemas" / f"{entity_lower}.py",
                     backend_root / "schemas.py",
                 ]
-                if not any(c.exists() for c in schema_candidates):
+                if not any(idx.exists(c) for c in schema_candidates):
                     checks.append(
                         QualityCheck(
                             name=f"completeness_schema:{entity}",
@@ -779,9 +1112,13 @@ class CodeQualityPipeline:
                         pages.append(p.get("title", p.get("route", str(p))))
                     else:
                         pages.append(str(p))
+                frontend_paths = _index_paths_under(idx, frontend_root)
                 for page in pages:
                     page_lower = page.lower().replace(" ", "")
-                    page_candidates = list(frontend_root.rglob(f"*{page_lower}*"))
+                    page_candidates = [
+                        rel for rel in frontend_paths
+                        if fnmatch.fnmatchcase(rel.rsplit("/", 1)[-1], f"*{page_lower}*")
+                    ]
                     if not page_candidates:
                         checks.append(
                             QualityCheck(
@@ -812,7 +1149,7 @@ class CodeQualityPipeline:
                     backend_root / "routes" / "auth.py",
                     backend_root / "auth.py",
                 ]
-                if not any(c.exists() for c in auth_candidates):
+                if not any(idx.exists(c) for c in auth_candidates):
                     checks.append(
                         QualityCheck(
                             name="completeness_auth",
@@ -836,9 +1173,19 @@ class CodeQualityPipeline:
 
             return checks
 
+        def _run() -> List[QualityCheck]:
+            # Only file/directory existence matters here, not contents
+            idx = ProjectIndex.ensure(root, index)
+            fingerprint = _layout_fingerprint(
+                root, idx, extra=json.dumps(spec, sort_keys=True, default=str)
+            )
+            return list(self._cache.cross_file("completeness", fingerprint, lambda: _compute(idx)))
+
         return await asyncio.to_thread(_run)
 
-    async def _check_consistency(self, root: Path) -> List[QualityCheck]:
+    async def _check_consistency(
+        self, root: Path, index: Optional[ProjectIndex] = None
+    ) -> List[QualityCheck]:
         """
         Cross-file consistency checks:
         - Model field names vs schema field names
@@ -847,7 +1194,7 @@ class CodeQualityPipeline:
         - Import path consistency
         """
 
-        def _run() -> List[QualityCheck]:
+        def _compute(idx: ProjectIndex) -> List[QualityCheck]:
             checks: List[QualityCheck] = []
             backend_root = _find_dir(root, ["backend/app", "app", "backend"])
 
@@ -856,14 +1203,15 @@ class CodeQualityPipeline:
             schemas_dir = backend_root / "schemas" if backend_root else None
 
             if models_dir and models_dir.is_dir() and schemas_dir and schemas_dir.is_dir():
-                for model_file in models_dir.glob("*.py"):
-                    entity = model_file.stem
+                for model_file in idx.files([".py"], under=models_dir, recursive=False):
+                    entity = Path(model_file.rel).stem
                     schema_file = schemas_dir / f"{entity}.py"
-                    if not schema_file.exists():
+                    schema_entry = idx.get(schema_file)
+                    if schema_entry is None:
                         continue
 
                     model_fields = _extract_class_fields(model_file)
-                    schema_fields = _extract_class_fields(schema_file)
+                    schema_fields = _extract_class_fields(schema_entry)
 
                     missing_in_schema = model_fields - schema_fields - {"id", "created_at", "updated_at"}
                     if missing_in_schema:
@@ -895,11 +1243,13 @@ class CodeQualityPipeline:
             # --- API route names vs model names ---
             api_dir = _find_dir(root, ["backend/app/api", "app/api", "backend/api"])
             if api_dir and api_dir.is_dir() and models_dir and models_dir.is_dir():
-                model_names = {f.stem for f in models_dir.glob("*.py") if f.stem != "__init__"}
-                for route_file in api_dir.glob("*.py"):
-                    if route_file.stem in ("__init__", "deps", "dependencies", "auth"):
+                model_names = {
+                    Path(f.rel).stem for f in idx.files([".py"], under=models_dir, recursive=False)
+                } - {"__init__"}
+                for route_file in idx.files([".py"], under=api_dir, recursive=False):
+                    route_entity = Path(route_file.rel).stem
+                    if route_entity in ("__init__", "deps", "dependencies", "auth"):
                         continue
-                    route_entity = route_file.stem
                     if route_entity not in model_names:
                         checks.append(
                             QualityCheck(
@@ -911,7 +1261,7 @@ class CodeQualityPipeline:
                                     f"Route file '{route_entity}.py' has no matching model "
                                     f"in {models_dir.relative_to(root)}"
                                 ),
-                                file_path=str(route_file.relative_to(root)),
+                                file_path=route_file.rel,
                                 fix_suggestion=f"Create models/{route_entity}.py or rename the route file.",
                             )
                         )
@@ -921,11 +1271,12 @@ class CodeQualityPipeline:
                 root, ["frontend/src/types", "frontend/src/lib/types", "client/src/types"]
             )
             if frontend_types_dir and frontend_types_dir.is_dir() and schemas_dir and schemas_dir.is_dir():
-                backend_entities = {f.stem for f in schemas_dir.glob("*.py") if f.stem != "__init__"}
+                backend_entities = {
+                    Path(f.rel).stem for f in idx.files([".py"], under=schemas_dir, recursive=False)
+                } - {"__init__"}
                 ts_types = set()
-                for ts_file in frontend_types_dir.rglob("*.ts"):
-                    source = ts_file.read_text(encoding="utf-8", errors="replace")
-                    found = re.findall(r'(?:interface|type)\s+(\w+)', source)
+                for ts_file in idx.files([".ts"], under=frontend_types_dir):
+                    found = re.findall(r'(?:interface|type)\s+(\w+)', ts_file.text)
                     ts_types.update(name.lower() for name in found)
 
                 for entity in backend_entities:
@@ -943,32 +1294,26 @@ class CodeQualityPipeline:
                             )
                         )
 
-            # --- Import path consistency (relative vs absolute) ---
-            py_files = list(root.rglob("*.py"))
-            mixed_import_files: list[str] = []
-            for py_file in py_files:
-                try:
-                    source = py_file.read_text(encoding="utf-8", errors="replace")
-                except OSError:
-                    continue
-                has_relative = bool(re.search(r'from \.\w', source))
-                has_absolute_src = bool(re.search(r'from src\.', source))
-                if has_relative and has_absolute_src:
-                    mixed_import_files.append(str(py_file.relative_to(root)))
+            return checks
 
-            if mixed_import_files:
-                for f in mixed_import_files:
-                    checks.append(
-                        QualityCheck(
-                            name=f"consistency_import_style:{f}",
-                            category="consistency",
-                            passed=False,
-                            severity="warning",
-                            message=f"Mixed relative and absolute imports in {f}",
-                            file_path=f,
-                            fix_suggestion="Use either relative OR absolute imports consistently per file.",
-                        )
-                    )
+        def _run() -> List[QualityCheck]:
+            idx = ProjectIndex.ensure(root, index)
+            # The cross-file part reads the models, schemas and frontend types
+            backend_root = _find_dir(root, ["backend/app", "app", "backend"])
+            types_dir = _find_dir(
+                root, ["frontend/src/types", "frontend/src/lib/types", "client/src/types"]
+            )
+            inputs = (
+                idx.files([".py"], under=backend_root / "models", recursive=False)
+                + idx.files([".py"], under=backend_root / "schemas", recursive=False)
+                + idx.files([".ts"], under=types_dir)
+            )
+            fingerprint = _layout_fingerprint(root, idx, contents=inputs)
+            checks = list(self._cache.cross_file("consistency", fingerprint, lambda: _compute(idx)))
+
+            # --- Import path consistency (relative vs absolute) ---
+            for py_file in idx.files([".py"]):
+                checks.extend(self._cache.per_file("import_style", py_file, _import_style_checks))
 
             if not checks:
                 checks.append(
@@ -984,7 +1329,9 @@ class CodeQualityPipeline:
 
         return await asyncio.to_thread(_run)
 
-    async def _check_docker(self, root: Path) -> List[QualityCheck]:
+    async def _check_docker(
+        self, root: Path, index: Optional[ProjectIndex] = None
+    ) -> List[QualityCheck]:
         """
         Docker checks:
         - docker-compose.yml exists
@@ -992,14 +1339,9 @@ class CodeQualityPipeline:
         - Services reference valid image names or build contexts
         """
 
-        def _run() -> List[QualityCheck]:
+        def _compute(idx: ProjectIndex) -> List[QualityCheck]:
             checks: List[QualityCheck] = []
-            compose_file = root / "docker-compose.yml"
-            compose_file_alt = root / "docker-compose.yaml"
-
-            target = compose_file if compose_file.exists() else (
-                compose_file_alt if compose_file_alt.exists() else None
-            )
+            target = idx.get("docker-compose.yml") or idx.get("docker-compose.yaml")
 
             if target is None:
                 checks.append(
@@ -1025,7 +1367,7 @@ class CodeQualityPipeline:
             )
 
             # Parse service names and their build contexts
-            compose_source = target.read_text(encoding="utf-8", errors="replace")
+            compose_source = target.text
             service_builds = re.findall(
                 r'build:\s*\n\s+context:\s*(\S+)', compose_source
             )
@@ -1035,7 +1377,11 @@ class CodeQualityPipeline:
             for context in all_contexts:
                 context_path = (root / context).resolve()
                 dockerfile = context_path / "Dockerfile"
-                if not dockerfile.exists():
+                try:
+                    dockerfile_present = idx.is_file(dockerfile)
+                except ValueError:  # build context outside the project
+                    dockerfile_present = dockerfile.exists()
+                if not dockerfile_present:
                     checks.append(
                         QualityCheck(
                             name=f"docker_dockerfile:{context}",
@@ -1043,7 +1389,7 @@ class CodeQualityPipeline:
                             passed=False,
                             severity="error",
                             message=f"Dockerfile missing for build context '{context}'",
-                            file_path=str(target.relative_to(root)),
+                            file_path=target.rel,
                             fix_suggestion=f"Create a Dockerfile at {context_path}/Dockerfile",
                         )
                     )
@@ -1069,7 +1415,7 @@ class CodeQualityPipeline:
                                 passed=False,
                                 severity="warning",
                                 message=f"Hardcoded password in docker-compose.yml:{lineno}",
-                                file_path=str(target.relative_to(root)),
+                                file_path=target.rel,
                                 line_number=lineno,
                                 fix_suggestion="Use environment variable substitution: ${POSTGRES_PASSWORD}",
                             )
@@ -1077,12 +1423,22 @@ class CodeQualityPipeline:
 
             return checks
 
+        def _run() -> List[QualityCheck]:
+            idx = ProjectIndex.ensure(root, index)
+            compose = [
+                f for f in (idx.get("docker-compose.yml"), idx.get("docker-compose.yaml")) if f
+            ]
+            fingerprint = _layout_fingerprint(root, idx, contents=compose)
+            return list(self._cache.cross_file("docker", fingerprint, lambda: _compute(idx)))
+
         return await asyncio.to_thread(_run)
 
-    async def _check_file_structure(self, root: Path) -> List[QualityCheck]:
+    async def _check_file_structure(
+        self, root: Path, index: Optional[ProjectIndex] = None
+    ) -> List[QualityCheck]:
         """Verify expected directory structure: backend/app/, frontend/src/, etc."""
 
-        def _run() -> List[QualityCheck]:
+        def _compute(idx: ProjectIndex) -> List[QualityCheck]:
             checks: List[QualityCheck] = []
             expected_structures = [
                 # (description, list of candidate paths — any one counts)
@@ -1094,7 +1450,7 @@ class CodeQualityPipeline:
             ]
 
             for label, candidates in expected_structures:
-                found = any((root / c).exists() for c in candidates)
+                found = any(idx.exists(c) for c in candidates)
                 checks.append(
                     QualityCheck(
                         name=f"structure:{label.lower().replace(' ', '_')}",
@@ -1112,6 +1468,11 @@ class CodeQualityPipeline:
 
             return checks
 
+        def _run() -> List[QualityCheck]:
+            idx = ProjectIndex.ensure(root, index)
+            fingerprint = _layout_fingerprint(root, idx)
+            return list(self._cache.cross_file("file_structure", fingerprint, lambda: _compute(idx)))
+
         return await asyncio.to_thread(_run)
 
 
@@ -1128,17 +1489,28 @@ class AutoFixer:
     - Syntax errors: send broken source + error message to LLM, write back the fix.
     - Missing imports: insert the missing import statement at the top of the file.
     - Missing files: ask LLM to generate the file from context.
+
+    After fixing, the project is re-validated with *quality* (the pipeline
+    that produced the report, when given), so its cached results for
+    unchanged files are reused across fix rounds.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, quality: Optional[CodeQualityPipeline] = None) -> None:
         self._client = get_llm_client("auto")
+        self._quality = quality
 
     async def fix(
-        self, output_dir: str, report: QualityReport
+        self,
+        output_dir: str,
+        report: QualityReport,
+        index: Optional[ProjectIndex] = None,
     ) -> Tuple[int, QualityReport]:
         """
         Attempt to fix all fixable issues in *report*.
 
+        Files are read from and written through *index* (built if not
+        given), which is then reused to re-run the pipeline.
+
         Returns
         -------
         (fixes_applied, new_report)
@@ -1146,22 +1518,24 @@ class AutoFixer:
             ``new_report`` is the result of re-running the pipeline.
         """
         root = Path(output_dir)
+        idx = index if index is not None else await asyncio.to_thread(ProjectIndex.ensure, root, None)
         fixes_applied = 0
 
         # Group failed checks by category
         failed = [c for c in report.checks if not c.passed]
 
         # Run auto-fix attempts
-        syntax_fixes = await self._fix_syntax_errors(root, failed)
-        import_fixes = await self._fix_missing_imports(root, failed)
-        file_fixes = await self._fix_missing_files(root, failed)
+        syntax_fixes = await self._fix_syntax_errors(root, failed, idx)
+        import_fixes = await self._fix_missing_imports(root, failed, idx)
+        file_fixes = await self._fix_missing_files(root, failed, idx)
 
         fixes_applied = syntax_fixes + import_fixes + file_fixes
 
         if fixes_applied > 0:
             logger.info("AutoFixer applied %d fix(es); re-running pipeline.", fixes_applied)
-            pipeline = CodeQualityPipeline()
-            new_report = await pipeline.validate(output_dir)
+            if self._quality is None:
+                self._quality = CodeQualityPipeline()
+            new_report = await self._quality.validate(output_dir, index=idx)
         else:
             new_report = report
 
@@ -1172,9 +1546,10 @@ class AutoFixer:
     # ------------------------------------------------------------------
 
     async def _fix_syntax_errors(
-        self, root: Path, failed: List[QualityCheck]
+        self, root: Path, failed: List[QualityCheck], index: Optional[ProjectIndex] = None
     ) -> int:
         """Send each broken Python file to the LLM and write back the corrected version."""
+        idx = ProjectIndex.ensure(root, index)
         syntax_errors = [
             c for c in failed
             if c.category == "syntax"
@@ -1184,13 +1559,10 @@ class AutoFixer:
 
         fixed = 0
         for check in syntax_errors:
-            file_path = root / check.file_path
-            if not file_path.exists():
-                continue
-            try:
-                source = file_path.read_text(encoding="utf-8", errors="replace")
-            except OSError:
+            entry = idx.get(check.file_path)
+            if entry is None:
                 continue
+            source = entry.text
 
             prompt = (
                 f"The following Python file has a syntax error:\n\n"
@@ -1202,8 +1574,7 @@ class AutoFixer:
             )
 
             try:
-                response = await asyncio.to_thread(
-                    self._client.complete,
+                response = await self._client.acomplete(
                     prompt,
                     None,
                     4096,
@@ -1213,7 +1584,7 @@ class AutoFixer:
                 corrected = _strip_code_fences(response.content)
                 # Validate the fix before writing
                 ast.parse(corrected)
-                file_path.write_text(corrected, encoding="utf-8")
+                idx.write_text(check.file_path, corrected)
                 logger.info("AutoFixer: fixed syntax error in %s", check.file_path)
                 fixed += 1
             except SyntaxError:
@@ -1224,9 +1595,10 @@ class AutoFixer:
         return fixed
 
     async def _fix_missing_imports(
-        self, root: Path, failed: List[QualityCheck]
+        self, root: Path, failed: List[QualityCheck], index: Optional[ProjectIndex] = None
     ) -> int:
         """Add missing import statements to Python files."""
+        idx = ProjectIndex.ensure(root, index)
         import_errors = [
             c for c in failed
             if c.category == "imports"
@@ -1241,13 +1613,10 @@ class AutoFixer:
             by_file.setdefault(check.file_path, []).append(check)
 
         for rel_path, checks in by_file.items():
-            file_path = root / rel_path
-            if not file_path.exists():
-                continue
-            try:
-                source = file_path.read_text(encoding="utf-8", errors="replace")
-            except OSError:
+            entry = idx.get(rel_path)
+            if entry is None:
                 continue
+            source = entry.text
 
             # Extract module names from check names: "import_missing:{rel}:{module}"
             modules = set()
@@ -1265,7 +1634,7 @@ class AutoFixer:
 
             try:
                 ast.parse(patched)
-                file_path.write_text(patched, encoding="utf-8")
+                idx.write_text(rel_path, patched)
                 logger.info("AutoFixer: added imports %s to %s", modules, rel_path)
                 fixed += 1
             except SyntaxError:
@@ -1276,9 +1645,10 @@ class AutoFixer:
         return fixed
 
     async def _fix_missing_files(
-        self, root: Path, failed: List[QualityCheck]
+        self, root: Path, failed: List[QualityCheck], index: Optional[ProjectIndex] = None
     ) -> int:
         """Generate missing files (models, schemas, routes) using the LLM."""
+        idx = ProjectIndex.ensure(root, index)
         missing_file_checks = [
             c for c in failed
             if c.category == "completeness"
@@ -1297,11 +1667,11 @@ class AutoFixer:
             rel_target = match.group(1).lstrip("/")
             target_path = root / rel_target
 
-            if target_path.exists():
+            if idx.exists(rel_target):
                 continue
 
             # Ask LLM to generate the file
-            context_files = _gather_context_files(root, target_path, max_files=3)
+            context_files = _gather_context_files(root, target_path, max_files=3, index=idx)
             context_block = "\n\n".join(
                 f"# {name}\n```python\n{content}\n```"
                 for name, content in context_files
@@ -1316,8 +1686,7 @@ class AutoFixer:
             )
 
             try:
-                response = await asyncio.to_thread(
-                    self._client.complete,
+                response = await self._client.acomplete(
                     prompt,
                     None,
                     4096,
@@ -1328,8 +1697,7 @@ class AutoFixer:
                 # Validate before writing
                 if target_path.suffix == ".py":
                     ast.parse(content)
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-                target_path.write_text(content, encoding="utf-8")
+                idx.write_text(rel_target, content)
                 logger.info("AutoFixer: generated missing file %s", rel_target)
                 fixed += 1
             except SyntaxError as exc:
@@ -1354,15 +1722,18 @@ def _find_dir(root: Path, candidates: List[str]) -> Path:
     return root
 
 
-def _extract_class_fields(py_file: Path) -> set[str]:
+def _index_paths_under(index: ProjectIndex, directory: Path) -> List[str]:
+    """Relative paths of the indexed files and directories below *directory*."""
+    return [f.rel for f in index.files(under=directory)] + index.dirs(under=directory)
+
+
+def _extract_class_fields(py_file: IndexedFile) -> set[str]:
     """
-    Parse a Python file and return the set of field/attribute names defined
-    inside class bodies (SQLAlchemy columns or Pydantic fields).
+    Return the set of field/attribute names defined inside class bodies
+    (SQLAlchemy columns or Pydantic fields) of an indexed Python file.
     """
-    try:
-        source = py_file.read_text(encoding="utf-8", errors="replace")
-        tree = ast.parse(source)
-    except (SyntaxError, OSError):
+    tree = py_file.tree
+    if tree is None:
         return set()
 
     fields: set[str] = set()
@@ -1391,23 +1762,22 @@ def _strip_code_fences(text: str) -> str:
 
 
 def _gather_context_files(
-    root: Path, target: Path, max_files: int = 3
+    root: Path,
+    target: Path,
+    max_files: int = 3,
+    index: Optional[ProjectIndex] = None,
 ) -> List[Tuple[str, str]]:
     """
     Gather a few existing Python files from the same package directory
     to use as context for LLM generation.
     """
-    parent = target.parent
+    idx = ProjectIndex.ensure(root, index)
     results: List[Tuple[str, str]] = []
 
-    for sibling in sorted(parent.glob("*.py")):
-        if sibling.stem == "__init__":
-            continue
-        try:
-            content = sibling.read_text(encoding="utf-8", errors="replace")[:2000]
-            results.append((str(sibling.relative_to(root)), content))
-        except OSError:
+    for sibling in idx.files([".py"], under=target.parent, recursive=False):
+        if sibling.name == "__init__.py":
             continue
+        results.append((sibling.rel, sibling.text[:2000]))
         if len(results) >= max_files:
             break
 
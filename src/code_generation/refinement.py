@@ -526,8 +526,7 @@ Return a JSON object in EXACTLY this format:
 Only include files that genuinely need to change. Limit to the most impactful changes.
 """
 
-        raw = await asyncio.to_thread(
-            self._client.complete,
+        raw = await self._client.acomplete(
             user_prompt,
             system_prompt,
             4096,
@@ -599,8 +598,7 @@ Return ONLY the complete new file content. Do not include any commentary before
 """
 
         try:
-            raw = await asyncio.to_thread(
-                self._client.complete,
+            raw = await self._client.acomplete(
                 user_prompt,
                 system_prompt,
                 4096,
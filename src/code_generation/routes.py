@@ -3,18 +3,17 @@
 from __future__ import annotations
 
 import asyncio
-import io
 import json
 import logging
 import uuid
-import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, Field
 
+from src.code_generation.job_store import JobStore, job_store_from_env, parse_timestamp
 from src.code_generation.pipeline import GenerationPipeline, PipelineProgress, PipelineResult
 from src.code_generation.refinement import (
     RefinementEngine,
@@ -25,16 +24,21 @@ from src.code_generation.refinement import (
     refinement_history,
 )
 from src.code_generation.refinement_chat import ChatManager, RefinementChat, chat_manager
+from src.code_generation.zip_export import get_default_zip_cache, iter_project_zip, project_files, tree_hash
+from src.services.progress_channel import ProgressChannel
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v2", tags=["code-generation-v2"])
 
 # ---------------------------------------------------------------------------
-# In-memory job store
+# Job store
 # ---------------------------------------------------------------------------
-# Shape: { job_id: JobRecord }
-_jobs: Dict[str, "JobRecord"] = {}
+
+
+def _progress_coalesce_key(event: PipelineProgress) -> Optional[str]:
+    """Progress within one phase supersedes earlier progress; the final event is kept."""
+    return None if event.phase == "complete" else event.phase
 
 
 class JobRecord:
@@ -49,23 +53,50 @@ class JobRecord:
         self.result: Optional[PipelineResult] = None
         self.error: Optional[str] = None
         self.progress: Optional[PipelineProgress] = None
-        # Subscribers waiting on WebSocket progress
-        self._progress_queue: asyncio.Queue = asyncio.Queue()
+        # Progress events for any number of WebSocket subscribers
+        self.events = ProgressChannel(coalesce_key=_progress_coalesce_key)
 
-    def push_progress(self, event: PipelineProgress) -> None:
-        """Put a progress event onto the queue for WebSocket consumers."""
+    def push_progress(self, event: PipelineProgress) -> int:
+        """Publish a progress event to WebSocket subscribers; return its sequence number."""
         self.progress = event
-        try:
-            self._progress_queue.put_nowait(event)
-        except asyncio.QueueFull:
-            pass  # Non-blocking — drop if no consumer
+        return self.events.publish(event)
+
+    async def wait_progress(
+        self, after: int = 0, timeout: float = 60.0,
+    ) -> List[Tuple[int, PipelineProgress]]:
+        """Progress events after sequence number *after*, waiting up to *timeout* for one."""
+        return await self.events.wait(after, timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable state for the persistent job store."""
+        return {
+            "job_id": self.job_id,
+            "request": self.request.model_dump(mode="json"),
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "result": self.result.model_dump(mode="json") if self.result else None,
+            "error": self.error,
+            "progress": self.progress.model_dump(mode="json") if self.progress else None,
+        }
 
-    async def next_progress(self, timeout: float = 60.0) -> Optional[PipelineProgress]:
-        """Wait for the next progress event (used by WebSocket handler)."""
-        try:
-            return await asyncio.wait_for(self._progress_queue.get(), timeout=timeout)
-        except asyncio.TimeoutError:
-            return None
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobRecord":
+        """Rebuild a record saved with :meth:`to_dict`."""
+        job = cls(data["job_id"], GenerateRequest.model_validate(data["request"]))
+        job.status = data["status"]
+        job.created_at = parse_timestamp(data["created_at"]) or job.created_at
+        job.completed_at = parse_timestamp(data.get("completed_at"))
+        if data.get("result"):
+            job.result = PipelineResult.model_validate(data["result"])
+        job.error = data.get("error")
+        if data.get("progress"):
+            job.progress = PipelineProgress.model_validate(data["progress"])
+        return job
+
+
+# Persistent (SQLite), bounded registry of jobs; see job_store for settings
+_jobs: JobStore = job_store_from_env(JobRecord.from_dict)
 
 
 # ---------------------------------------------------------------------------
@@ -135,6 +166,7 @@ async def _run_pipeline(job_id: str, req: "GenerateRequest") -> None:
         return
 
     job.status = "running"
+    await asyncio.to_thread(_jobs.save, job)
     pipeline = GenerationPipeline()
 
     customization = {
@@ -160,7 +192,11 @@ async def _run_pipeline(job_id: str, req: "GenerateRequest") -> None:
             max_fix_rounds=req.max_fix_rounds,
             customization=customization,
         ):
+            phase_changed = job.progress is None or job.progress.phase != progress_event.phase
             job.push_progress(progress_event)
+            if phase_changed:
+                # Lets other workers follow the job and keeps it from looking abandoned
+                await asyncio.to_thread(_jobs.save, job)
             logger.debug(
                 "[job %s] phase=%s progress=%d%% step=%s",
                 job_id,
@@ -180,6 +216,7 @@ async def _run_pipeline(job_id: str, req: "GenerateRequest") -> None:
         job.result = result
         job.status = "completed"
         job.completed_at = datetime.now(timezone.utc)
+        await asyncio.to_thread(_jobs.save, job)
         logger.info("[job %s] completed — status=%s", job_id, result.status)
 
     except Exception as exc:
@@ -187,6 +224,7 @@ async def _run_pipeline(job_id: str, req: "GenerateRequest") -> None:
         job.error = str(exc)
         job.status = "failed"
         job.completed_at = datetime.now(timezone.utc)
+        await asyncio.to_thread(_jobs.save, job)
         # Push a terminal progress event so WebSocket clients unblock
         job.push_progress(
             PipelineProgress(
@@ -278,6 +316,9 @@ async def stream_generation_progress(websocket: WebSocket, job_id: str) -> None:
 
     Connect immediately after calling ``POST /api/v2/generate``.
     The stream closes automatically when ``phase="complete"`` is reached.
+    Each message carries a ``seq`` number; reconnect with
+    ``?last_event_id=<seq>`` to resume after it. Any number of clients can
+    follow the same job.
 
     Example client (JavaScript)::
 
@@ -293,21 +334,30 @@ async def stream_generation_progress(websocket: WebSocket, job_id: str) -> None:
         return
 
     logger.info("[ws] Client connected to job %s", job_id)
+    try:
+        cursor = int(websocket.query_params.get("last_event_id", "0"))
+    except ValueError:
+        cursor = 0
 
     try:
         while True:
-            event = await job.next_progress(timeout=120.0)
+            if job.status in ("completed", "failed") and job.events.last_seq <= cursor:
+                # Finished with nothing new (e.g. a job loaded from the store):
+                # send its final state, if this client hasn't seen anything yet
+                if cursor == 0 and job.progress is not None:
+                    await websocket.send_json(job.progress.model_dump())
+                break
+
+            events = await job.wait_progress(after=cursor, timeout=120.0)
 
-            if event is None:
+            if not events:
                 # Timeout — send a keepalive ping
                 await websocket.send_json({"type": "ping"})
-                if job.status in ("completed", "failed"):
-                    break
                 continue
 
-            await websocket.send_json(event.model_dump())
-
-            if event.phase == "complete":
+            for cursor, event in events:
+                await websocket.send_json({**event.model_dump(), "seq": cursor})
+            if events[-1][1].phase == "complete":
                 break
 
     except WebSocketDisconnect:
@@ -326,6 +376,10 @@ async def stream_generation_progress(websocket: WebSocket, job_id: str) -> None:
 async def download_project(job_id: str):
     """Package the generated project as a ZIP and return it for download.
 
+    The archive is streamed while it is compressed (in the thread pool, with
+    constant memory). With the archive cache on, an unchanged project is
+    served from the cached ZIP instead.
+
     Returns:
         A ``application/zip`` response with the full project tree.
 
@@ -334,7 +388,7 @@ async def download_project(job_id: str):
         409: If the job has not completed yet.
         500: If the output directory cannot be found or zipped.
     """
-    from fastapi.responses import StreamingResponse
+    from fastapi.responses import FileResponse, StreamingResponse
 
     job = _jobs.get(job_id)
     if job is None:
@@ -353,27 +407,28 @@ async def download_project(job_id: str):
             detail=f"Output directory not found: {output_path}",
         )
 
-    # Build zip in memory
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for file_path in sorted(output_path.rglob("*")):
-            if file_path.is_file():
-                arcname = file_path.relative_to(output_path)
-                zf.write(file_path, arcname)
-    buf.seek(0)
-
     safe_name = "".join(
         c if c.isalnum() or c in "-_" else "_"
         for c in job.request.idea_name
     ).strip("_") or "project"
     filename = f"{safe_name}.zip"
 
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    cache = get_default_zip_cache()
+    if cache is None:
+        content = iter_project_zip(output_path)
+    else:
+        key = await asyncio.to_thread(tree_hash, output_path)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("[job %s] Serving cached ZIP download: %s", job_id, filename)
+            return FileResponse(cached, media_type="application/zip", headers=headers)
+        content = cache.stream(key, output_path)
+
     logger.info("[job %s] Serving ZIP download: %s", job_id, filename)
-    return StreamingResponse(
-        content=buf,
-        media_type="application/zip",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+    # A sync iterator: StreamingResponse compresses each chunk in its thread pool
+    return StreamingResponse(content=content, media_type="application/zip", headers=headers)
 
 
 @router.get("/generate/{job_id}/files")
@@ -390,7 +445,7 @@ async def list_project_files(job_id: str):
         raise HTTPException(status_code=500, detail="Output directory not found.")
 
     files = []
-    for file_path in sorted(output_path.rglob("*")):
+    for file_path in project_files(output_path):
         if file_path.is_file():
             rel_path = str(file_path.relative_to(output_path))
             try:
@@ -0,0 +1,213 @@
+"""
+Difficulty-Based Model Tiering for Code Generation.
+
+Most files of a project plan are easy: ignore files, ``tsconfig.json``,
+``postcss.config.js``, Dockerfiles. Generating them on the strong model costs
+the same latency as a CRUD router. With a :class:`ModelTiering` attached,
+:class:`~src.code_generation.engine_v2.CodeGeneratorV2` sends each request to
+one of two tiers:
+
+- ``fast`` — a cheap, low-latency provider (e.g. Groq) for files whose
+  :class:`~src.code_generation.engine_v2.FileCategory` is in
+  ``fast_categories`` and whose prompt is at most ``max_fast_prompt_tokens``;
+- ``strong`` — the generator's own client, for everything else (models,
+  schemas, routes, pages, tests).
+
+A file that fails validation on the fast tier is healed and regenerated on
+the strong tier, and is remembered in an :class:`EscalationMemory` so later
+builds send it to the strong tier straight away. The memory is shared by
+every build of the process, and survives restarts (and is shared between
+workers) when ``CODEGEN_TIER_ESCALATIONS`` names a file to keep it in.
+
+Configured per deployment with environment variables::
+
+    CODEGEN_FAST_PROVIDER=groq            # enables tiering
+    CODEGEN_FAST_MODEL=llama-3.1-8b-instant
+    CODEGEN_FAST_CATEGORIES=backend_config,frontend_config,infrastructure
+    CODEGEN_FAST_MAX_PROMPT_TOKENS=2000
+    CODEGEN_TIER_ESCALATIONS=.codegen_tier_escalations.json   # optional
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# FileCategory values of files that are simple enough for the fast tier
+DEFAULT_FAST_CATEGORIES = frozenset({"backend_config", "frontend_config", "infrastructure"})
+
+
+class ModelTier(str, Enum):
+    """Which model a generation request goes to."""
+    FAST = "fast"
+    STRONG = "strong"
+
+
+@dataclass
+class TieringConfig:
+    """Routing rules between the fast and strong tiers."""
+    # Provider of the fast tier (a get_llm_client name); None disables tiering
+    fast_provider: Optional[str] = None
+    fast_model: Optional[str] = None
+    fast_categories: FrozenSet[str] = field(default_factory=lambda: DEFAULT_FAST_CATEGORIES)
+    # Larger prompts carry enough context to need the strong model
+    max_fast_prompt_tokens: int = 2000
+    # Failed validations on the fast tier before a file moves to the strong tier
+    escalate_after_failures: int = 1
+
+    @classmethod
+    def from_env(cls) -> "TieringConfig":
+        """Read the ``CODEGEN_FAST_*`` environment variables."""
+        config = cls(
+            fast_provider=os.getenv("CODEGEN_FAST_PROVIDER", "").strip() or None,
+            fast_model=os.getenv("CODEGEN_FAST_MODEL", "").strip() or None,
+        )
+        categories = os.getenv("CODEGEN_FAST_CATEGORIES", "").strip()
+        if categories:
+            config.fast_categories = frozenset(c.strip() for c in categories.split(",") if c.strip())
+        max_tokens = os.getenv("CODEGEN_FAST_MAX_PROMPT_TOKENS", "").strip()
+        if max_tokens:
+            config.max_fast_prompt_tokens = int(max_tokens)
+        return config
+
+
+class EscalationMemory:
+    """
+    Relative paths that failed validation on the fast tier (heal history).
+
+    With a *path*, the set is loaded from and saved to that JSON file, so it
+    outlives the process; other workers pick up additions on their next
+    :meth:`__contains__` after the file changed.
+    """
+
+    def __init__(self, path: Optional[os.PathLike] = None):
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._paths: Set[str] = set()
+        self._loaded_mtime: Optional[int] = None
+        self._reload()
+
+    def _reload(self) -> None:
+        """Merge in the file's entries if it changed since the last read."""
+        if self.path is None:
+            return
+        try:
+            mtime = self.path.stat().st_mtime_ns
+            if mtime == self._loaded_mtime:
+                return
+            self._paths.update(json.loads(self.path.read_text(encoding="utf-8")))
+            self._loaded_mtime = mtime
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Could not read tier escalations from %s: %s", self.path, exc)
+
+    def __contains__(self, relative_path: object) -> bool:
+        with self._lock:
+            self._reload()
+            return relative_path in self._paths
+
+    def add(self, relative_path: str) -> None:
+        """Remember *relative_path* (and save the set when file-backed)."""
+        with self._lock:
+            self._reload()
+            if relative_path in self._paths:
+                return
+            self._paths.add(relative_path)
+            if self.path is None:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump(sorted(self._paths), fh)
+                os.replace(tmp, self.path)
+                self._loaded_mtime = self.path.stat().st_mtime_ns
+            except OSError as exc:
+                logger.warning("Could not save tier escalations to %s: %s", self.path, exc)
+
+
+_shared_escalations: Dict[Tuple[Optional[str], Optional[str], Optional[str]], EscalationMemory] = {}
+_shared_escalations_lock = threading.Lock()
+
+
+def shared_escalations(config: TieringConfig) -> EscalationMemory:
+    """
+    The process-wide :class:`EscalationMemory` of *config*'s fast tier.
+
+    Kept in the ``CODEGEN_TIER_ESCALATIONS`` file when that is set.
+    """
+    path = os.getenv("CODEGEN_TIER_ESCALATIONS", "").strip() or None
+    key = (config.fast_provider, config.fast_model, path)
+    with _shared_escalations_lock:
+        memory = _shared_escalations.get(key)
+        if memory is None:
+            memory = _shared_escalations[key] = EscalationMemory(path)
+        return memory
+
+
+class ModelTiering:
+    """Picks a tier per request and holds the fast tier's client."""
+
+    def __init__(
+        self,
+        config: TieringConfig,
+        fast_client: Any,
+        escalations: Optional[EscalationMemory] = None,
+    ):
+        self.config = config
+        self.fast_client = fast_client
+        # Files that failed validation on the fast tier, in this and earlier builds
+        self.escalations = escalations if escalations is not None else EscalationMemory()
+
+    @classmethod
+    def from_env(cls) -> Optional["ModelTiering"]:
+        """Tiering configured by the environment, or None when it is off."""
+        config = TieringConfig.from_env()
+        if config.fast_provider is None:
+            return None
+        from src.llm import get_llm_client
+
+        try:
+            fast_client = get_llm_client(config.fast_provider, model=config.fast_model)
+        except Exception as exc:
+            logger.warning(
+                "Fast model tier (%s) unavailable, using one model for every file: %s",
+                config.fast_provider, exc,
+            )
+            return None
+        return cls(config, fast_client, shared_escalations(config))
+
+    def choose(
+        self,
+        relative_path: str,
+        category: Optional[str],
+        prompt_tokens: int,
+        failures: int = 0,
+    ) -> ModelTier:
+        """
+        The tier for generating *relative_path*.
+
+        *failures* is the number of failed validations of this file so far;
+        with ``escalate_after_failures`` of them the file goes to the strong tier.
+        """
+        if category is None or category not in self.config.fast_categories:
+            return ModelTier.STRONG
+        if prompt_tokens > self.config.max_fast_prompt_tokens:
+            return ModelTier.STRONG
+        if failures >= self.config.escalate_after_failures:
+            return ModelTier.STRONG
+        if relative_path in self.escalations:
+            return ModelTier.STRONG
+        return ModelTier.FAST
+
+    def record_failure(self, relative_path: str) -> None:
+        """Remember that *relative_path* did not validate on the fast tier."""
+        self.escalations.add(relative_path)
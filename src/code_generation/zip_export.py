@@ -0,0 +1,170 @@
+"""
+Streaming ZIP Export of Generated Projects.
+
+The download route used to compress the whole project into an in-memory
+buffer on the event loop before sending a byte. :func:`iter_project_zip`
+instead yields the archive in chunks while it compresses: each file is read
+and deflated ``chunk_size`` bytes at a time, and the compressed output is
+handed out as soon as it is produced, so memory stays constant however large
+the tree is. The iterator is synchronous; Starlette's ``StreamingResponse``
+runs each step in its thread pool, off the event loop.
+
+With a :class:`ZipCache`, the finished archive is kept under the output
+tree's hash (paths, sizes and modification times), and repeat downloads of
+an unchanged project are served from disk with no compression work.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from src.code_generation.project_index import is_project_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_ZIP_CACHE_DIR = ".codegen_zip_cache"
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object that collects ZipFile output."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def project_files(root: Path) -> List[Path]:
+    """Generated files under *root* (no build metadata or scratch files), in archive order."""
+    root = Path(root)
+    return sorted(
+        p for p in root.rglob("*")
+        if p.is_file() and is_project_file(p.relative_to(root).as_posix())
+    )
+
+
+def tree_hash(root: Path) -> str:
+    """Hash of the file paths, sizes and modification times under *root*."""
+    root = Path(root)
+    digest = hashlib.sha256()
+    for path in project_files(root):
+        stat = path.stat()
+        digest.update(
+            f"{path.relative_to(root).as_posix()}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode()
+        )
+    return digest.hexdigest()
+
+
+def iter_project_zip(root: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a deflated ZIP of every file under *root*, chunk by chunk."""
+    root = Path(root)
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path in project_files(root):
+            info = zipfile.ZipInfo.from_file(path, path.relative_to(root).as_posix())
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, "rb") as src, zf.open(info, mode="w") as dest:
+                while True:
+                    block = src.read(chunk_size)
+                    if not block:
+                        break
+                    dest.write(block)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory, written when the archive is closed
+    data = sink.drain()
+    if data:
+        yield data
+
+
+class ZipCache:
+    """Finished project archives on disk, keyed by :func:`tree_hash`."""
+
+    def __init__(self, root: os.PathLike = DEFAULT_ZIP_CACHE_DIR, max_entries: int = 32) -> None:
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.zip"
+
+    def get(self, key: str) -> Optional[Path]:
+        """The cached archive for *key*, or None."""
+        path = self._path(key)
+        return path if path.is_file() else None
+
+    def stream(self, key: str, root: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Stream the archive of *root* like :func:`iter_project_zip`, saving it under *key*.
+
+        The archive is only cached once it was streamed completely; an
+        aborted download leaves nothing behind.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".part")
+        complete = False
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for data in iter_project_zip(root, chunk_size):
+                    tmp.write(data)
+                    yield data
+            os.replace(tmp_name, self._path(key))
+            complete = True
+            self._evict()
+        finally:
+            if not complete:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def _evict(self) -> None:
+        """Drop the oldest archives beyond ``max_entries``."""
+        with self._lock:
+            archives = sorted(self.root.glob("*.zip"), key=lambda p: p.stat().st_mtime)
+            for path in archives[:max(0, len(archives) - self.max_entries)]:
+                try:
+                    path.unlink()
+                except OSError as exc:
+                    logger.debug("Could not evict cached archive %s: %s", path, exc)
+
+
+_default_zip_cache: Optional[ZipCache] = None
+
+
+def get_default_zip_cache() -> Optional[ZipCache]:
+    """
+    Return the process-wide archive cache, or None when it is off.
+
+    Enabled with ``CODEGEN_ZIP_CACHE=1`` (stored under
+    ``.codegen_zip_cache``) or ``CODEGEN_ZIP_CACHE=<directory>``.
+    """
+    global _default_zip_cache
+    if _default_zip_cache is None:
+        setting = os.getenv("CODEGEN_ZIP_CACHE", "").strip()
+        if not setting or setting.lower() in ("0", "false", "no"):
+            return None
+        root = DEFAULT_ZIP_CACHE_DIR if setting.lower() in ("1", "true", "yes") else setting
+        _default_zip_cache = ZipCache(root)
+    return _default_zip_cache
@@ -1452,9 +1452,12 @@ async def api_list_builds() -> List[Dict[str, Any]]:
     return build_manager.list_builds(limit=50)
 
 
-async def api_build_stream(build_id: str):
-    """GET /api/build/{build_id}/stream — SSE endpoint."""
-    import asyncio
+async def api_build_stream(build_id: str, request: Request):
+    """GET /api/build/{build_id}/stream — SSE endpoint.
+
+    Every event carries an ``id:``; a reconnecting client (``Last-Event-ID``
+    header) resumes after it. Any number of clients can follow one build.
+    """
     import json as _json
 
     from fastapi import HTTPException
@@ -1466,21 +1469,27 @@ async def api_build_stream(build_id: str):
     if not build:
         raise HTTPException(status_code=404, detail="Build not found")
 
+    try:
+        cursor = int(request.headers.get("last-event-id", "0"))
+    except ValueError:
+        cursor = 0
+
     async def _event_generator():
-        keepalive_counter = 0
+        nonlocal cursor
         while True:
-            events = build_manager.get_events(build_id)
-            for ev in events:
-                yield f"data: {_json.dumps(ev)}\n\n"
-                if ev.get("type") in ("complete", "failed"):
+            events = await build_manager.wait_events(build_id, after=cursor, timeout=15.0)
+            if not events:
+                # A client resuming after the final event has nothing left to wait for
+                current = build_manager.get_build(build_id)
+                if current is None or current["status"] in ("completed", "failed"):
                     return
-
-            keepalive_counter += 1
-            if keepalive_counter >= 30:  # 30 * 0.5s = 15s
                 yield ": keepalive\n\n"
-                keepalive_counter = 0
-
-            await asyncio.sleep(0.5)
+                continue
+            for event_id, ev in events:
+                cursor = event_id
+                yield f"id: {event_id}\ndata: {_json.dumps(ev)}\n\n"
+                if ev.get("type") in ("complete", "failed"):
+                    return
 
     return StreamingResponse(
         _event_generator(),
@@ -6,6 +6,7 @@ import logging
 from typing import Any, Dict, List
 
 from src.llm import get_llm_client
+from src.llm.similarity_cache import get_default_similarity_cache
 from src.models import IdeaCatalog, IntelligenceData, StartupIdea
 
 logger = logging.getLogger(__name__)
@@ -26,9 +27,11 @@ except ImportError:
 class LLMIdeaGenerationEngine:
     """Generates startup ideas using LLM with enhanced prompts."""
 
-    def __init__(self, config, llm_provider: str = 'groq'):
+    def __init__(self, config, llm_provider: str = 'groq', similarity_cache=None):
         self.config = config
         self.llm = get_llm_client(llm_provider)
+        # Serves ideas for near-identical pain point summaries (off by default)
+        self.similarity_cache = similarity_cache or get_default_similarity_cache()
         self.num_ideas = getattr(config.idea_generation, 'min_ideas', 10) if hasattr(config, 'idea_generation') else 10
         self.max_retries = 3
 
@@ -163,14 +166,22 @@ class LLMIdeaGenerationEngine:
 
         for attempt in range(self.max_retries):
             try:
-                # Call LLM (synchronous method in async context)
-                response = self.llm.complete(
-                    prompt=user_prompt,
+                kwargs = dict(
                     system_prompt=IDEA_GENERATION_SYSTEM_PROMPT,
                     max_tokens=4000,
                     temperature=0.8,
                     json_mode=False
                 )
+                # Retries after a parse failure must reach the LLM again
+                if self.similarity_cache is not None and attempt == 0:
+                    # Only answers that parse into ideas are cached (and replayed)
+                    response = await self.similarity_cache.acomplete(
+                        self.llm, "idea_generation", pain_points_summary, user_prompt,
+                        validate=lambda r: bool(self._parse_llm_response(r.content)),
+                        **kwargs
+                    )
+                else:
+                    response = await self.llm.acomplete(prompt=user_prompt, **kwargs)
 
                 # Parse response - response is LLMResponse object with .content
                 idea_dicts = self._parse_llm_response(response.content)
@@ -202,16 +213,14 @@ class LLMIdeaGenerationEngine:
     def generate(self, intelligence: IntelligenceData) -> IdeaCatalog:
         """Generate ideas synchronously.
         
-        Note: generate_async already makes synchronous LLM calls internally,
-        so we call its logic directly here to avoid nested asyncio.run() which
-        would crash with RuntimeError when called from within pipeline.run()
-        (which itself runs inside asyncio.run() from api.py).
+        Note: a nested asyncio.run() would crash with RuntimeError when called
+        from within pipeline.run() (which itself runs inside asyncio.run() from
+        api.py), so when a loop is already running we drive generate_async on a
+        fresh loop in a helper thread.
         """
         try:
             loop = asyncio.get_running_loop()
-            # We're inside an event loop — cannot use asyncio.run().
-            # Since generate_async's LLM calls are sync anyway, run it
-            # via the loop's thread executor to avoid blocking.
+            # We're inside an event loop — cannot use asyncio.run() here.
             import concurrent.futures
             with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
                 future = pool.submit(asyncio.run, self.generate_async(intelligence))
@@ -21,16 +21,38 @@ from src.llm.client import (
     get_llm_client,
     list_available_providers,
 )
+from src.llm.rate_governor import (
+    GovernorConfig,
+    ProviderLimiter,
+    RateGovernor,
+    get_default_governor,
+)
 from src.llm.retry_cache import (
+    CacheBackend,
     CacheConfig,
+    DiskCacheBackend,
     LLMCache,
+    MemoryLRUCache,
     RateLimitError,
+    RedisCacheBackend,
     RetryConfig,
+    SingleFlight,
     SmartRetry,
     TransientError,
     configure_llm_resilience,
     get_default_cache,
     get_default_retry,
+    get_default_single_flight,
+)
+from src.llm.routing import (
+    CircuitBreakerState,
+    RoutingConfig,
+    RoutingPolicy,
+)
+from src.llm.similarity_cache import (
+    SimilarityCache,
+    SimilarityCacheConfig,
+    get_default_similarity_cache,
 )
 
 __all__ = [
@@ -47,10 +69,29 @@ __all__ = [
     "RetryConfig",
     "CacheConfig",
     "LLMCache",
+    "CacheBackend",
+    "MemoryLRUCache",
+    "DiskCacheBackend",
+    "RedisCacheBackend",
     "SmartRetry",
+    "SingleFlight",
     "RateLimitError",
     "TransientError",
     "get_default_cache",
     "get_default_retry",
+    "get_default_single_flight",
     "configure_llm_resilience",
+    # Rate governance
+    "GovernorConfig",
+    "ProviderLimiter",
+    "RateGovernor",
+    "get_default_governor",
+    # Multi-provider routing
+    "RoutingConfig",
+    "RoutingPolicy",
+    "CircuitBreakerState",
+    # Similarity-keyed caching
+    "SimilarityCache",
+    "SimilarityCacheConfig",
+    "get_default_similarity_cache",
 ]
@@ -10,30 +10,50 @@ Groq provides ultra-fast inference as a backup option.
 Features:
 - Automatic retry with exponential backoff for rate limits and transient errors
 - Response caching to reduce API costs and improve performance
+- Request coalescing: identical concurrent requests share one provider call
+- Process-wide rate governor per (provider, model): RPM/TPM budgets and
+  adaptive concurrency that backs off on 429s
 - Unified interface across all providers
+- Native async completions (``acomplete``) so async pipelines don't need a
+  thread per in-flight request
+- Streaming completions (``astream``) yielding text deltas as they arrive
 """
 
+import asyncio
 import json
 import logging
 import os
 import time
+import weakref
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
+from .rate_governor import (
+    RateGovernor,
+    estimate_tokens,
+    get_default_governor,
+    usage_tokens,
+)
+from .routing import ProviderRouter, RoutingConfig, RoutingPolicy
 from .retry_cache import (
     CacheConfig,
     LLMCache,
     RetryConfig,
+    SingleFlight,
     SmartRetry,
     get_default_cache,
     get_default_retry,
+    get_default_single_flight,
 )
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 60
 
+# Computes request keys for clients that run without a cache
+_KEY_ONLY_CACHE = LLMCache(CacheConfig(enabled=False))
+
 
 @dataclass
 class LLMResponse:
@@ -85,6 +105,10 @@ class BaseLLMClient(ABC):
         """Initialize base client with optional retry and cache configuration."""
         self._use_cache = use_cache
         self._use_retry = use_retry
+        # Native async SDK clients, one per event loop (see _loop_client)
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
 
         # Set up caching
         if use_cache:
@@ -104,6 +128,11 @@ class BaseLLMClient(ABC):
         else:
             self._retry = None
 
+        # Identical concurrent requests share one provider call (process-wide)
+        self._single_flight: Optional[SingleFlight] = get_default_single_flight()
+        # Every provider attempt is admitted by the shared rate governor
+        self._governor: Optional[RateGovernor] = get_default_governor()
+
     @abstractmethod
     def _complete_impl(
         self,
@@ -143,45 +172,366 @@ class BaseLLMClient(ABC):
         Returns:
             LLMResponse with the completion
         """
-        # Check cache first
-        if self._cache is not None:
-            cached = self._cache.get(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                model=self.model,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                json_mode=json_mode,
-                provider=self.provider_name,
-            )
-            if cached:
-                logger.debug(f"Using cached response for {self.provider_name}")
-                return LLMResponse.from_dict(cached)
+        cached = self._get_cached(prompt, system_prompt, max_tokens, temperature, json_mode)
+        if cached is not None:
+            return cached
+
+        def call() -> LLMResponse:
+            # A call that finished between our cache miss and joining the
+            # flight has already stored its answer
+            cached = self._get_cached(prompt, system_prompt, max_tokens, temperature, json_mode)
+            if cached is not None:
+                return cached
+
+            # Make the actual call (with or without retry)
+            if self._retry is not None:
+                response = self._retry(self._governed_complete)(
+                    prompt, system_prompt, max_tokens, temperature, json_mode
+                )
+            else:
+                response = self._governed_complete(
+                    prompt, system_prompt, max_tokens, temperature, json_mode
+                )
 
-        # Make the actual call (with or without retry)
-        if self._retry is not None:
-            response = self._retry(self._complete_impl)(
+            self._store_cached(prompt, system_prompt, max_tokens, temperature, json_mode, response)
+            return response
+
+        if self._single_flight is None:
+            return call()
+        key = self._request_key(prompt, system_prompt, max_tokens, temperature, json_mode)
+        return self._single_flight.do(key, call)
+
+    def _governed_complete(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        """One :meth:`_complete_impl` attempt, admitted by the rate governor."""
+        if self._governor is None:
+            return self._complete_impl(prompt, system_prompt, max_tokens, temperature, json_mode)
+        limiter = self._governor.limiter(self.provider_name, self.model)
+        est = estimate_tokens(prompt, system_prompt, max_tokens)
+        admitted_at = limiter.acquire(est)
+        try:
+            response = self._complete_impl(prompt, system_prompt, max_tokens, temperature, json_mode)
+        except Exception as e:
+            limiter.release(admitted_at, est, error=e)
+            raise
+        limiter.release(admitted_at, est, used_tokens=usage_tokens(response.usage))
+        return response
+
+    async def _governed_acomplete(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        """One :meth:`_acomplete_impl` attempt, admitted by the rate governor."""
+        if self._governor is None:
+            return await self._acomplete_impl(
                 prompt, system_prompt, max_tokens, temperature, json_mode
             )
-        else:
-            response = self._complete_impl(
+        limiter = self._governor.limiter(self.provider_name, self.model)
+        est = estimate_tokens(prompt, system_prompt, max_tokens)
+        admitted_at = await limiter.aacquire(est)
+        try:
+            response = await self._acomplete_impl(
                 prompt, system_prompt, max_tokens, temperature, json_mode
             )
+        except BaseException as e:
+            limiter.release(admitted_at, est, error=e)
+            raise
+        limiter.release(admitted_at, est, used_tokens=usage_tokens(response.usage))
+        return response
+
+    def _loop_client(self, factory: Callable[[], Any]) -> Any:
+        """
+        Return the async SDK client for the running event loop, creating it on first use.
+
+        Async HTTP clients own connection pools bound to the loop that created
+        them, and callers such as ``LLMIdeaGenerationEngine.generate`` spin up
+        short-lived loops, so one client is kept per loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = factory()
+            self._async_clients[loop] = client
+        return client
+
+    async def _acomplete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        """
+        Internal async completion implementation.
+
+        Providers with a native async SDK override this. The default runs the
+        blocking :meth:`_complete_impl` in a worker thread so that every client
+        supports :meth:`acomplete`.
+        """
+        return await asyncio.to_thread(
+            self._complete_impl, prompt, system_prompt, max_tokens, temperature, json_mode
+        )
+
+    async def acomplete(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        """
+        Async variant of :meth:`complete` with the same caching and retry semantics.
+
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature (0-2)
+            json_mode: Request JSON output format
+
+        Returns:
+            LLMResponse with the completion
+        """
+        cached = await self._aget_cached(prompt, system_prompt, max_tokens, temperature, json_mode)
+        if cached is not None:
+            return cached
+
+        async def call() -> LLMResponse:
+            cached = await self._aget_cached(prompt, system_prompt, max_tokens, temperature, json_mode)
+            if cached is not None:
+                return cached
+
+            if self._retry is not None:
+                response = await self._retry(self._governed_acomplete)(
+                    prompt, system_prompt, max_tokens, temperature, json_mode
+                )
+            else:
+                response = await self._governed_acomplete(
+                    prompt, system_prompt, max_tokens, temperature, json_mode
+                )
+
+            await self._astore_cached(prompt, system_prompt, max_tokens, temperature, json_mode, response)
+            return response
+
+        if self._single_flight is None:
+            return await call()
+        key = self._request_key(prompt, system_prompt, max_tokens, temperature, json_mode)
+        return await self._single_flight.ado(key, call)
+
+    async def _astream_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Internal streaming implementation.
+
+        Providers with a streaming API override this. The default yields the
+        whole :meth:`_acomplete_impl` result as a single delta. Implementations
+        fill *usage* with token counts once the provider reports them.
+        """
+        response = await self._acomplete_impl(
+            prompt, system_prompt, max_tokens, temperature, json_mode
+        )
+        if usage is not None:
+            usage.update(response.usage)
+        yield response.content
+
+    def _finalize_content(self, content: str, json_mode: bool) -> str:
+        """
+        Provider-specific cleanup applied to assembled streamed text before caching.
+
+        Mirrors the post-processing each provider's ``_build_response`` applies,
+        so a cached streamed answer matches what :meth:`complete` would return.
+        """
+        return content
+
+    async def astream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion as an async iterator of text deltas.
+
+        A cached response is replayed as a single delta. Once the stream
+        finishes, the assembled text (after the same cleanup ``complete()``
+        applies) is cached together with the reported token usage. Retryable
+        errors are retried only while nothing has been yielded yet; a failure
+        mid-stream is raised to the caller, which has already seen partial output.
+
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature (0-2)
+            json_mode: Request JSON output format
+
+        Yields:
+            Raw text deltas in arrival order
+        """
+        cached = await self._aget_cached(prompt, system_prompt, max_tokens, temperature, json_mode)
+        if cached is not None:
+            yield cached.content
+            return
+
+        start = time.time()
+        chunks: List[str] = []
+        usage: Dict[str, int] = {}
+        attempt = 0
+        limiter = (
+            self._governor.limiter(self.provider_name, self.model)
+            if self._governor is not None else None
+        )
+        est = estimate_tokens(prompt, system_prompt, max_tokens)
+        while True:
+            # The governor slot is held for the whole stream
+            admitted_at = await limiter.aacquire(est) if limiter is not None else 0.0
+            try:
+                async for delta in self._astream_impl(
+                    prompt, system_prompt, max_tokens, temperature, json_mode, usage
+                ):
+                    chunks.append(delta)
+                    yield delta
+            except BaseException as e:
+                if limiter is not None:
+                    limiter.release(admitted_at, est, error=e)
+                if chunks or self._retry is None or not isinstance(e, Exception):
+                    raise
+                wait_time = self._retry.should_retry(attempt, e)
+                if wait_time is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(wait_time)
+            else:
+                if limiter is not None:
+                    limiter.release(admitted_at, est, used_tokens=usage_tokens(usage))
+                break
 
-        # Cache the response
-        if self._cache is not None and response:
-            self._cache.set(
-                prompt=prompt,
-                system_prompt=system_prompt,
+        if self._retry is not None:
+            self._retry.record_success()
+        await self._astore_cached(
+            prompt, system_prompt, max_tokens, temperature, json_mode,
+            LLMResponse(
+                content=self._finalize_content("".join(chunks), json_mode),
                 model=self.model,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                json_mode=json_mode,
                 provider=self.provider_name,
-                response=response.to_dict(),
-            )
+                usage=usage,
+                latency_ms=(time.time() - start) * 1000,
+            ),
+        )
 
-        return response
+    def _request_key(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+    ) -> str:
+        """Key identifying this request, shared by the cache and request coalescing."""
+        return (self._cache or _KEY_ONLY_CACHE)._generate_key(
+            prompt, system_prompt, self.model, temperature, max_tokens, json_mode,
+            self.provider_name,
+        )
+
+    def _get_cached(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+    ) -> Optional[LLMResponse]:
+        """Return the cached response for this request, if any."""
+        if self._cache is None:
+            return None
+        cached = self._cache.get(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            model=self.model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+            provider=self.provider_name,
+        )
+        if cached:
+            logger.debug(f"Using cached response for {self.provider_name}")
+            return LLMResponse.from_dict(cached)
+        return None
+
+    def _store_cached(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+        response: Optional[LLMResponse],
+    ) -> None:
+        """Store a fresh response in the cache."""
+        if self._cache is None or not response:
+            return
+        self._cache.set(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            model=self.model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+            provider=self.provider_name,
+            response=response.to_dict(),
+        )
+
+    async def _aget_cached(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+    ) -> Optional[LLMResponse]:
+        """:meth:`_get_cached` in a worker thread, so disk and Redis lookups don't block the loop."""
+        if self._cache is None:
+            return None
+        return await asyncio.to_thread(
+            self._get_cached, prompt, system_prompt, max_tokens, temperature, json_mode
+        )
+
+    async def _astore_cached(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+        response: Optional[LLMResponse],
+    ) -> None:
+        """:meth:`_store_cached` in a worker thread."""
+        if self._cache is None or not response:
+            return
+        await asyncio.to_thread(
+            self._store_cached, prompt, system_prompt, max_tokens, temperature, json_mode, response
+        )
 
     def complete_with_retry(
         self,
@@ -272,16 +622,20 @@ class PerplexityClient(BaseLLMClient):
     def model(self) -> str:
         return self._model
 
-    def _complete_impl(
+    @property
+    def async_client(self):
+        """``AsyncOpenAI`` client pointed at the Perplexity API."""
+        from openai import AsyncOpenAI
+        return self._loop_client(lambda: AsyncOpenAI(api_key=self.api_key, base_url=self.base_url))
+
+    def _build_request(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-        json_mode: bool = False
-    ) -> LLMResponse:
-        start_time = time.time()
-
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+    ) -> Dict[str, Any]:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -292,16 +646,15 @@ class PerplexityClient(BaseLLMClient):
 
         messages.append({"role": "user", "content": user_content})
 
-        kwargs = {
+        return {
             "model": self.model,
             "messages": messages,
             "max_tokens": max_tokens,
             "temperature": temperature,
+            "timeout": DEFAULT_TIMEOUT,
         }
 
-        kwargs["timeout"] = DEFAULT_TIMEOUT
-        response = self.client.chat.completions.create(**kwargs)
-
+    def _build_response(self, response: Any, start_time: float, json_mode: bool) -> LLMResponse:
         latency_ms = (time.time() - start_time) * 1000
 
         content = response.choices[0].message.content
@@ -321,6 +674,55 @@ class PerplexityClient(BaseLLMClient):
             raw_response=response
         )
 
+    def _complete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        start_time = time.time()
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+        response = self.client.chat.completions.create(**kwargs)
+        return self._build_response(response, start_time, json_mode)
+
+    async def _acomplete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        start_time = time.time()
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+        response = await self.async_client.chat.completions.create(**kwargs)
+        return self._build_response(response, start_time, json_mode)
+
+    async def _astream_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+        stream = await self.async_client.chat.completions.create(**kwargs, stream=True)
+        async for chunk in stream:
+            if usage is not None and getattr(chunk, "usage", None):
+                usage.update({
+                    "prompt_tokens": getattr(chunk.usage, 'prompt_tokens', 0),
+                    "completion_tokens": getattr(chunk.usage, 'completion_tokens', 0),
+                })
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def _finalize_content(self, content: str, json_mode: bool) -> str:
+        return self._clean_json_response(content) if json_mode else content
+
     def _clean_json_response(self, content: str) -> str:
         """Clean markdown code blocks from JSON response."""
         content = content.strip()
@@ -418,16 +820,20 @@ class OpenAIClient(BaseLLMClient):
     def model(self) -> str:
         return self._model
 
-    def _complete_impl(
+    @property
+    def async_client(self):
+        """``openai.AsyncOpenAI`` client for the running event loop."""
+        import openai
+        return self._loop_client(lambda: openai.AsyncOpenAI(api_key=self.api_key))
+
+    def _build_request(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-        json_mode: bool = False
-    ) -> LLMResponse:
-        start = time.time()
-
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+    ) -> Dict[str, Any]:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -444,23 +850,85 @@ class OpenAIClient(BaseLLMClient):
             kwargs["response_format"] = {"type": "json_object"}
 
         kwargs["timeout"] = DEFAULT_TIMEOUT
+        return kwargs
+
+    def _build_response(self, response: Any, start: float) -> LLMResponse:
+        latency_ms = (time.time() - start) * 1000
+
+        return LLMResponse(
+            content=response.choices[0].message.content,
+            model=self._model,
+            provider=self.provider_name,
+            usage={
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens,
+            },
+            latency_ms=latency_ms,
+            raw_response=response,
+        )
+
+    def _complete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        start = time.time()
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
 
         try:
             response = self.client.chat.completions.create(**kwargs)
-            latency_ms = (time.time() - start) * 1000
+            return self._build_response(response, start)
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
 
-            return LLMResponse(
-                content=response.choices[0].message.content,
-                model=self._model,
-                provider=self.provider_name,
-                usage={
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens,
-                },
-                latency_ms=latency_ms,
-                raw_response=response,
+    async def _acomplete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        start = time.time()
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+
+        try:
+            response = await self.async_client.chat.completions.create(**kwargs)
+            return self._build_response(response, start)
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
+
+    async def _astream_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+
+        try:
+            stream = await self.async_client.chat.completions.create(
+                **kwargs, stream=True, stream_options={"include_usage": True}
             )
+            async for chunk in stream:
+                # With include_usage the final chunk has no choices, only usage
+                if usage is not None and chunk.usage:
+                    usage.update({
+                        "prompt_tokens": chunk.usage.prompt_tokens,
+                        "completion_tokens": chunk.usage.completion_tokens,
+                        "total_tokens": chunk.usage.total_tokens,
+                    })
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             raise
@@ -513,16 +981,19 @@ class AnthropicClient(BaseLLMClient):
     def model(self) -> str:
         return self._model
 
-    def _complete_impl(
+    @property
+    def async_client(self):
+        """``anthropic.AsyncAnthropic`` client for the running event loop."""
+        import anthropic
+        return self._loop_client(lambda: anthropic.AsyncAnthropic(api_key=self.api_key))
+
+    def _build_request(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-        json_mode: bool = False
-    ) -> LLMResponse:
-        start = time.time()
-
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+    ) -> Dict[str, Any]:
         kwargs = {
             "model": self._model,
             "max_tokens": max_tokens,
@@ -534,30 +1005,91 @@ class AnthropicClient(BaseLLMClient):
             kwargs["system"] = system_prompt
 
         kwargs["timeout"] = DEFAULT_TIMEOUT
+        return kwargs
+
+    def _finalize_content(self, content: str, json_mode: bool) -> str:
+        if json_mode and not content.strip().startswith("{"):
+            # Try to extract JSON from markdown code blocks
+            import re
+            json_match = re.search(r'```json\s*(\{.*?\})\s*```', content, re.DOTALL)
+            if json_match:
+                content = json_match.group(1)
+        return content
+
+    def _build_response(self, response: Any, start: float, json_mode: bool) -> LLMResponse:
+        latency_ms = (time.time() - start) * 1000
+
+        content = self._finalize_content(response.content[0].text, json_mode)
+
+        return LLMResponse(
+            content=content,
+            model=self._model,
+            provider=self.provider_name,
+            usage={
+                "input_tokens": response.usage.input_tokens,
+                "output_tokens": response.usage.output_tokens,
+            },
+            latency_ms=latency_ms,
+            raw_response=response,
+        )
+
+    def _complete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        start = time.time()
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature)
 
         try:
             response = self.client.messages.create(**kwargs)
-            latency_ms = (time.time() - start) * 1000
-
-            content = response.content[0].text
-            if json_mode and not content.strip().startswith("{"):
-                # Try to extract JSON from markdown code blocks
-                import re
-                json_match = re.search(r'```json\s*(\{.*?\})\s*```', content, re.DOTALL)
-                if json_match:
-                    content = json_match.group(1)
-
-            return LLMResponse(
-                content=content,
-                model=self._model,
-                provider=self.provider_name,
-                usage={
-                    "input_tokens": response.usage.input_tokens,
-                    "output_tokens": response.usage.output_tokens,
-                },
-                latency_ms=latency_ms,
-                raw_response=response,
-            )
+            return self._build_response(response, start, json_mode)
+        except Exception as e:
+            logger.error(f"Anthropic API error: {e}")
+            raise
+
+    async def _acomplete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        start = time.time()
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature)
+
+        try:
+            response = await self.async_client.messages.create(**kwargs)
+            return self._build_response(response, start, json_mode)
+        except Exception as e:
+            logger.error(f"Anthropic API error: {e}")
+            raise
+
+    async def _astream_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature)
+
+        try:
+            async with self.async_client.messages.stream(**kwargs) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                if usage is not None:
+                    final = await stream.get_final_message()
+                    usage.update({
+                        "input_tokens": final.usage.input_tokens,
+                        "output_tokens": final.usage.output_tokens,
+                    })
         except Exception as e:
             logger.error(f"Anthropic API error: {e}")
             raise
@@ -608,6 +1140,52 @@ class GoogleClient(BaseLLMClient):
     def model(self) -> str:
         return self._model
 
+    @property
+    def async_client(self):
+        """google-genai async surface (``Client.aio``) for the running event loop."""
+        from google import genai
+        return self._loop_client(lambda: genai.Client(api_key=self.api_key).aio)
+
+    def _build_request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+    ) -> Dict[str, Any]:
+        from google.genai import types
+
+        # Combine system and user prompts for Gemini
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+
+        if json_mode:
+            full_prompt += "\n\nRespond with valid JSON only."
+
+        return {
+            "model": self._model,
+            "contents": full_prompt,
+            "config": types.GenerateContentConfig(
+                temperature=temperature,
+                max_output_tokens=max_tokens,
+                http_options=types.HttpOptions(timeout=DEFAULT_TIMEOUT * 1000),
+            ),
+        }
+
+    def _build_response(self, response: Any, start: float) -> LLMResponse:
+        latency_ms = (time.time() - start) * 1000
+
+        return LLMResponse(
+            content=response.text,
+            model=self._model,
+            provider=self.provider_name,
+            usage={},
+            latency_ms=latency_ms,
+            raw_response=response,
+        )
+
     def _complete_impl(
         self,
         prompt: str,
@@ -618,35 +1196,46 @@ class GoogleClient(BaseLLMClient):
     ) -> LLMResponse:
         start = time.time()
 
-        # Combine system and user prompts for Gemini
-        full_prompt = prompt
-        if system_prompt:
-            full_prompt = f"{system_prompt}\n\n{prompt}"
+        try:
+            kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+            response = self.client.models.generate_content(**kwargs)
+            return self._build_response(response, start)
+        except Exception as e:
+            logger.error(f"Google API error: {e}")
+            raise
 
-        if json_mode:
-            full_prompt += "\n\nRespond with valid JSON only."
+    async def _acomplete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        start = time.time()
 
         try:
-            from google.genai import types
-            response = self.client.models.generate_content(
-                model=self._model,
-                contents=full_prompt,
-                config=types.GenerateContentConfig(
-                    temperature=temperature,
-                    max_output_tokens=max_tokens,
-                    http_options=types.HttpOptions(timeout=DEFAULT_TIMEOUT * 1000),
-                ),
-            )
-            latency_ms = (time.time() - start) * 1000
+            kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+            response = await self.async_client.models.generate_content(**kwargs)
+            return self._build_response(response, start)
+        except Exception as e:
+            logger.error(f"Google API error: {e}")
+            raise
 
-            return LLMResponse(
-                content=response.text,
-                model=self._model,
-                provider=self.provider_name,
-                usage={},
-                latency_ms=latency_ms,
-                raw_response=response,
-            )
+    async def _astream_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        try:
+            kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+            async for chunk in await self.async_client.models.generate_content_stream(**kwargs):
+                if chunk.text:
+                    yield chunk.text
         except Exception as e:
             logger.error(f"Google API error: {e}")
             raise
@@ -699,16 +1288,20 @@ class GroqClient(BaseLLMClient):
     def model(self) -> str:
         return self._model
 
-    def _complete_impl(
+    @property
+    def async_client(self):
+        """``groq.AsyncGroq`` client for the running event loop."""
+        from groq import AsyncGroq
+        return self._loop_client(lambda: AsyncGroq(api_key=self.api_key))
+
+    def _build_request(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-        json_mode: bool = False
-    ) -> LLMResponse:
-        start_time = time.time()
-
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+    ) -> Dict[str, Any]:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -730,8 +1323,9 @@ class GroqClient(BaseLLMClient):
             kwargs["response_format"] = {"type": "json_object"}
 
         kwargs["timeout"] = DEFAULT_TIMEOUT
-        response = self.client.chat.completions.create(**kwargs)
+        return kwargs
 
+    def _build_response(self, response: Any, start_time: float) -> LLMResponse:
         latency_ms = (time.time() - start_time) * 1000
 
         return LLMResponse(
@@ -747,6 +1341,55 @@ class GroqClient(BaseLLMClient):
             raw_response=response
         )
 
+    def _complete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        start_time = time.time()
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+        response = self.client.chat.completions.create(**kwargs)
+        return self._build_response(response, start_time)
+
+    async def _acomplete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        start_time = time.time()
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+        response = await self.async_client.chat.completions.create(**kwargs)
+        return self._build_response(response, start_time)
+
+    async def _astream_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        kwargs = self._build_request(prompt, system_prompt, max_tokens, temperature, json_mode)
+        stream = await self.async_client.chat.completions.create(**kwargs, stream=True)
+        async for chunk in stream:
+            # Groq reports usage on the final chunk under ``x_groq``
+            chunk_usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+            if usage is not None and chunk_usage:
+                usage.update({
+                    "prompt_tokens": chunk_usage.prompt_tokens,
+                    "completion_tokens": chunk_usage.completion_tokens,
+                    "total_tokens": chunk_usage.total_tokens,
+                })
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
 
 class MockLLMClient(BaseLLMClient):
     """Mock LLM client for testing without API calls."""
@@ -783,6 +1426,17 @@ class MockLLMClient(BaseLLMClient):
             latency_ms=10
         )
 
+    async def _acomplete_impl(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        # Pure CPU work — no need to hop to a worker thread.
+        return self._complete_impl(prompt, system_prompt, max_tokens, temperature, json_mode)
+
     def _generate_mock_json(self, prompt: str) -> str:
         """Generate contextual mock JSON based on prompt content."""
         prompt_lower = prompt.lower()
@@ -918,14 +1572,32 @@ class MockLLMClient(BaseLLMClient):
 
 
 class MultiProviderClient(BaseLLMClient):
-    """Client that fails over between Perplexity and Groq."""
+    """
+    Client that routes each request across several providers.
+
+    Providers are tried in the order chosen by a :class:`RoutingPolicy`
+    (configured priority, lowest EWMA latency, or latency/error weighted).
+    A per-provider circuit breaker skips providers that keep failing, so
+    failover doesn't pay a full timeout per dead provider on every call.
+    With ``RoutingConfig.hedge`` enabled, :meth:`acomplete` also sends the
+    request to the next provider once the first has run past its p95
+    latency, and returns whichever answers first.
+    """
 
     provider_name = "multi"
 
-    def __init__(self, providers: Optional[List[BaseLLMClient]] = None):
+    def __init__(
+        self,
+        providers: Optional[List[BaseLLMClient]] = None,
+        routing: Optional[RoutingConfig] = None,
+    ):
         """
         Initialize with providers. If none provided, auto-detects available.
 
+        Args:
+            providers: Clients to route between, in priority order.
+            routing: Routing policy, circuit breaker and hedging settings.
+
         Priority order:
         1. OpenAI (most popular, reliable)
         2. Anthropic (high quality Claude models)
@@ -977,6 +1649,8 @@ class MultiProviderClient(BaseLLMClient):
                 logger.warning("No providers available, adding mock")
                 self.providers.append(MockLLMClient())
 
+        self.router = ProviderRouter(self.providers, routing)
+
         logger.info(f"Initialized MultiProvider with {len(self.providers)} providers: {[p.provider_name for p in self.providers]}")
 
     @property
@@ -995,6 +1669,10 @@ class MultiProviderClient(BaseLLMClient):
         # But if somehow invoked without any providers succeeding, raise explicitly.
         raise RuntimeError("All LLM providers failed — no response received")
 
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker state, EWMA latency and error rate for each provider."""
+        return self.router.stats()
+
     def complete(
         self,
         prompt: str,
@@ -1003,26 +1681,140 @@ class MultiProviderClient(BaseLLMClient):
         temperature: float = 0.7,
         json_mode: bool = False
     ) -> LLMResponse:
-        last_error = None
-
-        for provider in self.providers:
+        for index, _claimed in self.router.candidates():
+            provider, health = self.providers[index], self.router.health[index]
+            start = time.monotonic()
             try:
                 logger.info(f"Trying provider: {provider.provider_name}")
                 response = provider.complete(prompt, system_prompt, max_tokens, temperature, json_mode)
+            except Exception as e:
+                logger.warning(f"Provider {provider.provider_name} failed: {e}")
+                health.record_failure(e)
+                continue
+            health.record_success(_observed_latency(response, start))
+            logger.info(f"Success with provider: {provider.provider_name}")
+            return response
+
+        raise RuntimeError("All LLM providers failed — no response received")
+
+    async def _attempt(self, index: int, claimed: bool, *args: Any) -> LLMResponse:
+        """One provider's acomplete, feeding the outcome into its health record."""
+        provider, health = self.providers[index], self.router.health[index]
+        start = time.monotonic()
+        try:
+            logger.info(f"Trying provider: {provider.provider_name}")
+            response = await provider.acomplete(*args)
+        except asyncio.CancelledError:
+            # Lost a hedge race: no verdict on this provider
+            if claimed:
+                health.release_probe()
+            raise
+        except Exception as e:
+            logger.warning(f"Provider {provider.provider_name} failed: {e}")
+            health.record_failure(e)
+            raise
+        health.record_success(_observed_latency(response, start))
+        logger.info(f"Success with provider: {provider.provider_name}")
+        return response
+
+    async def acomplete(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> LLMResponse:
+        args = (prompt, system_prompt, max_tokens, temperature, json_mode)
+        # Claimed lazily: taking a provider's half-open probe slot we don't use would block it
+        candidates = self.router.candidates()
+        running: Dict[asyncio.Task, int] = {}
+        exhausted = False
+
+        def launch() -> Optional[int]:
+            nonlocal exhausted
+            candidate = next(candidates, None)
+            if candidate is None:
+                exhausted = True
+                return None
+            index, claimed = candidate
+            running[asyncio.ensure_future(self._attempt(index, claimed, *args))] = index
+            return index
+
+        try:
+            launch()
+            while running:
+                # Hedge to the next provider once the oldest attempt runs past its p95
+                delay = (
+                    self.router.hedge_delay(next(iter(running.values())))
+                    if not exhausted and len(running) == 1 else None
+                )
+                done, _ = await asyncio.wait(
+                    running, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    index = launch()
+                    if index is not None:
+                        logger.info(
+                            f"Hedging request to {self.providers[index].provider_name} "
+                            f"after {delay:.2f}s"
+                        )
+                    continue
+                for task in done:
+                    del running[task]
+                    if task.exception() is None:
+                        return task.result()
+                if not running:
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+
+        raise RuntimeError("All LLM providers failed — no response received")
+
+    async def astream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False
+    ) -> AsyncIterator[str]:
+        # Fail over only before the first delta — once output has been
+        # yielded, switching providers would splice two different answers.
+        for index, _claimed in self.router.candidates():
+            provider, health = self.providers[index], self.router.health[index]
+            started = False
+            start = time.monotonic()
+            try:
+                logger.info(f"Trying provider: {provider.provider_name}")
+                async for delta in provider.astream(prompt, system_prompt, max_tokens, temperature, json_mode):
+                    if not started:
+                        # Time to first delta is what routing cares about
+                        health.record_success(time.monotonic() - start)
+                        started = True
+                    yield delta
+                if not started:
+                    health.record_success(time.monotonic() - start)
                 logger.info(f"Success with provider: {provider.provider_name}")
-                return response
+                return
             except Exception as e:
-                # TODO: Differentiate error types:
-                # - RateLimitError → retry after delay
-                # - AuthenticationError → skip provider permanently
-                # - TimeoutError → retry once, then skip
+                if started:
+                    raise
                 logger.warning(f"Provider {provider.provider_name} failed: {e}")
-                last_error = e
+                health.record_failure(e)
                 continue
 
         raise RuntimeError("All LLM providers failed — no response received")
 
 
+def _observed_latency(response: Any, start: float) -> Optional[float]:
+    """Wall time of a provider call, or None for cache hits (which say nothing about the provider)."""
+    if getattr(response, "cached", False) is True:
+        return None
+    return time.monotonic() - start
+
+
 def get_llm_client(
     provider: str = "auto",
     api_key: Optional[str] = None,
@@ -0,0 +1,293 @@
+"""
+Process-Wide Rate Governor for LLM Calls
+
+Every provider call made through :class:`~src.llm.client.BaseLLMClient`
+passes through a :class:`ProviderLimiter` keyed by ``(provider, model)``,
+shared by every client, engine and concurrent build in the process:
+
+- Requests/minute and tokens/minute token buckets (when limits are known).
+  Token cost is estimated up front from the prompt size and ``max_tokens``
+  and corrected from the provider's reported usage afterwards.
+- An adaptive concurrency limit (AIMD): each success grows the limit by
+  roughly one slot per window, each rate-limit error halves it and pauses
+  the key for the provider's ``retry-after`` hint.
+
+Limits come from :class:`GovernorConfig`, overridable per provider with
+``LLM_<PROVIDER>_RPM`` / ``LLM_<PROVIDER>_TPM`` (and ``LLM_RPM`` / ``LLM_TPM``
+for all providers), or programmatically with :meth:`RateGovernor.configure`.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Tuple
+
+from .retry_cache import extract_retry_after, is_rate_limit_error
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio used to estimate prompt cost before the call
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class GovernorConfig:
+    """Budgets and AIMD parameters for one (provider, model) key."""
+    requests_per_minute: Optional[float] = None  # None = no request budget
+    tokens_per_minute: Optional[float] = None  # None = no token budget
+    initial_concurrency: float = 8
+    min_concurrency: float = 1
+    max_concurrency: float = 64
+    decrease_factor: float = 0.5
+    # Pause applied after a 429 without a retry-after hint
+    default_cooldown_seconds: float = 1.0
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        logger.warning(f"Ignoring non-numeric {name}={value!r}")
+        return None
+
+
+class _TokenBucket:
+    """Continuously refilling bucket; callers hold the limiter lock."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until *amount* is available (0 if it is now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class ProviderLimiter:
+    """Rate budgets and adaptive concurrency for one (provider, model)."""
+
+    # Poll interval while waiting for a concurrency slot
+    SLOT_POLL_SECONDS = 0.02
+
+    def __init__(self, key: Tuple[str, str], config: GovernorConfig):
+        self.key = key
+        self.config = config
+        self._lock = threading.Lock()
+        self._requests = (
+            _TokenBucket(config.requests_per_minute) if config.requests_per_minute else None
+        )
+        self._tokens = (
+            _TokenBucket(config.tokens_per_minute) if config.tokens_per_minute else None
+        )
+        self.limit = float(config.initial_concurrency)
+        self.in_flight = 0
+        self._blocked_until = 0.0
+        # Calls started before this time were admitted under the old limit;
+        # their 429s shouldn't halve it again
+        self._last_decrease = 0.0
+        self.successes = 0
+        self.rate_limited = 0
+        self.wait_seconds = 0.0
+
+    # -- admission ---------------------------------------------------------
+
+    def _try_acquire(self, est_tokens: int) -> float:
+        """Admit one call and return 0, or return how long to wait before trying again."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self.in_flight >= max(1, int(self.limit)):
+                return self.SLOT_POLL_SECONDS
+            wait = 0.0
+            if self._requests is not None:
+                wait = max(wait, self._requests.wait_time(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.wait_time(est_tokens, now))
+            if wait > 0:
+                return wait
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(est_tokens)
+            self.in_flight += 1
+            return 0.0
+
+    def acquire(self, est_tokens: int = 0) -> float:
+        """Block until a call may start; returns the admission time for :meth:`release`."""
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(est_tokens)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+        self.wait_seconds += waited
+        return time.monotonic()
+
+    async def aacquire(self, est_tokens: int = 0) -> float:
+        """Async counterpart of :meth:`acquire`."""
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(est_tokens)
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        self.wait_seconds += waited
+        return time.monotonic()
+
+    # -- feedback ----------------------------------------------------------
+
+    def release(
+        self,
+        admitted_at: float,
+        est_tokens: int = 0,
+        used_tokens: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Return the slot taken by :meth:`acquire` and feed the outcome back.
+
+        *used_tokens* (from the provider's usage report) corrects the token
+        bucket for the difference from the up-front estimate.
+        """
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if self._tokens is not None and used_tokens is not None:
+                diff = est_tokens - used_tokens
+                if diff > 0:
+                    self._tokens.give_back(diff)
+                else:
+                    self._tokens.take(-diff)
+
+            if error is not None and is_rate_limit_error(error):
+                self.rate_limited += 1
+                hint = extract_retry_after(error)
+                cooldown = hint if hint is not None else self.config.default_cooldown_seconds
+                self._blocked_until = max(self._blocked_until, time.monotonic() + cooldown)
+                if admitted_at >= self._last_decrease:
+                    self.limit = max(
+                        self.config.min_concurrency, self.limit * self.config.decrease_factor
+                    )
+                    self._last_decrease = time.monotonic()
+                    logger.warning(
+                        f"Rate limited on {self.key[0]}/{self.key[1]}: concurrency -> "
+                        f"{int(self.limit)}, pausing {cooldown:.1f}s"
+                    )
+            elif error is None:
+                self.successes += 1
+                # Additive increase: about one extra slot per window of successes
+                self.limit = min(self.config.max_concurrency, self.limit + 1.0 / self.limit)
+
+    def stats(self) -> Dict[str, float]:
+        """Current limit, occupancy and counters."""
+        with self._lock:
+            return {
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "successes": self.successes,
+                "rate_limited": self.rate_limited,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+class RateGovernor:
+    """Registry of :class:`ProviderLimiter` objects keyed by (provider, model)."""
+
+    def __init__(self, default_config: Optional[GovernorConfig] = None):
+        self.default_config = default_config or GovernorConfig()
+        self._lock = threading.Lock()
+        self._limiters: Dict[Tuple[str, str], ProviderLimiter] = {}
+        self._overrides: Dict[Tuple[str, Optional[str]], GovernorConfig] = {}
+
+    def configure(self, provider: str, config: GovernorConfig, model: Optional[str] = None) -> None:
+        """Set the budgets for *provider* (all models, or just *model*)."""
+        with self._lock:
+            self._overrides[(provider, model)] = config
+            for key in list(self._limiters):
+                if key[0] == provider and (model is None or key[1] == model):
+                    del self._limiters[key]
+
+    def _config_for(self, provider: str, model: str) -> GovernorConfig:
+        config = (
+            self._overrides.get((provider, model))
+            or self._overrides.get((provider, None))
+        )
+        if config is not None:
+            return config
+        prefix = f"LLM_{provider.upper()}_"
+        rpm = _env_float(prefix + "RPM") or _env_float("LLM_RPM")
+        tpm = _env_float(prefix + "TPM") or _env_float("LLM_TPM")
+        return replace(
+            self.default_config,
+            requests_per_minute=rpm or self.default_config.requests_per_minute,
+            tokens_per_minute=tpm or self.default_config.tokens_per_minute,
+        )
+
+    def limiter(self, provider: str, model: str) -> ProviderLimiter:
+        """Return the shared limiter for (provider, model), creating it on first use."""
+        key = (provider, model)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = ProviderLimiter(key, self._config_for(provider, model))
+                self._limiters[key] = limiter
+            return limiter
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-key limiter stats as ``{"provider/model": {...}}``."""
+        with self._lock:
+            limiters = list(self._limiters.items())
+        return {f"{p}/{m}": limiter.stats() for (p, m), limiter in limiters}
+
+
+def estimate_tokens(prompt: str, system_prompt: Optional[str], max_tokens: int) -> int:
+    """Up-front token cost of a request: prompt size plus the completion budget."""
+    return (len(prompt) + len(system_prompt or "")) // CHARS_PER_TOKEN + max_tokens
+
+
+def usage_tokens(usage: Optional[Dict[str, int]]) -> Optional[int]:
+    """Total tokens from a provider usage dict, whichever naming it uses."""
+    if not usage:
+        return None
+    total = usage.get("total_tokens")
+    if isinstance(total, (int, float)):
+        return int(total)
+    parts = [
+        usage.get(name) for name in
+        ("prompt_tokens", "completion_tokens", "input_tokens", "output_tokens")
+    ]
+    counted = [int(v) for v in parts if isinstance(v, (int, float))]
+    return sum(counted) if counted else None
+
+
+_default_governor: Optional[RateGovernor] = None
+
+
+def get_default_governor() -> RateGovernor:
+    """Get or create the process-wide governor."""
+    global _default_governor
+    if _default_governor is None:
+        _default_governor = RateGovernor()
+    return _default_governor
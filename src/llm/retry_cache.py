@@ -5,13 +5,23 @@ Provides robust retry mechanisms with exponential backoff and
 response caching to handle rate limits, transient errors, and reduce costs.
 """
 
+import asyncio
+import base64
 import hashlib
+import inspect
+import json
 import logging
+import pickle
+import threading
 import time
+import weakref
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
 from functools import wraps
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, ParamSpec, TypeVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, ParamSpec, Tuple, TypeVar
 
 from tenacity import (
     before_sleep_log,
@@ -51,6 +61,16 @@ class CacheConfig:
     cache_dir: str = ".llm_cache"
     ttl_seconds: int = 86400 * 7  # 7 days default
     max_size_gb: float = 1.0
+    # In-process LRU tier in front of the disk cache, bounded by pickled size
+    memory_max_bytes: int = 64 * 1024 * 1024  # 0 disables the memory tier
+
+    # Shared Redis tier behind the disk cache; used when a URL is configured
+    # (redis_url, falling back to the REDIS_URL setting)
+    redis_enabled: bool = True
+    redis_url: Optional[str] = None
+    redis_key_prefix: str = "llm:"
+    redis_compression_level: int = 6
+    redis_timeout_seconds: float = 0.5
 
     # What to include in cache key
     include_model: bool = True
@@ -70,38 +90,373 @@ class TransientError(Exception):
     pass
 
 
+class CacheBackend(ABC):
+    """
+    One storage tier of :class:`LLMCache`.
+
+    Backends store JSON-serialisable response dicts under the request keys
+    :meth:`LLMCache._generate_key` computes. They must never raise on
+    lookup or write failures: a broken tier should degrade to a miss.
+    """
+
+    name: str = "backend"
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """Return ``(value, seconds_to_live)``; ``(None, None)`` on a miss."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        """Store *value*, expiring after *expire* seconds (None for the tier default)."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Drop *key* if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry this backend owns."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counts and whatever size information the tier has."""
+
+    def close(self) -> None:
+        """Release connections or file handles."""
+
+
+class MemoryLRUCache(CacheBackend):
+    """
+    Thread-safe in-process LRU cache bounded by total value size in bytes.
+
+    Values are kept pickled: the pickled length is the size charged against
+    the budget, and every hit hands back a fresh copy, so callers can't mutate
+    what's cached.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int, ttl_seconds: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (pickled value, expires_at)
+        self._entries: "OrderedDict[str, tuple[bytes, Optional[float]]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """Return the value for *key* and its remaining lifetime, marking it most recently used."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= now:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            data, expires_at = entry
+        return pickle.loads(data), (expires_at - now if expires_at is not None else None)
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        """
+        Store *value*, evicting least recently used entries to stay within budget.
+
+        Returns False if the value alone is larger than the whole budget.
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return False
+        ttl = expire if expire is not None else self.ttl_seconds
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (data, expires_at)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def delete(self, key: str) -> None:
+        """Drop *key* if present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        data, _ = self._entries.pop(key)
+        self._bytes -= len(data)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def volume(self) -> int:
+        """Total pickled size of the cached values in bytes."""
+        return self._bytes
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counts and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "item_count": len(self._entries),
+                "size_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class DiskCacheBackend(CacheBackend):
+    """Local SQLite-backed tier using diskcache."""
+
+    name = "disk"
+
+    def __init__(self, cache_dir: str, max_size_gb: float, ttl_seconds: Optional[float] = None):
+        import diskcache
+
+        cache_path = Path(cache_dir)
+        cache_path.mkdir(parents=True, exist_ok=True)
+
+        # Size limit in bytes (GB to bytes)
+        size_limit = int(max_size_gb * 1024 * 1024 * 1024)
+
+        self.ttl_seconds = ttl_seconds
+        self._cache = diskcache.Cache(
+            directory=str(cache_path),
+            size_limit=size_limit,
+            eviction_policy='least-recently-used',
+        )
+        # Counted here; diskcache's own stats are per-process opt-in
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        logger.info(f"Initialized LLM cache at {cache_path} (max {max_size_gb}GB)")
+
+    def get(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        try:
+            value, expire_time = self._cache.get(key, expire_time=True)
+        except Exception as e:
+            logger.warning(f"Cache read error: {e}")
+            return None, None
+        if not value:
+            self.misses += 1
+            return None, None
+        self.hits += 1
+        return value, (expire_time - time.time() if expire_time else None)
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        try:
+            count_before = len(self._cache)
+            replaced = key in self._cache
+            self._cache.set(key, value, expire=expire if expire is not None else self.ttl_seconds)
+            # diskcache culls silently on write; infer how many entries went
+            # (approximate when other processes share the directory)
+            expected = count_before + (0 if replaced else 1)
+            self.evictions += max(0, expected - len(self._cache))
+            return True
+        except Exception as e:
+            logger.warning(f"Cache write error: {e}")
+            return False
+
+    def delete(self, key: str) -> None:
+        try:
+            self._cache.delete(key)
+        except Exception as e:
+            logger.warning(f"Cache delete error: {e}")
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "item_count": len(self._cache),
+            "size_bytes": self._cache.volume(),
+        }
+
+    def close(self) -> None:
+        try:
+            self._cache.close()
+        except (RuntimeError, ConnectionError, Exception):
+            pass
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared tier on Redis, built on :class:`src.cache.redis_client.RedisClient`.
+
+    Responses are stored as zlib-compressed JSON (base64-encoded, since the
+    client speaks decoded strings) under ``key_prefix``. ``RedisClient`` is
+    async and its connection is bound to the loop that opened it, so the
+    backend runs it on a private event loop thread and waits up to
+    ``timeout_seconds`` per call; a slow or unreachable Redis counts as a miss.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        client: Any,
+        ttl_seconds: Optional[float] = None,
+        key_prefix: str = "llm:",
+        compression_level: int = 6,
+        timeout_seconds: float = 0.5,
+    ):
+        self._client = client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.compression_level = compression_level
+        self.timeout_seconds = timeout_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _run(self, coro: Awaitable[T]) -> Optional[T]:
+        """Run *coro* on the backend's loop thread, giving up after the timeout."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="llm-cache-redis", daemon=True
+                ).start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(self.timeout_seconds)
+        except Exception as e:
+            future.cancel()
+            self.errors += 1
+            logger.warning(f"Redis cache error: {e!r}")
+            return None
+
+    def _encode(self, value: Any) -> str:
+        raw = json.dumps(value).encode()
+        return base64.b64encode(zlib.compress(raw, self.compression_level)).decode("ascii")
+
+    @staticmethod
+    def _decode(data: str) -> Any:
+        return json.loads(zlib.decompress(base64.b64decode(data)))
+
+    def get(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        data = self._run(self._client.get(self.key_prefix + key))
+        if not data:
+            self.misses += 1
+            return None, None
+        try:
+            value = self._decode(data)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Discarding unreadable Redis cache entry: {e}")
+            return None, None
+        self.hits += 1
+        return value, None
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        ttl = expire if expire is not None else self.ttl_seconds
+        return bool(self._run(self._client.set(
+            self.key_prefix + key, self._encode(value), ttl=int(ttl) if ttl else None
+        )))
+
+    def delete(self, key: str) -> None:
+        self._run(self._client.delete(self.key_prefix + key))
+
+    def clear(self) -> None:
+        self._run(self._client.delete_pattern(self.key_prefix + "*"))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+    def close(self) -> None:
+        if self._loop is None:
+            return
+        self._run(self._client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
 class LLMCache:
-    """Disk-based cache for LLM responses using diskcache."""
+    """
+    Tiered cache for LLM responses.
+
+    By default lookups go to a byte-bounded in-process LRU
+    (:class:`MemoryLRUCache`), then the diskcache store under ``cache_dir``,
+    then a shared Redis tier when one is configured. A hit in a lower tier is
+    promoted into every tier above it; writes go to all tiers, so entries a
+    faster tier evicts are demoted rather than lost. Pass ``backends`` to
+    supply a different stack of :class:`CacheBackend` tiers, fastest first.
+    """
 
-    def __init__(self, config: Optional[CacheConfig] = None):
+    def __init__(
+        self,
+        config: Optional[CacheConfig] = None,
+        backends: Optional[List[CacheBackend]] = None,
+    ):
         self.config = config or CacheConfig()
-        self._cache = None
+        self._tiers: List[CacheBackend] = []
 
         if self.config.enabled:
-            self._initialize_cache()
+            self._tiers = backends if backends is not None else self._default_backends()
+            if not self._tiers:
+                self.config.enabled = False
 
-    def _initialize_cache(self):
-        """Initialize the disk cache."""
+    def _default_backends(self) -> List[CacheBackend]:
+        """Build the memory/disk/Redis stack described by the config."""
+        tiers: List[CacheBackend] = []
         try:
-            import diskcache
-            cache_path = Path(self.config.cache_dir)
-            cache_path.mkdir(parents=True, exist_ok=True)
-
-            # Size limit in bytes (GB to bytes)
-            size_limit = int(self.config.max_size_gb * 1024 * 1024 * 1024)
-
-            self._cache = diskcache.Cache(
-                directory=str(cache_path),
-                size_limit=size_limit,
-                eviction_policy='least-recently-used',
+            disk = DiskCacheBackend(
+                self.config.cache_dir, self.config.max_size_gb, self.config.ttl_seconds
             )
-            logger.info(f"Initialized LLM cache at {cache_path} (max {self.config.max_size_gb}GB)")
         except ImportError:
             logger.warning("diskcache not installed. Caching disabled. Run: pip install diskcache")
-            self.config.enabled = False
+            return tiers
         except Exception as e:
             logger.warning(f"Failed to initialize cache: {e}. Caching disabled.")
-            self.config.enabled = False
+            return tiers
+
+        if self.config.memory_max_bytes > 0:
+            tiers.append(MemoryLRUCache(
+                self.config.memory_max_bytes, ttl_seconds=self.config.ttl_seconds
+            ))
+        tiers.append(disk)
+
+        if self.config.redis_enabled:
+            from src.cache.redis_client import RedisClient
+
+            client = RedisClient(url=self.config.redis_url)
+            if client.enabled:
+                tiers.append(RedisCacheBackend(
+                    client,
+                    ttl_seconds=self.config.ttl_seconds,
+                    key_prefix=self.config.redis_key_prefix,
+                    compression_level=self.config.redis_compression_level,
+                    timeout_seconds=self.config.redis_timeout_seconds,
+                ))
+        return tiers
+
+    def tier(self, name: str) -> Optional[CacheBackend]:
+        """Return the tier called *name* (``"memory"``, ``"disk"``, ``"redis"``), if active."""
+        for backend in self._tiers:
+            if backend.name == name:
+                return backend
+        return None
 
     def _generate_key(
         self,
@@ -145,22 +500,25 @@ class LLMCache:
         provider: str,
     ) -> Optional[Dict[str, Any]]:
         """Retrieve cached response if available."""
-        if not self.config.enabled or self._cache is None:
+        if not self.config.enabled or not self._tiers:
             return None
 
         key = self._generate_key(
             prompt, system_prompt, model, temperature, max_tokens, json_mode, provider
         )
 
-        try:
-            cached = self._cache.get(key)
-            if cached:
-                logger.debug(f"Cache HIT for key {key[:16]}...")
-                return cached
-            logger.debug(f"Cache MISS for key {key[:16]}...")
-        except Exception as e:
-            logger.warning(f"Cache read error: {e}")
-
+        for i, backend in enumerate(self._tiers):
+            cached, remaining = backend.get(key)
+            if not cached:
+                continue
+            logger.debug(f"Cache HIT ({backend.name}) for key {key[:16]}...")
+            # Promote with whatever lifetime the entry has left
+            if remaining is None or remaining > 0:
+                for upper in self._tiers[:i]:
+                    upper.set(key, cached, expire=remaining)
+            return cached
+
+        logger.debug(f"Cache MISS for key {key[:16]}...")
         return None
 
     def set(
@@ -175,53 +533,151 @@ class LLMCache:
         response: Dict[str, Any],
     ) -> None:
         """Store response in cache."""
-        if not self.config.enabled or self._cache is None:
+        if not self.config.enabled or not self._tiers:
             return
 
         key = self._generate_key(
             prompt, system_prompt, model, temperature, max_tokens, json_mode, provider
         )
 
-        try:
-            self._cache.set(key, response, expire=self.config.ttl_seconds)
-            logger.debug(f"Cached response for key {key[:16]}...")
-        except Exception as e:
-            logger.warning(f"Cache write error: {e}")
+        for backend in self._tiers:
+            backend.set(key, response, expire=self.config.ttl_seconds)
+        logger.debug(f"Cached response for key {key[:16]}...")
 
     def clear(self) -> None:
         """Clear all cached responses."""
-        if self._cache is not None:
+        for backend in self._tiers:
             try:
-                self._cache.clear()
-                logger.info("LLM cache cleared")
+                backend.clear()
             except Exception as e:
-                logger.warning(f"Cache clear error: {e}")
+                logger.warning(f"Cache clear error ({backend.name}): {e}")
+        if self._tiers:
+            logger.info("LLM cache cleared")
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        if not self.config.enabled or self._cache is None:
+        if not self.config.enabled or not self._tiers:
             return {"enabled": False}
 
         try:
+            tiers = {backend.name: backend.stats() for backend in self._tiers}
+            sized = tiers.get("disk") or next(
+                (t for t in tiers.values() if "size_bytes" in t), {}
+            )
             return {
                 "enabled": True,
-                "size_bytes": self._cache.volume(),
-                "item_count": len(self._cache),
-                "hits": self._cache.stats().get('hits', 0),
-                "misses": self._cache.stats().get('misses', 0),
+                "size_bytes": sized.get("size_bytes", 0),
+                "item_count": sized.get("item_count", 0),
+                "hits": sum(t.get("hits", 0) for t in tiers.values()),
+                # A lookup misses overall only when the last tier misses
+                "misses": tiers[self._tiers[-1].name].get("misses", 0),
+                "tiers": tiers,
             }
         except (RuntimeError, ConnectionError, Exception):
             return {"enabled": True, "error": "Could not retrieve stats"}
 
     def close(self):
         """Close the cache properly."""
-        if self._cache is not None:
+        for backend in self._tiers:
             try:
-                self._cache.close()
+                backend.close()
             except (RuntimeError, ConnectionError, Exception):
                 pass
 
 
+class SingleFlight:
+    """
+    Coalesce identical in-flight requests so only one reaches the provider.
+
+    Callers pass a request key (the same key :meth:`LLMCache._generate_key`
+    computes); while a call for that key is running, every other caller with
+    the same key waits for it and receives its result or its exception.
+    Synchronous callers coordinate through threading primitives, async callers
+    through a shared task on their event loop.
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, "SingleFlight._Call"] = {}
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Callers awaiting each async call
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run *fn* unless a call for *key* is already in flight, then share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = SingleFlight._Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Async counterpart of :meth:`do`.
+
+        The call runs as its own task and each caller awaits it through
+        ``asyncio.shield``, so cancelling one waiter (including the one that
+        started the call) doesn't cancel the request for the others. Once the
+        last waiter is cancelled the call itself is cancelled, so an
+        abandoned request (e.g. a lost hedge) stops instead of running on.
+        """
+        loop = asyncio.get_running_loop()
+        tasks = self._tasks.setdefault(loop, {})
+        task = tasks.get(key)
+        if task is None:
+            task = loop.create_task(fn())
+            tasks[key] = task
+            task.add_done_callback(lambda _t: tasks.pop(key, None))
+        else:
+            self.coalesced += 1
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def stats(self) -> Dict[str, int]:
+        """Get coalescing statistics."""
+        with self._lock:
+            in_flight = len(self._calls)
+        in_flight += sum(len(tasks) for tasks in list(self._tasks.values()))
+        return {"in_flight": in_flight, "coalesced": self.coalesced}
+
+
 def is_rate_limit_error(exception: Exception) -> bool:
     """Check if exception is a rate limit error."""
     error_str = str(exception).lower()
@@ -338,6 +794,9 @@ class SmartRetry:
         self.failed_calls = 0
 
     def __call__(self, func: Callable[P, T]) -> Callable[P, T]:
+        if inspect.iscoroutinefunction(func):
+            return self._wrap_async(func)
+
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
             last_exception = None
@@ -345,48 +804,91 @@ class SmartRetry:
             for attempt in range(self.config.max_retries + 1):
                 try:
                     result = func(*args, **kwargs)
-                    self.successful_calls += 1
+                    self.record_success()
                     return result
 
                 except Exception as e:
                     last_exception = e
+                    wait_time = self.should_retry(attempt, e)
+                    if wait_time is None:
+                        raise
+                    time.sleep(wait_time)
 
-                    # Check if we should retry
-                    should_retry = False
-                    wait_time = self._calculate_wait_time(attempt, e)
-
-                    if is_rate_limit_error(e) and self.config.retry_on_rate_limit:
-                        should_retry = True
-                        # Try to get retry-after hint
-                        hint = extract_retry_after(e)
-                        if hint and hint < self.config.max_wait_seconds * 2:
-                            wait_time = hint + 1  # Add 1 second buffer
+            # Should not reach here, but just in case
+            self.failed_calls += 1
+            raise last_exception
 
-                    elif is_transient_error(e) and self.config.retry_on_server_error:
-                        should_retry = True
+        return wrapper
 
-                    elif 'timeout' in str(e).lower() and self.config.retry_on_timeout:
-                        should_retry = True
+    def _wrap_async(self, func: Callable[P, Any]) -> Callable[P, Any]:
+        """Async counterpart of the sync wrapper; backs off with ``asyncio.sleep``."""
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+            last_exception = None
 
-                    elif 'connection' in str(e).lower() and self.config.retry_on_connection_error:
-                        should_retry = True
+            for attempt in range(self.config.max_retries + 1):
+                try:
+                    result = await func(*args, **kwargs)
+                    self.record_success()
+                    return result
 
-                    if not should_retry or attempt >= self.config.max_retries:
-                        self.failed_calls += 1
+                except Exception as e:
+                    last_exception = e
+                    wait_time = self.should_retry(attempt, e)
+                    if wait_time is None:
                         raise
+                    await asyncio.sleep(wait_time)
 
-                    self.total_retries += 1
-                    logger.warning(
-                        f"Retry {attempt + 1}/{self.config.max_retries} after {wait_time:.1f}s: {e}"
-                    )
-                    time.sleep(wait_time)
-
-            # Should not reach here, but just in case
             self.failed_calls += 1
             raise last_exception
 
         return wrapper
 
+    def record_success(self) -> None:
+        """Record a successful call (for callers that drive their own retry loop)."""
+        self.successful_calls += 1
+
+    def should_retry(self, attempt: int, e: Exception) -> Optional[float]:
+        """
+        Decide whether a failed attempt should be retried.
+
+        Callers that cannot use the decorator (e.g. streaming, where only the
+        part before the first delta is safely retryable) drive their own loop
+        with this and :meth:`record_success`.
+
+        Returns the number of seconds to wait before the next attempt, or
+        ``None`` when the error is not retryable or retries are exhausted
+        (in which case the failure is recorded).
+        """
+        should_retry = False
+        wait_time = self._calculate_wait_time(attempt, e)
+
+        if is_rate_limit_error(e) and self.config.retry_on_rate_limit:
+            should_retry = True
+            # Try to get retry-after hint
+            hint = extract_retry_after(e)
+            if hint and hint < self.config.max_wait_seconds * 2:
+                wait_time = hint + 1  # Add 1 second buffer
+
+        elif is_transient_error(e) and self.config.retry_on_server_error:
+            should_retry = True
+
+        elif 'timeout' in str(e).lower() and self.config.retry_on_timeout:
+            should_retry = True
+
+        elif 'connection' in str(e).lower() and self.config.retry_on_connection_error:
+            should_retry = True
+
+        if not should_retry or attempt >= self.config.max_retries:
+            self.failed_calls += 1
+            return None
+
+        self.total_retries += 1
+        logger.warning(
+            f"Retry {attempt + 1}/{self.config.max_retries} after {wait_time:.1f}s: {e}"
+        )
+        return wait_time
+
     def _calculate_wait_time(self, attempt: int, exception: Exception) -> float:
         """Calculate wait time with exponential backoff and optional jitter."""
         base_wait = self.config.min_wait_seconds * (self.config.exponential_base ** attempt)
@@ -411,6 +913,7 @@ class SmartRetry:
 # Global instances for convenience
 _default_cache: Optional[LLMCache] = None
 _default_retry: Optional[SmartRetry] = None
+_default_single_flight: Optional[SingleFlight] = None
 
 
 def get_default_cache() -> LLMCache:
@@ -429,6 +932,14 @@ def get_default_retry() -> SmartRetry:
     return _default_retry
 
 
+def get_default_single_flight() -> SingleFlight:
+    """Get or create the process-wide request coalescing group."""
+    global _default_single_flight
+    if _default_single_flight is None:
+        _default_single_flight = SingleFlight()
+    return _default_single_flight
+
+
 def configure_llm_resilience(
     cache_config: Optional[CacheConfig] = None,
     retry_config: Optional[RetryConfig] = None,
@@ -0,0 +1,254 @@
+"""
+Provider Health and Routing for MultiProviderClient
+
+Each provider behind :class:`~src.llm.client.MultiProviderClient` gets a
+:class:`ProviderHealth` record:
+
+- A circuit breaker (closed → open → half-open). After
+  ``failure_threshold`` consecutive failures (or one authentication error)
+  the provider is skipped for ``open_seconds``; then a single probe request
+  is let through and its outcome closes or re-opens the breaker.
+- EWMA latency and error rate, plus a window of recent latencies for a p95
+  used as the hedging delay.
+
+:class:`ProviderRouter` orders providers for each request according to a
+:class:`RoutingPolicy`. Providers whose breaker is open go last, so they are
+only tried when every healthy provider has failed.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_AUTH_ERROR_PATTERNS = (
+    "401", "403", "invalid api key", "invalid_api_key", "authentication", "unauthorized",
+    "permission denied",
+)
+
+
+class RoutingPolicy(str, Enum):
+    """How MultiProviderClient orders healthy providers."""
+    PRIORITY = "priority"  # configured order
+    LOWEST_LATENCY = "lowest_latency"  # lowest EWMA latency first
+    WEIGHTED = "weighted"  # random, weighted by speed and success rate
+
+
+class CircuitBreakerState(str, Enum):
+    """Circuit breaker states for one provider."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class RoutingConfig:
+    """Breaker, EWMA and hedging parameters for MultiProviderClient."""
+    policy: RoutingPolicy = RoutingPolicy.PRIORITY
+    failure_threshold: int = 3
+    open_seconds: float = 30.0
+    ewma_alpha: float = 0.2
+    latency_window: int = 50
+    # Hedge acomplete() to a second provider once the first has been slower
+    # than its p95 latency (needs hedge_min_samples observations first)
+    hedge: bool = False
+    hedge_min_samples: int = 10
+    hedge_min_delay_seconds: float = 0.5
+
+
+def is_auth_error(exception: BaseException) -> bool:
+    """Check if exception means the provider will keep rejecting us."""
+    error_str = str(exception).lower()
+    return any(pattern in error_str for pattern in _AUTH_ERROR_PATTERNS)
+
+
+class ProviderHealth:
+    """Circuit breaker plus latency/error statistics for one provider."""
+
+    def __init__(self, name: str, config: RoutingConfig):
+        self.name = name
+        self.config = config
+        self._lock = threading.Lock()
+        self.state = CircuitBreakerState.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.latency_ewma: Optional[float] = None
+        self.error_rate_ewma = 0.0
+        self._latencies: Deque[float] = deque(maxlen=config.latency_window)
+        self.requests = 0
+        self.failures = 0
+
+    def available(self) -> bool:
+        """True if routing should treat this provider as healthy right now."""
+        with self._lock:
+            if self.state == CircuitBreakerState.OPEN:
+                return time.monotonic() - self._opened_at >= self.config.open_seconds
+            if self.state == CircuitBreakerState.HALF_OPEN:
+                return not self._probe_in_flight
+            return True
+
+    def begin(self) -> bool:
+        """
+        Claim a request slot; past the open period the request becomes the half-open probe.
+
+        The check and the claim are one step, so of several concurrent
+        callers only one gets the probe. False if the breaker is open or its
+        probe is already in flight.
+        """
+        with self._lock:
+            if self.state == CircuitBreakerState.OPEN:
+                if time.monotonic() - self._opened_at < self.config.open_seconds:
+                    return False
+                self.state = CircuitBreakerState.HALF_OPEN
+            if self.state == CircuitBreakerState.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self, latency_seconds: Optional[float]) -> None:
+        """Close the breaker and fold the latency into the EWMA and window."""
+        alpha = self.config.ewma_alpha
+        with self._lock:
+            self.requests += 1
+            self.consecutive_failures = 0
+            self.error_rate_ewma *= (1 - alpha)
+            if self.state != CircuitBreakerState.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = CircuitBreakerState.CLOSED
+            self._probe_in_flight = False
+            if latency_seconds is not None:
+                self._latencies.append(latency_seconds)
+                self.latency_ewma = (
+                    latency_seconds if self.latency_ewma is None
+                    else alpha * latency_seconds + (1 - alpha) * self.latency_ewma
+                )
+
+    def record_failure(self, error: BaseException) -> None:
+        """Count a failure; open the breaker past the threshold or on auth errors."""
+        alpha = self.config.ewma_alpha
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.error_rate_ewma = alpha + (1 - alpha) * self.error_rate_ewma
+            trip = (
+                self.state == CircuitBreakerState.HALF_OPEN
+                or self.consecutive_failures >= self.config.failure_threshold
+                or is_auth_error(error)
+            )
+            self._probe_in_flight = False
+            if trip and self.state != CircuitBreakerState.OPEN:
+                logger.warning(f"Circuit for {self.name} opened after: {error}")
+            if trip:
+                self.state = CircuitBreakerState.OPEN
+                self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe slot that ended without an outcome (cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def p95_latency(self) -> Optional[float]:
+        """95th percentile of recent latencies, or None with too few samples."""
+        with self._lock:
+            if len(self._latencies) < self.config.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current breaker state and statistics."""
+        with self._lock:
+            return {
+                "state": self.state.value,
+                "consecutive_failures": self.consecutive_failures,
+                "latency_ewma_ms": (
+                    round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None
+                ),
+                "error_rate": round(self.error_rate_ewma, 3),
+                "requests": self.requests,
+                "failures": self.failures,
+            }
+
+
+class ProviderRouter:
+    """Orders providers per request using their health and a routing policy."""
+
+    def __init__(self, providers: Sequence[Any], config: Optional[RoutingConfig] = None):
+        self.config = config or RoutingConfig()
+        self.providers = list(providers)
+        self.health: List[ProviderHealth] = [
+            ProviderHealth(getattr(p, "provider_name", f"provider{i}"), self.config)
+            for i, p in enumerate(self.providers)
+        ]
+
+    def _score(self, index: int) -> float:
+        """Lower is better: EWMA latency, unmeasured providers first so they get measured."""
+        latency = self.health[index].latency_ewma
+        return latency if latency is not None else 0.0
+
+    def _weight(self, index: int) -> float:
+        health = self.health[index]
+        speed = 1.0 / max(health.latency_ewma or 0.05, 0.05)
+        return speed * max(1.0 - health.error_rate_ewma, 0.01)
+
+    def order(self) -> List[int]:
+        """
+        Provider indices in the order to try them.
+
+        Providers whose breaker allows a request come first, arranged by the
+        policy; the rest follow in priority order as a last resort.
+        """
+        healthy = [i for i in range(len(self.providers)) if self.health[i].available()]
+        blocked = [i for i in range(len(self.providers)) if i not in healthy]
+
+        policy = RoutingPolicy(self.config.policy)
+        if policy == RoutingPolicy.LOWEST_LATENCY:
+            healthy.sort(key=self._score)
+        elif policy == RoutingPolicy.WEIGHTED:
+            remaining, weighted = list(healthy), []
+            while remaining:
+                pick = random.choices(remaining, [self._weight(i) for i in remaining])[0]
+                weighted.append(pick)
+                remaining.remove(pick)
+            healthy = weighted
+        return healthy + blocked
+
+    def candidates(self) -> Iterator[Tuple[int, bool]]:
+        """
+        ``(index, claimed)`` for each provider to try, in :meth:`order`.
+
+        Each provider's slot is claimed with :meth:`ProviderHealth.begin` as
+        it is handed out, so consume lazily and stop once a request succeeds.
+        Providers that refuse the claim (open, or half-open with the probe
+        taken) come last with ``claimed=False``, as a last resort.
+        """
+        deferred = []
+        for index in self.order():
+            if self.health[index].begin():
+                yield index, True
+            else:
+                deferred.append(index)
+        for index in deferred:
+            yield index, False
+
+    def hedge_delay(self, index: int) -> Optional[float]:
+        """Seconds to wait on provider *index* before hedging, or None to not hedge."""
+        if not self.config.hedge:
+            return None
+        p95 = self.health[index].p95_latency()
+        if p95 is None:
+            return None
+        return max(p95, self.config.hedge_min_delay_seconds)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider breaker state and statistics, keyed by provider name."""
+        return {h.name: h.snapshot() for h in self.health}
@@ -0,0 +1,344 @@
+"""
+Similarity-Keyed Response Cache
+
+``LLMCache`` only hits when a prompt is byte-identical. Demo traffic is full
+of near-duplicates ("todo app for teams" vs "team todo app") that differ only
+in the free-text part of an otherwise fixed prompt. This cache matches that
+free text approximately:
+
+- The caller names the *similarity text* (e.g. the idea description) inside
+  the prompt. Everything else (the prompt template with that text removed,
+  system prompt, model, temperature, JSON mode) must match exactly.
+- The similarity text is normalised to a token set and summarised with a
+  MinHash signature. An LSH band index finds candidates without scanning
+  every entry, and candidates are verified by exact Jaccard similarity
+  against ``SimilarityCacheConfig.threshold``.
+- Entries are grouped by namespace (one per architect step or prompt
+  family) and hit rates are reported per namespace.
+
+Everything is computed locally; nothing is sent to a provider.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .client import BaseLLMClient, LLMResponse
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and app application are as at be by for from in into is it of on or "
+    "that the this to with".split()
+)
+
+
+@dataclass
+class SimilarityCacheConfig:
+    """Configuration for the similarity-keyed cache."""
+    enabled: bool = False
+    # Minimum Jaccard similarity between normalised token sets for a hit
+    threshold: float = 0.8
+    num_perm: int = 128
+    # LSH bands; num_perm // bands rows each. More bands finds looser candidates.
+    bands: int = 32
+    max_entries_per_namespace: int = 5000
+    ttl_seconds: int = 86400  # 1 day default
+
+    @classmethod
+    def from_env(cls) -> "SimilarityCacheConfig":
+        """Build a config from ``LLM_SIMILARITY_CACHE`` / ``LLM_SIMILARITY_THRESHOLD``."""
+        config = cls()
+        config.enabled = os.getenv("LLM_SIMILARITY_CACHE", "").lower() in ("1", "true", "yes")
+        threshold = os.getenv("LLM_SIMILARITY_THRESHOLD")
+        if threshold:
+            config.threshold = float(threshold)
+        return config
+
+
+def normalize_tokens(text: str) -> FrozenSet[str]:
+    """Lower-case word tokens without stopwords and with a naive plural strip."""
+    tokens = set()
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.add(token)
+    return frozenset(tokens)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two token sets (1.0 for two empty sets)."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash signatures over token sets using seeded universal hash functions."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, tokens: FrozenSet[str]) -> Tuple[int, ...]:
+        """Return the MinHash signature of *tokens*."""
+        if not tokens:
+            return tuple([_MAX_HASH] * self.num_perm)
+        hashed = [
+            int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "big")
+            for t in tokens
+        ]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashed)
+            for a, b in self._params
+        )
+
+
+@dataclass
+class _Entry:
+    exact_key: str
+    tokens: FrozenSet[str]
+    bucket_keys: List[Tuple[str, int, Tuple[int, ...]]]
+    response: Dict[str, Any]
+    expires_at: float
+
+
+class _Namespace:
+    """Entries, LSH buckets and counters for one namespace."""
+
+    def __init__(self):
+        self.entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self.buckets: Dict[Tuple[str, int, Tuple[int, ...]], set] = {}
+        self.lookups = 0
+        self.hits = 0
+
+
+class SimilarityCache:
+    """
+    Approximate-match cache for LLM responses, keyed by namespace.
+
+    Thread-safe; entries live in process memory and are evicted least
+    recently used per namespace, or when their TTL lapses.
+    """
+
+    def __init__(self, config: Optional[SimilarityCacheConfig] = None):
+        self.config = config or SimilarityCacheConfig()
+        if self.config.num_perm % self.config.bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self._rows = self.config.num_perm // self.config.bands
+        self._hasher = MinHasher(self.config.num_perm)
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._next_id = 0
+
+    @staticmethod
+    def exact_key(
+        client: BaseLLMClient,
+        similar_text: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        json_mode: bool,
+    ) -> str:
+        """Hash of everything in the request except the similarity text."""
+        template = prompt.replace(similar_text, "\x00") if similar_text else prompt
+        parts = [
+            template, system_prompt or "", str(client.model),
+            str(getattr(client, "provider_name", "")), str(temperature), str(json_mode),
+        ]
+        return hashlib.sha256("|||".join(parts).encode()).hexdigest()
+
+    def _bucket_keys(
+        self, exact_key: str, signature: Tuple[int, ...]
+    ) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        rows = self._rows
+        return [
+            (exact_key, band, signature[band * rows:(band + 1) * rows])
+            for band in range(self.config.bands)
+        ]
+
+    def lookup(self, namespace: str, exact_key: str, similar_text: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response most similar to *similar_text*, if above threshold."""
+        tokens = normalize_tokens(similar_text)
+        bucket_keys = self._bucket_keys(exact_key, self._hasher.signature(tokens))
+        now = time.time()
+
+        with self._lock:
+            ns = self._namespaces.setdefault(namespace, _Namespace())
+            ns.lookups += 1
+            candidates = set()
+            for key in bucket_keys:
+                candidates.update(ns.buckets.get(key, ()))
+
+            best_id, best_score = None, -1.0
+            for entry_id in candidates:
+                entry = ns.entries[entry_id]
+                if entry.expires_at <= now:
+                    self._remove(ns, entry_id)
+                    continue
+                score = jaccard(tokens, entry.tokens)
+                if score > best_score:
+                    best_id, best_score = entry_id, score
+
+            if best_id is None or best_score < self.config.threshold:
+                return None
+            ns.hits += 1
+            ns.entries.move_to_end(best_id)
+            logger.debug(f"Similarity cache HIT in {namespace!r} (jaccard={best_score:.2f})")
+            return dict(ns.entries[best_id].response)
+
+    def store(
+        self, namespace: str, exact_key: str, similar_text: str, response: Dict[str, Any]
+    ) -> None:
+        """Remember *response* for *similar_text* under *namespace*."""
+        tokens = normalize_tokens(similar_text)
+        entry = _Entry(
+            exact_key=exact_key,
+            tokens=tokens,
+            bucket_keys=self._bucket_keys(exact_key, self._hasher.signature(tokens)),
+            response=dict(response),
+            expires_at=time.time() + self.config.ttl_seconds,
+        )
+        with self._lock:
+            ns = self._namespaces.setdefault(namespace, _Namespace())
+            entry_id = self._next_id
+            self._next_id += 1
+            ns.entries[entry_id] = entry
+            for key in entry.bucket_keys:
+                ns.buckets.setdefault(key, set()).add(entry_id)
+            while len(ns.entries) > self.config.max_entries_per_namespace:
+                self._remove(ns, next(iter(ns.entries)))
+
+    def invalidate(self, namespace: str, exact_key: str, similar_text: str) -> int:
+        """Drop every entry a lookup of *similar_text* could return; returns the count."""
+        tokens = normalize_tokens(similar_text)
+        bucket_keys = self._bucket_keys(exact_key, self._hasher.signature(tokens))
+        with self._lock:
+            ns = self._namespaces.get(namespace)
+            if ns is None:
+                return 0
+            candidates = set()
+            for key in bucket_keys:
+                candidates.update(ns.buckets.get(key, ()))
+            removed = 0
+            for entry_id in candidates:
+                if jaccard(tokens, ns.entries[entry_id].tokens) >= self.config.threshold:
+                    self._remove(ns, entry_id)
+                    removed += 1
+            return removed
+
+    @staticmethod
+    def _remove(ns: _Namespace, entry_id: int) -> None:
+        entry = ns.entries.pop(entry_id)
+        for key in entry.bucket_keys:
+            bucket = ns.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del ns.buckets[key]
+
+    async def acomplete(
+        self,
+        client: BaseLLMClient,
+        namespace: str,
+        similar_text: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        json_mode: bool = False,
+        validate: Optional[Callable[[LLMResponse], bool]] = None,
+    ) -> LLMResponse:
+        """
+        ``client.acomplete`` with a similarity lookup in front of it.
+
+        *similar_text* is the part of *prompt* allowed to vary between hits;
+        the rest of the request must match exactly. When *validate* is given,
+        only responses it accepts are stored, and a cached response it
+        rejects is invalidated and fetched again.
+        """
+        exact_key = self.exact_key(
+            client, similar_text, prompt, system_prompt, temperature, json_mode
+        )
+        cached = self.lookup(namespace, exact_key, similar_text)
+        if cached is not None:
+            cached_response = LLMResponse.from_dict(cached)
+            if validate is None or validate(cached_response):
+                return cached_response
+            logger.warning(f"Similarity cache entry in {namespace!r} failed validation; dropping it")
+            self.invalidate(namespace, exact_key, similar_text)
+
+        response = await client.acomplete(
+            prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            json_mode=json_mode,
+        )
+        if (
+            response is not None
+            and response.content
+            and (validate is None or validate(response))
+        ):
+            self.store(namespace, exact_key, similar_text, response.to_dict())
+        return response
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._namespaces.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-namespace lookups, hits, hit rate and entry counts."""
+        with self._lock:
+            namespaces = {
+                name: {
+                    "lookups": ns.lookups,
+                    "hits": ns.hits,
+                    "misses": ns.lookups - ns.hits,
+                    "hit_rate": ns.hits / ns.lookups if ns.lookups else 0.0,
+                    "entries": len(ns.entries),
+                }
+                for name, ns in self._namespaces.items()
+            }
+        return {
+            "enabled": self.config.enabled,
+            "threshold": self.config.threshold,
+            "namespaces": namespaces,
+        }
+
+
+_default_similarity_cache: Optional[SimilarityCache] = None
+
+
+def get_default_similarity_cache() -> Optional[SimilarityCache]:
+    """
+    Return the process-wide similarity cache, or None when the mode is off.
+
+    Enabled with ``LLM_SIMILARITY_CACHE=1``; the threshold can be tuned with
+    ``LLM_SIMILARITY_THRESHOLD``.
+    """
+    global _default_similarity_cache
+    if _default_similarity_cache is None:
+        config = SimilarityCacheConfig.from_env()
+        if not config.enabled:
+            return None
+        _default_similarity_cache = SimilarityCache(config)
+    return _default_similarity_cache
@@ -1,6 +1,5 @@
 """LLM-powered scoring engine for evaluating startup ideas."""
 
-import asyncio
 import json
 import logging
 from datetime import datetime, timezone
@@ -112,9 +111,9 @@ class LLMScoringEngine:
             selection_reasoning=selection_reasoning,
         )
 
-    def _score_idea_llm_sync(self, idea) -> "IdeaScores | None":
-        """Synchronous implementation of LLM idea scoring (called via executor)."""
-        prompt = SCORING_USER_PROMPT.format(
+    def _build_scoring_prompt(self, idea) -> str:
+        """Render the scoring prompt for a single idea."""
+        return SCORING_USER_PROMPT.format(
             name=idea.name,
             one_liner=idea.one_liner,
             problem=idea.problem_statement,
@@ -124,16 +123,8 @@ class LLMScoringEngine:
             value_prop=idea.value_proposition,
         )
 
-        response = self.llm.complete(
-            prompt=prompt,
-            system_prompt=SCORING_SYSTEM_PROMPT,
-            max_tokens=1500,
-            temperature=0.3,
-            json_mode=False,
-        )
-
-        # Parse JSON from response
-        content = response.content
+    def _parse_scores(self, content: str) -> "IdeaScores | None":
+        """Parse the LLM's JSON scoring response into IdeaScores."""
         start = content.find("{")
         end = content.rfind("}") + 1
         if start == -1 or end <= start:
@@ -181,11 +172,16 @@ class LLMScoringEngine:
         )
 
     async def _score_idea_llm(self, idea) -> "IdeaScores | None":
-        """Score a single idea using LLM (async wrapper using executor to avoid blocking event loop)."""
+        """Score a single idea using the LLM's native async completion."""
         try:
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, self._score_idea_llm_sync, idea)
-            return result
+            response = await self.llm.acomplete(
+                prompt=self._build_scoring_prompt(idea),
+                system_prompt=SCORING_SYSTEM_PROMPT,
+                max_tokens=1500,
+                temperature=0.3,
+                json_mode=False,
+            )
+            return self._parse_scores(response.content)
         except Exception as e:
             logger.warning(f"LLM scoring failed for {idea.name}: {e}")
             return None
@@ -1,40 +1,93 @@
 """
 Build Manager Service
 
-Manages build lifecycle, persistence via SQLite, and in-memory event streaming.
+Manages build lifecycle, persistence via SQLite, and event streaming.
+Each build's events go to an :class:`~src.services.event_log.EventLog` shared
+by every worker (SQLite in the builds database, or Redis Streams when
+``REDIS_URL`` is set), so any number of SSE subscribers on any worker can read
+(and resume) the same stream.
+
+Each thread keeps one SQLite connection for the manager's lifetime, and
+frequent progress-only updates (``current_stage``/``progress`` while running)
+are coalesced per build and written together at most every
+``progress_flush_interval`` seconds.
 """
 
 import logging
 import sqlite3
 import threading
+import time
 import uuid
-from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Hashable, Optional
+
+from src.services.event_log import EventLog, event_log_from_env
+from src.services.progress_channel import SequencedEvent
 
 logger = logging.getLogger(__name__)
 
 # Database file location
 _DB_PATH = Path("ignara_builds.db")
+# Columns a progress callback updates; such updates are batched
+_PROGRESS_COLUMNS = frozenset({"current_stage", "progress", "status"})
+
+
+def _event_coalesce_key(event: dict[str, Any]) -> Optional[Hashable]:
+    """Progress events of one stage supersede each other; others are all kept."""
+    if event.get("type") == "progress":
+        return event.get("stage")
+    return None
 
 
 class BuildManager:
     """Manages pipeline build state, persistence, and SSE event buffers."""
 
-    def __init__(self, db_path: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        event_log: Optional[EventLog] = None,
+        progress_flush_interval: float = 0.5,
+    ) -> None:
         self._db_path = db_path or _DB_PATH
-        self._events: dict[str, deque[dict[str, Any]]] = {}
-        self._lock = threading.Lock()
+        self.progress_flush_interval = progress_flush_interval
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        # build_id -> latest progress-only columns not yet written
+        self._pending_progress: dict[str, dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
         self._init_db()
+        self._event_log = event_log or event_log_from_env(self._db_path, coalesce_key=_event_coalesce_key)
 
     # ------------------------------------------------------------------ DB
     def _get_conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self._db_path), timeout=10)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
+        """This thread's connection, opened (and its PRAGMAs set) on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only ever used by this thread; close() may run on another one
+            conn = sqlite3.connect(str(self._db_path), timeout=10, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
         return conn
 
+    def close(self) -> None:
+        """Write pending progress and close every thread's connection."""
+        self.flush_progress()
+        self._event_log.close()
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
     def _init_db(self) -> None:
         with self._get_conn() as conn:
             conn.execute(
@@ -60,6 +113,8 @@ class BuildManager:
                 )
                 """
             )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_builds_started_at ON builds (started_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_builds_status ON builds (status, started_at)")
 
     # ------------------------------------------------------------------ CRUD
     def create_build(
@@ -84,58 +139,104 @@ class BuildManager:
                 """,
                 (build_id, idea, llm_provider, theme, now, target_users, features, monetization),
             )
-        # Initialise event buffer
-        with self._lock:
-            self._events[build_id] = deque(maxlen=500)
         logger.info("Created build %s", build_id)
         return build_id
 
     def get_build(self, build_id: str) -> Optional[dict[str, Any]]:
         """Return a single build as dict, or None."""
-        with self._get_conn() as conn:
-            row = conn.execute(
-                "SELECT * FROM builds WHERE build_id = ?", (build_id,)
-            ).fetchone()
+        self.flush_progress()
+        row = self._get_conn().execute(
+            "SELECT * FROM builds WHERE build_id = ?", (build_id,)
+        ).fetchone()
         return dict(row) if row else None
 
     def list_builds(self, limit: int = 50) -> list[dict[str, Any]]:
         """Return most-recent builds, newest first."""
-        with self._get_conn() as conn:
-            rows = conn.execute(
-                "SELECT * FROM builds ORDER BY started_at DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
+        self.flush_progress()
+        rows = self._get_conn().execute(
+            "SELECT * FROM builds ORDER BY started_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
         return [dict(r) for r in rows]
 
     def update_build(self, build_id: str, **kwargs: Any) -> None:
-        """Update arbitrary columns on a build row."""
+        """
+        Update arbitrary columns on a build row.
+
+        Progress-only updates of a running build are queued and written in
+        the next batch; any other update writes immediately, together with
+        the build's queued progress.
+        """
         if not kwargs:
             return
-        cols = ", ".join(f"{k} = ?" for k in kwargs)
-        vals = list(kwargs.values())
-        vals.append(build_id)
+        if kwargs.keys() <= _PROGRESS_COLUMNS and kwargs.get("status", "running") == "running":
+            with self._pending_lock:
+                self._pending_progress.setdefault(build_id, {}).update(kwargs)
+            self._schedule_flush()
+            return
+        with self._write_lock:
+            with self._pending_lock:
+                pending = self._pending_progress.pop(build_id, {})
+            self._write_updates({build_id: {**pending, **kwargs}})
+
+    def flush_progress(self) -> None:
+        """Write every queued progress update in one transaction."""
+        if not self._pending_progress:
+            return
+        # Held across the write so a queued "running" can't land after a final update
+        with self._write_lock:
+            with self._pending_lock:
+                pending, self._pending_progress = self._pending_progress, {}
+            if pending:
+                self._write_updates(pending)
+
+    def _write_updates(self, updates: dict[str, dict[str, Any]]) -> None:
         with self._get_conn() as conn:
-            conn.execute(
-                f"UPDATE builds SET {cols} WHERE build_id = ?",  # noqa: S608
-                vals,
-            )
+            for build_id, columns in updates.items():
+                cols = ", ".join(f"{k} = ?" for k in columns)
+                conn.execute(
+                    f"UPDATE builds SET {cols} WHERE build_id = ?",  # noqa: S608
+                    [*columns.values(), build_id],
+                )
+
+    def _schedule_flush(self) -> None:
+        self._flush_requested.set()
+        if self._flusher is None:
+            with self._pending_lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._run_flusher, name="build-progress-flusher", daemon=True,
+                    )
+                    self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while True:
+            self._flush_requested.wait()
+            time.sleep(self.progress_flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush_progress()
+            except sqlite3.Error as exc:
+                logger.warning("Could not write build progress: %s", exc)
 
     # ------------------------------------------------------------------ Events
     def push_event(self, build_id: str, event: dict[str, Any]) -> None:
-        """Append an SSE event dict to the in-memory buffer (thread-safe)."""
-        with self._lock:
-            buf = self._events.setdefault(build_id, deque(maxlen=500))
-            buf.append(event)
-
-    def get_events(self, build_id: str) -> list[dict[str, Any]]:
-        """Return and drain the event buffer for *build_id*."""
-        with self._lock:
-            buf = self._events.get(build_id)
-            if not buf:
-                return []
-            events = list(buf)
-            buf.clear()
-            return events
+        """Append an SSE event dict to the build's event log (thread-safe)."""
+        self._event_log.append(build_id, event)
+
+    def get_events(self, build_id: str, after: int = 0) -> list[dict[str, Any]]:
+        """Return the logged events of *build_id* after event id *after* (non-draining)."""
+        return [event for _, event in self.read_events(build_id, after)]
+
+    def read_events(self, build_id: str, after: int = 0) -> list[SequencedEvent]:
+        """``(event_id, event)`` pairs of *build_id* after event id *after*."""
+        return self._event_log.read(build_id, after)
+
+    async def wait_events(
+        self, build_id: str, after: int = 0, timeout: Optional[float] = None,
+    ) -> list[SequencedEvent]:
+        """Like :meth:`read_events`, waiting up to *timeout* seconds for a new event."""
+        return await self._event_log.wait(build_id, after, timeout)
 
 
 # Module-level singleton
@@ -0,0 +1,394 @@
+"""
+Build Event Logs
+
+Where :class:`~src.services.build_manager.BuildManager` keeps the SSE events
+of each build. With several dashboard workers, the worker serving a build's
+stream is often not the one running the build, so the log must be shared:
+
+- :class:`SQLiteEventLog` — a WAL-mode table next to the builds table,
+  shared by every worker on the host. Events are queued and inserted in
+  batches by a writer thread.
+- :class:`RedisEventLog` — one Redis Stream per build, used when
+  ``REDIS_URL`` is set, for workers spread over several hosts.
+- :class:`MemoryEventLog` — per-process :class:`ProgressChannel` buffers
+  (single worker, or ``BUILD_EVENT_LOG=memory``).
+
+Event ids increase per build, so readers resume from a cursor
+(``Last-Event-ID``). Subscribers in the process that wrote an event are woken
+as soon as its batch lands (only those following that build); subscribers in
+other workers see it on their next poll (every ``poll_interval`` seconds).
+Each log keeps at most ``max_events_per_build`` events per build and drops
+events ``retention_seconds`` after they were written (the memory log drops a
+build's whole buffer once its newest event is that old).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from src.services.progress_channel import Doorbell, ProgressChannel, SequencedEvent, coalesce_events
+
+logger = logging.getLogger(__name__)
+
+CoalesceKey = Callable[[Any], Optional[Hashable]]
+
+
+class EventLog(ABC):
+    """Append-only, per-build event log with cursor reads."""
+
+    def __init__(
+        self,
+        max_events_per_build: int = 500,
+        retention_seconds: float = 24 * 3600,
+        coalesce_key: Optional[CoalesceKey] = None,
+        coalesce_backlog: int = 50,
+        poll_interval: float = 0.25,
+    ) -> None:
+        self.max_events_per_build = max_events_per_build
+        self.retention_seconds = retention_seconds
+        self._coalesce_key = coalesce_key
+        self.coalesce_backlog = coalesce_backlog
+        self.poll_interval = poll_interval
+        # One per build with waiters; rung when this process's events for it become readable
+        self._bells: Dict[str, Doorbell] = {}
+        self._bell_users: Dict[str, int] = {}
+        self._bells_lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    @abstractmethod
+    def append(self, build_id: str, event: Dict[str, Any]) -> None:
+        """Add *event* to the build's log (possibly buffered; thread-safe)."""
+
+    @abstractmethod
+    def _read(self, build_id: str, after: int) -> List[SequencedEvent]:
+        """Stored events of *build_id* with an id above *after*, oldest first."""
+
+    @abstractmethod
+    def _expire(self, before: float) -> None:
+        """Drop events written before the Unix time *before*."""
+
+    def _maybe_expire(self) -> None:
+        """Apply ``retention_seconds``, at most once a minute."""
+        now = time.monotonic()
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+        try:
+            self._expire(time.time() - self.retention_seconds)
+        except Exception as exc:
+            logger.warning("Build event retention sweep failed: %s", exc)
+
+    def _ring(self, build_ids: Iterable[str]) -> None:
+        """Wake this process's subscribers of *build_ids*."""
+        with self._bells_lock:
+            bells = [self._bells[b] for b in build_ids if b in self._bells]
+        for bell in bells:
+            bell.ring()
+
+    def flush(self) -> None:
+        """Make every appended event readable."""
+
+    def close(self) -> None:
+        """Flush and release connections."""
+        self.flush()
+
+    def read(self, build_id: str, after: int = 0) -> List[SequencedEvent]:
+        """``(event_id, event)`` pairs after *after*; a long backlog is coalesced."""
+        self.flush()
+        pending = self._read(build_id, after)
+        if self._coalesce_key is not None and len(pending) > self.coalesce_backlog:
+            pending = coalesce_events(pending, self._coalesce_key)
+        return pending
+
+    async def wait(
+        self, build_id: str, after: int = 0, timeout: Optional[float] = None,
+    ) -> List[SequencedEvent]:
+        """Events after *after*, waiting up to *timeout* seconds for one (empty on timeout)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._bells_lock:
+            bell = self._bells.setdefault(build_id, Doorbell())
+            self._bell_users[build_id] = self._bell_users.get(build_id, 0) + 1
+        try:
+            while True:
+                events = await asyncio.to_thread(self.read, build_id, after)
+                if events:
+                    return events
+                remaining = self.poll_interval
+                if deadline is not None:
+                    remaining = min(remaining, deadline - time.monotonic())
+                    if remaining <= 0:
+                        return []
+                await bell.wait(remaining)
+        finally:
+            with self._bells_lock:
+                self._bell_users[build_id] -= 1
+                if not self._bell_users[build_id]:
+                    del self._bell_users[build_id], self._bells[build_id]
+
+
+class MemoryEventLog(EventLog):
+    """Events in this process only, in a :class:`ProgressChannel` per build."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._channels: Dict[str, ProgressChannel] = {}
+        # Unix time of each build's newest event (or of its first subscriber)
+        self._written_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _channel(self, build_id: str) -> ProgressChannel:
+        with self._lock:
+            channel = self._channels.get(build_id)
+            if channel is None:
+                channel = ProgressChannel(
+                    self.max_events_per_build,
+                    coalesce_key=self._coalesce_key,
+                    coalesce_backlog=self.coalesce_backlog,
+                )
+                self._channels[build_id] = channel
+                # A build only subscribed to expires like one that was written
+                self._written_at[build_id] = time.time()
+            return channel
+
+    def append(self, build_id: str, event: Dict[str, Any]) -> None:
+        self._channel(build_id).publish(event)
+        with self._lock:
+            self._written_at[build_id] = time.time()
+        self._maybe_expire()
+
+    def _expire(self, before: float) -> None:
+        with self._lock:
+            for build_id in [b for b, t in self._written_at.items() if t < before]:
+                del self._written_at[build_id]
+                self._channels.pop(build_id).close()
+
+    def _read(self, build_id: str, after: int) -> List[SequencedEvent]:
+        with self._lock:
+            channel = self._channels.get(build_id)
+        return channel.read(after) if channel is not None else []
+
+    def read(self, build_id: str, after: int = 0) -> List[SequencedEvent]:
+        # The channel coalesces on its own
+        return self._read(build_id, after)
+
+    async def wait(
+        self, build_id: str, after: int = 0, timeout: Optional[float] = None,
+    ) -> List[SequencedEvent]:
+        return await self._channel(build_id).wait(after, timeout)
+
+
+class _BatchingEventLog(EventLog):
+    """Queues appends and writes them in batches from a daemon thread."""
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 0.05, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue()
+        # Serialises batch writes between the writer thread and flush()
+        self._write_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    @abstractmethod
+    def _write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Store *batch* in order and apply the per-build retention limit."""
+
+    def append(self, build_id: str, event: Dict[str, Any]) -> None:
+        self._queue.put((build_id, event))
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(
+                        target=self._run_writer, name=f"{type(self).__name__}-writer", daemon=True,
+                    )
+                    self._writer.start()
+
+    def _take_batch(self, block: bool) -> List[Tuple[str, Dict[str, Any]]]:
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        try:
+            batch.append(self._queue.get(block=block, timeout=self.flush_interval if block else None))
+        except queue.Empty:
+            return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic() if block else 0
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_writer(self) -> None:
+        while True:
+            self._drain(block=True)
+
+    def _drain(self, block: bool) -> None:
+        written: Set[str] = set()
+        with self._write_lock:
+            batch = self._take_batch(block)
+            while batch:
+                try:
+                    self._write_batch(batch)
+                    written.update(build_id for build_id, _ in batch)
+                except Exception as exc:
+                    logger.warning("Dropped %d build events: %s", len(batch), exc)
+                batch = self._take_batch(block=False)
+            self._maybe_expire()
+        self._ring(written)
+
+    def flush(self) -> None:
+        if not self._queue.empty():
+            self._drain(block=False)
+
+
+class SQLiteEventLog(_BatchingEventLog):
+    """Build events in a WAL-mode SQLite table, shared by the workers on one host."""
+
+    def __init__(self, db_path: os.PathLike, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._db_path = Path(db_path)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS build_events (
+                    event_id    INTEGER PRIMARY KEY AUTOINCREMENT,
+                    build_id    TEXT NOT NULL,
+                    created_at  REAL NOT NULL,
+                    payload     TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_build_events_build ON build_events (build_id, event_id)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self._db_path), timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        now = time.time()
+        with self._conn() as conn:
+            conn.executemany(
+                "INSERT INTO build_events (build_id, created_at, payload) VALUES (?, ?, ?)",
+                [(build_id, now, json.dumps(event, default=str)) for build_id, event in batch],
+            )
+            for build_id in {build_id for build_id, _ in batch}:
+                conn.execute(
+                    """
+                    DELETE FROM build_events WHERE build_id = ? AND event_id <= (
+                        SELECT event_id FROM build_events WHERE build_id = ?
+                        ORDER BY event_id DESC LIMIT 1 OFFSET ?
+                    )
+                    """,
+                    (build_id, build_id, self.max_events_per_build),
+                )
+
+    def _expire(self, before: float) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM build_events WHERE created_at < ?", (before,))
+
+    def _read(self, build_id: str, after: int) -> List[SequencedEvent]:
+        rows = self._conn().execute(
+            "SELECT event_id, payload FROM build_events WHERE build_id = ? AND event_id > ? "
+            "ORDER BY event_id",
+            (build_id, after),
+        ).fetchall()
+        return [(event_id, json.loads(payload)) for event_id, payload in rows]
+
+    def close(self) -> None:
+        super().close()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RedisEventLog(_BatchingEventLog):
+    """
+    One Redis Stream per build (``<prefix><build_id>``), for multi-host workers.
+
+    Entry ids are ``<n>-0`` with ``n`` taken from a per-build counter, so
+    event ids are plain increasing integers as with the other logs. Streams
+    are capped at ``max_events_per_build`` entries and expire
+    ``retention_seconds`` after their last write.
+    """
+
+    def __init__(self, client: Any, key_prefix: str = "build_events:", **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._client = client
+        self.key_prefix = key_prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisEventLog":
+        import redis
+
+        return cls(redis.Redis.from_url(url, decode_responses=True), **kwargs)
+
+    def _write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        by_build: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for build_id, event in batch:
+            by_build[build_id].append(event)
+        ttl = max(1, int(self.retention_seconds))
+        for build_id, events in by_build.items():
+            stream = self.key_prefix + build_id
+            last = int(self._client.incrby(stream + ":seq", len(events)))
+            pipe = self._client.pipeline(transaction=False)
+            for n, event in enumerate(events, start=last - len(events) + 1):
+                pipe.xadd(
+                    stream, {"e": json.dumps(event, default=str)}, id=f"{n}-0",
+                    maxlen=self.max_events_per_build, approximate=True,
+                )
+            pipe.expire(stream, ttl)
+            pipe.expire(stream + ":seq", ttl)
+            pipe.execute()
+
+    def _expire(self, before: float) -> None:
+        # Streams expire through their TTL
+        pass
+
+    def _read(self, build_id: str, after: int) -> List[SequencedEvent]:
+        entries = self._client.xrange(self.key_prefix + build_id, min=f"{after + 1}-0", max="+")
+        return [(int(entry_id.split("-", 1)[0]), json.loads(fields["e"])) for entry_id, fields in entries]
+
+
+def event_log_from_env(db_path: os.PathLike, coalesce_key: Optional[CoalesceKey] = None) -> EventLog:
+    """
+    The event log for this deployment.
+
+    Redis Streams when ``REDIS_URL`` is set (and the ``redis`` package is
+    available), in-process buffers with ``BUILD_EVENT_LOG=memory``, otherwise
+    SQLite in *db_path*. ``BUILD_EVENT_RETENTION_SECONDS`` sets the retention.
+    """
+    options: Dict[str, Any] = {
+        "coalesce_key": coalesce_key,
+        "retention_seconds": float(os.getenv("BUILD_EVENT_RETENTION_SECONDS", str(24 * 3600))),
+    }
+    if os.getenv("BUILD_EVENT_LOG", "").strip().lower() == "memory":
+        return MemoryEventLog(**options)
+    redis_url = os.getenv("REDIS_URL", "").strip()
+    if redis_url:
+        try:
+            return RedisEventLog.from_url(redis_url, **options)
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is missing; using SQLite build events")
+    return SQLiteEventLog(db_path, **options)
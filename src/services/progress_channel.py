@@ -0,0 +1,155 @@
+"""
+Progress Broadcast Channel
+
+A :class:`ProgressChannel` is the per-build (or per-job) event log that
+SSE and WebSocket subscribers read from. Unlike a queue, reading does not
+consume: every event gets a monotonically increasing sequence number and
+stays in a bounded ring buffer, so
+
+- any number of subscribers (browser tabs, pollers) see every event;
+- a reconnecting subscriber resumes after the last sequence number it saw
+  (the SSE ``Last-Event-ID``);
+- waiting subscribers are woken by :meth:`ProgressChannel.publish`, which may
+  be called from any thread, instead of polling.
+
+A subscriber that falls far behind (more than ``coalesce_backlog`` pending
+events) gets runs of redundant events, those with the same ``coalesce_key``,
+collapsed to the newest one.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, Hashable, List, Optional, Tuple
+
+# (sequence number, event)
+SequencedEvent = Tuple[int, Any]
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def coalesce_events(
+    pending: List[SequencedEvent], key: Callable[[Any], Optional[Hashable]],
+) -> List[SequencedEvent]:
+    """Drop every event followed by one with the same (non-None) coalesce *key*."""
+    keys = [key(event) for _, event in pending]
+    return [
+        item for i, item in enumerate(pending)
+        if keys[i] is None or i + 1 == len(pending) or keys[i + 1] != keys[i]
+    ]
+
+
+class Doorbell:
+    """Wakes coroutines on any event loop when :meth:`ring` is called from any thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+
+    def ring(self) -> None:
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass  # waiter's loop already closed
+
+    async def wait(self, timeout: Optional[float], ready: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Wait for the next :meth:`ring`; False on timeout.
+
+        *ready* is checked after the waiter is registered, so a ring between
+        the caller's own check and this wait can't be missed.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            self._waiters.append(waiter)
+        try:
+            if ready is not None and ready():
+                return True
+            await asyncio.wait_for(waiter[1], timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+
+class ProgressChannel:
+    """Append-only ring buffer of sequenced events with async fan-out."""
+
+    def __init__(
+        self,
+        maxlen: int = 500,
+        coalesce_key: Optional[Callable[[Any], Optional[Hashable]]] = None,
+        coalesce_backlog: int = 50,
+    ) -> None:
+        self._buffer: Deque[SequencedEvent] = deque(maxlen=maxlen)
+        self._coalesce_key = coalesce_key
+        self.coalesce_backlog = coalesce_backlog
+        self._lock = threading.Lock()
+        self._last_seq = 0
+        self._closed = False
+        self._bell = Doorbell()
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest event (0 before the first)."""
+        return self._last_seq
+
+    @property
+    def closed(self) -> bool:
+        """True once :meth:`close` was called; no more events will follow."""
+        return self._closed
+
+    def publish(self, event: Any) -> int:
+        """Append *event*, wake every waiting subscriber and return its sequence number."""
+        with self._lock:
+            self._last_seq += 1
+            seq = self._last_seq
+            self._buffer.append((seq, event))
+        self._bell.ring()
+        return seq
+
+    def close(self) -> None:
+        """Mark the stream finished and wake subscribers so they can stop waiting."""
+        self._closed = True
+        self._bell.ring()
+
+    def read(self, after: int = 0) -> List[SequencedEvent]:
+        """
+        Events with a sequence number above *after* that are still buffered.
+
+        A cursor older than the buffer gets everything retained; a long
+        backlog is coalesced (see the module docstring).
+        """
+        with self._lock:
+            if not self._buffer:
+                return []
+            start = max(0, after - self._buffer[0][0] + 1)
+            pending = list(islice(self._buffer, start, None))
+        if self._coalesce_key is not None and len(pending) > self.coalesce_backlog:
+            pending = coalesce_events(pending, self._coalesce_key)
+        return pending
+
+    async def wait(self, after: int = 0, timeout: Optional[float] = None) -> List[SequencedEvent]:
+        """
+        Events after *after*, waiting up to *timeout* seconds for one to arrive.
+
+        Returns an empty list on timeout or when the channel is closed with
+        nothing new.
+        """
+        events = self.read(after)
+        if events:
+            return events
+        if not await self._bell.wait(timeout, ready=lambda: self._last_seq > after or self._closed):
+            return []
+        return self.read(after)
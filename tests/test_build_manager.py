@@ -1,5 +1,6 @@
 """Tests for the BuildManager service."""
 
+import asyncio
 import threading
 import time
 from pathlib import Path
@@ -7,6 +8,8 @@ from pathlib import Path
 import pytest
 
 from src.services.build_manager import BuildManager
+from src.services.event_log import MemoryEventLog, RedisEventLog, SQLiteEventLog
+from src.services.progress_channel import ProgressChannel
 
 
 @pytest.fixture()
@@ -77,6 +80,51 @@ class TestUpdateBuild:
         bm.update_build(build_id)  # should not raise
         assert bm.get_build(build_id)["status"] == "pending"
 
+    def test_progress_updates_are_batched(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "builds.db"
+        runner = BuildManager(db_path=db_path, progress_flush_interval=0.5)
+        dashboard = BuildManager(db_path=db_path)
+        build_id = runner.create_build(idea="x")
+        for percent in range(1, 50):
+            runner.update_build(build_id, current_stage="generate", progress=percent, status="running")
+        # Queued, not yet written, but visible to the writing manager
+        assert dashboard.get_build(build_id)["progress"] == 0
+        assert runner.get_build(build_id)["progress"] == 49
+        runner.update_build(build_id, current_stage="generate", progress=60, status="running")
+        deadline = time.monotonic() + 2
+        while dashboard.get_build(build_id)["progress"] != 60 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert dashboard.get_build(build_id)["progress"] == 60
+
+    def test_final_update_includes_queued_progress(self, bm: BuildManager) -> None:
+        build_id = bm.create_build(idea="x")
+        bm.update_build(build_id, current_stage="fix", progress=90, status="running")
+        bm.update_build(build_id, status="completed", completed_at="now")
+        bm.flush_progress()
+        build = bm.get_build(build_id)
+        assert (build["status"], build["current_stage"], build["progress"]) == ("completed", "fix", 90)
+
+
+class TestConnections:
+    def test_connection_reused_per_thread(self, bm: BuildManager) -> None:
+        conn = bm._get_conn()
+        assert bm._get_conn() is conn
+        other: list = []
+        thread = threading.Thread(target=lambda: other.append(bm._get_conn()))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+        bm.close()
+        assert bm._get_conn() is not conn
+
+    def test_indexes_exist(self, bm: BuildManager) -> None:
+        names = {
+            row[0] for row in bm._get_conn().execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'builds'"
+            )
+        }
+        assert {"idx_builds_started_at", "idx_builds_status"} <= names
+
 
 class TestEventBuffer:
     def test_push_and_get(self, bm: BuildManager) -> None:
@@ -86,8 +134,17 @@ class TestEventBuffer:
         events = bm.get_events(build_id)
         assert len(events) == 2
         assert events[0]["type"] == "progress"
-        # get_events drains the buffer
-        assert bm.get_events(build_id) == []
+        # Reading doesn't drain: every subscriber sees every event
+        assert bm.get_events(build_id) == events
+
+    def test_resume_after_event_id(self, bm: BuildManager) -> None:
+        build_id = bm.create_build(idea="x")
+        bm.push_event(build_id, {"type": "progress", "stage": "ideas"})
+        bm.push_event(build_id, {"type": "complete"})
+        (first, _), (second, _) = bm.read_events(build_id)
+        assert second > first
+        assert bm.read_events(build_id, after=first) == [(second, {"type": "complete"})]
+        assert bm.get_events(build_id, after=second) == []
 
     def test_get_events_unknown_id(self, bm: BuildManager) -> None:
         assert bm.get_events("unknown") == []
@@ -110,7 +167,146 @@ class TestEventBuffer:
             t.join()
 
         assert errors == [], f"Thread errors: {errors}"
-        # All events should have been pushed (some may have been drained)
-        # Just verify no corruption
-        remaining = bm.get_events(build_id)
-        assert isinstance(remaining, list)
+        # All events were pushed, with distinct consecutive ids
+        event_ids = [event_id for event_id, _ in bm.read_events(build_id)]
+        assert event_ids == list(range(1, 201))
+
+    def test_wait_events_wakes_on_push_from_thread(self, bm: BuildManager) -> None:
+        build_id = bm.create_build(idea="x")
+
+        async def subscribe():
+            waiting = asyncio.ensure_future(bm.wait_events(build_id, after=0, timeout=5))
+            await asyncio.sleep(0.05)
+            threading.Thread(target=bm.push_event, args=(build_id, {"type": "complete"})).start()
+            started = time.monotonic()
+            events = await waiting
+            return events, time.monotonic() - started
+
+        events, waited = asyncio.run(subscribe())
+        assert events == [(1, {"type": "complete"})]
+        assert waited < 1
+
+
+class TestEventLog:
+    def test_workers_share_events_through_sqlite(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "shared.db"
+        runner = BuildManager(db_path=db_path, event_log=SQLiteEventLog(db_path))
+        dashboard = BuildManager(db_path=db_path, event_log=SQLiteEventLog(db_path))
+        build_id = runner.create_build(idea="x")
+        runner.push_event(build_id, {"type": "progress", "stage": "ideas"})
+        runner.push_event(build_id, {"type": "complete"})
+        runner._event_log.flush()
+        events = dashboard.read_events(build_id)
+        assert [event for _, event in events] == [
+            {"type": "progress", "stage": "ideas"}, {"type": "complete"},
+        ]
+        assert dashboard.read_events(build_id, after=events[0][0]) == events[1:]
+
+    def test_waiting_worker_sees_other_workers_events(self, tmp_path: Path) -> None:
+        db_path = tmp_path / "shared.db"
+        writer = SQLiteEventLog(db_path)
+        reader = SQLiteEventLog(db_path, poll_interval=0.02)
+
+        async def subscribe():
+            waiting = asyncio.ensure_future(reader.wait("b1", after=0, timeout=5))
+            await asyncio.sleep(0.05)
+            writer.append("b1", {"type": "complete"})
+            return await waiting
+
+        assert [event for _, event in asyncio.run(subscribe())] == [{"type": "complete"}]
+
+    def test_retention_keeps_newest_events_per_build(self, tmp_path: Path) -> None:
+        log = SQLiteEventLog(tmp_path / "events.db", max_events_per_build=3)
+        for i in range(5):
+            log.append("b1", {"i": i})
+        log.append("b2", {"i": 0})
+        assert [event["i"] for _, event in log.read("b1")] == [2, 3, 4]
+        assert len(log.read("b2")) == 1
+        log._expire(time.time() + 1)
+        assert log.read("b1") == []
+
+    def test_writes_only_wake_subscribers_of_that_build(self, tmp_path: Path) -> None:
+        log = SQLiteEventLog(tmp_path / "events.db", poll_interval=10)
+        reads: list[str] = []
+        read = log.read
+        log.read = lambda build_id, after=0: reads.append(build_id) or read(build_id, after)
+
+        async def subscribe():
+            waiting = asyncio.ensure_future(log.wait("b1", after=0, timeout=0.3))
+            await asyncio.sleep(0.05)
+            for i in range(3):
+                log.append("b2", {"i": i})
+                log.flush()
+            return await waiting
+
+        assert asyncio.run(subscribe()) == []
+        # The first read, then the one after the timeout: never woken by b2
+        assert reads == ["b1", "b1"]
+        assert log._bells == {}
+
+    def test_memory_log_drops_expired_builds(self) -> None:
+        log = MemoryEventLog(retention_seconds=60)
+        log.append("old", {"type": "complete"})
+        log._written_at["old"] -= 120
+        log._last_sweep -= 120
+        log.append("new", {"type": "complete"})
+        assert log.read("old") == []
+        assert list(log._channels) == ["new"]
+
+    def test_redis_stream_cursor_reads(self) -> None:
+        fakeredis = pytest.importorskip("fakeredis")
+        log = RedisEventLog(fakeredis.FakeRedis(decode_responses=True))
+        for i in range(3):
+            log.append("b1", {"i": i})
+        log.append("b2", {"i": 0})
+        assert log.read("b1") == [(1, {"i": 0}), (2, {"i": 1}), (3, {"i": 2})]
+        assert log.read("b1", after=2) == [(3, {"i": 2})]
+        assert log.read("b2") == [(1, {"i": 0})]
+
+    def test_memory_log_is_selected_by_env(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setenv("BUILD_EVENT_LOG", "memory")
+        bm = BuildManager(db_path=tmp_path / "builds.db")
+        assert isinstance(bm._event_log, MemoryEventLog)
+        build_id = bm.create_build(idea="x")
+        bm.push_event(build_id, {"type": "complete"})
+        assert bm.read_events(build_id) == [(1, {"type": "complete"})]
+
+
+class TestProgressChannel:
+    def test_multiple_readers_see_every_event(self) -> None:
+        channel = ProgressChannel(maxlen=10)
+        for i in range(3):
+            channel.publish({"i": i})
+        assert channel.read() == channel.read() == [(1, {"i": 0}), (2, {"i": 1}), (3, {"i": 2})]
+        assert channel.read(after=2) == [(3, {"i": 2})]
+
+    def test_ring_buffer_drops_oldest(self) -> None:
+        channel = ProgressChannel(maxlen=3)
+        for i in range(5):
+            channel.publish(i)
+        # A cursor older than the buffer gets everything still retained
+        assert channel.read(after=1) == [(3, 2), (4, 3), (5, 4)]
+
+    def test_lagging_reader_gets_coalesced_events(self) -> None:
+        channel = ProgressChannel(
+            coalesce_key=lambda e: e.get("stage"), coalesce_backlog=3,
+        )
+        for i in range(5):
+            channel.publish({"stage": "generate", "i": i})
+        channel.publish({"type": "complete"})
+        assert channel.read() == [(5, {"stage": "generate", "i": 4}), (6, {"type": "complete"})]
+        # A reader that keeps up sees every event
+        assert len(channel.read(after=3)) == 3
+
+    def test_wait_times_out_and_close_wakes(self) -> None:
+        channel = ProgressChannel()
+
+        async def scenario():
+            assert await channel.wait(0, timeout=0.05) == []
+            waiting = asyncio.ensure_future(channel.wait(0, timeout=5))
+            await asyncio.sleep(0.01)
+            channel.close()
+            return await waiting
+
+        assert asyncio.run(scenario()) == []
+        assert channel.closed
@@ -111,6 +111,54 @@ class TestSystemArchitect:
         # Even with mock LLM, fallback should produce valid spec
         assert len(spec.entities) >= 1
 
+    def _architect_with_slow_steps(self, delay, failing=()):
+        from src.code_generation.architect import EntitySpec, FieldSpec, SystemArchitect
+
+        arch = SystemArchitect()
+
+        async def step(name, result):
+            await asyncio.sleep(delay)
+            if name in failing:
+                raise RuntimeError(f"{name} boom")
+            return result
+
+        async def step1(context, idea_name):
+            return {"features": ["Boards"]}
+
+        async def step2(context, decomposition):
+            return [EntitySpec(name="Task", fields=[FieldSpec(name="title", type="string")])]
+
+        arch._step1_decompose = step1
+        arch._step2_entities = step2
+        arch._step3_routes = lambda c, e, d: step("routes", [])
+        arch._step4_pages = lambda c, e, d: step("pages", [])
+        arch._step5_cross_cutting = lambda c, e, d: step("cross_cutting", {})
+        return arch
+
+    def test_design_runs_steps_3_to_5_concurrently(self):
+        """Routes, pages and cross-cutting steps overlap instead of running back to back."""
+        import time
+
+        arch = self._architect_with_slow_steps(delay=0.3)
+        t0 = time.monotonic()
+        spec = run_async(arch.design("TaskFlow", "Task boards"))
+        elapsed = time.monotonic() - t0
+
+        assert elapsed < 0.8
+        assert spec.llm_steps_completed == [
+            "decomposition", "entities", "routes", "pages", "cross_cutting",
+        ]
+
+    def test_design_keeps_partial_results_when_a_parallel_step_fails(self):
+        """A failed step is left out of steps_completed and the rest still land in the spec."""
+        arch = self._architect_with_slow_steps(delay=0.01, failing=("pages",))
+        spec = run_async(arch.design("TaskFlow", "Task boards"))
+
+        assert "pages" not in spec.llm_steps_completed
+        assert "routes" in spec.llm_steps_completed
+        assert "cross_cutting" in spec.llm_steps_completed
+        assert "Task" in [e.name for e in spec.entities]
+
 
 # ---------------------------------------------------------------------------
 # Engine v2 tests
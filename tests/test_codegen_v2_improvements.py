@@ -1089,3 +1089,1682 @@ class TestConsistencyResult:
         assert fix.file_path == "backend/app/routes/users.py"
         assert "import_fix" in fix.fix_type
         assert "app.models.user" in fix.description
+
+
+# =============================================================================
+# 7. Streaming generation
+# =============================================================================
+
+
+class TestStreamingGeneration:
+    """Tests for streamed LLM output in CodeGeneratorV2."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make_generator(self, deltas):
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+
+        async def _astream(*args, **kwargs):
+            for delta in deltas:
+                yield delta
+
+        client = MagicMock()
+        client.astream = _astream
+        with patch("src.code_generation.engine_v2.get_llm_client", return_value=client):
+            return CodeGeneratorV2()
+
+    def _make_spec(self):
+        from src.code_generation.architect import SystemSpec
+
+        return SystemSpec(app_name="StreamApp", description="Streaming test app")
+
+    def _make_ctx(self, events):
+        from src.code_generation.engine_v2 import _GenerationContext
+
+        return _GenerationContext(
+            spec=self._make_spec(), output_dir=Path(self.tmpdir), theme="Modern",
+            on_progress=events.append,
+        )
+
+    def test_call_llm_streams_into_partial_file(self):
+        """_call_llm streams deltas to the .partial sibling and returns the joined content."""
+        from src.code_generation.engine_v2 import _PartialFileWriter
+
+        gen = self._make_generator(["x = 1\n", "y = 2\n"])
+        ctx = self._make_ctx([])
+        dest = Path(self.tmpdir) / "app.py"
+        writer = _PartialFileWriter(dest, "app.py", ctx)
+
+        async def _run():
+            content = await gen._call_llm("prompt", ctx, writer=writer)
+            await writer.flush()
+            return content
+
+        content = run_async(_run())
+
+        assert content == "x = 1\ny = 2\n"
+        assert writer.partial_path.read_text() == content
+        assert not dest.exists()
+        assert writer.bytes_generated == len(content)
+        assert ctx.llm_calls == 1
+
+    def test_writer_emits_streaming_progress(self):
+        """_PartialFileWriter reports bytes and estimated tokens so far."""
+        from src.code_generation.engine_v2 import _PartialFileWriter
+
+        events = []
+        ctx = self._make_ctx(events)
+        writer = _PartialFileWriter(Path(self.tmpdir) / "a.py", "a.py", ctx)
+        run_async(writer.write("abcdefgh"))
+
+        assert len(events) == 1
+        assert events[0].step == "streaming"
+        assert events[0].current_file == "a.py"
+        assert events[0].bytes_generated == 8
+        assert events[0].tokens_generated == 2
+
+    def test_writer_buffers_between_flushes(self):
+        """Deltas inside the throttle window stay in memory until the next flush."""
+        from src.code_generation.engine_v2 import _PartialFileWriter
+
+        ctx = self._make_ctx([])
+        writer = _PartialFileWriter(Path(self.tmpdir) / "c.py", "c.py", ctx)
+
+        async def _run():
+            await writer.write("first\n")   # flushes (first event)
+            await writer.write("second\n")  # inside the throttle window
+            on_disk = writer.partial_path.read_text()
+            await writer.flush()
+            return on_disk
+
+        on_disk = run_async(_run())
+        assert on_disk == "first\n"
+        assert writer.partial_path.read_text() == "first\nsecond\n"
+
+    def test_writer_reset_truncates_previous_attempt(self):
+        """A retry starts the partial file from scratch."""
+        from src.code_generation.engine_v2 import _PartialFileWriter
+
+        ctx = self._make_ctx([])
+        writer = _PartialFileWriter(Path(self.tmpdir) / "b.py", "b.py", ctx)
+
+        async def _run():
+            await writer.write("broken(")
+            await writer.reset()
+            await writer.write("ok = True\n")
+            await writer.flush()
+
+        run_async(_run())
+        assert writer.partial_path.read_text() == "ok = True\n"
+        assert writer.bytes_generated == len("ok = True\n")
+
+    def test_commit_replaces_destination_and_removes_partial(self):
+        """commit() moves the final source onto dest; no .partial file is left."""
+        from src.code_generation.engine_v2 import _PartialFileWriter
+
+        ctx = self._make_ctx([])
+        dest = Path(self.tmpdir) / "pkg" / "d.py"
+        writer = _PartialFileWriter(dest, "pkg/d.py", ctx)
+
+        async def _run():
+            await writer.write("draft")
+            await writer.commit("final = 1\n")
+
+        run_async(_run())
+        assert dest.read_text() == "final = 1\n"
+        assert not writer.partial_path.exists()
+
+    def test_generate_file_failure_discards_partial(self):
+        """A failed generation leaves neither the destination nor the .partial file."""
+        from src.code_generation.engine_v2 import FileCategory, _FileSpec
+
+        gen = self._make_generator([])
+        gen._llm_generate_with_heal = AsyncMock(side_effect=RuntimeError("boom"))
+        ctx = self._make_ctx([])
+        fs = _FileSpec(
+            relative_path="backend/app/x.py",
+            category=FileCategory.BACKEND_CORE,
+            prompt_builder=lambda c: "Generate a long enough prompt for the LLM to be called. " * 3,
+        )
+        dest = Path(self.tmpdir) / "backend/app/x.py"
+        dest.parent.mkdir(parents=True)
+        (dest.parent / "x.py.partial").write_text("half")
+
+        with pytest.raises(RuntimeError):
+            run_async(gen._generate_file(fs, ctx))
+        assert not dest.exists()
+        assert not (dest.parent / "x.py.partial").exists()
+
+    def test_generate_reports_progress(self):
+        """generate(on_progress=...) emits start, streaming and per-file events."""
+        gen = self._make_generator(["value = 1\n"])
+        events = []
+        result = run_async(gen.generate(self._make_spec(), self.tmpdir, on_progress=events.append))
+
+        steps = [e.step for e in events]
+        assert steps[0] == "start"
+        assert "streaming" in steps
+        assert steps.count("generating") == result.total_files
+        assert events[-1].percentage == 100.0
+        assert not list(Path(self.tmpdir).rglob("*.partial"))
+
+    def test_generate_with_progress_yields_events_then_complete(self):
+        """generate_with_progress relays generate()'s events and ends with 'complete'."""
+        gen = self._make_generator(["value = 1\n"])
+
+        async def _collect():
+            return [e async for e in gen.generate_with_progress(self._make_spec(), self.tmpdir)]
+
+        events = run_async(_collect())
+        assert events[0].step == "start"
+        assert events[-1].step == "complete"
+        assert any(e.step == "generating" for e in events)
+
+
+class TestDrainProgress:
+    """Tests for the drain_progress helper."""
+
+    def test_events_arrive_before_task_finishes(self):
+        """Queued events are yielded while the producing task is still running."""
+        from src.code_generation.engine_v2 import drain_progress
+
+        async def _run():
+            events: asyncio.Queue = asyncio.Queue()
+            release = asyncio.Event()
+
+            async def _producer():
+                events.put_nowait("first")
+                await release.wait()
+                events.put_nowait("last")
+                return "done"
+
+            task = asyncio.ensure_future(_producer())
+            seen = []
+            async for item in drain_progress(task, events):
+                seen.append((item, task.done()))
+                if item == "first":
+                    release.set()
+            return seen, task.result()
+
+        seen, result = run_async(_run())
+        assert seen[0] == ("first", False)
+        assert [item for item, _ in seen] == ["first", "last"]
+        assert result == "done"
+
+    def test_task_cancelled_when_consumer_stops(self):
+        """Closing the generator early cancels the producing task."""
+        from src.code_generation.engine_v2 import drain_progress
+
+        async def _run():
+            events: asyncio.Queue = asyncio.Queue()
+
+            async def _producer():
+                events.put_nowait("tick")
+                await asyncio.sleep(60)
+
+            task = asyncio.ensure_future(_producer())
+            agen = drain_progress(task, events)
+            assert await agen.__anext__() == "tick"
+            await agen.aclose()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            return task.cancelled()
+
+        assert run_async(_run()) is True
+
+
+# =============================================================================
+# 8. Content-addressed artifact store
+# =============================================================================
+
+
+class TestArtifactStore:
+    """Tests for reusing validated files from the artifact store."""
+
+    PROMPT = "Generate the user model with all fields, relationships and validation. " * 3
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make_generator(self, store, source="value = 1\n"):
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+
+        client = MagicMock()
+        client.model = "test-model"
+        client.provider_name = "test"
+        with patch("src.code_generation.engine_v2.get_llm_client", return_value=client):
+            gen = CodeGeneratorV2(artifact_store=store)
+        gen._call_llm = AsyncMock(return_value=source)
+        return gen
+
+    def _make_ctx(self, name):
+        from src.code_generation.architect import SystemSpec
+        from src.code_generation.engine_v2 import _GenerationContext
+
+        return _GenerationContext(
+            spec=SystemSpec(app_name="CacheApp", description="Artifact store test"),
+            output_dir=Path(self.tmpdir) / name, theme="Modern",
+        )
+
+    def _file_spec(self):
+        from src.code_generation.engine_v2 import FileCategory, _FileSpec
+
+        return _FileSpec(
+            relative_path="backend/app/models/user.py",
+            category=FileCategory.BACKEND_MODEL,
+            prompt_builder=lambda c: self.PROMPT,
+            depends_on=["backend/app/db/base.py"],
+        )
+
+    def _store(self):
+        from src.code_generation.artifact_store import ArtifactStore
+
+        return ArtifactStore(Path(self.tmpdir) / "artifacts")
+
+    def test_hit_skips_llm_and_writes_file(self):
+        """A repeated request is served from the store without calling the LLM."""
+        store = self._store()
+        gen = self._make_generator(store)
+        first_ctx, second_ctx = self._make_ctx("first"), self._make_ctx("second")
+
+        first = run_async(gen._generate_file(self._file_spec(), first_ctx))
+        second = run_async(gen._generate_file(self._file_spec(), second_ctx))
+
+        assert gen._call_llm.await_count == 1
+        assert first.cached is False and second.cached is True
+        dest = second_ctx.output_dir / "backend/app/models/user.py"
+        assert dest.read_text() == "value = 1\n"
+        assert "backend/app/models/user.py" in second_ctx.generated_interfaces
+        assert (first_ctx.artifact_misses, second_ctx.artifact_hits) == (1, 1)
+
+    def test_changed_dependency_interface_misses(self):
+        """A different interface for a dependency must not reuse the old file."""
+        store = self._store()
+        gen = self._make_generator(store)
+        first_ctx, second_ctx = self._make_ctx("first"), self._make_ctx("second")
+        first_ctx.generated_interfaces["backend/app/db/base.py"] = "class Base: ..."
+        second_ctx.generated_interfaces["backend/app/db/base.py"] = "class BaseModel: ..."
+
+        run_async(gen._generate_file(self._file_spec(), first_ctx))
+        run_async(gen._generate_file(self._file_spec(), second_ctx))
+
+        assert gen._call_llm.await_count == 2
+        assert second_ctx.artifact_misses == 1
+
+    def test_unvalidated_source_is_not_stored(self):
+        """Best-effort output that never passed validation is not replayed."""
+        store = self._store()
+        gen = self._make_generator(store, source="def broken(:\n")
+
+        run_async(gen._generate_file(self._file_spec(), self._make_ctx("first")))
+        run_async(gen._generate_file(self._file_spec(), self._make_ctx("second")))
+
+        assert store.stats()["stores"] == 0
+        assert store.stats()["hits"] == 0
+
+    def test_gc_evicts_least_recently_used_and_expired_entries(self):
+        """gc() keeps the store under max_bytes (LRU) and drops refs past max_age_seconds."""
+        import time
+
+        from src.code_generation.artifact_store import ArtifactStore
+
+        store = ArtifactStore(Path(self.tmpdir) / "artifacts", max_bytes=2500, gc_every=1000)
+        now = time.time()
+        for i, age in enumerate([300, 200, 100]):
+            store.put(f"key{i}", f"{i}" * 1000)
+            ref = store._path("refs", f"key{i}")
+            os.utime(ref, (now - age, now - age))
+            os.utime(store._path("objects", ref.read_text()), (now - 600,) * 2)
+        assert store.get("key0") is not None  # now the most recently used
+
+        assert store.gc() == 1
+        assert store.get("key1") is None
+        assert store.get("key0") is not None and store.get("key2") is not None
+        assert len(list((store.root / "objects").glob("*/*"))) == 2
+
+        store.max_age_seconds = 150
+        os.utime(store._path("refs", "key2"), (now - 200,) * 2)
+        assert store.gc() == 1
+        assert store.get("key2") is None
+
+    def test_generate_reports_hit_counts(self):
+        """GenerationResult reports artifact hits and misses for the run."""
+        from src.code_generation.architect import SystemSpec
+
+        store = self._store()
+        gen = self._make_generator(store)
+        spec = SystemSpec(app_name="CacheApp", description="Artifact store test")
+
+        first = run_async(gen.generate(spec, str(Path(self.tmpdir) / "first")))
+        calls_after_first = gen._call_llm.await_count
+        second = run_async(gen.generate(spec, str(Path(self.tmpdir) / "second")))
+
+        assert first.artifact_cache_hits == 0
+        assert first.artifact_cache_misses > 0
+        assert second.artifact_cache_hits > 0
+        assert second.artifact_cache_hits + second.artifact_cache_misses == first.artifact_cache_misses
+        assert gen._call_llm.await_count - calls_after_first < calls_after_first
+        assert sum(f.cached for f in second.files) == second.artifact_cache_hits
+
+    def test_default_store_is_off_unless_enabled(self, monkeypatch):
+        """The process-wide store only exists when CODEGEN_ARTIFACT_STORE is set."""
+        import src.code_generation.artifact_store as module
+
+        monkeypatch.setattr(module, "_default_artifact_store", None)
+        monkeypatch.delenv("CODEGEN_ARTIFACT_STORE", raising=False)
+        assert module.get_default_artifact_store() is None
+
+        monkeypatch.setenv("CODEGEN_ARTIFACT_STORE", str(Path(self.tmpdir) / "store"))
+        store = module.get_default_artifact_store()
+        assert store is not None
+        assert store.root == Path(self.tmpdir) / "store"
+
+
+# =============================================================================
+# 9. Incremental regeneration
+# =============================================================================
+
+
+class TestIncrementalRegeneration:
+    """Tests for regenerating only the files affected by a spec change."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.output = str(Path(self.tmpdir) / "project")
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make_spec(self, task_fields=("title",), entities=("User", "Task")):
+        from src.code_generation.architect import EntitySpec, FieldSpec, PageSpec, SystemSpec
+
+        fields = {"User": ["email"], "Task": list(task_fields)}
+        return SystemSpec(
+            app_name="TaskApp",
+            description="Incremental test app",
+            entities=[
+                EntitySpec(name=name, fields=[FieldSpec(name=f) for f in fields[name]])
+                for name in entities
+            ],
+            pages=[PageSpec(route="/users", title="Users", related_entities=["User"])],
+        )
+
+    def _make_generator(self, interface_per_call=False):
+        """Generator whose files are ``value = N`` without going through the LLM."""
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+
+        with patch("src.code_generation.engine_v2.get_llm_client", return_value=MagicMock()):
+            gen = CodeGeneratorV2()
+        gen._artifacts = None
+        calls = []
+
+        async def _generate(prompt, relative_path, ctx, writer=None):
+            calls.append(relative_path)
+            value = len(calls) if interface_per_call else 1
+            if relative_path.endswith(".py"):
+                return f"VALUE_{value} = {value}\n", 0
+            return f"export const value{value} = {value};\n", 0
+
+        gen._llm_generate_with_heal = _generate
+        return gen, calls
+
+    def test_diff_specs_scopes_field_change_to_entity(self):
+        """Adding a field to one entity only marks that entity (and aggregates) changed."""
+        from src.code_generation.incremental import diff_specs
+
+        diff = diff_specs(self._make_spec(), self._make_spec(task_fields=("title", "due_date")))
+
+        assert not diff.full
+        assert diff.changed == {"entity:task", "entities"}
+        assert diff.affects(["entity:task"]) and not diff.affects(["entity:user"])
+        assert not diff.affects([])
+        assert diff.affects(None)
+
+    def test_diff_specs_spec_wide_change_is_full(self):
+        """Changing a spec-wide field such as the tech stack affects every file."""
+        from src.code_generation.incremental import diff_specs
+
+        new = self._make_spec()
+        new.tech_stack.database = "MySQL"
+        diff = diff_specs(self._make_spec(), new)
+
+        assert diff.full and diff.affects([])
+
+    def test_field_change_regenerates_only_affected_files(self):
+        """A one-field change regenerates that entity's files and reuses the rest."""
+        gen, calls = self._make_generator()
+        run_async(gen.generate(self._make_spec(), self.output))
+        full_calls = len(calls)
+        user_model = Path(self.output) / "backend/app/models/user.py"
+        user_model.write_text("VALUE_1 = 1  # kept\n")
+        calls.clear()
+
+        result = run_async(gen.generate(
+            self._make_spec(task_fields=("title", "due_date")), self.output, incremental=True,
+        ))
+
+        assert "backend/app/models/task.py" in calls
+        assert not [path for path in calls if "user" in path]
+        assert len(calls) < full_calls
+        assert user_model.read_text() == "VALUE_1 = 1  # kept\n"
+        reused = {f.path for f in result.files if f.reused}
+        assert "backend/app/models/user.py" in reused
+        assert "frontend/src/app/users/page.tsx" in reused
+        assert result.files_reused == len(reused)
+
+    def test_diff_specs_relationship_change_marks_both_entities(self):
+        """A relationship added on one entity also marks the entity it points at."""
+        from src.code_generation.architect import RelationshipSpec
+        from src.code_generation.incremental import diff_specs
+
+        new = self._make_spec()
+        new.entities[1].relationships.append(RelationshipSpec(entity="User", type="many-to-one"))
+        diff = diff_specs(self._make_spec(), new)
+
+        assert {"entity:task", "entity:user"} <= diff.changed
+        assert diff.affects(["entity:user"])
+
+    def test_prompts_embedding_the_spec_summary_follow_entity_changes(self):
+        """Unfocused files whose prompt embeds every entity are regenerated when one changes."""
+        from src.code_generation.incremental import BuildManifest
+
+        gen, calls = self._make_generator()
+        run_async(gen.generate(self._make_spec(), self.output))
+        scopes = BuildManifest.load(Path(self.output)).scopes
+        assert "entities" in scopes["backend/app/core/config.py"]
+        assert scopes["backend/app/models/user.py"] == ["entity:user"]
+        calls.clear()
+
+        run_async(gen.generate(
+            self._make_spec(task_fields=("title", "due_date")), self.output, incremental=True,
+        ))
+
+        assert "backend/app/core/config.py" in calls
+        # Reused files keep their recorded scope for the build after this one
+        assert BuildManifest.load(Path(self.output)).scopes["backend/app/models/user.py"] == ["entity:user"]
+
+    def test_changed_interface_propagates_to_dependents(self):
+        """Files depending on a regenerated file with a new interface are regenerated too."""
+        gen, calls = self._make_generator(interface_per_call=True)
+        run_async(gen.generate(self._make_spec(), self.output))
+        calls.clear()
+
+        run_async(gen.generate(
+            self._make_spec(task_fields=("title", "due_date")), self.output, incremental=True,
+        ))
+
+        # The users page isn't scoped to Task but depends on Task's components
+        assert "frontend/src/app/users/page.tsx" in calls
+        assert "backend/app/models/user.py" not in calls
+
+    def test_removed_entity_files_are_deleted(self):
+        """Files of an entity dropped from the spec are removed from the output."""
+        gen, calls = self._make_generator()
+        run_async(gen.generate(self._make_spec(), self.output))
+        task_model = Path(self.output) / "backend/app/models/task.py"
+        assert task_model.exists()
+
+        run_async(gen.generate(self._make_spec(entities=("User",)), self.output, incremental=True))
+
+        assert not task_model.exists()
+
+    def test_without_manifest_falls_back_to_full_build(self):
+        """An incremental request with no previous build generates everything."""
+        gen, calls = self._make_generator()
+        result = run_async(gen.generate(self._make_spec(), self.output, incremental=True))
+
+        assert result.files_reused == 0
+        assert (Path(self.output) / ".ignara/build_manifest.json").exists()
+
+
+# =============================================================================
+# 10. Shared project file index
+# =============================================================================
+
+
+class TestProjectIndex:
+    """Tests for the per-project file index shared by the post-generation passes."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.root = Path(self.tmpdir)
+        for rel, content in {
+            "backend/app/main.py": "from app.models.user import User\n",
+            "backend/app/models/user.py": "class User:\n    name: str\n",
+            "backend/app/broken.py": "def broken(:\n",
+            "frontend/node_modules/pkg/index.js": "module.exports = 1;\n",
+            ".ignara/build_manifest.json": "{}\n",
+            "backend/app/api.py.partial": "def half",
+            "README.md": "# Demo\n",
+        }.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_single_walk_indexes_files_and_skips_ignored_dirs(self):
+        """Files are indexed with hashes; dependency dirs and build metadata are skipped."""
+        import hashlib
+        from src.code_generation.project_index import ProjectIndex
+
+        idx = ProjectIndex.build(self.root)
+
+        assert [f.rel for f in idx] == [
+            "README.md",
+            "backend/app/broken.py",
+            "backend/app/main.py",
+            "backend/app/models/user.py",
+        ]
+        entry = idx.get(self.root / "README.md")
+        assert entry.sha256 == hashlib.sha256(b"# Demo\n").hexdigest()
+        assert idx.is_dir(self.root / "backend" / "app" / "models")
+        assert not idx.exists("frontend/node_modules/pkg/index.js")
+        assert [f.rel for f in idx.files([".py"], under="backend/app", recursive=False)] == [
+            "backend/app/broken.py",
+            "backend/app/main.py",
+        ]
+
+    def test_ast_is_parsed_lazily_once(self):
+        """The AST is parsed on first access and cached; parse errors are recorded."""
+        from src.code_generation.project_index import ProjectIndex
+
+        idx = ProjectIndex.build(self.root)
+        with patch("src.code_generation.project_index.ast.parse", wraps=__import__("ast").parse) as parse:
+            user = idx.get("backend/app/models/user.py")
+            assert parse.call_count == 0
+            assert user.tree is user.tree
+            assert user.parse_error is None
+            assert parse.call_count == 1
+        assert idx.get("backend/app/broken.py").tree is None
+        assert isinstance(idx.get("backend/app/broken.py").parse_error, SyntaxError)
+
+    def test_write_text_updates_entry_and_refresh_detects_outside_edits(self):
+        """Writes through the index update it; refresh picks up edits made on disk."""
+        from src.code_generation.project_index import ProjectIndex
+
+        idx = ProjectIndex.build(self.root)
+        before = idx.get("backend/app/main.py").sha256
+        idx.write_text("backend/app/main.py", "import os\n")
+        assert idx.get("backend/app/main.py").sha256 != before
+        assert idx.get("backend/app/main.py").tree is not None
+
+        idx.write_text("backend/app/core/config.py", "X = 1\n")
+        assert idx.is_dir("backend/app/core")
+
+        (self.root / "README.md").write_text("# Changed readme\n")
+        (self.root / "backend/app/broken.py").unlink()
+        assert idx.refresh() == {"README.md", "backend/app/broken.py"}
+        assert idx.get("README.md").text == "# Changed readme\n"
+
+    def test_validate_with_shared_index_matches_fresh_walk(self):
+        """Quality checks give the same results with a prebuilt index."""
+        from src.code_generation.project_index import ProjectIndex
+        from src.code_generation.quality import CodeQualityPipeline
+
+        pipeline = CodeQualityPipeline()
+        fresh = run_async(pipeline.validate(str(self.root)))
+        shared = run_async(pipeline.validate(str(self.root), index=ProjectIndex.build(self.root)))
+
+        assert [(c.name, c.passed) for c in shared.checks] == [(c.name, c.passed) for c in fresh.checks]
+        assert any(c.category == "syntax" and not c.passed for c in shared.checks)
+
+    def test_consistency_fixes_are_visible_to_later_passes(self):
+        """Files created by the consistency pass show up in the shared index."""
+        from src.code_generation.consistency import ConsistencyChecker
+        from src.code_generation.project_index import ProjectIndex
+
+        idx = ProjectIndex.build(self.root)
+        result = ConsistencyChecker().run(str(self.root), index=idx)
+
+        created = {f.file_path for f in result.fixes if f.fix_type == "init_created"}
+        assert "backend/app/models/__init__.py" in created
+        assert idx.is_file("backend/app/models/__init__.py")
+        assert (self.root / "backend/app/models/__init__.py").exists()
+        # The index already matches the disk
+        assert idx.refresh() == set()
+
+
+# =============================================================================
+# 11. Incremental re-validation
+# =============================================================================
+
+
+class TestIncrementalValidation:
+    """Tests for the per-file validation cache reused across fix rounds."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.root = Path(self.tmpdir)
+        for rel, content in {
+            "backend/app/main.py": "from fastapi import FastAPI\napp = FastAPI()\n",
+            "backend/app/models/user.py": "class User:\n    name: str\n    email: str\n",
+            "backend/app/schemas/user.py": "class UserSchema:\n    name: str\n    email: str\n",
+            "backend/app/broken.py": "def broken(:\n",
+            "README.md": "# Demo\n",
+        }.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    @staticmethod
+    def _signature(report):
+        return [(c.name, c.passed, c.message) for c in report.checks]
+
+    def test_unchanged_project_reuses_every_result(self):
+        """A second validation of the same tree recomputes nothing."""
+        from src.code_generation.project_index import ProjectIndex
+        from src.code_generation.quality import CodeQualityPipeline
+
+        pipeline = CodeQualityPipeline()
+        idx = ProjectIndex.build(self.root)
+        first = run_async(pipeline.validate(str(self.root), index=idx))
+        misses = pipeline._cache.stats()["misses"]
+
+        second = run_async(pipeline.validate(str(self.root), index=idx))
+
+        assert pipeline._cache.stats()["misses"] == misses
+        assert self._signature(second) == self._signature(first)
+
+    def test_only_changed_file_is_rechecked(self):
+        """Fixing one file re-runs only that file's checks; results match a cold run."""
+        from src.code_generation.project_index import ProjectIndex
+        from src.code_generation.quality import CodeQualityPipeline
+
+        pipeline = CodeQualityPipeline()
+        idx = ProjectIndex.build(self.root)
+        before = run_async(pipeline.validate(str(self.root), index=idx))
+        assert not before.passed
+
+        idx.write_text("backend/app/broken.py", "def broken():\n    return 1\n")
+        misses = pipeline._cache.stats()["misses"]
+        after = run_async(pipeline.validate(str(self.root), index=idx))
+
+        # syntax, imports, security and import-style for the one changed file
+        assert pipeline._cache.stats()["misses"] - misses == 4
+        assert not any(c.category == "syntax" and not c.passed for c in after.checks)
+        cold = run_async(CodeQualityPipeline().validate(str(self.root)))
+        assert self._signature(after) == self._signature(cold)
+
+    def test_cross_file_check_reruns_when_its_inputs_change(self):
+        """Changing a model re-runs the model/schema consistency check."""
+        from src.code_generation.project_index import ProjectIndex
+        from src.code_generation.quality import CodeQualityPipeline
+
+        pipeline = CodeQualityPipeline()
+        idx = ProjectIndex.build(self.root)
+        report = run_async(pipeline.validate(str(self.root), index=idx))
+        assert any(c.name == "consistency_schema_fields:user" and c.passed for c in report.checks)
+
+        idx.write_text(
+            "backend/app/models/user.py",
+            "class User:\n    name: str\n    email: str\n    age: int\n",
+        )
+        report = run_async(pipeline.validate(str(self.root), index=idx))
+
+        assert any(c.name == "consistency_schema_fields:user" and not c.passed for c in report.checks)
+
+    def test_autofixer_revalidates_with_shared_pipeline(self):
+        """AutoFixer re-validates through the pipeline it was given, reusing its cache."""
+        from src.code_generation.project_index import ProjectIndex
+        from src.code_generation.quality import AutoFixer, CodeQualityPipeline
+
+        pipeline = CodeQualityPipeline()
+        idx = ProjectIndex.build(self.root)
+        report = run_async(pipeline.validate(str(self.root), index=idx))
+
+        fixer = AutoFixer(quality=pipeline)
+        response = MagicMock()
+        response.content = "def broken():\n    return 1\n"
+        fixer._client = MagicMock()
+        fixer._client.acomplete = AsyncMock(return_value=response)
+
+        misses = pipeline._cache.stats()["misses"]
+        fixes, new_report = run_async(fixer.fix(str(self.root), report, index=idx))
+
+        assert fixes == 1
+        assert not any(c.category == "syntax" and not c.passed for c in new_report.checks)
+        # Only the repaired file's checks were re-run
+        assert pipeline._cache.stats()["misses"] - misses == 4
+
+
+# =============================================================================
+# 12. Process-pool quality checks
+# =============================================================================
+
+
+class TestProcessPoolValidation:
+    """Tests for sharding per-file quality checks across worker processes."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.root = Path(self.tmpdir)
+        files = {
+            "backend/app/main.py": "from fastapi import FastAPI\napp = FastAPI()\n",
+            "backend/app/broken.py": "def broken(:\n",
+            "backend/app/db.py": 'import os\npassword = "hunter2hunter2"\nresult = eval("1 + 1")\n',
+            "frontend/src/app/page.tsx": "export default function Page() { return <div>{1}</div> }\n",
+            "frontend/src/lib/api.ts": "import api\nexport const f = () => {\n",
+        }
+        for i in range(12):
+            files[f"backend/app/models/m{i}.py"] = f"import unknown_pkg_{i}\nclass M{i}:\n    name: str\n"
+        for rel, content in files.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_process_mode_matches_thread_mode(self):
+        """Worker processes produce the same report, and fill the shared cache."""
+        from src.code_generation.quality import CodeQualityPipeline
+
+        threaded = run_async(CodeQualityPipeline(workers=0).validate(str(self.root)))
+        pipeline = CodeQualityPipeline(workers=2, process_min_files=1)
+        try:
+            pooled = run_async(pipeline.validate(str(self.root)))
+            assert pipeline._pool is not None
+            misses = pipeline._cache.stats()["misses"]
+            run_async(pipeline.validate(str(self.root)))
+            assert pipeline._cache.stats()["misses"] == misses
+        finally:
+            pipeline.close()
+
+        signature = lambda report: [(c.name, c.passed, c.message) for c in report.checks]  # noqa: E731
+        assert signature(pooled) == signature(threaded)
+
+    def test_small_workloads_stay_in_threads(self):
+        """Below process_min_files no worker processes are started."""
+        from src.code_generation.quality import CodeQualityPipeline
+
+        pipeline = CodeQualityPipeline(workers=2, process_min_files=1000)
+        run_async(pipeline.validate(str(self.root)))
+        assert pipeline._pool is None
+
+    def test_shards_are_balanced_by_size(self):
+        """Files are spread so each shard carries a similar number of bytes."""
+        from src.code_generation.quality import _shard_by_size
+
+        items = [(f"f{i}.py", b"x" * size, ("python_syntax",)) for i, size in enumerate([90, 50, 40, 30, 20, 10])]
+        shards = _shard_by_size(items, 2)
+
+        assert len(shards) == 2
+        assert sorted(sum(len(i[1]) for i in shard) for shard in shards) == [120, 120]
+        assert sorted(i[0] for shard in shards for i in shard) == sorted(i[0] for i in items)
+
+
+# =============================================================================
+# 13. Token-budgeted context packing
+# =============================================================================
+
+
+class TestContextPacking:
+    """Tests for packing spec and interface context into a per-file token budget."""
+
+    def _make_spec(self, n_entities=40):
+        from src.code_generation.architect import (
+            EntitySpec, FieldSpec, RelationshipSpec, RouteSpec, SystemSpec,
+        )
+
+        entities = [
+            EntitySpec(
+                name=f"Thing{i}",
+                fields=[FieldSpec(name=f"attribute_{j}") for j in range(8)],
+                relationships=[RelationshipSpec(entity=f"Thing{i + 1}", type="many_to_one")] if i % 2 else [],
+            )
+            for i in range(n_entities)
+        ]
+        routes = [RouteSpec(method="GET", path=f"/api/thing{i}s", business_logic="List things " * 5)
+                  for i in range(n_entities)]
+        rules = [f"Thing{i} records are archived after a year" for i in range(n_entities)]
+        return SystemSpec(app_name="Big", description="Large spec", entities=entities,
+                          api_routes=routes, business_rules=rules)
+
+    def _make_ctx(self, spec, **kwargs):
+        from src.code_generation.engine_v2 import _GenerationContext
+
+        return _GenerationContext(spec=spec, output_dir=Path(tempfile.gettempdir()), theme="Modern", **kwargs)
+
+    def _file_spec(self, path, depends_on=(), scope=None):
+        from src.code_generation.engine_v2 import FileCategory, _FileSpec
+
+        return _FileSpec(path, FileCategory.BACKEND_CRUD, None,
+                         depends_on=list(depends_on), spec_scope=scope)
+
+    def test_pack_keeps_required_then_best_scoring(self):
+        """Required fragments always stay; the rest go by score until the budget is spent."""
+        from src.code_generation.context_packer import Fragment, pack
+
+        fragments = [
+            Fragment("a" * 40, score=1),
+            Fragment("b" * 40, required=True),
+            Fragment("c" * 40, score=5),
+            Fragment("d" * 40, score=3),
+        ]
+        assert pack(fragments, 25) == [False, True, True, False]
+        assert pack(fragments, 1000, max_items=2) == [False, True, True, True]
+
+    def test_large_spec_is_packed_around_the_target_entity(self):
+        """A spec over budget keeps the file's entity, its relations and its routes."""
+        from src.code_generation.context_packer import ContextBudget, estimate_tokens
+        from src.code_generation.engine_v2 import _spec_summary
+
+        spec = self._make_spec()
+        ctx = self._make_ctx(spec, context_budget=ContextBudget(spec_tokens=800))
+        full = _spec_summary(spec, ctx=ctx)
+        ctx._packing_for = self._file_spec("backend/app/crud/thing11.py", scope=["entity:thing11"])
+        packed = _spec_summary(spec, ctx=ctx)
+
+        assert estimate_tokens(full) > 800 >= estimate_tokens(packed) - 60
+        assert "• Thing11 [" in packed and "• Thing12 [" in packed
+        assert "/api/thing11s" in packed
+        assert "Thing11 records are archived" in packed
+        assert "more entities omitted" in packed
+        assert "Tech Stack:" in packed and "Roles:" in packed
+
+    def test_spec_within_budget_is_unchanged(self):
+        """Packing never alters a summary that already fits."""
+        from src.code_generation.engine_v2 import _spec_summary
+
+        spec = self._make_spec(n_entities=3)
+        ctx = self._make_ctx(spec)
+        full = _spec_summary(spec, ctx=ctx)
+        ctx._packing_for = self._file_spec("backend/app/crud/thing1.py")
+        assert _spec_summary(spec, ctx=ctx) == full
+
+    def test_dependency_interfaces_are_always_kept(self):
+        """The file's depends_on interfaces survive even when others score higher."""
+        from src.code_generation.context_packer import ContextBudget, estimate_tokens
+        from src.code_generation.engine_v2 import _interfaces_summary
+
+        ctx = self._make_ctx(self._make_spec(n_entities=1), context_budget=ContextBudget(interface_tokens=300))
+        for i in range(30):
+            ctx.generated_interfaces[f"backend/app/crud/widget{i}.py"] = "def get_widget(db, id): ...\n" * 3
+        ctx.generated_interfaces["frontend/src/misc/unrelated.ts"] = "export const x = 1"
+        ctx._packing_for = self._file_spec(
+            "backend/app/crud/widget7.py", depends_on=["frontend/src/misc/unrelated.ts"],
+        )
+
+        summary = _interfaces_summary(ctx, relevant_to="backend/app/crud/widget7.py")
+
+        assert "--- frontend/src/misc/unrelated.ts ---" in summary
+        assert summary.startswith("--- frontend/src/misc/unrelated.ts ---")
+        assert estimate_tokens(summary) <= 300
+        assert summary.count("--- ") < 30
+
+    def test_generation_result_reports_prompt_tokens(self):
+        """Each LLM-generated file records its prompt size in the result."""
+        from src.code_generation.architect import EntitySpec, FieldSpec, SystemSpec
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+
+        with patch("src.code_generation.engine_v2.get_llm_client", return_value=MagicMock()):
+            gen = CodeGeneratorV2()
+        gen._artifacts = None
+        prompts = {}
+
+        async def _generate(prompt, relative_path, ctx, writer=None):
+            prompts[relative_path] = prompt
+            return "value = 1\n", 0
+
+        gen._llm_generate_with_heal = _generate
+        spec = SystemSpec(app_name="Tiny", description="Notes", entities=[EntitySpec(name="Note", fields=[FieldSpec(name="body")])])
+        tmpdir = tempfile.mkdtemp()
+        try:
+            result = run_async(gen.generate(spec, tmpdir))
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+        assert set(result.prompt_tokens) == set(prompts)
+        assert result.prompt_tokens["backend/app/models/note.py"] == (len(prompts["backend/app/models/note.py"]) + 3) // 4
+        assert result.total_prompt_tokens == sum(result.prompt_tokens.values()) > 0
+
+
+# =============================================================================
+# 14. Patch-based healing
+# =============================================================================
+
+
+class TestPatchHealing:
+    """Tests for repairing invalid files with model-written patches."""
+
+    BROKEN = "import os\n\n\ndef handler(:\n    return os.getcwd()\n\nVALUE = 1\n"
+    FIXED = "import os\n\n\ndef handler():\n    return os.getcwd()\n\nVALUE = 1\n"
+
+    def _make_generator(self, responses):
+        """Generator whose _call_llm replays *responses* and records each call's kwargs."""
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+
+        with patch("src.code_generation.engine_v2.get_llm_client", return_value=MagicMock()):
+            gen = CodeGeneratorV2()
+        calls = []
+
+        async def _call_llm(prompt, ctx=None, **kwargs):
+            calls.append((prompt, kwargs))
+            ctx.llm_calls += 1
+            return responses[len(calls) - 1]
+
+        gen._call_llm = _call_llm
+        return gen, calls
+
+    def _make_ctx(self):
+        from src.code_generation.architect import SystemSpec
+        from src.code_generation.engine_v2 import _GenerationContext
+
+        spec = SystemSpec(app_name="PatchApp", description="Patch test app")
+        return _GenerationContext(spec=spec, output_dir=Path(tempfile.gettempdir()), theme="Modern")
+
+    def test_unified_diff_applies_despite_line_drift(self):
+        """Hunks are located by their context when the stated line numbers are off."""
+        from src.code_generation.patching import apply_patch
+
+        diff = "--- a/app.py\n+++ b/app.py\n@@ -6,2 +6,2 @@\n-def handler(:\n+def handler():\n     return os.getcwd()\n"
+        assert apply_patch(self.BROKEN, diff) == self.FIXED
+
+    def test_line_range_replacement(self):
+        """REPLACE LINES blocks swap the given 1-based line range."""
+        from src.code_generation.patching import apply_patch
+
+        assert apply_patch(self.BROKEN, "REPLACE LINES 4-4\ndef handler():\nEND REPLACE") == self.FIXED
+        assert apply_patch(self.BROKEN, "REPLACE LINES 4-99\nx\nEND REPLACE") is None
+
+    def test_patch_that_does_not_match_is_rejected(self):
+        """Context that isn't in the file makes the whole patch fail."""
+        from src.code_generation.patching import apply_patch
+
+        assert apply_patch(self.BROKEN, "@@ -1,1 +1,1 @@\n-import sys\n+import os\n") is None
+        assert apply_patch(self.BROKEN, "Here is the fixed file") is None
+
+    def test_syntax_error_is_healed_with_a_patch(self):
+        """A one-line error costs one small patch request instead of a full regeneration."""
+        from src.code_generation.patching import PATCH_SYSTEM_PROMPT
+
+        diff = "```diff\n@@ -4,1 +4,1 @@\n-def handler(:\n+def handler():\n```"
+        gen, calls = self._make_generator([self.BROKEN, diff])
+        ctx = self._make_ctx()
+
+        source, heal_attempts = run_async(gen._llm_generate_with_heal("prompt", "backend/app/x.py", ctx))
+
+        assert source == self.FIXED
+        assert heal_attempts == 1
+        assert len(calls) == 2
+        patch_prompt, patch_kwargs = calls[1]
+        assert patch_kwargs["system_prompt"] == PATCH_SYSTEM_PROMPT
+        assert patch_kwargs["max_tokens"] == gen.PATCH_MAX_TOKENS
+        assert "4 | def handler(:" in patch_prompt and "SyntaxError at line 4" in patch_prompt
+        assert ctx.patch_heals == 1
+
+    def test_unusable_patch_falls_back_to_full_regeneration(self):
+        """When the patch doesn't apply, the file is regenerated with the broken source shown."""
+        gen, calls = self._make_generator([self.BROKEN, "I cannot produce a diff", self.FIXED])
+        ctx = self._make_ctx()
+
+        source, heal_attempts = run_async(gen._llm_generate_with_heal("prompt", "backend/app/x.py", ctx))
+
+        assert source == self.FIXED
+        assert heal_attempts == 1
+        regen_prompt, regen_kwargs = calls[2]
+        assert "system_prompt" not in regen_kwargs
+        assert regen_prompt.startswith("prompt\n\nCRITICAL") and "def handler(:" in regen_prompt
+        assert ctx.patch_heals == 0
+
+
+# =============================================================================
+# 15. Batched generation of small files
+# =============================================================================
+
+
+class TestBatchedGeneration:
+    """Tests for generating several small files with one LLM completion."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make_generator(self, batch_response):
+        """Generator whose _call_llm answers batch requests with *batch_response*."""
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+
+        with patch("src.code_generation.engine_v2.get_llm_client", return_value=MagicMock()):
+            gen = CodeGeneratorV2()
+        gen._artifacts = None
+        calls = []
+
+        async def _call_llm(prompt, ctx=None, **kwargs):
+            ctx.llm_calls += 1
+            system_prompt = kwargs.get("system_prompt", "")
+            if "BATCH MODE" in system_prompt:
+                calls.append("batch")
+                return batch_response
+            if "repair syntax errors" in system_prompt:
+                calls.append("patch")
+                return "@@ -1,1 +1,1 @@\n-def broken(:\n+def broken():\n"
+            calls.append("single")
+            # Valid as both Python and TypeScript
+            return "import os\n"
+
+        gen._call_llm = _call_llm
+        return gen, calls
+
+    def _file_spec(self, path):
+        from src.code_generation.engine_v2 import FileCategory, _FileSpec
+
+        return _FileSpec(path, FileCategory.BACKEND_CONFIG,
+                         lambda ctx: f"Generate {path} for the project. " * 4)
+
+    def _make_ctx(self):
+        from src.code_generation.architect import SystemSpec
+        from src.code_generation.engine_v2 import _GenerationContext
+
+        spec = SystemSpec(app_name="BatchApp", description="Batch test app")
+        return _GenerationContext(spec=spec, output_dir=Path(self.tmpdir), theme="Modern")
+
+    def test_split_batch_response(self):
+        """Sections are cut at the delimiters; unknown and unterminated ones are dropped."""
+        from src.code_generation.batching import split_batch_response
+
+        response = (
+            "=== FILE: .gitignore ===\nnode_modules/\n=== END FILE ===\n"
+            "=== FILE: other.txt ===\nx\n=== END FILE ===\n"
+            "=== FILE: tsconfig.json ===\n{\"compilerOptions\": {\n"
+        )
+        files = split_batch_response(response, [".gitignore", "tsconfig.json"])
+
+        assert files == {".gitignore": "node_modules/\n"}
+
+    def test_batch_is_split_validated_and_healed_per_file(self):
+        """One call covers the batch; a broken file is patched, a missing one generated alone."""
+        from src.code_generation.batching import is_batchable
+
+        response = (
+            "=== FILE: .gitignore ===\n.env\n=== END FILE ===\n"
+            "=== FILE: pkg/__init__.py ===\ndef broken(:\n    return 1\n=== END FILE ===\n"
+        )
+        gen, calls = self._make_generator(response)
+        ctx = self._make_ctx()
+        specs = [self._file_spec(p) for p in (".gitignore", "pkg/__init__.py", "frontend/tsconfig.json")]
+        assert all(is_batchable(fs.relative_path) for fs in specs)
+
+        results = run_async(gen._generate_batch(specs, ctx))
+
+        assert calls == ["batch", "patch", "single"]
+        assert [r.path for r in results] == [fs.relative_path for fs in specs]
+        assert [r.batched for r in results] == [True, True, False]
+        assert results[1].heal_attempts == 1
+        root = Path(self.tmpdir)
+        assert (root / ".gitignore").read_text() == ".env\n"
+        assert (root / "pkg/__init__.py").read_text() == "def broken():\n    return 1\n"
+        assert (root / "frontend/tsconfig.json").read_text() == "import os\n"
+        assert set(ctx.generated_interfaces) == {fs.relative_path for fs in specs}
+
+    def test_generate_batches_small_config_files(self):
+        """A full build requests the small config files together and reports them."""
+        from src.code_generation.architect import SystemSpec
+
+        response = "".join(
+            f"=== FILE: {p} ===\nexport const batched = true;\n=== END FILE ===\n"
+            for p in (".gitignore", ".dockerignore", "frontend/tsconfig.json", "frontend/postcss.config.js")
+        )
+        gen, calls = self._make_generator(response)
+        spec = SystemSpec(app_name="BatchApp", description="Batch test app")
+
+        result = run_async(gen.generate(spec, self.tmpdir))
+
+        assert "batch" in calls
+        assert result.files_batched >= 2
+        assert result.llm_calls_made == len(calls) < result.total_files
+        batched = [f.path for f in result.files if f.batched]
+        for path in batched:
+            assert (Path(self.tmpdir) / path).read_text() == "export const batched = true;\n"
+
+
+# =============================================================================
+# 16. Checkpoint and resume
+# =============================================================================
+
+
+class TestCheckpointResume:
+    """Tests for checkpointing builds and resuming interrupted ones."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.output = str(Path(self.tmpdir) / "project")
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make_spec(self, name="ResumeApp"):
+        from src.code_generation.architect import EntitySpec, FieldSpec, SystemSpec
+
+        return SystemSpec(
+            app_name=name,
+            description="Resume test app",
+            entities=[EntitySpec(name="Task", fields=[FieldSpec(name="title")])],
+        )
+
+    def _make_generator(self, fail_on=None):
+        """Generator whose files are written without the LLM; *fail_on* raises mid-build."""
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+
+        with patch("src.code_generation.engine_v2.get_llm_client", return_value=MagicMock()):
+            gen = CodeGeneratorV2()
+        gen._artifacts = None
+        calls = []
+
+        async def _generate(prompt, relative_path, ctx, writer=None):
+            if relative_path == fail_on:
+                raise KeyboardInterrupt("worker killed")
+            calls.append(relative_path)
+            ctx.llm_calls += 1
+            if relative_path.endswith(".py"):
+                return "VALUE = 1\n", 0
+            return "export const value = 1;\n", 0
+
+        gen._llm_generate_with_heal = _generate
+        return gen, calls
+
+    def test_checkpoint_records_every_file(self):
+        """After generation the checkpoint lists each file as done, with LLM call counts."""
+        from src.code_generation.checkpoint import BuildCheckpoint
+
+        gen, calls = self._make_generator()
+        result = run_async(gen.generate(self._make_spec(), self.output))
+
+        checkpoint = BuildCheckpoint.load(Path(self.output))
+        assert checkpoint.stage == "generated"
+        assert checkpoint.llm_calls == result.llm_calls_made == len(calls)
+        assert set(checkpoint.files) == {f.path for f in result.files}
+        entry = checkpoint.files["backend/app/models/task.py"]
+        assert entry.status == "done" and entry.sha256
+        assert checkpoint.completed_file(Path(self.output), "backend/app/models/task.py") is entry
+
+    def test_resume_generates_only_unfinished_files(self):
+        """A resumed build skips finished files and reports them as resumed."""
+        from src.code_generation.checkpoint import BuildCheckpoint
+
+        spec = self._make_spec()
+        gen, calls = self._make_generator()
+        full = run_async(gen.generate(spec, self.output))
+        checkpoint = BuildCheckpoint.load(Path(self.output))
+        missing = ["backend/app/models/task.py", "backend/app/main.py"]
+        for path in missing:
+            del checkpoint.files[path]
+        checkpoint.save(Path(self.output))
+        calls.clear()
+
+        result = run_async(gen.generate(spec, self.output, resume=True))
+
+        assert sorted(calls) == sorted(missing)
+        assert result.files_resumed == full.total_files - len(missing)
+        assert result.total_files == full.total_files
+        assert {f.path for f in result.files if not f.resumed} == set(missing)
+        assert result.llm_calls_made == full.llm_calls_made + len(missing)
+
+    def test_resume_after_interruption(self):
+        """Files finished before the worker died are not generated again."""
+        spec = self._make_spec()
+        gen, first_calls = self._make_generator(fail_on="backend/app/main.py")
+        with pytest.raises(KeyboardInterrupt):
+            run_async(gen.generate(spec, self.output))
+
+        gen, calls = self._make_generator()
+        result = run_async(gen.generate(spec, self.output, resume=True))
+
+        assert "backend/app/main.py" in calls
+        assert result.files_resumed > 0
+        assert not set(calls) & {f.path for f in result.files if f.resumed}
+
+    def test_modified_file_is_regenerated(self):
+        """A checkpointed file whose content changed on disk is generated again."""
+        spec = self._make_spec()
+        gen, calls = self._make_generator()
+        run_async(gen.generate(spec, self.output))
+        (Path(self.output) / "backend/app/models/task.py").write_text("truncated")
+        calls.clear()
+
+        run_async(gen.generate(spec, self.output, resume=True))
+
+        assert calls == ["backend/app/models/task.py"]
+
+    def test_checkpoint_for_other_spec_is_ignored(self):
+        """Resuming with a different spec generates everything."""
+        gen, calls = self._make_generator()
+        run_async(gen.generate(self._make_spec(), self.output))
+        full_calls = len(calls)
+        calls.clear()
+
+        result = run_async(gen.generate(self._make_spec("OtherApp"), self.output, resume=True))
+
+        assert result.files_resumed == 0
+        assert len(calls) == full_calls
+
+    def test_pipeline_resume_reuses_checkpointed_spec(self):
+        """The pipeline skips the architect when resuming and keeps the checkpoint on failure."""
+        from src.code_generation.checkpoint import BuildCheckpoint
+        from src.code_generation.pipeline import GenerationPipeline
+
+        pipeline = GenerationPipeline(output_base_dir=self.tmpdir)
+        output_dir = pipeline._output_dir("Resume App")
+        spec = self._make_spec()
+        BuildCheckpoint(spec=spec, theme="Modern").save(output_dir)
+        pipeline.architect.design = AsyncMock()
+        pipeline.generator.generate = AsyncMock(side_effect=RuntimeError("LLM down"))
+
+        with pytest.raises(RuntimeError):
+            run_async(pipeline.run("Resume App", "An app", resume=True))
+
+        pipeline.architect.design.assert_not_called()
+        kwargs = pipeline.generator.generate.call_args.kwargs
+        assert kwargs["spec"] == spec and kwargs["resume"] is True
+        assert BuildCheckpoint.load(output_dir) is not None
+
+
+# =============================================================================
+# 17. Difficulty-based model tiering
+# =============================================================================
+
+
+class _TierClient:
+    """Minimal async LLM client that answers every request with *reply*."""
+
+    def __init__(self, name, reply="import os\n"):
+        self.model = name
+        self.provider_name = name
+        self.reply = reply
+        self.calls = 0
+
+    async def acomplete(self, *args):
+        from types import SimpleNamespace
+
+        self.calls += 1
+        return SimpleNamespace(content=self.reply)
+
+    async def astream(self, *args):
+        self.calls += 1
+        yield self.reply
+
+
+class TestModelTiering:
+    """Tests for routing files between the fast and strong model tiers."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make_generator(self, strong, fast, **config):
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+        from src.code_generation.tiering import ModelTiering, TieringConfig
+
+        tiering = ModelTiering(TieringConfig(fast_provider="groq", **config), fast)
+        with patch("src.code_generation.engine_v2.get_llm_client", return_value=strong):
+            gen = CodeGeneratorV2(tiering=tiering)
+        gen._artifacts = None
+        return gen
+
+    def test_choose_by_category_prompt_size_and_history(self):
+        """Config files with small prompts go fast; escalated files stay strong."""
+        from src.code_generation.tiering import ModelTier, ModelTiering, TieringConfig
+
+        tiering = ModelTiering(TieringConfig(fast_provider="groq", max_fast_prompt_tokens=100), None)
+
+        assert tiering.choose(".gitignore", "infrastructure", 50) == ModelTier.FAST
+        assert tiering.choose("backend/app/models/user.py", "backend_model", 50) == ModelTier.STRONG
+        assert tiering.choose(".gitignore", "infrastructure", 500) == ModelTier.STRONG
+        assert tiering.choose(".gitignore", "infrastructure", 50, failures=1) == ModelTier.STRONG
+        assert tiering.choose("x.py", None, 50) == ModelTier.STRONG
+
+        tiering.record_failure(".gitignore")
+        assert tiering.choose(".gitignore", "infrastructure", 50) == ModelTier.STRONG
+
+    def test_escalations_carry_over_to_later_builds(self, monkeypatch, tmp_path):
+        """Escalations are shared by the process's builds and kept in CODEGEN_TIER_ESCALATIONS."""
+        from src.code_generation.tiering import (
+            EscalationMemory, ModelTier, ModelTiering, TieringConfig, shared_escalations,
+        )
+
+        path = tmp_path / "escalations.json"
+        monkeypatch.setenv("CODEGEN_TIER_ESCALATIONS", str(path))
+        config = TieringConfig(fast_provider="groq-test")
+        first_build = ModelTiering(config, None, shared_escalations(config))
+        first_build.record_failure("Dockerfile")
+
+        next_build = ModelTiering(config, None, shared_escalations(config))
+        assert next_build.choose("Dockerfile", "infrastructure", 50) == ModelTier.STRONG
+        # A restarted worker reads them back from the file
+        assert "Dockerfile" in EscalationMemory(path)
+
+    def test_config_from_env(self, monkeypatch):
+        """CODEGEN_FAST_* variables configure the tiers; no provider means no tiering."""
+        from src.code_generation.tiering import ModelTiering, TieringConfig
+
+        monkeypatch.delenv("CODEGEN_FAST_PROVIDER", raising=False)
+        assert ModelTiering.from_env() is None
+
+        monkeypatch.setenv("CODEGEN_FAST_PROVIDER", "groq")
+        monkeypatch.setenv("CODEGEN_FAST_CATEGORIES", "frontend_config, infrastructure")
+        monkeypatch.setenv("CODEGEN_FAST_MAX_PROMPT_TOKENS", "800")
+        config = TieringConfig.from_env()
+
+        assert config.fast_provider == "groq"
+        assert config.fast_categories == frozenset({"frontend_config", "infrastructure"})
+        assert config.max_fast_prompt_tokens == 800
+
+    def test_failed_fast_file_escalates_to_strong(self):
+        """A file that fails validation on the fast tier is regenerated on the strong tier."""
+        from src.code_generation.architect import SystemSpec
+        from src.code_generation.engine_v2 import FileCategory, _GenerationContext
+        from src.code_generation.tiering import ModelTier
+
+        strong, fast = _TierClient("strong", "VALUE = 1\n"), _TierClient("fast", "def broken(:\n")
+        gen = self._make_generator(strong, fast)
+        gen.MAX_PATCH_ATTEMPTS = 0
+        path = "backend/app/core/extra.py"
+        ctx = _GenerationContext(
+            spec=SystemSpec(app_name="TierApp", description="Tier test app"),
+            output_dir=Path(self.tmpdir), theme="Modern",
+        )
+        ctx.file_categories = {path: FileCategory.BACKEND_CONFIG}
+
+        source, heal_attempts = run_async(gen._llm_generate_with_heal("Generate it", path, ctx))
+
+        assert source == "VALUE = 1\n" and heal_attempts == 1
+        assert (fast.calls, strong.calls) == (1, 1)
+        assert ctx.tier_calls == {"fast": 1, "strong": 1}
+        assert ctx.tier_escalations == 1
+        assert gen._tier_for(path, "Generate it", ctx) == ModelTier.STRONG
+
+    def test_generate_reports_per_tier_calls(self):
+        """A full build uses both tiers and reports calls and latency per tier."""
+        from src.code_generation.architect import SystemSpec
+
+        strong, fast = _TierClient("strong"), _TierClient("fast")
+        gen = self._make_generator(strong, fast)
+
+        result = run_async(gen.generate(SystemSpec(app_name="TierApp", description="Tier test app"), self.tmpdir))
+
+        assert fast.calls > 0 and strong.calls > 0
+        assert result.tier_calls == {"fast": fast.calls, "strong": strong.calls}
+        assert sum(result.tier_calls.values()) == result.llm_calls_made
+        assert set(result.tier_latency_seconds) == {"fast", "strong"}
+        assert result.tier_escalations == 0
+
+
+# =============================================================================
+# 18. Streaming ZIP export
+# =============================================================================
+
+
+class TestZipExport:
+    """Tests for streaming (and caching) project archives."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.project = Path(self.tmpdir) / "project"
+        (self.project / "backend/app").mkdir(parents=True)
+        (self.project / "backend/app/main.py").write_text("app = None\n")
+        (self.project / "README.md").write_text("# Project\n")
+        (self.project / "assets").mkdir()
+        (self.project / "assets/blob.bin").write_bytes(os.urandom(300_000))
+        # Build metadata and an interrupted write, never shipped
+        (self.project / ".ignara").mkdir()
+        (self.project / ".ignara/checkpoint.json").write_text("{}\n")
+        (self.project / "backend/app/routes.py.partial").write_text("def half")
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _read_zip(self, data):
+        import io
+        import zipfile
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            return {name: zf.read(name) for name in zf.namelist()}
+
+    def test_stream_is_a_complete_archive_in_small_chunks(self):
+        """The chunks form a valid ZIP of the tree; no chunk holds a whole large file."""
+        from src.code_generation.zip_export import iter_project_zip
+
+        chunks = list(iter_project_zip(self.project, chunk_size=16 * 1024))
+
+        assert len(chunks) > 10
+        assert max(len(c) for c in chunks) < 100_000
+        files = self._read_zip(b"".join(chunks))
+        assert files == {
+            "README.md": b"# Project\n",
+            "assets/blob.bin": (self.project / "assets/blob.bin").read_bytes(),
+            "backend/app/main.py": b"app = None\n",
+        }
+
+    def test_cache_keeps_only_complete_archives(self):
+        """A fully streamed archive is cached under the tree hash; an aborted one is not."""
+        from src.code_generation.zip_export import ZipCache, tree_hash
+
+        cache = ZipCache(Path(self.tmpdir) / "zips")
+        key = tree_hash(self.project)
+
+        aborted = cache.stream(key, self.project, chunk_size=16 * 1024)
+        next(aborted)
+        aborted.close()
+        assert cache.get(key) is None
+        assert not list((Path(self.tmpdir) / "zips").iterdir())
+
+        data = b"".join(cache.stream(key, self.project))
+        assert cache.get(key).read_bytes() == data
+
+        (self.project / "README.md").write_text("# Changed project\n")
+        assert tree_hash(self.project) != key
+
+    def test_download_route_streams_zip(self, monkeypatch):
+        """The download endpoint returns the streamed archive, then the cached one."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from src.code_generation import routes, zip_export
+
+        monkeypatch.setattr(zip_export, "_default_zip_cache", zip_export.ZipCache(Path(self.tmpdir) / "zips"))
+        job = routes.JobRecord("job-zip", routes.GenerateRequest(idea_name="Zip App", description="A zip test app"))
+        job.status = "completed"
+        job.result = MagicMock(output_path=str(self.project))
+        monkeypatch.setattr(routes, "_jobs", {"job-zip": job})
+        app = FastAPI()
+        app.include_router(routes.router)
+        client = TestClient(app)
+
+        first = client.post("/api/v2/generate/job-zip/download")
+        second = client.post("/api/v2/generate/job-zip/download")
+
+        assert first.status_code == second.status_code == 200
+        assert 'filename="Zip_App.zip"' in first.headers["content-disposition"]
+        assert "backend/app/main.py" in self._read_zip(first.content)
+        assert second.content == first.content
+        assert "content-length" in second.headers
+
+
+# =============================================================================
+# 19. Durable job store
+# =============================================================================
+
+
+class TestJobStore:
+    """Tests for the persistent, bounded registry of v2 generation jobs."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = Path(self.tmpdir) / "jobs.db"
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make_store(self, **kwargs):
+        from src.code_generation.job_store import JobStore, SQLiteJobBackend
+        from src.code_generation.routes import JobRecord
+
+        return JobStore(SQLiteJobBackend(self.db), JobRecord.from_dict, **kwargs)
+
+    def _make_job(self, job_id, status="completed", age_seconds=0.0):
+        from datetime import datetime, timedelta, timezone
+
+        from src.code_generation.architect import SystemSpec
+        from src.code_generation.engine_v2 import GenerationResult
+        from src.code_generation.pipeline import PipelineResult
+        from src.code_generation.quality import QualityReport
+        from src.code_generation.routes import GenerateRequest, JobRecord
+
+        job = JobRecord(job_id, GenerateRequest(idea_name="Store App", description="A job store test"))
+        job.status = status
+        if status == "completed":
+            job.completed_at = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+            job.result = PipelineResult(
+                spec=SystemSpec(app_name="StoreApp", description="Store test"),
+                generation=GenerationResult(output_path="/tmp/store-app", total_files=3),
+                quality=QualityReport(),
+                output_path="/tmp/store-app",
+            )
+        return job
+
+    def test_jobs_survive_a_restart(self):
+        """A job saved by one store is loaded, result included, by a fresh one."""
+        store = self._make_store()
+        store["job-1"] = self._make_job("job-1")
+        store.backend.close()
+
+        job = self._make_store().get("job-1")
+
+        assert job.status == "completed"
+        assert job.result.generation.total_files == 3
+        assert job.request.idea_name == "Store App"
+        assert job.completed_at is not None
+
+    def test_hot_set_is_bounded_but_keeps_running_jobs(self):
+        """Finished jobs leave memory past max_hot and are reloaded on demand."""
+        store = self._make_store(max_hot=3)
+        running = [self._make_job(f"run-{i}", status="running") for i in range(2)]
+        for job in running:
+            store.save(job)
+        for i in range(10):
+            store.save(self._make_job(f"done-{i}"))
+
+        assert len(store._hot) == 3
+        assert all(store._hot[job.job_id] is job for job in running)
+        assert store.get("done-0").result.output_path == "/tmp/store-app"
+        assert "missing" not in store
+        assert len(list(store.values())) == 12
+
+    def test_finished_jobs_expire_after_ttl(self):
+        """The TTL sweep drops old finished jobs but keeps recent and running ones."""
+        store = self._make_store(ttl_seconds=3600)
+        # The first save sweeps; sweep now so the one under test comes from evict_expired
+        assert store.evict_expired() == 0
+        store.save(self._make_job("old", age_seconds=7200))
+        store.save(self._make_job("new", age_seconds=60))
+        store.save(self._make_job("running", status="running"))
+
+        assert store.evict_expired() == 1
+        assert store.get("old") is None
+        assert store.get("new") is not None and store.get("running") is not None
+
+    def test_other_workers_progress_is_reread(self):
+        """A worker holding another worker's running job sees it finish."""
+        runner = self._make_store()
+        viewer = self._make_store(refresh_seconds=0)
+        job = self._make_job("job-1", status="running")
+        runner.save(job)
+        assert viewer.get("job-1").status == "running"
+
+        runner.save(self._make_job("job-1"))
+
+        assert viewer.get("job-1").status == "completed"
+
+    def test_abandoned_running_jobs_are_failed(self):
+        """Unfinished jobs nobody saved for stale_seconds are marked failed, except our own."""
+        crashed = self._make_store()
+        crashed.save(self._make_job("orphan", status="running"))
+        crashed.backend.close()
+        store = self._make_store(stale_seconds=0)
+        store.save(self._make_job("mine", status="running"))
+
+        store.evict_expired()
+
+        orphan = store.get("orphan")
+        assert orphan.status == "failed" and orphan.error and orphan.completed_at is not None
+        assert store.get("mine").status == "running"
+        assert "orphan" not in store._owned
+
+
+# =============================================================================
+# 20. Progress fan-out to WebSocket subscribers
+# =============================================================================
+
+
+class TestProgressFanOut:
+    """Tests for several WebSocket clients following (and resuming) one job."""
+
+    def _make_client(self, monkeypatch, job):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from src.code_generation import routes
+
+        monkeypatch.setattr(routes, "_jobs", {job.job_id: job})
+        app = FastAPI()
+        app.include_router(routes.router)
+        return TestClient(app)
+
+    def _receive_all(self, ws):
+        messages = []
+        while not messages or messages[-1]["phase"] != "complete":
+            messages.append(ws.receive_json())
+        return messages
+
+    def test_subscribers_each_get_events_and_resume_from_cursor(self, monkeypatch):
+        """Two clients both receive every event; a reconnect only gets newer ones."""
+        from src.code_generation.pipeline import PipelineProgress
+        from src.code_generation.routes import GenerateRequest, JobRecord
+
+        job = JobRecord("job-ws", GenerateRequest(idea_name="Ws App", description="A websocket test"))
+        job.status = "running"
+        job.push_progress(PipelineProgress(phase="architect", step="design", progress=5))
+        job.push_progress(PipelineProgress(phase="generate", step="files", progress=40))
+        job.push_progress(PipelineProgress(phase="complete", step="done", progress=100))
+        client = self._make_client(monkeypatch, job)
+
+        with client.websocket_connect("/api/v2/generate/ws/job-ws") as first:
+            first_messages = self._receive_all(first)
+        with client.websocket_connect("/api/v2/generate/ws/job-ws") as second:
+            second_messages = self._receive_all(second)
+        with client.websocket_connect("/api/v2/generate/ws/job-ws?last_event_id=2") as resumed:
+            resumed_messages = self._receive_all(resumed)
+
+        assert [m["seq"] for m in first_messages] == [1, 2, 3]
+        assert second_messages == first_messages
+        assert [m["phase"] for m in resumed_messages] == ["complete"]
+
+    def test_finished_job_without_events_sends_final_state(self, monkeypatch):
+        """A job loaded from the store (no live events) reports its last progress."""
+        from src.code_generation.pipeline import PipelineProgress
+        from src.code_generation.routes import GenerateRequest, JobRecord
+
+        job = JobRecord("job-done", GenerateRequest(idea_name="Ws App", description="A websocket test"))
+        job.status = "completed"
+        job.progress = PipelineProgress(phase="complete", step="done", progress=100)
+        client = self._make_client(monkeypatch, job)
+
+        with client.websocket_connect("/api/v2/generate/ws/job-done") as ws:
+            assert ws.receive_json()["progress"] == 100
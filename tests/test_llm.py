@@ -92,6 +92,32 @@ class TestOpenAIProvider:
         assert result.content == "Generated text"
         assert result.provider == "openai"
 
+    @pytest.mark.asyncio
+    @patch('openai.AsyncOpenAI')
+    @patch('openai.OpenAI')
+    async def test_openai_acomplete_uses_async_client(self, mock_openai, mock_async_openai):
+        """Test OpenAI async completion goes through AsyncOpenAI, not a thread."""
+        from unittest.mock import AsyncMock
+        from src.llm.client import OpenAIClient
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Async text"
+        mock_response.usage.prompt_tokens = 10
+        mock_response.usage.completion_tokens = 20
+        mock_response.usage.total_tokens = 30
+
+        mock_async_client = Mock()
+        mock_async_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_async_openai.return_value = mock_async_client
+
+        client = OpenAIClient(api_key="test_key", use_cache=False, use_retry=False)
+        result = await client.acomplete("Test prompt")
+
+        assert result.content == "Async text"
+        mock_async_client.chat.completions.create.assert_awaited_once()
+        mock_openai.return_value.chat.completions.create.assert_not_called()
+
     def test_openai_available_models(self):
         """Test OpenAI available models."""
         from src.llm.client import OpenAIClient
@@ -139,6 +165,33 @@ class TestAnthropicProvider:
         assert result.content == "Claude response"
         assert result.provider == "anthropic"
 
+    @pytest.mark.asyncio
+    @patch('anthropic.AsyncAnthropic')
+    @patch('anthropic.Anthropic')
+    async def test_anthropic_acomplete_uses_async_client(self, mock_anthropic, mock_async_anthropic):
+        """Test Anthropic async completion goes through AsyncAnthropic, not a thread."""
+        from unittest.mock import AsyncMock
+        from src.llm.client import AnthropicClient
+
+        mock_response = Mock()
+        mock_response.content = [Mock()]
+        mock_response.content[0].text = 'Here you go:\n```json\n{"ok": true}\n```'
+        mock_response.usage.input_tokens = 15
+        mock_response.usage.output_tokens = 25
+
+        mock_async_client = Mock()
+        mock_async_client.messages.create = AsyncMock(return_value=mock_response)
+        mock_async_anthropic.return_value = mock_async_client
+
+        client = AnthropicClient(api_key="test_key", use_cache=False, use_retry=False)
+        result = await client.acomplete("Test prompt", system_prompt="Be terse", json_mode=True)
+
+        assert result.content == '{"ok": true}'
+        assert result.usage == {"input_tokens": 15, "output_tokens": 25}
+        kwargs = mock_async_client.messages.create.await_args.kwargs
+        assert kwargs["system"] == "Be terse"
+        mock_anthropic.return_value.messages.create.assert_not_called()
+
     def test_anthropic_available_models(self):
         """Test Anthropic available models."""
         from src.llm.client import AnthropicClient
@@ -184,6 +237,47 @@ class TestGoogleProvider:
         assert result.content == "Gemini response"
         assert result.provider == "google"
 
+    @pytest.mark.asyncio
+    @patch('google.genai.Client')
+    async def test_google_acomplete_uses_async_client(self, mock_client_cls):
+        """Test Google async completion goes through the genai ``aio`` surface."""
+        from unittest.mock import AsyncMock
+        from src.llm.client import GoogleClient
+
+        mock_response = Mock()
+        mock_response.text = "Async Gemini response"
+
+        mock_genai_client = Mock()
+        mock_genai_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+        mock_client_cls.return_value = mock_genai_client
+
+        client = GoogleClient(api_key="test_key", use_cache=False, use_retry=False)
+        result = await client.acomplete("Test prompt", system_prompt="System")
+
+        assert result.content == "Async Gemini response"
+        assert result.provider == "google"
+        kwargs = mock_genai_client.aio.models.generate_content.await_args.kwargs
+        assert kwargs["contents"] == "System\n\nTest prompt"
+        mock_genai_client.models.generate_content.assert_not_called()
+
+    @patch('google.genai.Client')
+    def test_google_async_client_per_event_loop(self, mock_client_cls):
+        """Each event loop gets its own genai client (asyncio.run creates fresh loops)."""
+        import asyncio
+        from src.llm.client import GoogleClient
+
+        mock_client_cls.side_effect = lambda **kwargs: Mock()
+        client = GoogleClient(api_key="test_key", use_cache=False, use_retry=False)
+
+        async def _get():
+            return client.async_client, client.async_client
+
+        first_a, first_b = asyncio.run(_get())
+        second, _ = asyncio.run(_get())
+
+        assert first_a is first_b
+        assert first_a is not second
+
     def test_google_available_models(self):
         """Test Google available models."""
         from src.llm.client import GoogleClient
@@ -192,6 +286,68 @@ class TestGoogleProvider:
         assert any("gemini" in model.lower() for model in GoogleClient.MODELS.keys())
 
 
+class TestPerplexityProvider:
+    """Test Perplexity provider implementation."""
+
+    @pytest.mark.asyncio
+    @patch('openai.AsyncOpenAI')
+    @patch('openai.OpenAI')
+    async def test_perplexity_acomplete_uses_async_client(self, mock_openai, mock_async_openai):
+        """Test Perplexity async completion uses AsyncOpenAI against the Perplexity API."""
+        from unittest.mock import AsyncMock
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = '```json\n{"ok": true}\n```'
+        mock_response.model = "sonar-pro"
+        mock_response.usage.prompt_tokens = 5
+        mock_response.usage.completion_tokens = 7
+
+        mock_async_client = Mock()
+        mock_async_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_async_openai.return_value = mock_async_client
+
+        client = PerplexityClient(api_key="test_key", use_cache=False, use_retry=False)
+        result = await client.acomplete("Test prompt", json_mode=True)
+
+        assert result.content == '{"ok": true}'
+        assert result.usage == {"prompt_tokens": 5, "completion_tokens": 7}
+        assert mock_async_openai.call_args.kwargs["base_url"] == "https://api.perplexity.ai"
+        mock_openai.return_value.chat.completions.create.assert_not_called()
+
+
+class TestGroqProvider:
+    """Test Groq provider implementation."""
+
+    @pytest.mark.asyncio
+    @patch('groq.AsyncGroq')
+    @patch('groq.Groq')
+    async def test_groq_acomplete_uses_async_client(self, mock_groq, mock_async_groq):
+        """Test Groq async completion goes through AsyncGroq, not a thread."""
+        from unittest.mock import AsyncMock
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Fast response"
+        mock_response.model = "llama-3.3-70b-versatile"
+        mock_response.usage.prompt_tokens = 3
+        mock_response.usage.completion_tokens = 4
+        mock_response.usage.total_tokens = 7
+
+        mock_async_client = Mock()
+        mock_async_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_async_groq.return_value = mock_async_client
+
+        client = GroqClient(api_key="test_key", use_cache=False, use_retry=False)
+        result = await client.acomplete("Test prompt", json_mode=True)
+
+        assert result.content == "Fast response"
+        assert result.usage["total_tokens"] == 7
+        kwargs = mock_async_client.chat.completions.create.await_args.kwargs
+        assert kwargs["response_format"] == {"type": "json_object"}
+        mock_groq.return_value.chat.completions.create.assert_not_called()
+
+
 class TestProviderAbstraction:
     """Test provider abstraction and interface."""
 
@@ -249,6 +405,383 @@ class TestMultiProviderFallback:
         assert result.content == "Fallback response"
         assert result.provider == "anthropic"
 
+    @pytest.mark.asyncio
+    async def test_async_fallback_to_secondary_provider(self):
+        """Test acomplete fails over between providers."""
+        from unittest.mock import AsyncMock
+        from src.llm.client import MultiProviderClient
+
+        primary = Mock(provider_name="openai")
+        primary.acomplete = AsyncMock(side_effect=Exception("API Error"))
+        secondary = Mock(provider_name="anthropic")
+        secondary.acomplete = AsyncMock(return_value=LLMResponse(
+            content="Async fallback", model="claude-3", provider="anthropic"
+        ))
+
+        client = MultiProviderClient(providers=[primary, secondary])
+        result = await client.acomplete("Test prompt")
+
+        assert result.content == "Async fallback"
+
+    @pytest.mark.asyncio
+    async def test_astream_fails_over_before_first_delta(self):
+        """astream switches provider if the first one fails before yielding."""
+        from src.llm.client import MultiProviderClient
+
+        async def _broken(*args, **kwargs):
+            raise Exception("connect failed")
+            yield  # pragma: no cover
+
+        async def _working(*args, **kwargs):
+            for part in ("fall", "back"):
+                yield part
+
+        primary = Mock(provider_name="openai", astream=_broken)
+        secondary = Mock(provider_name="anthropic", astream=_working)
+
+        client = MultiProviderClient(providers=[primary, secondary])
+        deltas = [d async for d in client.astream("Test prompt")]
+
+        assert deltas == ["fall", "back"]
+
+    @pytest.mark.asyncio
+    async def test_astream_does_not_fail_over_mid_stream(self):
+        """Once a provider has yielded output, its failure is raised, not masked."""
+        from src.llm.client import MultiProviderClient
+
+        async def _dies_mid_stream(*args, **kwargs):
+            yield "partial"
+            raise Exception("stream reset")
+
+        secondary_astream = Mock()
+        primary = Mock(provider_name="openai", astream=_dies_mid_stream)
+        secondary = Mock(provider_name="anthropic", astream=secondary_astream)
+
+        client = MultiProviderClient(providers=[primary, secondary])
+        seen = []
+        with pytest.raises(Exception, match="stream reset"):
+            async for delta in client.astream("Test prompt"):
+                seen.append(delta)
+
+        assert seen == ["partial"]
+        secondary_astream.assert_not_called()
+
+    def test_circuit_breaker_skips_failing_provider(self):
+        """After repeated failures the primary is skipped instead of retried every call."""
+        from src.llm.client import MultiProviderClient
+        from src.llm.routing import RoutingConfig
+
+        primary = Mock(provider_name="openai")
+        primary.complete.side_effect = Exception("503 unavailable")
+        secondary = Mock(provider_name="anthropic")
+        secondary.complete.return_value = LLMResponse(content="ok", model="m", provider="anthropic")
+
+        client = MultiProviderClient(
+            providers=[primary, secondary], routing=RoutingConfig(failure_threshold=2)
+        )
+        for _ in range(4):
+            assert client.complete("Test prompt").content == "ok"
+
+        assert primary.complete.call_count == 2
+        assert client.health()["openai"]["state"] == "open"
+        assert client.health()["anthropic"]["state"] == "closed"
+
+    def test_auth_error_opens_breaker_immediately(self):
+        """A provider rejecting our key shouldn't be retried on the next call."""
+        from src.llm.client import MultiProviderClient
+
+        primary = Mock(provider_name="openai")
+        primary.complete.side_effect = Exception("401 invalid api key")
+        secondary = Mock(provider_name="anthropic")
+        secondary.complete.return_value = LLMResponse(content="ok", model="m", provider="anthropic")
+
+        client = MultiProviderClient(providers=[primary, secondary])
+        client.complete("a")
+        client.complete("b")
+
+        assert primary.complete.call_count == 1
+
+    def test_half_open_probe_closes_breaker(self):
+        """Once the open period lapses, one successful probe restores the provider."""
+        from src.llm.client import MultiProviderClient
+        from src.llm.routing import RoutingConfig
+
+        primary = Mock(provider_name="openai")
+        primary.complete.side_effect = [
+            Exception("503 unavailable"),
+            LLMResponse(content="primary", model="m", provider="openai"),
+        ]
+        secondary = Mock(provider_name="anthropic")
+        secondary.complete.return_value = LLMResponse(content="secondary", model="m", provider="anthropic")
+
+        client = MultiProviderClient(
+            providers=[primary, secondary],
+            routing=RoutingConfig(failure_threshold=1, open_seconds=0.0),
+        )
+        assert client.complete("a").content == "secondary"
+        assert client.health()["openai"]["state"] == "open"
+        assert client.complete("b").content == "primary"
+        assert client.health()["openai"]["state"] == "closed"
+
+    def test_half_open_admits_a_single_probe(self):
+        """Of concurrent callers past the open period, only one gets the probe."""
+        import threading
+        from src.llm.routing import ProviderHealth, RoutingConfig
+
+        health = ProviderHealth("openai", RoutingConfig(failure_threshold=1, open_seconds=0.0))
+        health.record_failure(Exception("503 unavailable"))
+        claims = []
+        threads = [threading.Thread(target=lambda: claims.append(health.begin())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(claims) == [False] * 7 + [True]
+        health.release_probe()
+        assert health.begin()
+
+    def test_all_breakers_open_still_tries_providers(self):
+        """When every provider is open they are still tried as a last resort."""
+        from src.llm.client import MultiProviderClient
+        from src.llm.routing import RoutingConfig
+
+        only = Mock(provider_name="openai")
+        only.complete.side_effect = [
+            Exception("503 unavailable"),
+            LLMResponse(content="recovered", model="m", provider="openai"),
+        ]
+        client = MultiProviderClient(providers=[only], routing=RoutingConfig(failure_threshold=1))
+
+        with pytest.raises(RuntimeError):
+            client.complete("a")
+        assert client.complete("b").content == "recovered"
+
+    def test_lowest_latency_policy_prefers_faster_provider(self):
+        """The lowest-latency policy routes to the provider with the best EWMA."""
+        from src.llm.client import MultiProviderClient
+        from src.llm.routing import RoutingConfig, RoutingPolicy
+
+        slow = Mock(provider_name="openai")
+        fast = Mock(provider_name="groq")
+        client = MultiProviderClient(
+            providers=[slow, fast],
+            routing=RoutingConfig(policy=RoutingPolicy.LOWEST_LATENCY),
+        )
+        client.router.health[0].record_success(2.0)
+        client.router.health[1].record_success(0.2)
+        fast.complete.return_value = LLMResponse(content="fast", model="m", provider="groq")
+
+        assert client.complete("Test prompt").content == "fast"
+        slow.complete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_hedges_slow_provider_after_p95(self):
+        """With hedging on, a primary stuck past its p95 is raced by the next provider."""
+        import asyncio
+        from src.llm.client import MultiProviderClient
+        from src.llm.routing import RoutingConfig
+
+        cancelled = asyncio.Event()
+
+        async def _stuck(*args, **kwargs):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def _quick(*args, **kwargs):
+            return LLMResponse(content="hedged", model="m", provider="groq")
+
+        primary = Mock(provider_name="openai", acomplete=_stuck)
+        secondary = Mock(provider_name="groq", acomplete=_quick)
+        client = MultiProviderClient(
+            providers=[primary, secondary],
+            routing=RoutingConfig(hedge=True, hedge_min_samples=3, hedge_min_delay_seconds=0.01),
+        )
+        for _ in range(3):
+            client.router.health[0].record_success(0.02)
+
+        result = await asyncio.wait_for(client.acomplete("Test prompt"), timeout=2)
+
+        assert result.content == "hedged"
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert client.health()["openai"]["failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_history(self):
+        """Hedging waits for enough samples to estimate p95."""
+        from unittest.mock import AsyncMock
+        from src.llm.client import MultiProviderClient
+        from src.llm.routing import RoutingConfig
+
+        primary = Mock(provider_name="openai")
+        primary.acomplete = AsyncMock(return_value=LLMResponse(content="p", model="m", provider="openai"))
+        secondary = Mock(provider_name="groq")
+        secondary.acomplete = AsyncMock()
+
+        client = MultiProviderClient(
+            providers=[primary, secondary], routing=RoutingConfig(hedge=True)
+        )
+        assert (await client.acomplete("Test prompt")).content == "p"
+        secondary.acomplete.assert_not_called()
+
+
+class TestAsyncCompletion:
+    """Test the native async completion API."""
+
+    @pytest.mark.asyncio
+    async def test_mock_acomplete(self):
+        """MockLLMClient should support acomplete."""
+        client = MockLLMClient()
+        result = await client.acomplete("Hello", json_mode=True)
+        assert isinstance(result, LLMResponse)
+        assert result.provider == "mock"
+
+    @pytest.mark.asyncio
+    async def test_acomplete_uses_cache(self):
+        """acomplete should serve cached responses without calling the provider."""
+        client = MockLLMClient()
+        client._cache = Mock()
+        client._cache.get.return_value = LLMResponse(
+            content="cached", model="mock-model", provider="mock"
+        ).to_dict()
+
+        result = await client.acomplete("Hello")
+
+        assert result.content == "cached"
+        assert result.cached is True
+        client._cache.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_acomplete_cache_io_runs_off_the_event_loop(self):
+        """Cache lookups and writes (disk, Redis) happen in worker threads, not on the loop."""
+        import threading
+
+        loop_thread = threading.current_thread()
+        threads = []
+        client = MockLLMClient()
+        client._cache = Mock()
+        client._cache.get.side_effect = lambda **kw: threads.append(threading.current_thread())
+        client._cache.set.side_effect = lambda **kw: threads.append(threading.current_thread())
+
+        await client.acomplete("Hello")
+
+        assert len(threads) == 3  # miss, re-check inside the flight, store
+        assert loop_thread not in threads
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_acomplete_calls_are_coalesced(self):
+        """Concurrent identical prompts should reach the provider once."""
+        import asyncio
+        from src.llm.retry_cache import SingleFlight
+
+        client = MockLLMClient()
+        client._single_flight = SingleFlight()
+        calls = []
+
+        async def _slow(*args, **kwargs):
+            calls.append(args)
+            await asyncio.sleep(0.05)
+            return LLMResponse(content="shared", model="mock-model", provider="mock")
+
+        client._acomplete_impl = _slow
+        results = await asyncio.gather(*(client.acomplete("Same prompt") for _ in range(4)))
+
+        assert [r.content for r in results] == ["shared"] * 4
+        assert len(calls) == 1
+        assert client._single_flight.coalesced == 3
+
+    def test_identical_concurrent_complete_calls_are_coalesced(self):
+        """Threads sending the same prompt should share one provider call."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from src.llm.retry_cache import SingleFlight
+
+        client = MockLLMClient()
+        client._single_flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def _slow(*args, **kwargs):
+            calls.append(args)
+            release.wait(5)
+            return LLMResponse(content="shared", model="mock-model", provider="mock")
+
+        client._complete_impl = _slow
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(client.complete, "Same prompt") for _ in range(3)]
+            while client._single_flight.coalesced < 2:
+                time.sleep(0.01)
+            release.set()
+            results = [f.result(5) for f in futures]
+
+        assert [r.content for r in results] == ["shared"] * 3
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_astream_default_yields_whole_completion(self):
+        """Clients without a streaming API yield the full completion once."""
+        client = MockLLMClient()
+        deltas = [d async for d in client.astream("Hello")]
+        assert len(deltas) == 1
+        assert deltas[0].startswith("[MOCK RESPONSE]")
+
+    @pytest.mark.asyncio
+    async def test_astream_caches_assembled_text(self):
+        """astream should store the joined deltas once the stream finishes."""
+        client = MockLLMClient()
+        client._cache = Mock()
+        client._cache.get.return_value = None
+
+        async def _deltas(*args, **kwargs):
+            for part in ("Hel", "lo"):
+                yield part
+
+        client._astream_impl = _deltas
+        deltas = [d async for d in client.astream("Hello")]
+
+        assert deltas == ["Hel", "lo"]
+        stored = client._cache.set.call_args.kwargs["response"]
+        assert stored["content"] == "Hello"
+
+    @pytest.mark.asyncio
+    @patch('openai.AsyncOpenAI')
+    @patch('openai.OpenAI')
+    async def test_astream_caches_cleaned_json_and_usage(self, mock_openai, mock_async_openai):
+        """Streamed json_mode output is cached with the same cleanup complete() applies."""
+        from unittest.mock import AsyncMock
+
+        def _chunk(text, usage=None):
+            chunk = Mock()
+            chunk.usage = usage
+            chunk.choices = [Mock()] if text else []
+            if text:
+                chunk.choices[0].delta.content = text
+            return chunk
+
+        async def _stream():
+            yield _chunk("```json\n{\"ok\": ")
+            yield _chunk("true}\n```")
+            yield _chunk(None, usage=Mock(prompt_tokens=4, completion_tokens=6))
+
+        mock_async_client = Mock()
+        mock_async_client.chat.completions.create = AsyncMock(return_value=_stream())
+        mock_async_openai.return_value = mock_async_client
+
+        client = PerplexityClient(api_key="test_key", use_retry=False)
+        client._cache = Mock()
+        client._cache.get.return_value = None
+
+        deltas = [d async for d in client.astream("Test prompt", json_mode=True)]
+
+        assert "".join(deltas) == '```json\n{"ok": true}\n```'
+        stored = client._cache.set.call_args.kwargs["response"]
+        assert stored["content"] == '{"ok": true}'
+        assert stored["usage"] == {"prompt_tokens": 4, "completion_tokens": 6}
+
 
 class TestProviderSelection:
     """Test provider selection logic."""
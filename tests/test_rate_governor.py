@@ -0,0 +1,153 @@
+"""Tests for the process-wide LLM rate governor."""
+import asyncio
+import time
+
+import pytest
+
+from src.llm.client import LLMResponse, MockLLMClient
+from src.llm.rate_governor import (
+    GovernorConfig,
+    ProviderLimiter,
+    RateGovernor,
+    estimate_tokens,
+    usage_tokens,
+)
+
+
+def _limiter(**overrides) -> ProviderLimiter:
+    return ProviderLimiter(("test", "model"), GovernorConfig(**overrides))
+
+
+class TestProviderLimiter:
+    """Budgets and AIMD concurrency for one (provider, model)."""
+
+    def test_request_budget_paces_calls(self):
+        """Once the RPM bucket is empty, the next call waits for a refill."""
+        limiter = _limiter(requests_per_minute=600)  # 10/s refill
+        limiter._requests.tokens = 1
+
+        start = time.monotonic()
+        limiter.release(limiter.acquire())
+        limiter.release(limiter.acquire())
+
+        assert time.monotonic() - start >= 0.08
+
+    def test_token_budget_is_corrected_from_usage(self):
+        """Unused estimated tokens are returned to the bucket."""
+        limiter = _limiter(tokens_per_minute=10_000)
+        admitted = limiter.acquire(est_tokens=4_000)
+        assert limiter._tokens.tokens == pytest.approx(6_000, abs=5)
+
+        limiter.release(admitted, est_tokens=4_000, used_tokens=1_000)
+
+        assert limiter._tokens.tokens == pytest.approx(9_000, abs=5)
+
+    def test_concurrency_limit_is_enforced(self):
+        """No more than the current limit may be in flight."""
+        limiter = _limiter(initial_concurrency=2)
+        limiter.acquire()
+        limiter.acquire()
+
+        assert limiter._try_acquire(0) > 0
+        assert limiter.in_flight == 2
+
+    def test_rate_limit_halves_limit_and_honours_retry_after(self):
+        """A 429 should cut concurrency and pause the key for the hinted time."""
+        limiter = _limiter(initial_concurrency=8)
+        admitted = limiter.acquire()
+
+        limiter.release(admitted, error=Exception("429 Too Many Requests, try again in 0.2s"))
+
+        assert limiter.stats()["concurrency_limit"] == 4
+        assert limiter.stats()["rate_limited"] == 1
+        assert 0.1 < limiter._try_acquire(0) <= 0.2
+
+    def test_burst_of_429s_from_one_window_decreases_once(self):
+        """Calls admitted before a decrease shouldn't shrink the limit again."""
+        limiter = _limiter(initial_concurrency=8, default_cooldown_seconds=0)
+        admitted = [limiter.acquire() for _ in range(3)]
+
+        for a in admitted:
+            limiter.release(a, error=Exception("rate limit exceeded"))
+
+        assert limiter.stats()["concurrency_limit"] == 4
+
+    def test_successes_grow_limit_additively(self):
+        """About one extra slot per window of successful calls, up to the max."""
+        limiter = _limiter(initial_concurrency=2, max_concurrency=3)
+        for _ in range(2):
+            limiter.release(limiter.acquire())
+        assert limiter.stats()["concurrency_limit"] == 2
+        for _ in range(10):
+            limiter.release(limiter.acquire())
+        assert limiter.stats()["concurrency_limit"] == 3
+
+    def test_other_errors_do_not_change_limit(self):
+        """Non rate-limit failures release the slot without feedback."""
+        limiter = _limiter(initial_concurrency=4)
+        limiter.release(limiter.acquire(), error=ValueError("bad request"))
+
+        assert limiter.stats() == {
+            "concurrency_limit": 4, "in_flight": 0, "successes": 0,
+            "rate_limited": 0, "wait_seconds": 0.0,
+        }
+
+
+class TestRateGovernor:
+    """Registry, configuration and client integration."""
+
+    def test_limiters_are_shared_per_provider_and_model(self):
+        governor = RateGovernor()
+        assert governor.limiter("openai", "gpt-4o") is governor.limiter("openai", "gpt-4o")
+        assert governor.limiter("openai", "gpt-4o") is not governor.limiter("openai", "gpt-4o-mini")
+
+    def test_configure_and_env_overrides(self, monkeypatch):
+        governor = RateGovernor()
+        monkeypatch.setenv("LLM_GROQ_RPM", "30")
+        monkeypatch.setenv("LLM_TPM", "6000")
+        governor.configure("openai", GovernorConfig(requests_per_minute=500))
+
+        assert governor.limiter("groq", "llama").config.requests_per_minute == 30
+        assert governor.limiter("groq", "llama").config.tokens_per_minute == 6000
+        assert governor.limiter("openai", "gpt-4o").config.requests_per_minute == 500
+
+    def test_usage_and_estimate_helpers(self):
+        assert usage_tokens({"prompt_tokens": 3, "completion_tokens": 4}) == 7
+        assert usage_tokens({"input_tokens": 5, "output_tokens": 1}) == 6
+        assert usage_tokens({"total_tokens": 9, "prompt_tokens": 1}) == 9
+        assert usage_tokens({}) is None
+        assert estimate_tokens("x" * 400, "y" * 40, 100) == 210
+
+    @pytest.mark.asyncio
+    async def test_client_calls_pass_through_governor(self):
+        """acomplete should hold a slot per attempt and report 429s to the limiter."""
+        from src.llm.retry_cache import RetryConfig, SmartRetry
+
+        governor = RateGovernor(GovernorConfig(initial_concurrency=2, default_cooldown_seconds=0))
+        client = MockLLMClient()
+        client._governor = governor
+        client._single_flight = None
+        client._retry = SmartRetry(RetryConfig(min_wait_seconds=0, jitter=False))
+        limiter = governor.limiter("mock", client.model)
+        peak = 0
+        attempts = 0
+
+        async def _impl(prompt, *args, **kwargs):
+            nonlocal peak, attempts
+            attempts += 1
+            attempt = attempts
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+            if attempt == 1:
+                raise Exception("429 rate limit")
+            return LLMResponse(content="ok", model="mock-model", provider="mock")
+
+        client._acomplete_impl = _impl
+        results = await asyncio.gather(*(client.acomplete(f"p{i}") for i in range(5)))
+
+        assert all(r.content == "ok" for r in results)
+        assert peak <= 2
+        stats = limiter.stats()
+        assert stats["rate_limited"] == 1
+        assert stats["successes"] == 5
+        assert stats["in_flight"] == 0
@@ -12,6 +12,7 @@ import pytest
 import time
 import hashlib
 import json
+import pickle
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 import tempfile
@@ -21,8 +22,12 @@ import shutil
 from src.llm.retry_cache import (
     RetryConfig,
     CacheConfig,
+    DiskCacheBackend,
     LLMCache,
+    MemoryLRUCache,
+    RedisCacheBackend,
     SmartRetry,
+    SingleFlight,
     RateLimitError,
     TransientError,
     is_rate_limit_error,
@@ -177,6 +182,193 @@ class TestLLMCache:
         # Disabled cache should return None
         assert result is None
 
+    def test_memory_tier_serves_repeat_hits(self, cache):
+        """Hits after a write should be answered from memory, not disk."""
+        cache.set("prompt", None, "model", 0.7, 1000, False, "openai", {"data": "value"})
+        cache.get("prompt", None, "model", 0.7, 1000, False, "openai")
+        cache.get("prompt", None, "model", 0.7, 1000, False, "openai")
+
+        tiers = cache.stats()["tiers"]
+        assert tiers["memory"]["hits"] == 2
+        assert tiers["disk"]["hits"] == 0
+
+    def test_disk_hit_is_promoted_to_memory(self, cache):
+        """An entry only on disk should move into memory on first read."""
+        cache.set("prompt", None, "model", 0.7, 1000, False, "openai", {"data": "value"})
+        cache.tier("memory").clear()
+
+        assert cache.get("prompt", None, "model", 0.7, 1000, False, "openai") == {"data": "value"}
+        assert cache.get("prompt", None, "model", 0.7, 1000, False, "openai") == {"data": "value"}
+
+        tiers = cache.stats()["tiers"]
+        assert tiers["disk"]["hits"] == 1
+        assert tiers["memory"]["hits"] == 1
+        assert tiers["memory"]["misses"] == 1
+
+    def test_memory_eviction_demotes_to_disk(self, temp_cache_dir):
+        """Entries pushed out of the memory budget stay readable from disk."""
+        config = CacheConfig(cache_dir=temp_cache_dir, memory_max_bytes=400)
+        cache = LLMCache(config)
+        for i in range(5):
+            cache.set(f"prompt{i}", None, "model", 0.7, 1000, False, "openai", {"data": "x" * 100})
+
+        memory = cache.stats()["tiers"]["memory"]
+        assert memory["evictions"] > 0
+        assert memory["size_bytes"] <= 400
+        assert cache.get("prompt0", None, "model", 0.7, 1000, False, "openai") == {"data": "x" * 100}
+        assert cache.stats()["tiers"]["disk"]["hits"] == 1
+
+    def test_memory_tier_can_be_disabled(self, temp_cache_dir):
+        """memory_max_bytes=0 should leave only the disk tier."""
+        cache = LLMCache(CacheConfig(cache_dir=temp_cache_dir, memory_max_bytes=0))
+        cache.set("prompt", None, "model", 0.7, 1000, False, "openai", {"data": "value"})
+
+        assert cache.get("prompt", None, "model", 0.7, 1000, False, "openai") == {"data": "value"}
+        assert "memory" not in cache.stats()["tiers"]
+
+
+class TestMemoryLRUCache:
+    """Tests for the byte-bounded in-process LRU tier."""
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Reading an entry should protect it from the next eviction."""
+        size = len(pickle.dumps("a" * 50, protocol=pickle.HIGHEST_PROTOCOL))
+        lru = MemoryLRUCache(max_bytes=size * 2)
+        lru.set("a", "a" * 50)
+        lru.set("b", "b" * 50)
+        lru.get("a")
+        lru.set("c", "c" * 50)
+
+        assert lru.get("b") == (None, None)
+        assert lru.get("a")[0] == "a" * 50
+        assert lru.get("c")[0] == "c" * 50
+        assert lru.stats()["evictions"] == 1
+        assert lru.volume() <= size * 2
+
+    def test_rejects_values_larger_than_budget(self):
+        """A value bigger than the whole budget isn't stored."""
+        lru = MemoryLRUCache(max_bytes=10)
+        assert lru.set("big", "x" * 100) is False
+        assert len(lru) == 0
+
+    def test_returns_copies(self):
+        """Mutating a returned value must not change the cached one."""
+        lru = MemoryLRUCache(max_bytes=1024)
+        lru.set("k", {"usage": {"tokens": 1}})
+        lru.get("k")[0]["usage"]["tokens"] = 99
+
+        assert lru.get("k")[0] == {"usage": {"tokens": 1}}
+
+    def test_expired_entries_miss(self):
+        """Entries past their TTL are dropped on read."""
+        lru = MemoryLRUCache(max_bytes=1024)
+        lru.set("k", "v", expire=0.01)
+        time.sleep(0.02)
+
+        assert lru.get("k") == (None, None)
+        assert lru.stats()["misses"] == 1
+
+    def test_reports_remaining_lifetime(self):
+        """get() should return how long the entry has left to live."""
+        lru = MemoryLRUCache(max_bytes=1024, ttl_seconds=60)
+        lru.set("k", "v")
+
+        value, remaining = lru.get("k")
+        assert value == "v"
+        assert 0 < remaining <= 60
+
+
+class TestRedisCacheTier:
+    """Tests for the shared Redis tier, run against fakeredis."""
+
+    @pytest.fixture
+    def redis_client(self):
+        """A RedisClient wired to an in-process fake server."""
+        fakeredis = pytest.importorskip("fakeredis")
+        from src.cache.redis_client import RedisClient
+
+        client = RedisClient(url="redis://fake:6379/0", enabled=True)
+        client._client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        return client
+
+    @pytest.fixture
+    def temp_cache_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _cache(self, cache_dir, redis_client, name="a"):
+        """An LLMCache with memory, its own disk dir, and the shared Redis tier."""
+        config = CacheConfig(cache_dir=f"{cache_dir}/{name}", ttl_seconds=3600)
+        return LLMCache(config, backends=[
+            MemoryLRUCache(1024 * 1024, ttl_seconds=config.ttl_seconds),
+            DiskCacheBackend(config.cache_dir, config.max_size_gb, config.ttl_seconds),
+            RedisCacheBackend(redis_client, ttl_seconds=config.ttl_seconds),
+        ])
+
+    def test_round_trip_is_compressed_with_ttl(self, redis_client):
+        """Stored values should be compressed and expire after the configured TTL."""
+        backend = RedisCacheBackend(redis_client, ttl_seconds=3600)
+        value = {"content": "x" * 5000, "usage": {"tokens": 7}}
+        assert backend.set("k", value) is True
+
+        assert backend.get("k") == (value, None)
+        raw = backend._run(redis_client._client.get("llm:k"))
+        assert len(raw) < 1000
+        ttl = backend._run(redis_client._client.ttl("llm:k"))
+        assert 0 < ttl <= 3600
+        backend.close()
+
+    def test_replicas_share_responses_through_redis(self, temp_cache_dir, redis_client):
+        """A response cached by one replica is a hit for another, then promoted locally."""
+        first = self._cache(temp_cache_dir, redis_client, "a")
+        second = self._cache(temp_cache_dir, redis_client, "b")
+        first.set("prompt", None, "model", 0.7, 1000, False, "openai", {"data": "value"})
+
+        assert second.get("prompt", None, "model", 0.7, 1000, False, "openai") == {"data": "value"}
+        assert second.get("prompt", None, "model", 0.7, 1000, False, "openai") == {"data": "value"}
+
+        tiers = second.stats()["tiers"]
+        assert tiers["redis"]["hits"] == 1
+        assert tiers["memory"]["hits"] == 1
+        assert second.tier("disk").get(
+            second._generate_key("prompt", None, "model", 0.7, 1000, False, "openai")
+        )[0] == {"data": "value"}
+        first.close()
+        second.close()
+
+    def test_clear_removes_only_llm_keys(self, temp_cache_dir, redis_client):
+        """clear() should wipe this cache's Redis keys and leave others alone."""
+        cache = self._cache(temp_cache_dir, redis_client)
+        cache.set("prompt", None, "model", 0.7, 1000, False, "openai", {"data": "value"})
+        backend = cache.tier("redis")
+        backend._run(redis_client.set("other:key", "keep"))
+
+        cache.clear()
+
+        assert cache.get("prompt", None, "model", 0.7, 1000, False, "openai") is None
+        assert backend._run(redis_client.get("other:key")) == "keep"
+        cache.close()
+
+    def test_unreachable_redis_is_a_miss(self):
+        """A Redis that can't be reached must degrade to a cache miss."""
+        from src.cache.redis_client import RedisClient
+
+        backend = RedisCacheBackend(RedisClient(url="redis://invalid:9999", enabled=True))
+
+        assert backend.get("k") == (None, None)
+        assert backend.set("k", {"data": 1}) is False
+        backend.close()
+
+    def test_not_configured_without_url(self, temp_cache_dir, monkeypatch):
+        """Without a Redis URL the default stack is memory + disk only."""
+        from src.config.settings import settings
+
+        monkeypatch.setattr(settings, "REDIS_URL", None)
+        cache = LLMCache(CacheConfig(cache_dir=temp_cache_dir))
+
+        assert [t.name for t in cache._tiers] == ["memory", "disk"]
+
 
 class TestRateLimitDetection:
     """Tests for rate limit error detection."""
@@ -347,6 +539,153 @@ class TestSmartRetry:
         assert stats["successful_calls"] == 1
         assert stats["failed_calls"] == 0
 
+    @pytest.mark.asyncio
+    async def test_async_function_retried(self):
+        """Test that coroutine functions are retried without blocking the loop."""
+        config = RetryConfig(max_retries=3, min_wait_seconds=0.01, max_wait_seconds=0.1)
+        retry = SmartRetry(config)
+
+        call_count = 0
+
+        @retry
+        async def flaky_coro():
+            nonlocal call_count
+            call_count += 1
+            if call_count < 3:
+                raise Exception("503 Service Unavailable")
+            return "success"
+
+        result = await flaky_coro()
+
+        assert result == "success"
+        assert call_count == 3
+        assert retry.get_stats()["total_retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_async_non_retryable_error_not_retried(self):
+        """Test that async non-retryable errors propagate immediately."""
+        retry = SmartRetry(RetryConfig(max_retries=3, min_wait_seconds=0.01))
+
+        @retry
+        async def auth_error_coro():
+            raise ValueError("Invalid API key")
+
+        with pytest.raises(ValueError):
+            await auth_error_coro()
+        assert retry.get_stats()["failed_calls"] == 1
+
+
+class TestSingleFlight:
+    """Tests for request coalescing."""
+
+    def test_concurrent_sync_calls_share_one_execution(self):
+        """Threads with the same key should wait for the leader's result."""
+        import threading
+
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "result"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("k", slow_call)))
+        leader.start()
+        started.wait(5)
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("k", slow_call)))
+            for _ in range(3)
+        ]
+        for t in followers:
+            t.start()
+        while flight.coalesced < 3:
+            time.sleep(0.01)
+        release.set()
+        for t in [leader, *followers]:
+            t.join(5)
+
+        assert results == ["result"] * 4
+        assert len(calls) == 1
+        assert flight.stats() == {"in_flight": 0, "coalesced": 3}
+
+    def test_sync_error_is_shared_and_key_released(self):
+        """A failed call raises for its waiters and doesn't poison the key."""
+        flight = SingleFlight()
+
+        with pytest.raises(ValueError):
+            flight.do("k", Mock(side_effect=ValueError("boom")))
+
+        assert flight.do("k", lambda: "ok") == "ok"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_async_calls_share_one_execution(self):
+        """Coroutines with the same key should await a single call."""
+        import asyncio
+
+        flight = SingleFlight()
+        calls = []
+
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(
+            *(flight.ado("k", slow_call) for _ in range(5)),
+            flight.ado("other", slow_call),
+        )
+
+        assert results == ["result"] * 6
+        assert len(calls) == 2
+        assert flight.coalesced == 4
+        assert flight.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelling_leader_does_not_cancel_followers(self):
+        """Followers still get the result when the caller that started it goes away."""
+        import asyncio
+
+        flight = SingleFlight()
+
+        async def slow_call():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        leader = asyncio.ensure_future(flight.ado("k", slow_call))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.ado("k", slow_call))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "result"
+
+    @pytest.mark.asyncio
+    async def test_cancelling_last_waiter_cancels_the_call(self):
+        """A call nobody waits for any more is cancelled instead of running to the end."""
+        import asyncio
+
+        flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def slow_call():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.ensure_future(flight.ado("k", slow_call))
+        await asyncio.sleep(0)
+        waiter.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert flight.stats()["in_flight"] == 0
+
 
 class TestConfigureLLMResilience:
     """Tests for the configure_llm_resilience helper."""
@@ -0,0 +1,197 @@
+"""Tests for the similarity-keyed LLM response cache."""
+import pytest
+from unittest.mock import AsyncMock
+
+from src.llm.client import LLMResponse, MockLLMClient
+from src.llm.similarity_cache import (
+    MinHasher,
+    SimilarityCache,
+    SimilarityCacheConfig,
+    get_default_similarity_cache,
+    jaccard,
+    normalize_tokens,
+)
+
+
+def _cache(**overrides) -> SimilarityCache:
+    return SimilarityCache(SimilarityCacheConfig(enabled=True, **overrides))
+
+
+def _client(content="answer") -> MockLLMClient:
+    client = MockLLMClient()
+    client.acomplete = AsyncMock(
+        return_value=LLMResponse(content=content, model="mock-model", provider="mock")
+    )
+    return client
+
+
+class TestNormalization:
+    """Token normalisation and signatures."""
+
+    def test_reordered_phrasing_normalises_identically(self):
+        """Word order, stopwords and plurals shouldn't matter."""
+        assert normalize_tokens("todo app for teams") == normalize_tokens("Team todo app")
+
+    def test_minhash_estimates_jaccard(self):
+        """Signature agreement should approximate the true Jaccard similarity."""
+        a = frozenset(f"w{i}" for i in range(100))
+        b = frozenset(f"w{i}" for i in range(20, 120))
+        hasher = MinHasher(num_perm=256)
+        sig_a, sig_b = hasher.signature(a), hasher.signature(b)
+        estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / 256
+
+        assert abs(estimate - jaccard(a, b)) < 0.12
+
+
+class TestSimilarityCache:
+    """Lookup, store and statistics."""
+
+    @pytest.mark.asyncio
+    async def test_near_identical_text_hits(self):
+        """A reworded idea in the same prompt template should reuse the response."""
+        cache = _cache()
+        client = _client()
+        template = "Design this app:\n{idea}\nReturn JSON."
+
+        first = await cache.acomplete(
+            client, "architect.step1", "todo app for teams",
+            template.format(idea="todo app for teams"), temperature=0.4,
+        )
+        second = await cache.acomplete(
+            client, "architect.step1", "team todo app",
+            template.format(idea="team todo app"), temperature=0.4,
+        )
+
+        assert client.acomplete.await_count == 1
+        assert second.content == first.content
+        assert second.cached is True
+
+    @pytest.mark.asyncio
+    async def test_dissimilar_text_misses(self):
+        """Different ideas must not share a response."""
+        cache = _cache()
+        client = _client()
+
+        await cache.acomplete(client, "ns", "todo app for teams", "P: todo app for teams")
+        await cache.acomplete(client, "ns", "recipe sharing network", "P: recipe sharing network")
+
+        assert client.acomplete.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rest_of_request_must_match_exactly(self):
+        """Same idea but different template or temperature is a miss."""
+        cache = _cache()
+        client = _client()
+        idea = "todo app for teams"
+
+        await cache.acomplete(client, "ns", idea, f"Step A: {idea}", temperature=0.3)
+        await cache.acomplete(client, "ns", idea, f"Step B: {idea}", temperature=0.3)
+        await cache.acomplete(client, "ns", idea, f"Step A: {idea}", temperature=0.9)
+
+        assert client.acomplete.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_responses_failing_validation_are_not_cached(self):
+        """An answer the caller can't parse must not be replayed to similar prompts."""
+        cache = _cache()
+        client = _client(content="not json")
+        parses = lambda response: response.content.startswith("{")
+
+        await cache.acomplete(client, "ns", "todo app for teams", "P: todo app for teams", validate=parses)
+        client.acomplete.return_value = LLMResponse(content="{}", model="mock-model", provider="mock")
+        second = await cache.acomplete(client, "ns", "team todo app", "P: team todo app", validate=parses)
+
+        assert client.acomplete.await_count == 2
+        assert second.content == "{}"
+        assert cache.stats()["namespaces"]["ns"]["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_response_failing_validation_is_invalidated(self):
+        """A stored entry the caller rejects is dropped and fetched again."""
+        cache = _cache()
+        client = _client(content="{}")
+        cache.store(
+            "ns", SimilarityCache.exact_key(client, "todo app", "P: todo app", None, 0.7, False),
+            "todo app", {"content": "garbage", "model": "mock-model", "provider": "mock"},
+        )
+
+        response = await cache.acomplete(
+            client, "ns", "todo app", "P: todo app",
+            validate=lambda r: r.content.startswith("{"),
+        )
+
+        assert response.content == "{}"
+        assert client.acomplete.await_count == 1
+        assert cache.lookup(
+            "ns", SimilarityCache.exact_key(client, "todo app", "P: todo app", None, 0.7, False), "todo app"
+        )["content"] == "{}"
+
+    def test_threshold_is_configurable(self):
+        """A strict threshold rejects partial overlaps a loose one accepts."""
+        key = "k"
+        strict, loose = _cache(threshold=0.95), _cache(threshold=0.5)
+        for cache in (strict, loose):
+            cache.store("ns", key, "shared team task board kanban", {"content": "x"})
+
+        query = "shared team task board calendar"
+        assert strict.lookup("ns", key, query) is None
+        assert loose.lookup("ns", key, query) == {"content": "x"}
+
+    def test_reports_per_namespace_hit_rates(self):
+        """stats() should break lookups down by namespace."""
+        cache = _cache()
+        cache.store("a", "k", "todo app for teams", {"content": "x"})
+        cache.lookup("a", "k", "team todo app")
+        cache.lookup("a", "k", "weather dashboard")
+        cache.lookup("b", "k", "team todo app")
+
+        namespaces = cache.stats()["namespaces"]
+        assert namespaces["a"] == {
+            "lookups": 2, "hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1,
+        }
+        assert namespaces["b"]["hit_rate"] == 0.0
+
+    def test_evicts_oldest_entries_per_namespace(self):
+        """Each namespace keeps at most max_entries_per_namespace entries."""
+        cache = _cache(max_entries_per_namespace=2)
+        for i, text in enumerate(["alpha beta", "gamma delta", "epsilon zeta"]):
+            cache.store("ns", "k", text, {"content": str(i)})
+
+        assert cache.lookup("ns", "k", "alpha beta") is None
+        assert cache.lookup("ns", "k", "epsilon zeta") == {"content": "2"}
+        assert cache.stats()["namespaces"]["ns"]["entries"] == 2
+
+    def test_default_cache_is_off_unless_enabled(self, monkeypatch):
+        """The process-wide cache only exists when LLM_SIMILARITY_CACHE is set."""
+        import src.llm.similarity_cache as module
+
+        monkeypatch.setattr(module, "_default_similarity_cache", None)
+        monkeypatch.delenv("LLM_SIMILARITY_CACHE", raising=False)
+        assert get_default_similarity_cache() is None
+
+        monkeypatch.setenv("LLM_SIMILARITY_CACHE", "1")
+        monkeypatch.setenv("LLM_SIMILARITY_THRESHOLD", "0.9")
+        cache = get_default_similarity_cache()
+        assert cache is not None
+        assert cache.config.threshold == 0.9
+
+
+class TestArchitectIntegration:
+    """SystemArchitect routes its steps through the similarity cache."""
+
+    @pytest.mark.asyncio
+    async def test_reworded_idea_reuses_architect_steps(self):
+        """Designing a reworded idea twice should only call the LLM for the first."""
+        from src.code_generation.architect import SystemArchitect
+
+        client = _client(content="{}")
+        cache = _cache()
+        arch = SystemArchitect(llm_client=client, similarity_cache=cache)
+
+        await arch.design("Todo", "A todo app for teams")
+        calls_after_first = client.acomplete.await_count
+        await arch.design("Todo", "Team todo app")
+
+        assert calls_after_first > 0
+        assert client.acomplete.await_count == calls_after_first
+        assert cache.stats()["namespaces"]["architect.step1_decompose"]["hits"] == 1
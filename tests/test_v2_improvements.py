@@ -4,6 +4,7 @@ Tests for the v2 Code Generation improvements made in this session.
 Covers:
 - _topological_tiers dependency ordering
 - Concurrent generation via asyncio.gather + semaphore
+- DAG scheduling with critical-path priority
 - _extract_interface_summary (rich AST extraction: imports, class methods, async funcs)
 - _interfaces_summary with relevant_to filtering
 - Pipeline run_with_progress (no double-run, result attached to final event)
@@ -144,6 +145,163 @@ class TestTopologicalTiers:
         assert tiers == []
 
 
+# ---------------------------------------------------------------------------
+# DAG scheduler tests
+# ---------------------------------------------------------------------------
+
+class TestDagScheduler:
+    """Tests for CodeGeneratorV2._run_dag and critical-path priorities."""
+
+    def _make_spec(self, path, depends_on=None):
+        from src.code_generation.engine_v2 import FileCategory, _FileSpec
+        return _FileSpec(
+            relative_path=path,
+            category=FileCategory.BACKEND_CORE,
+            prompt_builder=lambda ctx: "",
+            description=f"Test file {path}",
+            depends_on=depends_on or [],
+        )
+
+    def _run(self, plan, delays=None, max_concurrency=4, fail=()):
+        """Run the scheduler with sleeping workers and record start/finish order."""
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+
+        delays = delays or {}
+        events: List[tuple] = []
+        results: Dict[str, Any] = {}
+        running = 0
+        peak = 0
+
+        async def worker(fs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            events.append(("start", fs.relative_path))
+            await asyncio.sleep(delays.get(fs.relative_path, 0.01))
+            running -= 1
+            events.append(("end", fs.relative_path))
+            if fs.relative_path in fail:
+                raise RuntimeError("boom")
+            return fs.relative_path
+
+        def on_done(fs, result):
+            results[fs.relative_path] = result
+
+        run_async(CodeGeneratorV2._run_dag(plan, worker, on_done, max_concurrency))
+        return events, results, peak
+
+    def test_file_starts_when_its_own_deps_finish(self):
+        """A fast chain must not wait for an unrelated slow file (no tier barrier)."""
+        plan = [
+            self._make_spec("slow_model.py"),
+            self._make_spec("fast_model.py"),
+            self._make_spec("fast_route.py", depends_on=["fast_model.py"]),
+        ]
+        events, _, _ = self._run(plan, delays={"slow_model.py": 0.3})
+
+        assert events.index(("start", "fast_route.py")) < events.index(("end", "slow_model.py"))
+
+    def test_dependencies_finish_before_dependents_start(self):
+        plan = [
+            self._make_spec("a.py"),
+            self._make_spec("b.py", depends_on=["a.py"]),
+            self._make_spec("c.py", depends_on=["a.py"]),
+            self._make_spec("d.py", depends_on=["b.py", "c.py"]),
+        ]
+        events, results, _ = self._run(plan)
+
+        assert set(results) == {"a.py", "b.py", "c.py", "d.py"}
+        for dep, child in [("a.py", "b.py"), ("a.py", "c.py"), ("b.py", "d.py"), ("c.py", "d.py")]:
+            assert events.index(("end", dep)) < events.index(("start", child))
+
+    def test_concurrency_cap_is_respected(self):
+        plan = [self._make_spec(f"f{i}.py") for i in range(10)]
+        _, results, peak = self._run(plan, max_concurrency=3)
+
+        assert len(results) == 10
+        assert peak == 3
+
+    def test_critical_path_starts_first(self):
+        """With one slot, the head of the longest chain should run before leaf files."""
+        plan = [
+            self._make_spec("readme.md"),
+            self._make_spec("config.py"),
+            self._make_spec("models.py", depends_on=["config.py"]),
+            self._make_spec("crud.py", depends_on=["models.py"]),
+        ]
+        events, _, _ = self._run(plan, max_concurrency=1)
+
+        assert events[0] == ("start", "config.py")
+
+    def test_critical_path_lengths(self):
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+
+        plan = [
+            self._make_spec("a.py"),
+            self._make_spec("b.py", depends_on=["a.py"]),
+            self._make_spec("c.py", depends_on=["b.py", "external.py"]),
+            self._make_spec("d.py"),
+        ]
+        assert CodeGeneratorV2._critical_path_lengths(plan) == {
+            "a.py": 3, "b.py": 2, "c.py": 1, "d.py": 1,
+        }
+
+    def test_failed_dependency_still_releases_dependents(self):
+        """A failed file is reported and its dependents still run (against a placeholder)."""
+        plan = [
+            self._make_spec("a.py"),
+            self._make_spec("b.py", depends_on=["a.py"]),
+        ]
+        _, results, _ = self._run(plan, fail={"a.py"})
+
+        assert isinstance(results["a.py"], RuntimeError)
+        assert results["b.py"] == "b.py"
+
+    def test_cycles_and_unknown_deps_do_not_hang(self):
+        plan = [
+            self._make_spec("a.py", depends_on=["b.py"]),
+            self._make_spec("b.py", depends_on=["a.py"]),
+            self._make_spec("c.py", depends_on=["not_in_plan.py"]),
+        ]
+        _, results, _ = self._run(plan)
+
+        assert set(results) == {"a.py", "b.py", "c.py"}
+
+    def test_ready_batchable_files_share_one_slot(self):
+        """Small ready files are grouped for the batch worker; the rest run alone."""
+        from src.code_generation.engine_v2 import CodeGeneratorV2
+
+        plan = [
+            self._make_spec("main.py"),
+            self._make_spec(".gitignore"),
+            self._make_spec("tsconfig.json"),
+            self._make_spec(".dockerignore"),
+            self._make_spec("late.css", depends_on=["main.py"]),
+        ]
+        batches: List[List[str]] = []
+        results: Dict[str, Any] = {}
+
+        async def worker(fs):
+            return fs.relative_path
+
+        async def batch_worker(specs):
+            batches.append([fs.relative_path for fs in specs])
+            return [f"batched:{fs.relative_path}" for fs in specs]
+
+        run_async(CodeGeneratorV2._run_dag(
+            plan, worker, lambda fs, r: results.__setitem__(fs.relative_path, r), 4,
+            batch_worker=batch_worker,
+            batchable=lambda fs: not fs.relative_path.endswith(".py"),
+            batch_size=3,
+        ))
+
+        assert batches == [[".gitignore", "tsconfig.json", ".dockerignore"]]
+        assert results["main.py"] == "main.py"
+        assert results[".gitignore"] == "batched:.gitignore"
+        # Released alone later, so it runs on its own
+        assert results["late.css"] == "late.css"
+
+
 # ---------------------------------------------------------------------------
 # _extract_interface_summary tests
 # ---------------------------------------------------------------------------